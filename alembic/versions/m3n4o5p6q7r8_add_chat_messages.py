@@ -0,0 +1,42 @@
+"""add chat_messages table, range-partitioned by month
+
+Revision ID: m3n4o5p6q7r8
+Revises: l2m3n4o5p6q7
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = 'm3n4o5p6q7r8'
+down_revision: Union[str, Sequence[str], None] = 'l2m3n4o5p6q7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Alembic's create_table cannot declare partitioning, so the parent is raw DDL.
+    # Monthly partitions are created at runtime (couchd.core.chat_archive.ensure_partitions);
+    # the DEFAULT partition only catches rows that arrive before one exists.
+    op.execute("""
+        CREATE TABLE chat_messages (
+            id BIGINT GENERATED BY DEFAULT AS IDENTITY,
+            sent_at TIMESTAMPTZ NOT NULL,
+            session_id INTEGER REFERENCES stream_sessions (id),
+            platform VARCHAR(16) NOT NULL,
+            message_id VARCHAR NOT NULL,
+            user_id VARCHAR,
+            username VARCHAR NOT NULL,
+            message VARCHAR NOT NULL,
+            fragments JSON,
+            PRIMARY KEY (id, sent_at)
+        ) PARTITION BY RANGE (sent_at)
+    """)
+    op.execute("CREATE TABLE chat_messages_default PARTITION OF chat_messages DEFAULT")
+    op.execute("CREATE INDEX ix_chat_messages_session_sent ON chat_messages (session_id, sent_at)")
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE chat_messages")
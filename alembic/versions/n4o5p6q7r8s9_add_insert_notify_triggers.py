@@ -0,0 +1,48 @@
+"""add NOTIFY triggers on inserts the Discord bot syncs to forums/channels
+
+Revision ID: n4o5p6q7r8s9
+Revises: m3n4o5p6q7r8
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = 'n4o5p6q7r8s9'
+down_revision: Union[str, Sequence[str], None] = 'm3n4o5p6q7r8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# table → NOTIFY channel (couchd.core.constants.NotifyChannel)
+_TRIGGERS = {
+    'problem_attempts': 'problem_attempt_created',
+    'cf_problem_attempts': 'cf_problem_attempt_created',
+    'solution_posts': 'solution_post_created',
+    'clip_logs': 'clip_log_created',
+    'idea_posts': 'idea_post_created',
+}
+
+
+def upgrade() -> None:
+    # NOTIFY is delivered on commit, so listeners never see an id before the row is visible.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION notify_row_inserted() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify(TG_ARGV[0], NEW.id::text);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    for table, channel in _TRIGGERS.items():
+        op.execute(
+            f"CREATE TRIGGER {table}_notify_insert AFTER INSERT ON {table} "
+            f"FOR EACH ROW EXECUTE FUNCTION notify_row_inserted('{channel}')"
+        )
+
+
+def downgrade() -> None:
+    for table in _TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_notify_insert ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS notify_row_inserted()")
@@ -0,0 +1,34 @@
+"""add bus_events sequence table for couchd.core.bus
+
+Revision ID: o5p6q7r8s9t0
+Revises: n4o5p6q7r8s9
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'o5p6q7r8s9t0'
+down_revision: Union[str, Sequence[str], None] = 'n4o5p6q7r8s9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'bus_events',
+        sa.Column('id', sa.BigInteger(), sa.Identity(), nullable=False),
+        sa.Column('topic', sa.String(64), nullable=False),
+        sa.Column('payload', sa.JSON(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_bus_events_created_at', 'bus_events', ['created_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_bus_events_created_at', table_name='bus_events')
+    op.drop_table('bus_events')
@@ -0,0 +1,92 @@
+"""add discord_posts for per-guild announcement and thread ids
+
+Existing single-guild ids (problem_posts, cf_problem_posts and the discord_message_id
+columns) are copied over, attributed to the guild currently configured for that
+channel type, so nothing already posted is posted again.
+
+Revision ID: p6q7r8s9t0u1
+Revises: o5p6q7r8s9t0
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'p6q7r8s9t0u1'
+down_revision: Union[str, Sequence[str], None] = 'o5p6q7r8s9t0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _guild(channel_column: str) -> str:
+    return (
+        f"(SELECT guild_id, {channel_column} AS channel_id FROM guild_configs "
+        f"WHERE {channel_column} IS NOT NULL ORDER BY guild_id LIMIT 1) g"
+    )
+
+
+_BACKFILL = [
+    f"""
+    INSERT INTO discord_posts (kind, ref, guild_id, channel_id, message_id, thread_id, created_at)
+    SELECT 'lc_thread', p.platform_id, g.guild_id, g.channel_id, p.forum_thread_id, p.forum_thread_id, now()
+    FROM problem_posts p CROSS JOIN {_guild('problems_forum_id')}
+    """,
+    f"""
+    INSERT INTO discord_posts (kind, ref, guild_id, channel_id, message_id, thread_id, created_at)
+    SELECT 'cf_thread', p.problem_id, g.guild_id, g.channel_id, p.forum_thread_id, p.forum_thread_id, now()
+    FROM cf_problem_posts p CROSS JOIN {_guild('cf_problems_forum_id')}
+    """,
+    f"""
+    INSERT INTO discord_posts (kind, ref, guild_id, channel_id, message_id, created_at)
+    SELECT 'solution', CAST(s.id AS VARCHAR), g.guild_id, p.forum_thread_id, s.discord_message_id, now()
+    FROM solution_posts s
+    JOIN problem_posts p ON p.platform_id = s.problem_slug
+    CROSS JOIN {_guild('problems_forum_id')}
+    WHERE s.discord_message_id IS NOT NULL
+    """,
+    f"""
+    INSERT INTO discord_posts (kind, ref, guild_id, channel_id, message_id, created_at)
+    SELECT 'clip', CAST(c.id AS VARCHAR), g.guild_id, g.channel_id, c.discord_message_id, now()
+    FROM clip_logs c CROSS JOIN {_guild('clip_showcase_channel_id')}
+    WHERE c.discord_message_id IS NOT NULL
+    """,
+    f"""
+    INSERT INTO discord_posts (kind, ref, guild_id, channel_id, message_id, created_at)
+    SELECT 'idea', CAST(i.id AS VARCHAR), g.guild_id, g.channel_id, i.discord_message_id, now()
+    FROM idea_posts i CROSS JOIN {_guild('ideas_channel_id')}
+    WHERE i.discord_message_id IS NOT NULL
+    """,
+    f"""
+    INSERT INTO discord_posts (kind, ref, guild_id, channel_id, message_id, created_at)
+    SELECT 'go_live', CAST(s.id AS VARCHAR), g.guild_id, g.channel_id, s.discord_notification_message_id, now()
+    FROM stream_sessions s CROSS JOIN {_guild('stream_updates_channel_id')}
+    WHERE s.discord_notification_message_id IS NOT NULL
+    """,
+]
+
+
+def upgrade() -> None:
+    op.create_table(
+        'discord_posts',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('kind', sa.String(32), nullable=False),
+        sa.Column('ref', sa.String(), nullable=False),
+        sa.Column('guild_id', sa.BigInteger(), nullable=False),
+        sa.Column('channel_id', sa.BigInteger(), nullable=False),
+        sa.Column('message_id', sa.BigInteger(), nullable=False),
+        sa.Column('thread_id', sa.BigInteger(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('kind', 'ref', 'guild_id'),
+    )
+    op.create_index('ix_discord_posts_message_id', 'discord_posts', ['message_id'])
+    for statement in _BACKFILL:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_discord_posts_message_id', table_name='discord_posts')
+    op.drop_table('discord_posts')
@@ -0,0 +1,36 @@
+"""add mod_holds for moderation holds that survive restarts
+
+Revision ID: q7r8s9t0u1v2
+Revises: p6q7r8s9t0u1
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'q7r8s9t0u1v2'
+down_revision: Union[str, Sequence[str], None] = 'p6q7r8s9t0u1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'mod_holds',
+        sa.Column('platform', sa.String(16), nullable=False),
+        sa.Column('message_id', sa.String(), nullable=False),
+        sa.Column('payload', sa.JSON(), nullable=False),
+        sa.Column('hold_sources', sa.JSON(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('platform', 'message_id'),
+    )
+    op.create_index('ix_mod_holds_expires_at', 'mod_holds', ['expires_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_mod_holds_expires_at', table_name='mod_holds')
+    op.drop_table('mod_holds')
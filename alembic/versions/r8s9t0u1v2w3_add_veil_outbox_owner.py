@@ -0,0 +1,30 @@
+"""add veil_outbox.owner so each bot replays only the alerts it wrote
+
+Revision ID: r8s9t0u1v2w3
+Revises: q7r8s9t0u1v2
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'r8s9t0u1v2w3'
+down_revision: Union[str, Sequence[str], None] = 'q7r8s9t0u1v2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Rows already waiting were written before anyone tracked an owner; hand them to the Twitch bot,
+    # which raises almost all alert events, so they are replayed once rather than by every bot.
+    op.add_column('veil_outbox', sa.Column('owner', sa.String(16), nullable=False, server_default='twitch'))
+    op.alter_column('veil_outbox', 'owner', server_default=None)
+    op.create_index('ix_veil_outbox_owner_id', 'veil_outbox', ['owner', 'id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_veil_outbox_owner_id', table_name='veil_outbox')
+    op.drop_column('veil_outbox', 'owner')
@@ -0,0 +1,163 @@
+# couchd/core/batch_writer.py
+import asyncio
+import logging
+import weakref
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+
+from sqlalchemy import insert
+
+from couchd.core import metrics
+from couchd.core.constants import BatchWriterConfig
+from couchd.core.db import get_session
+
+log = logging.getLogger(__name__)
+
+_writers: weakref.WeakSet = weakref.WeakSet()
+
+
+@dataclass
+class BatchWriterStats:
+    rows_written: int = 0
+    flushes: int = 0
+    dropped: int = 0
+    failed: int = 0
+
+
+class BatchWriter:
+    """
+    Write-behind buffer for append-only rows.
+    add() is synchronous and never touches the database; a background task flushes the buffer
+    every flush_interval seconds or as soon as batch_rows rows are waiting. Once max_buffer rows
+    are pending, new rows are dropped and counted. Call close() on shutdown to flush the rest.
+    Subclasses can override _write() to change how a batch reaches the database.
+    """
+
+    def __init__(
+        self,
+        model,
+        *,
+        batch_rows: int = BatchWriterConfig.BATCH_ROWS,
+        flush_interval: float = BatchWriterConfig.FLUSH_INTERVAL_SECONDS,
+        max_buffer: int = BatchWriterConfig.MAX_BUFFER_ROWS,
+    ) -> None:
+        self.model = model
+        self.batch_rows = batch_rows
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self.stats = BatchWriterStats()
+        self._buffer: list[dict] = []
+        self._full: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._lock: asyncio.Lock | None = None
+        self._closing = False
+        _writers.add(self)
+
+    @property
+    def name(self) -> str:
+        return getattr(self.model, "__tablename__", str(self.model))
+
+    def add(self, row: dict) -> bool:
+        if len(self._buffer) >= self.max_buffer:
+            self.stats.dropped += 1
+            if self.stats.dropped % 100 == 1:
+                log.warning("%s write buffer full, dropped %d row(s) so far", self.name, self.stats.dropped)
+            return False
+        self._buffer.append(row)
+        self._ensure_task()
+        if len(self._buffer) >= self.batch_rows:
+            self._full.set()
+        return True
+
+    def pending(self) -> int:
+        return len(self._buffer)
+
+    def unwritten(self) -> list[dict]:
+        """Rows added but not yet handed to the database, oldest first."""
+        return list(self._buffer)
+
+    @asynccontextmanager
+    async def paused(self):
+        """
+        Hold back writes while the block runs, after any batch already in flight has landed, so a
+        reader inside it sees every row either in the database or in unwritten(), never in between.
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            yield
+
+    def discard(self, match) -> int:
+        """Drop buffered rows match(row) accepts before they are written; returns how many."""
+        kept = [row for row in self._buffer if not match(row)]
+        dropped = len(self._buffer) - len(kept)
+        self._buffer = kept
+        return dropped
+
+    def _ensure_task(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._loop is not loop:
+            self._loop = loop
+            self._full = asyncio.Event()
+            self._lock = asyncio.Lock()
+            self._task = loop.create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._full.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._full.clear()
+            if self._buffer:
+                await self.flush()
+            if self._closing:
+                return
+
+    async def flush(self) -> int:
+        """Write everything buffered so far. Returns the number of rows written."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            written = 0
+            while self._buffer:
+                rows, self._buffer = self._buffer[:self.batch_rows], self._buffer[self.batch_rows:]
+                try:
+                    await self._write(rows)
+                    written += len(rows)
+                    self.stats.rows_written += len(rows)
+                    self.stats.flushes += 1
+                except Exception:
+                    self.stats.failed += len(rows)
+                    log.error("Failed to write %d %s row(s)", len(rows), self.name, exc_info=True)
+            return written
+
+    async def _write(self, rows: list[dict]) -> None:
+        # executemany needs one key set per statement; rows from different handlers may differ.
+        groups: dict[tuple, list[dict]] = {}
+        for row in rows:
+            groups.setdefault(tuple(sorted(row)), []).append(row)
+        async with get_session() as db:
+            for group in groups.values():
+                await db.execute(insert(self.model), group)
+
+    async def close(self) -> None:
+        """Stop the flush task after it finishes any in-progress write, then flush the remainder."""
+        self._closing = True
+        if self._task and not self._task.done():
+            self._full.set()
+            await self._task
+        self._task = None
+        await self.flush()
+        self._closing = False
+
+
+metrics.gauge(
+    "couchd_batch_writer_pending_rows", "Rows buffered for the next flush, per table.",
+    lambda: {(w.name,): w.pending() for w in list(_writers)}, ("table",),
+)
+metrics.gauge(
+    "couchd_batch_writer_dropped_rows_total", "Rows dropped because the buffer was full, per table.",
+    lambda: {(w.name,): w.stats.dropped for w in list(_writers)}, ("table",), kind="counter",
+)
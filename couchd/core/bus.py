@@ -0,0 +1,222 @@
+# couchd/core/bus.py
+import asyncio
+import dataclasses
+import inspect
+import json
+import logging
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import ClassVar
+
+from sqlalchemy import delete, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from couchd.core.constants import BusConfig, Platform
+from couchd.core.db import get_session
+from couchd.core.listener import SingleFlight, listener
+from couchd.core.models import BusEvent
+
+log = logging.getLogger(__name__)
+
+
+# ── Event schemas ────────────────────────────────────────────────────────────
+
+@dataclass(frozen=True)
+class Event:
+    topic: ClassVar[str]
+
+
+@dataclass(frozen=True)
+class StreamOnline(Event):
+    topic: ClassVar[str] = "stream.online"
+    platform: str = Platform.TWITCH.value
+    title: str = ""
+    category: str = ""
+    thumbnail_url: str = ""
+
+
+@dataclass(frozen=True)
+class StreamOffline(Event):
+    topic: ClassVar[str] = "stream.offline"
+    platform: str = Platform.TWITCH.value
+    session_id: int | None = None
+
+
+@dataclass(frozen=True)
+class GuildConfigChanged(Event):
+    topic: ClassVar[str] = "guild_config.changed"
+    guild_id: int = 0
+
+
+@dataclass(frozen=True)
+class ModHoldResolved(Event):
+    topic: ClassVar[str] = "mod_hold.resolved"
+    platform: str = Platform.TWITCH.value
+    message_id: str = ""
+    resolution: str = ""
+
+
+EVENT_TYPES: dict[str, type[Event]] = {
+    cls.topic: cls for cls in (StreamOnline, StreamOffline, GuildConfigChanged, ModHoldResolved)
+}
+
+Handler = Callable[[Event], Awaitable[None] | None]
+
+
+def decode(topic: str, payload: dict) -> Event | None:
+    cls = EVENT_TYPES.get(topic)
+    if cls is None:
+        return None
+    names = {f.name for f in dataclasses.fields(cls)}
+    return cls(**{k: v for k, v in payload.items() if k in names})
+
+
+# ── Publishing ───────────────────────────────────────────────────────────────
+
+async def _notify(db: AsyncSession, body: str) -> None:
+    await db.execute(text("SELECT pg_notify(:channel, :body)"), {"channel": BusConfig.CHANNEL, "body": body})
+
+
+async def _publish(db: AsyncSession, event: Event) -> int:
+    payload = dataclasses.asdict(event)
+    row = BusEvent(topic=event.topic, payload=payload)
+    db.add(row)
+    await db.flush()
+    body = json.dumps({"seq": row.id, "topic": event.topic, "payload": payload}, separators=(",", ":"))
+    if len(body.encode()) > BusConfig.INLINE_MAX_BYTES:
+        # Subscribers load the payload from bus_events by seq.
+        body = json.dumps({"seq": row.id, "topic": event.topic}, separators=(",", ":"))
+    await _notify(db, body)
+    return row.id
+
+
+async def publish(event: Event, db: AsyncSession | None = None) -> int:
+    """
+    Record the event in bus_events and NOTIFY subscribers; returns its sequence number.
+    Pass db to publish inside an existing transaction: delivery then happens on its commit.
+    """
+    if db is not None:
+        return await _publish(db, event)
+    async with get_session() as session:
+        return await _publish(session, event)
+
+
+# ── Subscribing ──────────────────────────────────────────────────────────────
+
+class EventBus:
+    """
+    Per-process subscriber side of the bus, multiplexed over the shared PgListener connection.
+    Every delivered seq is tracked, so events are handed to subscribers once each; gaps in the
+    sequence and listener reconnects trigger a catch-up read from bus_events.
+    """
+
+    def __init__(self) -> None:
+        self._handlers: dict[type[Event], list[Handler]] = {}
+        self._floor: int | None = None      # every seq <= floor has been delivered or skipped
+        self._delivered: set[int] = set()   # delivered seqs above floor
+        self._pending: set[asyncio.Task] = set()
+        self._start_lock = asyncio.Lock()
+        self._catch_up_flight = SingleFlight(self.catch_up, "Event bus catch-up")
+
+    def subscribe(self, event_type: type[Event], handler: Handler) -> None:
+        self._handlers.setdefault(event_type, []).append(handler)
+
+    def unsubscribe(self, event_type: type[Event], handler: Handler) -> None:
+        handlers = self._handlers.get(event_type, [])
+        if handler in handlers:
+            handlers.remove(handler)
+
+    async def start(self) -> None:
+        """Start receiving from the current end of the log. Safe to call more than once."""
+        async with self._start_lock:
+            if self._floor is not None:
+                return
+            async with get_session() as db:
+                cutoff = datetime.now(timezone.utc) - timedelta(days=BusConfig.RETENTION_DAYS)
+                await db.execute(delete(BusEvent).where(BusEvent.created_at < cutoff))
+                self._floor = (await db.execute(select(func.max(BusEvent.id)))).scalar() or 0
+            listener.subscribe(BusConfig.CHANNEL, self._on_notify)
+            listener.on_reconnect(self._catch_up_flight.request)
+            await listener.start()
+            # Covers anything published between reading the floor and LISTEN taking effect.
+            self._catch_up_flight.request()
+            log.info("Event bus subscribed from seq %d.", self._floor)
+
+    async def _on_notify(self, body: str) -> None:
+        message = json.loads(body)
+        seq = message["seq"]
+        if self._seen(seq):
+            return
+        payload = message.get("payload")
+        if payload is None:
+            async with get_session() as db:
+                row = await db.get(BusEvent, seq)
+            if row is None:
+                log.warning("Bus event %d not found for by-reference delivery", seq)
+                return
+            payload = row.payload
+            if self._seen(seq):  # a catch-up may have delivered it meanwhile
+                return
+        self._deliver(seq, message["topic"], payload)
+        if any(s not in self._delivered for s in range(self._floor + 1, seq)):
+            self._catch_up_flight.request()
+
+    async def catch_up(self) -> None:
+        """Deliver logged events this process has not seen (e.g. sent while disconnected)."""
+        if self._floor is None:
+            return
+        now = datetime.now(timezone.utc)
+        async with get_session() as db:
+            rows = (
+                await db.execute(
+                    select(BusEvent)
+                    .where(
+                        (BusEvent.id > self._floor)
+                        & (BusEvent.created_at >= now - timedelta(minutes=BusConfig.CATCHUP_MAX_AGE_MINUTES))
+                    )
+                    .order_by(BusEvent.id)
+                )
+            ).scalars().all()
+            settled = (
+                await db.execute(
+                    select(func.max(BusEvent.id))
+                    .where(BusEvent.created_at < now - timedelta(seconds=BusConfig.GAP_GRACE_SECONDS))
+                )
+            ).scalar()
+        replayed = 0
+        for row in rows:
+            if not self._seen(row.id):
+                self._deliver(row.id, row.topic, row.payload)
+                replayed += 1
+        # Seqs below the newest settled row that never showed up were rolled back or expired.
+        if settled and settled > self._floor:
+            self._floor = settled
+            self._delivered = {s for s in self._delivered if s > settled}
+        if replayed:
+            log.info("Event bus caught up %d missed event(s).", replayed)
+
+    def _seen(self, seq: int) -> bool:
+        return self._floor is None or seq <= self._floor or seq in self._delivered
+
+    def _deliver(self, seq: int, topic: str, payload: dict) -> None:
+        self._delivered.add(seq)
+        while self._floor + 1 in self._delivered:
+            self._floor += 1
+            self._delivered.discard(self._floor)
+        event = decode(topic, payload)
+        if event is None:
+            log.debug("Ignoring bus event %d with unknown topic %s", seq, topic)
+            return
+        for handler in list(self._handlers.get(type(event), [])):
+            try:
+                result = handler(event)
+                if inspect.isawaitable(result):
+                    task = asyncio.get_running_loop().create_task(result)
+                    self._pending.add(task)
+                    task.add_done_callback(self._pending.discard)
+            except Exception:
+                log.error("Bus handler for %s failed", topic, exc_info=True)
+
+
+bus = EventBus()
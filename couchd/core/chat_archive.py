@@ -0,0 +1,140 @@
+# couchd/core/chat_archive.py
+import json
+import logging
+from datetime import datetime, timezone
+
+import asyncpg
+
+from couchd.core.batch_writer import BatchWriter
+from couchd.core.constants import ChatArchiveConfig, Platform
+from couchd.core.db import get_raw_connection
+from couchd.core.models import ChatMessage
+from couchd.core.utils import get_active_session
+
+log = logging.getLogger(__name__)
+
+_COLUMNS = ("sent_at", "session_id", "platform", "message_id", "user_id", "username", "message", "fragments")
+_FRAGMENT_KINDS = {"emote": "e", "cheermote": "c", "mention": "m"}
+
+
+def compact_fragments(fragments: list[dict]) -> list[list] | None:
+    """
+    Reduce Twitch message fragments to the non-text ones as [start, length, kind, ref].
+    Offsets are into the full message text, so text fragments need not be stored.
+    """
+    compact = []
+    offset = 0
+    for fragment in fragments:
+        text = fragment.get("text", "")
+        kind = _FRAGMENT_KINDS.get(fragment.get("type"))
+        if kind:
+            compact.append([offset, len(text), kind, fragment.get("id") or text])
+        offset += len(text)
+    return compact or None
+
+
+def _month_start(dt: datetime) -> datetime:
+    return datetime(dt.year, dt.month, 1, tzinfo=timezone.utc)
+
+
+def _next_month(dt: datetime) -> datetime:
+    return datetime(dt.year + dt.month // 12, dt.month % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+async def ensure_partitions(conn: asyncpg.Connection, now: datetime | None = None) -> None:
+    """Create this month's partition and the next PARTITIONS_AHEAD months' if missing."""
+    start = _month_start(now or datetime.now(timezone.utc))
+    for _ in range(ChatArchiveConfig.PARTITIONS_AHEAD + 1):
+        end = _next_month(start)
+        name = f"chat_messages_{start:%Y_%m}"
+        try:
+            await conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF chat_messages "
+                f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+            )
+        except asyncpg.PostgresError:
+            # Typically rows for this range already landed in the DEFAULT partition.
+            log.error("Could not create chat partition %s", name, exc_info=True)
+        start = end
+
+
+class ChatArchive(BatchWriter):
+    """
+    Archives chat lines into chat_messages via COPY on a dedicated asyncpg connection.
+    record() only appends to the buffer, so it adds no I/O to message handling. The active
+    session id is resolved once per platform per flush rather than per message.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(
+            ChatMessage,
+            batch_rows=ChatArchiveConfig.BATCH_ROWS,
+            flush_interval=ChatArchiveConfig.FLUSH_INTERVAL_SECONDS,
+            max_buffer=ChatArchiveConfig.MAX_BUFFER_ROWS,
+        )
+        self._conn: asyncpg.Connection | None = None
+        self._partitioned_through: datetime | None = None
+
+    def record(
+        self,
+        platform: Platform,
+        message_id: str,
+        user_id: str | None,
+        username: str,
+        message: str,
+        fragments: list[dict] | None = None,
+        sent_at: datetime | None = None,
+    ) -> bool:
+        compact = compact_fragments(fragments) if fragments else None
+        return self.add({
+            "sent_at": sent_at or datetime.now(timezone.utc),
+            "platform": platform.value,
+            "message_id": message_id,
+            "user_id": user_id,
+            "username": username,
+            "message": message,
+            "fragments": json.dumps(compact, separators=(",", ":")) if compact else None,
+        })
+
+    async def _connection(self) -> asyncpg.Connection:
+        if self._conn is None or self._conn.is_closed():
+            self._conn = await get_raw_connection()
+            self._partitioned_through = None
+        now = datetime.now(timezone.utc)
+        if self._partitioned_through is None or now >= self._partitioned_through:
+            await ensure_partitions(self._conn, now)
+            self._partitioned_through = _next_month(now)
+        return self._conn
+
+    async def _session_ids(self, rows: list[dict]) -> dict[str, int | None]:
+        ids = {}
+        for platform in {row["platform"] for row in rows}:
+            session = await get_active_session(Platform(platform))
+            ids[platform] = session.id if session else None
+        return ids
+
+    async def _write(self, rows: list[dict]) -> None:
+        session_ids = await self._session_ids(rows)
+        records = [
+            (r["sent_at"], session_ids[r["platform"]], r["platform"], r["message_id"],
+             r["user_id"], r["username"], r["message"], r["fragments"])
+            for r in rows
+        ]
+        conn = await self._connection()
+        try:
+            await conn.copy_records_to_table("chat_messages", records=records, columns=_COLUMNS)
+        except (asyncpg.PostgresConnectionError, ConnectionError):
+            await self._drop_connection()
+            raise
+
+    async def _drop_connection(self) -> None:
+        if self._conn is not None:
+            try:
+                await self._conn.close()
+            except Exception:
+                pass
+            self._conn = None
+
+    async def close(self) -> None:
+        await super().close()
+        await self._drop_connection()
@@ -0,0 +1,137 @@
+# couchd/core/chat_spikes.py
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from couchd.core.chat_velocity import ChatVelocity, chat_velocity
+from couchd.core.constants import ChatMetrics, EventType, Platform, SpikeConfig
+from couchd.core.db import get_session
+from couchd.core.models import StreamEvent
+from couchd.core.utils import get_active_session
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class Spike:
+    platform: Platform
+    started_at: datetime            # wall clock at the start of the burst, not when it was detected
+    peak_rate: float
+    peak_z: float
+    ended_at: datetime | None = None
+    session_id: int | None = None
+    clip_url: str | None = None
+
+    def describe(self) -> str:
+        text = f"{self.peak_rate:.1f} msg/s (z {self.peak_z:.1f})"
+        if self.ended_at:
+            text += f" for {int((self.ended_at - self.started_at).total_seconds())}s"
+        if self.clip_url:
+            text += f" · [clip]({self.clip_url})"
+        return text
+
+
+class SpikeDetector:
+    """
+    Hysteresis over ChatVelocity.zscore() for one platform. A spike opens once the z-score reaches
+    ENTER_Z (with at least MIN_RATE msg/s and a warmed-up baseline) and closes only after it has
+    stayed under EXIT_Z for EXIT_HOLD_SECONDS, so a burst that wobbles around the threshold is one
+    spike, not several. Call tick() about once a second; it reads a handful of counters.
+    """
+
+    def __init__(
+        self,
+        platform: Platform,
+        velocity: ChatVelocity = chat_velocity,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.platform = platform
+        self.velocity = velocity
+        self.active: Spike | None = None
+        self._clock = clock
+        self._started = 0.0
+        self._calm_since: float | None = None
+        self._ended_at = float("-inf")
+
+    def tick(self) -> tuple[Spike | None, Spike | None]:
+        """Returns (spike that just started, spike that just ended); either may be None."""
+        now = self._clock()
+        z = self.velocity.zscore(self.platform)
+        rate = self.velocity.rate(ChatMetrics.SPIKE_WINDOW_SECONDS, self.platform)
+
+        if self.active is None:
+            if (
+                z >= SpikeConfig.ENTER_Z
+                and rate >= SpikeConfig.MIN_RATE
+                and self.velocity.samples(self.platform) >= SpikeConfig.WARMUP_SECONDS
+                and now - self._ended_at >= SpikeConfig.COOLDOWN_SECONDS
+            ):
+                self._started = now - ChatMetrics.SPIKE_WINDOW_SECONDS
+                started = datetime.now(timezone.utc) - timedelta(seconds=ChatMetrics.SPIKE_WINDOW_SECONDS)
+                self.active = Spike(self.platform, started, rate, z)
+                self._calm_since = None
+                return self.active, None
+            return None, None
+
+        spike = self.active
+        spike.peak_rate = max(spike.peak_rate, rate)
+        spike.peak_z = max(spike.peak_z, z)
+        if z >= SpikeConfig.EXIT_Z:
+            self._calm_since = None
+            return None, None
+        if self._calm_since is None:
+            self._calm_since = now
+        if now - self._calm_since < SpikeConfig.EXIT_HOLD_SECONDS:
+            return None, None
+        spike.ended_at = spike.started_at + timedelta(seconds=self._calm_since - self._started)
+        self.cancel()
+        return None, spike
+
+    def cancel(self) -> None:
+        """Drop the open spike without reporting it; the cooldown still applies."""
+        self.active = None
+        self._ended_at = self._clock()
+
+
+async def record_spike(spike: Spike) -> None:
+    """Store a finished spike as a chat_spike StreamEvent timestamped at its start (its VOD offset)."""
+    async with get_session() as db:
+        db.add(StreamEvent(
+            session_id=spike.session_id,
+            event_type=EventType.CHAT_SPIKE.value,
+            timestamp=spike.started_at,
+            notes=spike.describe(),
+        ))
+    log.info("Chat spike on %s recorded: %s", spike.platform.value, spike.describe())
+
+
+SpikeHook = Callable[[Spike], Awaitable[None]]
+
+
+async def run_spike_monitor(platform: Platform, on_start: SpikeHook | None = None) -> None:
+    """
+    Tick a SpikeDetector every second for the life of the bot. Spikes outside a live session are
+    ignored. on_start runs as soon as a spike opens (e.g. to clip it while it is still happening);
+    the StreamEvent is written when it closes, with the peak it reached.
+    """
+    detector = SpikeDetector(platform)
+    while True:
+        await asyncio.sleep(SpikeConfig.TICK_SECONDS)
+        try:
+            started, ended = detector.tick()
+            if started:
+                session = await get_active_session(platform)
+                if session is None:
+                    detector.cancel()
+                    continue
+                started.session_id = session.id
+                log.info("Chat spike started on %s: %s", platform.value, started.describe())
+                if on_start:
+                    await on_start(started)
+            if ended and ended.session_id is not None:
+                await record_spike(ended)
+        except Exception:
+            log.error("Error in %s chat spike monitor", platform.value, exc_info=True)
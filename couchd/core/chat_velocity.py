@@ -0,0 +1,137 @@
+# couchd/core/chat_velocity.py
+import math
+import time
+from collections.abc import Callable
+
+from couchd.core import metrics
+from couchd.core.constants import ChatMetrics, Platform
+
+
+class _Ring:
+    """Per-second message counts for one platform over the last `size` seconds, plus an EWMA baseline."""
+
+    __slots__ = ("counts", "born", "head", "mean", "var", "samples")
+
+    def __init__(self, size: int, now: int) -> None:
+        self.counts = [0] * size
+        self.born = now
+        self.head = now         # the second the newest slot belongs to
+        self.mean = 0.0         # EWMA of per-second counts
+        self.var = 0.0          # exponentially weighted variance of the same
+        self.samples = 0        # completed seconds folded into the baseline so far
+
+
+class ChatVelocity:
+    """
+    Chat rate per platform from a fixed ring of per-second counters on the monotonic clock.
+    record() costs the same however busy chat gets: the EWMA work happens once per second,
+    not per message, and memory is one list of RING_SECONDS ints per platform. Seconds older
+    than SPIKE_WINDOW_SECONDS feed an EWMA baseline, so zscore() can say how far the most
+    recent ones stand above normal for this stream.
+    One instance per process: each bot feeds the platforms it reads.
+    """
+
+    def __init__(
+        self,
+        ring_seconds: int = ChatMetrics.RING_SECONDS,
+        half_life_seconds: float = ChatMetrics.EWMA_HALF_LIFE_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ring_seconds = ring_seconds
+        self.alpha = 1 - 0.5 ** (1 / half_life_seconds)
+        self._clock = clock
+        self._rings: dict[str, _Ring] = {}
+
+    def record(self, platform: Platform, count: int = 1) -> None:
+        now = int(self._clock())
+        ring = self._rings.get(platform.value)
+        if ring is None:
+            ring = self._rings[platform.value] = _Ring(self.ring_seconds, now)
+        elif now != ring.head:
+            self._advance(ring, now)
+        ring.counts[now % self.ring_seconds] += count
+        metrics.chat_messages.inc(platform.value, amount=count)
+
+    def _advance(self, ring: _Ring, now: int) -> None:
+        """
+        Fold newly completed seconds into the EWMA and clear their slots for reuse. The baseline
+        trails by SPIKE_WINDOW_SECONDS, so a burst is never scored against an average it has
+        already inflated.
+        """
+        size = self.ring_seconds
+        lag = ChatMetrics.SPIKE_WINDOW_SECONDS
+        mean, var, samples = ring.mean, ring.var, ring.samples
+        # Seconds after the head were silent (their slots still hold the previous lap). An idle
+        # gap longer than the ring needs no more than one lap of decay.
+        steps = min(now - ring.head, size)
+        for second in range(max(ring.head - lag, ring.born), ring.head - lag + steps):
+            count = ring.counts[second % size] if second <= ring.head else 0
+            # Plain running mean until there are enough samples for the EWMA to be unbiased.
+            samples += 1
+            alpha = max(self.alpha, 1 / samples)
+            diff = count - mean
+            mean += alpha * diff
+            var = (1 - alpha) * (var + alpha * diff * diff)
+        for second in range(max(ring.head + 1, now - size + 1), now + 1):
+            ring.counts[second % size] = 0
+        ring.mean, ring.var, ring.samples, ring.head = mean, var, samples, now
+
+    def _sync(self) -> int:
+        now = int(self._clock())
+        for ring in self._rings.values():
+            if ring.head != now:
+                self._advance(ring, now)
+        return now
+
+    def rate(self, window_seconds: int, platform: Platform | None = None) -> float:
+        """Messages per second over the last window_seconds completed seconds, for one platform or all."""
+        now = self._sync()
+        window = min(window_seconds, self.ring_seconds - 1)
+        rings = self._rings.values() if platform is None else filter(None, [self._rings.get(platform.value)])
+        total = sum(ring.counts[s % self.ring_seconds] for ring in rings for s in range(now - window, now))
+        return total / window
+
+    def rates(self, platform: Platform | None = None) -> dict[int, float]:
+        """rate() for every window in ChatMetrics.WINDOWS_SECONDS."""
+        return {w: self.rate(w, platform) for w in ChatMetrics.WINDOWS_SECONDS}
+
+    def ewma(self, platform: Platform) -> float:
+        """Baseline messages per second, as of SPIKE_WINDOW_SECONDS ago."""
+        self._sync()
+        ring = self._rings.get(platform.value)
+        return ring.mean if ring else 0.0
+
+    def samples(self, platform: Platform) -> int:
+        """Seconds folded into the baseline so far; a young baseline makes zscore() unreliable."""
+        self._sync()
+        ring = self._rings.get(platform.value)
+        return ring.samples if ring else 0
+
+    def zscore(self, platform: Platform, window_seconds: int = ChatMetrics.SPIKE_WINDOW_SECONDS) -> float:
+        """
+        How many standard errors the recent rate sits above the EWMA baseline. The per-second deviation
+        is scaled by sqrt(window) because the recent rate is itself an average of that many seconds.
+        """
+        recent = self.rate(window_seconds, platform)
+        ring = self._rings.get(platform.value)
+        if ring is None:
+            return 0.0
+        stderr = max(math.sqrt(ring.var), ChatMetrics.MIN_STDDEV) / math.sqrt(window_seconds)
+        return (recent - ring.mean) / stderr
+
+
+chat_velocity = ChatVelocity()
+
+metrics.gauge(
+    "couchd_chat_rate_per_second", "Chat messages per second over each window.",
+    lambda: {
+        (p, str(w)): chat_velocity.rate(w, Platform(p))
+        for p in list(chat_velocity._rings) for w in ChatMetrics.WINDOWS_SECONDS
+    },
+    ("platform", "window_seconds"),
+)
+metrics.gauge(
+    "couchd_chat_rate_zscore", "Recent chat rate against the EWMA baseline, in standard errors.",
+    lambda: {(p,): chat_velocity.zscore(Platform(p)) for p in list(chat_velocity._rings)},
+    ("platform",),
+)
@@ -4,6 +4,8 @@ import re
 
 import aiohttp
 
+from couchd.core.clients import http_pool
+
 log = logging.getLogger(__name__)
 
 _API_BASE = "https://codeforces.com/api"
@@ -32,9 +34,9 @@ async def fetch_problem(contest_id: int, index: str) -> dict | None:
     """Return {title, rating, tags} for the given CF problem, or None on failure."""
     url = f"{_API_BASE}/contest.standings?contestId={contest_id}&from=1&count=1"
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as resp:
-                data = await resp.json(content_type=None)
+        session = http_pool.get_session(url)
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as resp:
+            data = await resp.json(content_type=None)
     except Exception:
         log.error("Failed to fetch CF problem %d%s", contest_id, index, exc_info=True)
         return None
@@ -60,9 +62,9 @@ async def fetch_recent_ac_submissions(handle: str, count: int = 10) -> list[dict
     """Return recent accepted submissions for the given CF handle."""
     url = f"{_API_BASE}/user.status?handle={handle}&from=1&count={count}"
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as resp:
-                data = await resp.json(content_type=None)
+        session = http_pool.get_session(url)
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as resp:
+            data = await resp.json(content_type=None)
     except Exception:
         log.error("Failed to fetch CF submissions for %s", handle, exc_info=True)
         return []
@@ -2,10 +2,14 @@
 import asyncio
 import logging
 
-import aiohttp
+from couchd.core.clients import http_pool
 
 log = logging.getLogger(__name__)
 
+_7TV_BASE = "https://7tv.io"
+_BTTV_BASE = "https://api.betterttv.net"
+_FFZ_BASE = "https://api.frankerfacez.com"
+
 
 class EmoteClient:
     async def fetch_all(self, channel: str, channel_id: str) -> dict[str, str]:
@@ -26,11 +30,11 @@ class EmoteClient:
 
     async def _fetch_7tv_global(self) -> dict[str, str]:
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get("https://7tv.io/v3/emote-sets/global") as resp:
-                    if resp.status != 200:
-                        return {}
-                    d = await resp.json()
+            session = http_pool.get_session(_7TV_BASE)
+            async with session.get(f"{_7TV_BASE}/v3/emote-sets/global") as resp:
+                if resp.status != 200:
+                    return {}
+                d = await resp.json()
             return self._parse_7tv(d.get("emotes", []))
         except Exception:
             return {}
@@ -39,22 +43,22 @@ class EmoteClient:
         if not channel_id:
             return {}
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(f"https://7tv.io/v3/users/twitch/{channel_id}") as resp:
-                    if resp.status != 200:
-                        return {}
-                    d = await resp.json()
+            session = http_pool.get_session(_7TV_BASE)
+            async with session.get(f"{_7TV_BASE}/v3/users/twitch/{channel_id}") as resp:
+                if resp.status != 200:
+                    return {}
+                d = await resp.json()
             return self._parse_7tv(d.get("emote_set", {}).get("emotes", []))
         except Exception:
             return {}
 
     async def _fetch_bttv_global(self) -> dict[str, str]:
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get("https://api.betterttv.net/3/cached/emotes/global") as resp:
-                    if resp.status != 200:
-                        return {}
-                    d = await resp.json()
+            session = http_pool.get_session(_BTTV_BASE)
+            async with session.get(f"{_BTTV_BASE}/3/cached/emotes/global") as resp:
+                if resp.status != 200:
+                    return {}
+                d = await resp.json()
             return self._parse_bttv(d if isinstance(d, list) else [])
         except Exception:
             return {}
@@ -63,13 +67,13 @@ class EmoteClient:
         if not channel_id:
             return {}
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"https://api.betterttv.net/3/cached/users/twitch/{channel_id}"
-                ) as resp:
-                    if resp.status != 200:
-                        return {}
-                    d = await resp.json()
+            session = http_pool.get_session(_BTTV_BASE)
+            async with session.get(
+                f"{_BTTV_BASE}/3/cached/users/twitch/{channel_id}"
+            ) as resp:
+                if resp.status != 200:
+                    return {}
+                d = await resp.json()
             result = {}
             result.update(self._parse_bttv(d.get("channelEmotes", [])))
             result.update(self._parse_bttv(d.get("sharedEmotes", [])))
@@ -79,11 +83,11 @@ class EmoteClient:
 
     async def _fetch_ffz_global(self) -> dict[str, str]:
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get("https://api.frankerfacez.com/v1/set/global") as resp:
-                    if resp.status != 200:
-                        return {}
-                    d = await resp.json()
+            session = http_pool.get_session(_FFZ_BASE)
+            async with session.get(f"{_FFZ_BASE}/v1/set/global") as resp:
+                if resp.status != 200:
+                    return {}
+                d = await resp.json()
             result = {}
             for set_id in d.get("default_sets", []):
                 result.update(self._parse_ffz_set(d.get("sets", {}).get(str(set_id), {})))
@@ -95,11 +99,11 @@ class EmoteClient:
         if not channel:
             return {}
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(f"https://api.frankerfacez.com/v1/room/{channel}") as resp:
-                    if resp.status != 200:
-                        return {}
-                    d = await resp.json()
+            session = http_pool.get_session(_FFZ_BASE)
+            async with session.get(f"{_FFZ_BASE}/v1/room/{channel}") as resp:
+                if resp.status != 200:
+                    return {}
+                d = await resp.json()
             result = {}
             for s in d.get("sets", {}).values():
                 result.update(self._parse_ffz_set(s))
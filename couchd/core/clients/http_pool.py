@@ -0,0 +1,126 @@
+# couchd/core/clients/http_pool.py
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from couchd.core import metrics
+from couchd.core.constants import HttpConfig
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class HostStats:
+    requests: int = 0
+    connections_created: int = 0
+    connections_reused: int = 0
+    errors: int = 0
+
+
+_sessions: dict[str, aiohttp.ClientSession] = {}
+_session_loops: dict[str, asyncio.AbstractEventLoop] = {}
+_stats: dict[str, HostStats] = {}
+
+
+def _host_key(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}".lower()
+
+
+def _trace_config(key: str) -> aiohttp.TraceConfig:
+    stats = _stats.setdefault(key, HostStats())
+
+    async def on_request_start(_session, ctx, _params):
+        stats.requests += 1
+        ctx.start = time.perf_counter()
+
+    async def on_request_end(_session, ctx, _params):
+        metrics.http_latency.observe(time.perf_counter() - ctx.start, key)
+
+    async def on_connection_create_end(_session, _ctx, _params):
+        stats.connections_created += 1
+
+    async def on_connection_reuseconn(_session, _ctx, _params):
+        stats.connections_reused += 1
+
+    async def on_request_exception(_session, _ctx, _params):
+        stats.errors += 1
+        metrics.http_errors.inc(key)
+
+    trace = aiohttp.TraceConfig()
+    trace.on_request_start.append(on_request_start)
+    trace.on_request_end.append(on_request_end)
+    trace.on_connection_create_end.append(on_connection_create_end)
+    trace.on_connection_reuseconn.append(on_connection_reuseconn)
+    trace.on_request_exception.append(on_request_exception)
+    return trace
+
+
+def _new_session(key: str) -> aiohttp.ClientSession:
+    connector = aiohttp.TCPConnector(
+        limit_per_host=HttpConfig.LIMIT_PER_HOST,
+        ttl_dns_cache=HttpConfig.DNS_CACHE_TTL_SECONDS,
+        keepalive_timeout=HttpConfig.KEEPALIVE_SECONDS,
+    )
+    timeout = aiohttp.ClientTimeout(
+        total=HttpConfig.TOTAL_TIMEOUT_SECONDS,
+        connect=HttpConfig.CONNECT_TIMEOUT_SECONDS,
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=timeout,
+        trace_configs=[_trace_config(key)],
+    )
+
+
+def get_session(url: str) -> aiohttp.ClientSession:
+    """
+    Return the process-wide session for url's scheme+host, creating it on first use.
+    Sessions are long-lived: callers must NOT close them or use them as context managers.
+    """
+    key = _host_key(url)
+    loop = asyncio.get_running_loop()
+    session = _sessions.get(key)
+    if session is None or session.closed or _session_loops.get(key) is not loop:
+        session = _new_session(key)
+        _sessions[key] = session
+        _session_loops[key] = loop
+        log.debug("Opened pooled HTTP session for %s", key)
+    return session
+
+
+metrics.gauge(
+    "couchd_http_connections_created_total", "TCP connections opened per pooled upstream.",
+    lambda: {(k,): s.connections_created for k, s in _stats.items()}, ("upstream",), kind="counter",
+)
+metrics.gauge(
+    "couchd_http_connections_reused_total", "Requests served on a kept-alive connection per upstream.",
+    lambda: {(k,): s.connections_reused for k, s in _stats.items()}, ("upstream",), kind="counter",
+)
+
+
+def stats() -> dict[str, HostStats]:
+    """Per-host request/connection counters since process start."""
+    return dict(_stats)
+
+
+async def close_all() -> None:
+    """Close every pooled session. Call once from each bot's shutdown path."""
+    loop = asyncio.get_running_loop()
+    sessions = [
+        s for key, s in _sessions.items()
+        if not s.closed and _session_loops.get(key) is loop
+    ]
+    _sessions.clear()
+    _session_loops.clear()
+    for session in sessions:
+        try:
+            await session.close()
+        except Exception:
+            log.warning("Error closing pooled HTTP session", exc_info=True)
+    if sessions:
+        log.info("Closed %d pooled HTTP session(s).", len(sessions))
@@ -1,7 +1,6 @@
 # couchd/core/clients/leetcode.py
 import logging
-import aiohttp
-
+from couchd.core.clients import http_pool
 from couchd.core.constants import LeetCodeConfig, ZerotracConfig
 
 log = logging.getLogger(__name__)
@@ -39,16 +38,16 @@ class LeetCodeClient:
     async def load_ratings(self) -> None:
         """Download and parse the zerotrac ratings file into _ratings cache."""
         try:
-            async with aiohttp.ClientSession() as http:
-                async with http.get(ZerotracConfig.RATINGS_URL) as resp:
-                    if resp.status != 200:
-                        log.warning(
-                            "Failed to fetch zerotrac ratings (HTTP %s). "
-                            "Ratings will be unavailable.",
-                            resp.status,
-                        )
-                        return
-                    text = await resp.text()
+            http = http_pool.get_session(ZerotracConfig.RATINGS_URL)
+            async with http.get(ZerotracConfig.RATINGS_URL) as resp:
+                if resp.status != 200:
+                    log.warning(
+                        "Failed to fetch zerotrac ratings (HTTP %s). "
+                        "Ratings will be unavailable.",
+                        resp.status,
+                    )
+                    return
+                text = await resp.text()
 
             count = 0
             for line in text.splitlines():
@@ -85,20 +84,20 @@ class LeetCodeClient:
             "variables": {"titleSlug": slug},
         }
         try:
-            async with aiohttp.ClientSession() as http:
-                async with http.post(
-                    LeetCodeConfig.GRAPHQL_URL,
-                    json=payload,
-                    headers={"Content-Type": "application/json"},
-                ) as resp:
-                    if resp.status != 200:
-                        log.warning(
-                            "LeetCode GraphQL returned HTTP %s for slug '%s'.",
-                            resp.status,
-                            slug,
-                        )
-                        return None
-                    data = await resp.json()
+            http = http_pool.get_session(LeetCodeConfig.GRAPHQL_URL)
+            async with http.post(
+                LeetCodeConfig.GRAPHQL_URL,
+                json=payload,
+                headers={"Content-Type": "application/json"},
+            ) as resp:
+                if resp.status != 200:
+                    log.warning(
+                        "LeetCode GraphQL returned HTTP %s for slug '%s'.",
+                        resp.status,
+                        slug,
+                    )
+                    return None
+                data = await resp.json()
 
             question = data.get("data", {}).get("question")
             if not question:
@@ -143,19 +142,19 @@ class LeetCodeClient:
             ),
         }
         try:
-            async with aiohttp.ClientSession() as http:
-                async with http.post(
-                    LeetCodeConfig.GRAPHQL_URL,
-                    json=payload,
-                    headers=headers,
-                ) as resp:
-                    if resp.status != 200:
-                        log.warning(
-                            "LeetCode GraphQL returned HTTP %s for recent AC.",
-                            resp.status,
-                        )
-                        return []
-                    data = await resp.json()
+            http = http_pool.get_session(LeetCodeConfig.GRAPHQL_URL)
+            async with http.post(
+                LeetCodeConfig.GRAPHQL_URL,
+                json=payload,
+                headers=headers,
+            ) as resp:
+                if resp.status != 200:
+                    log.warning(
+                        "LeetCode GraphQL returned HTTP %s for recent AC.",
+                        resp.status,
+                    )
+                    return []
+                data = await resp.json()
             return data.get("data", {}).get("recentAcSubmissionList", []) or []
         except Exception:
             log.warning(
@@ -6,6 +6,7 @@ from collections.abc import Callable, Awaitable
 
 import aiohttp
 
+from couchd.core.clients import http_pool
 from couchd.core.config import settings
 
 log = logging.getLogger(__name__)
@@ -20,15 +21,15 @@ async def listen_tips(on_tip: Callable[[dict], Awaitable[None]]) -> None:
     delay = 1
     while True:
         try:
-            async with aiohttp.ClientSession() as http:
-                async with http.ws_connect(_SE_WS_URL) as ws:
-                    log.info("Connected to StreamElements WebSocket.")
-                    delay = 1
-                    async for msg in ws:
-                        if msg.type == aiohttp.WSMsgType.TEXT:
-                            await _handle(ws, msg.data, on_tip)
-                        elif msg.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
-                            break
+            http = http_pool.get_session(_SE_WS_URL)
+            async with http.ws_connect(_SE_WS_URL) as ws:
+                log.info("Connected to StreamElements WebSocket.")
+                delay = 1
+                async for msg in ws:
+                    if msg.type == aiohttp.WSMsgType.TEXT:
+                        await _handle(ws, msg.data, on_tip)
+                    elif msg.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                        break
         except aiohttp.ClientConnectorError:
             log.warning("StreamElements WS unreachable. Reconnecting in %ds.", delay)
         except Exception:
@@ -1,12 +1,104 @@
 # couchd/core/clients/twitch.py
+import asyncio
 import aiohttp
 import logging
+import time
+from collections.abc import Awaitable, Callable
 
+from couchd.core.clients import http_pool
 from couchd.core.config import settings
+from couchd.core.constants import TwitchConfig
 
 log = logging.getLogger(__name__)
 
 
+class _RateLimit:
+    """Tracks Helix Ratelimit-Remaining / Ratelimit-Reset for one token bucket."""
+
+    def __init__(self) -> None:
+        self.remaining: int | None = None
+        self.reset_at = 0.0  # epoch seconds
+
+    def update(self, headers) -> None:
+        try:
+            remaining = headers.get("Ratelimit-Remaining")
+            reset = headers.get("Ratelimit-Reset")
+            if remaining is not None:
+                self.remaining = int(remaining)
+            if reset is not None:
+                self.reset_at = float(reset)
+        except (TypeError, ValueError):
+            pass
+
+    def exhaust(self) -> None:
+        self.remaining = 0
+
+    async def wait(self) -> None:
+        if self.remaining is None or self.remaining > TwitchConfig.RATELIMIT_RESERVE:
+            if self.remaining is not None:
+                self.remaining -= 1
+            return
+        delay = self.reset_at - time.time()
+        if delay > 0:
+            delay = min(delay, TwitchConfig.RATELIMIT_MAX_WAIT_SECONDS)
+            log.warning("Twitch rate limit nearly exhausted — waiting %.1fs for reset.", delay)
+            await asyncio.sleep(delay)
+        self.remaining = None
+
+
+class _MicroBatcher:
+    """
+    Merges single-key lookups issued within BATCH_WINDOW_SECONDS into one bulk fetch.
+    fetch(keys) returns {key: item}; keys missing from the result resolve to None.
+    """
+
+    def __init__(self, fetch: Callable[[list[str]], Awaitable[dict[str, dict]]]) -> None:
+        self._fetch = fetch
+        self._pending: dict[str, list[asyncio.Future]] = {}
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def get(self, key: str) -> dict | None:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.setdefault(key, []).append(future)
+        if self._timer is None:
+            self._timer = loop.call_later(TwitchConfig.BATCH_WINDOW_SECONDS, self._start_flush, loop)
+        return await future
+
+    def _start_flush(self, loop: asyncio.AbstractEventLoop) -> None:
+        task = loop.create_task(self._flush())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _flush(self) -> None:
+        pending, self._pending, self._timer = self._pending, {}, None
+        try:
+            results = await self._fetch(list(pending))
+        except Exception as e:
+            for futures in pending.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+        for key, futures in pending.items():
+            for future in futures:
+                if not future.done():
+                    future.set_result(results.get(key))
+
+
+def _chunks(items: list, size: int = TwitchConfig.HELIX_MAX_IDS):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _emote_map(data: dict) -> dict[str, str]:
+    return {
+        e["name"]: f"https://static-cdn.jtvnw.net/emoticons/v2/{e['id']}/default/dark/2.0"
+        for e in data.get("data", [])
+    }
+
+
 class TwitchClient:
     """
     A reusable async client for interacting with the Twitch API.
@@ -17,69 +109,150 @@ class TwitchClient:
         self.client_id = settings.TWITCH_CLIENT_ID
         self.client_secret = settings.TWITCH_CLIENT_SECRET
         self.app_token = None
+        self._token_expires_at: float | None = None  # monotonic; None = unknown, rely on 401
+        self._token_lock = asyncio.Lock()
+        self._app_limit = _RateLimit()
+        self._user_limit = _RateLimit()
+        self._stream_batcher = _MicroBatcher(self._fetch_streams)
+        self._user_batcher = _MicroBatcher(self._fetch_users_by_login)
+        self._clip_batcher = _MicroBatcher(self._fetch_clips)
 
     async def _get_app_token(self) -> str:
         """Fetches a new App Access Token from Twitch."""
-        url = f"https://id.twitch.tv/oauth2/token?client_id={self.client_id}&client_secret={self.client_secret}&grant_type=client_credentials"
+        url = f"{TwitchConfig.TOKEN_URL}?client_id={self.client_id}&client_secret={self.client_secret}&grant_type=client_credentials"
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        self.app_token = data.get("access_token")
-                        log.info("Successfully acquired Twitch App Access Token.")
-                        return self.app_token
-                    else:
-                        log.error(
-                            f"Failed to get Twitch token: {response.status} - {await response.text()}"
-                        )
-                        return None
+            session = http_pool.get_session(url)
+            async with session.post(url) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    self.app_token = data.get("access_token")
+                    expires_in = data.get("expires_in")
+                    self._token_expires_at = (
+                        time.monotonic() + expires_in if isinstance(expires_in, (int, float)) else None
+                    )
+                    log.info("Successfully acquired Twitch App Access Token.")
+                    return self.app_token
+                else:
+                    log.error(
+                        f"Failed to get Twitch token: {response.status} - {await response.text()}"
+                    )
+                    return None
         except Exception as e:
             log.error("Exception while fetching Twitch token", exc_info=e)
             return None
 
-    async def get_stream_status(self, username: str) -> dict | None:
+    def _token_fresh(self) -> bool:
+        if not self.app_token:
+            return False
+        if self._token_expires_at is None:
+            return True
+        return time.monotonic() < self._token_expires_at - TwitchConfig.TOKEN_REFRESH_MARGIN_SECONDS
+
+    async def _ensure_token(self, rejected: str | None = None) -> str | None:
         """
-        Checks if a user is live.
-        Returns the stream data dict if live, or None if offline/error.
+        Returns a usable app token, refreshing it if missing, close to expiry, or equal to
+        `rejected` (a token Helix just answered 401 for). Concurrent callers share one refresh.
         """
-        if not self.app_token:
-            await self._get_app_token()
+        if self._token_fresh() and self.app_token != rejected:
+            return self.app_token
+        async with self._token_lock:
+            if self._token_fresh() and self.app_token != rejected:
+                return self.app_token
+            return await self._get_app_token()
+
+    async def _helix(self, path: str, params, *, user_token: str | None = None) -> dict | None:
+        """
+        GET a Helix endpoint and return the decoded body, or None on a non-200 answer.
+        Uses the app token unless user_token is given; a 401 on the app token triggers one
+        refresh-and-retry, and requests are held back while the rate-limit bucket is empty.
+        Network errors propagate to the caller.
+        """
+        url = f"{TwitchConfig.HELIX_URL}/{path}"
+        limit = self._user_limit if user_token else self._app_limit
+        for attempt in range(2):
+            token = user_token or await self._ensure_token()
+            if not token:
+                return None
+            await limit.wait()
+            headers = {"Client-ID": self.client_id, "Authorization": f"Bearer {token}"}
+            session = http_pool.get_session(url)
+            async with session.get(url, params=params, headers=headers) as response:
+                limit.update(response.headers)
+                if response.status == 401 and not user_token and attempt == 0:
+                    log.warning("Twitch token rejected. Refreshing...")
+                    await self._ensure_token(rejected=token)
+                    continue
+                if response.status == 429 and attempt == 0:
+                    limit.exhaust()
+                    continue
+                if response.status != 200:
+                    log.error("Twitch API Error: %s on %s", response.status, path)
+                    return None
+                return await response.json()
+        return None
+
+    async def _fetch_streams(self, logins: list[str]) -> dict[str, dict]:
+        """Live streams keyed by lowercase login; offline users are absent. Raises on network errors."""
+        streams = {}
+        for chunk in _chunks(logins):
+            params = [("user_login", login) for login in chunk] + [("first", str(len(chunk)))]
+            data = await self._helix("streams", params)
+            for stream in (data or {}).get("data", []):
+                streams[stream["user_login"].lower()] = stream
+        return streams
+
+    async def _fetch_users(self, logins: list[str], ids: list[str]) -> list[dict]:
+        users = []
+        keys = [("login", login) for login in logins] + [("id", user_id) for user_id in ids]
+        for chunk in _chunks(keys):
+            data = await self._helix("users", chunk)
+            users.extend((data or {}).get("data", []))
+        return users
+
+    async def _fetch_users_by_login(self, logins: list[str]) -> dict[str, dict]:
+        return {u["login"].lower(): u for u in await self._fetch_users(logins, [])}
+
+    async def _fetch_clips(self, clip_ids: list[str]) -> dict[str, dict]:
+        clips = {}
+        for chunk in _chunks(clip_ids):
+            data = await self._helix("clips", [("id", clip_id) for clip_id in chunk])
+            for clip in (data or {}).get("data", []):
+                clips[clip["id"]] = clip
+        return clips
+
+    async def get_streams(self, logins: list[str]) -> dict[str, dict]:
+        """Fetches live streams for many logins, 100 per request. Returns {login: stream} for live users only."""
+        try:
+            return await self._fetch_streams([login.lower() for login in dict.fromkeys(logins)])
+        except Exception:
+            log.error("Exception while fetching Twitch streams", exc_info=True)
+            return {}
 
-        if not self.app_token:
-            return None  # Couldn't get a token
+    async def get_users(self, logins: list[str] = (), ids: list[str] = ()) -> list[dict]:
+        """Fetches user objects by login and/or id, 100 per request. Returns [] on error."""
+        try:
+            return await self._fetch_users(list(dict.fromkeys(logins)), list(dict.fromkeys(ids)))
+        except Exception:
+            log.error("Exception while fetching Twitch users", exc_info=True)
+            return []
 
-        url = f"https://api.twitch.tv/helix/streams?user_login={username}"
-        headers = {
-            "Client-ID": self.client_id,
-            "Authorization": f"Bearer {self.app_token}",
-        }
+    async def get_clips(self, clip_ids: list[str]) -> dict[str, dict]:
+        """Fetches clip metadata for many clips, 100 per request. Returns {clip_id: clip}; missing clips are absent."""
+        try:
+            return await self._fetch_clips(list(dict.fromkeys(clip_ids)))
+        except Exception:
+            log.error("Exception while fetching Twitch clips", exc_info=True)
+            return {}
 
+    async def get_stream_status(self, username: str) -> dict | None:
+        """
+        Checks if a user is live.
+        Returns the stream data dict if live, or None if offline/error.
+        Concurrent calls are merged into one /streams request.
+        """
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=headers) as response:
-                    # If token expired (401), get a new one and retry once
-                    if response.status == 401:
-                        log.warning("Twitch token expired. Refreshing...")
-                        await self._get_app_token()
-                        headers["Authorization"] = f"Bearer {self.app_token}"
-                        async with session.get(url, headers=headers) as retry_response:
-                            if retry_response.status == 200:
-                                data = await retry_response.json()
-                            else:
-                                return None
-                    elif response.status == 200:
-                        data = await response.json()
-                    else:
-                        log.error(f"Twitch API Error: {response.status}")
-                        return None
-
-            # If the 'data' list has items, the user is live!
-            if data and data.get("data"):
-                return data["data"][0]  # Return the first stream object
-
-            return None  # List is empty, user is offline
+            return await self._stream_batcher.get(username.lower())
 
         except aiohttp.ClientError as e:
             log.error("Network error checking Twitch stream status", exc_info=e)
@@ -90,40 +263,9 @@ class TwitchClient:
 
     async def get_user_id(self, username: str) -> str | None:
         """Fetches the Twitch user ID for a given username. Returns the ID string or None."""
-        if not self.app_token:
-            await self._get_app_token()
-
-        if not self.app_token:
-            return None
-
-        url = f"https://api.twitch.tv/helix/users?login={username}"
-        headers = {
-            "Client-ID": self.client_id,
-            "Authorization": f"Bearer {self.app_token}",
-        }
-
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=headers) as response:
-                    if response.status == 401:
-                        log.warning("Twitch token expired. Refreshing...")
-                        await self._get_app_token()
-                        headers["Authorization"] = f"Bearer {self.app_token}"
-                        async with session.get(url, headers=headers) as retry_response:
-                            if retry_response.status == 200:
-                                data = await retry_response.json()
-                            else:
-                                return None
-                    elif response.status == 200:
-                        data = await response.json()
-                    else:
-                        log.error(f"Twitch API Error: {response.status}")
-                        return None
-
-            if data and data.get("data"):
-                return data["data"][0]["id"]
-
-            return None
+            user = await self._user_batcher.get(username.lower())
+            return user["id"] if user else None
 
         except Exception as e:
             log.error("Exception while fetching Twitch user ID", exc_info=e)
@@ -131,39 +273,9 @@ class TwitchClient:
 
     async def get_global_emotes(self) -> dict[str, str]:
         """Fetches Twitch global emotes. Returns {name: url} or {} on error."""
-        if not self.app_token:
-            await self._get_app_token()
-        if not self.app_token:
-            return {}
-
-        url = "https://api.twitch.tv/helix/chat/emotes/global"
-        headers = {
-            "Client-ID": self.client_id,
-            "Authorization": f"Bearer {self.app_token}",
-        }
-
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=headers) as response:
-                    if response.status == 401:
-                        log.warning("Twitch token expired. Refreshing...")
-                        await self._get_app_token()
-                        headers["Authorization"] = f"Bearer {self.app_token}"
-                        async with session.get(url, headers=headers) as retry:
-                            if retry.status == 200:
-                                data = await retry.json()
-                            else:
-                                return {}
-                    elif response.status == 200:
-                        data = await response.json()
-                    else:
-                        log.error(f"Twitch API Error: {response.status}")
-                        return {}
-
-            return {
-                e["name"]: f"https://static-cdn.jtvnw.net/emoticons/v2/{e['id']}/default/dark/2.0"
-                for e in data.get("data", [])
-            }
+            data = await self._helix("chat/emotes/global", {})
+            return _emote_map(data) if data else {}
         except Exception:
             log.error("Exception while fetching Twitch global emotes", exc_info=True)
             return {}
@@ -172,57 +284,22 @@ class TwitchClient:
         """Fetches emotes for a specific channel. Returns {name: url} or {} on error."""
         if not broadcaster_id:
             return {}
-        if not self.app_token:
-            await self._get_app_token()
-        if not self.app_token:
-            return {}
-
-        url = f"https://api.twitch.tv/helix/chat/emotes?broadcaster_id={broadcaster_id}"
-        headers = {
-            "Client-ID": self.client_id,
-            "Authorization": f"Bearer {self.app_token}",
-        }
-
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=headers) as response:
-                    if response.status == 401:
-                        log.warning("Twitch token expired. Refreshing...")
-                        await self._get_app_token()
-                        headers["Authorization"] = f"Bearer {self.app_token}"
-                        async with session.get(url, headers=headers) as retry:
-                            if retry.status == 200:
-                                data = await retry.json()
-                            else:
-                                return {}
-                    elif response.status == 200:
-                        data = await response.json()
-                    else:
-                        log.error(f"Twitch API Error: {response.status}")
-                        return {}
-
-            return {
-                e["name"]: f"https://static-cdn.jtvnw.net/emoticons/v2/{e['id']}/default/dark/2.0"
-                for e in data.get("data", [])
-            }
+            data = await self._helix("chat/emotes", {"broadcaster_id": broadcaster_id})
+            return _emote_map(data) if data else {}
         except Exception:
             log.error("Exception while fetching Twitch channel emotes", exc_info=True)
             return {}
 
     async def get_followers(self, broadcaster_id: str, user_token: str, *, after: str | None = None) -> tuple[list[dict], str | None]:
         """GET /helix/channels/followers — returns (items, next_cursor). Requires moderator:read:followers."""
-        params = f"broadcaster_id={broadcaster_id}&first=100"
+        params = {"broadcaster_id": broadcaster_id, "first": "100"}
         if after:
-            params += f"&after={after}"
-        url = f"https://api.twitch.tv/helix/channels/followers?{params}"
-        headers = {"Client-ID": self.client_id, "Authorization": f"Bearer {user_token}"}
+            params["after"] = after
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=headers) as response:
-                    if response.status != 200:
-                        log.error("get_followers error: %s", response.status)
-                        return [], None
-                    data = await response.json()
+            data = await self._helix("channels/followers", params, user_token=user_token)
+            if data is None:
+                return [], None
             cursor = data.get("pagination", {}).get("cursor")
             return data.get("data", []), cursor or None
         except Exception:
@@ -231,18 +308,13 @@ class TwitchClient:
 
     async def get_subscribers(self, broadcaster_id: str, user_token: str, *, after: str | None = None) -> tuple[list[dict], str | None]:
         """GET /helix/subscriptions — returns (items, next_cursor). Requires channel:read:subscriptions."""
-        params = f"broadcaster_id={broadcaster_id}&first=100"
+        params = {"broadcaster_id": broadcaster_id, "first": "100"}
         if after:
-            params += f"&after={after}"
-        url = f"https://api.twitch.tv/helix/subscriptions?{params}"
-        headers = {"Client-ID": self.client_id, "Authorization": f"Bearer {user_token}"}
+            params["after"] = after
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=headers) as response:
-                    if response.status != 200:
-                        log.error("get_subscribers error: %s", response.status)
-                        return [], None
-                    data = await response.json()
+            data = await self._helix("subscriptions", params, user_token=user_token)
+            if data is None:
+                return [], None
             cursor = data.get("pagination", {}).get("cursor")
             return data.get("data", []), cursor or None
         except Exception:
@@ -251,56 +323,18 @@ class TwitchClient:
 
     async def get_bits_leaderboard(self, broadcaster_id: str, user_token: str, *, count: int = 100) -> list[dict]:
         """GET /helix/bits/leaderboard?count=100&period=all — returns leaderboard entries. Requires bits:read."""
-        url = f"https://api.twitch.tv/helix/bits/leaderboard?count={count}&period=all&broadcaster_id={broadcaster_id}"
-        headers = {"Client-ID": self.client_id, "Authorization": f"Bearer {user_token}"}
+        params = {"count": str(count), "period": "all", "broadcaster_id": broadcaster_id}
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=headers) as response:
-                    if response.status != 200:
-                        log.error("get_bits_leaderboard error: %s", response.status)
-                        return []
-                    data = await response.json()
-            return data.get("data", [])
+            data = await self._helix("bits/leaderboard", params, user_token=user_token)
+            return data.get("data", []) if data else []
         except Exception:
             log.error("Exception in get_bits_leaderboard", exc_info=True)
             return []
 
     async def get_clip(self, clip_id: str) -> dict | None:
         """Fetches clip metadata from Twitch. Returns the clip object or None."""
-        if not self.app_token:
-            await self._get_app_token()
-
-        if not self.app_token:
-            return None
-
-        url = f"https://api.twitch.tv/helix/clips?id={clip_id}"
-        headers = {
-            "Client-ID": self.client_id,
-            "Authorization": f"Bearer {self.app_token}",
-        }
-
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=headers) as response:
-                    if response.status == 401:
-                        log.warning("Twitch token expired. Refreshing...")
-                        await self._get_app_token()
-                        headers["Authorization"] = f"Bearer {self.app_token}"
-                        async with session.get(url, headers=headers) as retry_response:
-                            if retry_response.status == 200:
-                                data = await retry_response.json()
-                            else:
-                                return None
-                    elif response.status == 200:
-                        data = await response.json()
-                    else:
-                        log.error(f"Twitch API Error: {response.status}")
-                        return None
-
-            if data and data.get("data"):
-                return data["data"][0]
-
-            return None
+            return await self._clip_batcher.get(clip_id)
 
         except Exception as e:
             log.error("Exception while fetching Twitch clip", exc_info=e)
@@ -1,59 +1,276 @@
 # couchd/core/clients/veil.py
 import asyncio
 import logging
+from collections import OrderedDict
 from collections.abc import Callable, Awaitable
+from dataclasses import dataclass
 
 import aiohttp
 
+from couchd.core import metrics
+from couchd.core.clients import http_pool, veil_outbox
 from couchd.core.config import settings
+from couchd.core.constants import VeilConfig
 
 log = logging.getLogger(__name__)
 
 
-async def post_event(event_type: str, payload: dict) -> None:
-    if not settings.VEIL_URL:
-        return
+@dataclass
+class QueueStats:
+    enqueued: int = 0
+    coalesced: int = 0
+    dropped: int = 0
+    sent: int = 0
+    failed: int = 0
+    batches: int = 0
+
+
+class _EventQueue:
+    """
+    Bounded, lane-prioritised outbound buffer drained by one background sender.
+    Lanes are drained alert → default → chat; when a lane is full its oldest event is dropped.
+    """
+
+    LANES = ("alert", "default", "chat")
+
+    def __init__(self) -> None:
+        self.lanes: dict[str, OrderedDict] = {lane: OrderedDict() for lane in self.LANES}
+        self.stats = QueueStats()
+        self.inflight: set[str] = set()
+        self._seq = 0
+        self._wakeup: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._batch_supported = True
+
+    @staticmethod
+    def lane_for(event_type: str) -> str:
+        if event_type in VeilConfig.ALERT_EVENTS:
+            return "alert"
+        if event_type in VeilConfig.CHAT_EVENTS:
+            return "chat"
+        return "default"
+
+    def _key_for(self, event_type: str, payload: dict, event_id: str | None):
+        if event_id:
+            return ("id", event_id)
+        if event_type in VeilConfig.COALESCE_KEYS:
+            field = VeilConfig.COALESCE_KEYS[event_type]
+            return (event_type, payload.get(field) if field else None)
+        self._seq += 1
+        return self._seq
+
+    def contains(self, event_id: str) -> bool:
+        return event_id in self.inflight or ("id", event_id) in self.lanes["alert"]
+
+    def put(self, event_type: str, payload: dict, event_id: str | None = None) -> None:
+        lane = self.lanes[self.lane_for(event_type)]
+        key = self._key_for(event_type, payload, event_id)
+        self.stats.enqueued += 1
+        if key in lane:
+            lane[key] = (event_type, payload, event_id)
+            self.stats.coalesced += 1
+            return
+        if len(lane) >= VeilConfig.LANE_MAX[self.lane_for(event_type)]:
+            dropped_type, _, _ = lane.popitem(last=False)[1]
+            self.stats.dropped += 1
+            if self.stats.dropped % 100 == 1:
+                log.warning("Veil queue full, dropped %s (%d dropped total)", dropped_type, self.stats.dropped)
+        lane[key] = (event_type, payload, event_id)
+        self._ensure_sender()
+        self._wakeup.set()
+
+    def pending(self) -> int:
+        return sum(len(lane) for lane in self.lanes.values())
+
+    def take(self, limit: int) -> list[tuple[str, dict, str | None]]:
+        batch = []
+        for lane in self.lanes.values():
+            while lane and len(batch) < limit:
+                batch.append(lane.popitem(last=False)[1])
+        return batch
+
+    def _ensure_sender(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._loop is not loop:
+            self._loop = loop
+            self._wakeup = asyncio.Event()
+            self._task = loop.create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            if not self.lanes["alert"]:
+                await asyncio.sleep(VeilConfig.LINGER_SECONDS)
+            while self.pending():
+                await self._send(self.take(VeilConfig.BATCH_MAX))
+
+    async def _send(self, batch: list[tuple[str, dict, str | None]]) -> None:
+        self.stats.batches += 1
+        ids = {eid for _, _, eid in batch if eid}
+        self.inflight |= ids
+        acked: list[str] = []
+        try:
+            if self._batch_supported and len(batch) > 1:
+                status = await _post_json("/events", {"events": [_envelope(*e) for e in batch]})
+                if status in (404, 405):
+                    log.info("Veil has no /events endpoint — falling back to per-event POSTs.")
+                    self._batch_supported = False
+                else:
+                    if self._record(status, len(batch), "batch"):
+                        acked.extend(ids)
+                    return
+            for event in batch:
+                if self._record(await _post_json("/event", _envelope(*event)), 1, event[0]) and event[2]:
+                    acked.append(event[2])
+        except aiohttp.ClientConnectorError:
+            self.stats.failed += len(batch)
+            log.warning("Veil unreachable, dropping %d event(s)", len(batch))
+        except Exception:
+            self.stats.failed += len(batch)
+            log.warning("Veil POST error, dropping %d event(s)", len(batch), exc_info=True)
+        finally:
+            self.inflight -= ids
+            if acked:
+                await veil_outbox.ack(acked)
+
+    def _record(self, status: int, count: int, label: str) -> bool:
+        if status in (200, 204):
+            self.stats.sent += count
+            log.debug("Veil POST %s (%d) → %d", label, count, status)
+            return True
+        self.stats.failed += count
+        log.warning("Veil POST %s (%d) → %d", label, count, status)
+        return False
+
+    async def close(self) -> None:
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        while self.pending():
+            await self._send(self.take(VeilConfig.BATCH_MAX))
+
+
+_queue = _EventQueue()
+metrics.gauge("couchd_veil_queue_depth", "Events waiting to be sent to veil.", lambda: _queue.pending())
+metrics.gauge("couchd_veil_events_sent_total", "Events veil accepted.", lambda: _queue.stats.sent, kind="counter")
+metrics.gauge(
+    "couchd_veil_events_dropped_total", "Events dropped from a full lane.",
+    lambda: _queue.stats.dropped, kind="counter",
+)
+metrics.gauge(
+    "couchd_veil_events_failed_total", "Events whose batch failed to send.",
+    lambda: _queue.stats.failed, kind="counter",
+)
+_replay_task: asyncio.Task | None = None
+
+
+def _envelope(event_type: str, payload: dict, event_id: str | None) -> dict:
+    body = {"type": event_type, "payload": payload}
+    if event_id:
+        body["id"] = event_id
+    return body
+
+
+def _headers() -> dict:
     headers = {}
     if settings.VEIL_SECRET:
         headers["Authorization"] = f"Bearer {settings.VEIL_SECRET}"
+    return headers
+
+
+async def _post_json(path: str, body: dict) -> int:
+    session = http_pool.get_session(settings.VEIL_URL)
+    async with session.post(
+        f"{settings.VEIL_URL}{path}",
+        json=body,
+        headers=_headers(),
+        timeout=aiohttp.ClientTimeout(total=VeilConfig.POST_TIMEOUT_SECONDS),
+    ) as resp:
+        return resp.status
+
+
+async def post_event(event_type: str, payload: dict) -> None:
+    """
+    Queue an event for veil and return immediately; a background task batches and sends it.
+    With VEIL_OUTBOX_ENABLED, alert-class events are also written behind to the outbox and replayed on
+    reconnect.
+    """
+    if not settings.VEIL_URL:
+        return
+    event_id = None
+    if settings.VEIL_OUTBOX_ENABLED and event_type in VeilConfig.ALERT_EVENTS:
+        event_id = veil_outbox.new_event_id()
+        if not veil_outbox.save(event_id, event_type, payload):
+            event_id = None
+    _queue.put(event_type, payload, event_id)
+
+
+async def replay_outbox() -> None:
+    """
+    Re-send unacknowledged outbox events oldest-first, REPLAY_BATCH at a time.
+    Events still queued or in flight are skipped, and veil dedupes on the envelope id.
+    """
+    if not settings.VEIL_OUTBOX_ENABLED:
+        return
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                f"{settings.VEIL_URL}/event",
-                json={"type": event_type, "payload": payload},
-                headers=headers,
-                timeout=aiohttp.ClientTimeout(total=5),
-            ) as resp:
-                if resp.status not in (200, 204):
-                    log.warning("Veil POST %s → %d", event_type, resp.status)
-                else:
-                    log.info("Veil POST %s → %d", event_type, resp.status)
-    except aiohttp.ClientConnectorError:
-        log.warning("Veil unreachable, dropping event %s", event_type)
+        purged = await veil_outbox.purge_stale()
+        if purged:
+            log.info("Discarded %d stale veil outbox event(s).", purged)
+        after_id = 0
+        replayed = 0
+        while rows := await veil_outbox.pending(after_id, VeilConfig.REPLAY_BATCH):
+            for row in rows:
+                if not _queue.contains(row.event_id):
+                    _queue.put(row.event_type, row.payload, row.event_id)
+                    replayed += 1
+            after_id = rows[-1].id
+            await asyncio.sleep(VeilConfig.REPLAY_INTERVAL_SECONDS)
+        if replayed:
+            log.info("Replayed %d veil outbox event(s).", replayed)
     except Exception:
-        log.warning("Veil POST error for %s", event_type, exc_info=True)
+        log.error("Veil outbox replay failed", exc_info=True)
+
+
+def stats() -> QueueStats:
+    """Outbound queue counters since process start."""
+    return _queue.stats
+
+
+async def close() -> None:
+    """Flush queued events and stop the sender. Call from each bot's shutdown path."""
+    await _queue.close()
+    await veil_outbox.close()
 
 
 async def _post(path: str) -> None:
     if not settings.VEIL_URL:
         return
-    headers = {}
-    if settings.VEIL_SECRET:
-        headers["Authorization"] = f"Bearer {settings.VEIL_SECRET}"
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                f"{settings.VEIL_URL}{path}",
-                headers=headers,
-                timeout=aiohttp.ClientTimeout(total=5),
-            ) as resp:
-                log.info("veil POST %s → %d", path, resp.status)
+        session = http_pool.get_session(settings.VEIL_URL)
+        async with session.post(
+            f"{settings.VEIL_URL}{path}",
+            headers=_headers(),
+            timeout=aiohttp.ClientTimeout(total=VeilConfig.POST_TIMEOUT_SECONDS),
+        ) as resp:
+            log.info("veil POST %s → %d", path, resp.status)
     except aiohttp.ClientConnectorError:
         log.warning("Veil unreachable, dropping %s", path)
     except Exception:
         log.warning("Veil POST error for %s", path, exc_info=True)
 
 
+def _start_replay() -> None:
+    global _replay_task
+    if _replay_task is None or _replay_task.done():
+        _replay_task = asyncio.create_task(replay_outbox())
+
+
 async def alerts_on() -> None:
     await _post("/alerts/on")
 
@@ -85,24 +302,25 @@ async def listen_decisions(
     delay = 1
     while True:
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.ws_connect(ws_url) as ws:
-                    log.info("Connected to veil WS for modqueue decisions.")
-                    delay = 1
-                    if on_connect:
-                        await on_connect()
-                    async for msg in ws:
-                        if msg.type == aiohttp.WSMsgType.TEXT:
-                            data = msg.json()
-                            if data.get("type") == "modqueue.decision":
-                                d = data.get("data", {})
-                                await on_decision(
-                                    d.get("message_id", ""),
-                                    d.get("decision", ""),
-                                    d.get("platform", "twitch"),
-                                )
-                        elif msg.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
-                            break
+            session = http_pool.get_session(settings.VEIL_URL)
+            async with session.ws_connect(ws_url) as ws:
+                log.info("Connected to veil WS for modqueue decisions.")
+                delay = 1
+                _start_replay()
+                if on_connect:
+                    await on_connect()
+                async for msg in ws:
+                    if msg.type == aiohttp.WSMsgType.TEXT:
+                        data = msg.json()
+                        if data.get("type") == "modqueue.decision":
+                            d = data.get("data", {})
+                            await on_decision(
+                                d.get("message_id", ""),
+                                d.get("decision", ""),
+                                d.get("platform", "twitch"),
+                            )
+                    elif msg.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                        break
         except aiohttp.ClientConnectorError:
             log.warning("Veil WS unreachable. Reconnecting in %ds.", delay)
         except Exception:
@@ -0,0 +1,78 @@
+# couchd/core/clients/veil_outbox.py
+import logging
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, select
+
+from couchd.core.batch_writer import BatchWriter
+from couchd.core.constants import VeilConfig
+from couchd.core.db import get_session
+from couchd.core.models import VeilOutboxEvent
+
+log = logging.getLogger(__name__)
+
+
+def new_event_id() -> str:
+    return uuid.uuid4().hex
+
+
+# Write-behind, so persisting an alert adds no database round trip to the handler that raised it.
+_writer = BatchWriter(VeilOutboxEvent)
+
+# Which bot process this is. Every bot shares the table, and each replays only the rows it wrote,
+# so an event another process is still delivering is never sent twice.
+_owner = VeilConfig.DEFAULT_OUTBOX_OWNER
+
+
+def set_owner(owner: str) -> None:
+    global _owner
+    _owner = owner
+
+
+def save(event_id: str, event_type: str, payload: dict) -> bool:
+    """Buffer an event for the outbox; False if the buffer is full and it was not kept."""
+    return _writer.add({"event_id": event_id, "owner": _owner, "event_type": event_type, "payload": payload})
+
+
+async def flush() -> None:
+    await _writer.flush()
+
+
+async def close() -> None:
+    await _writer.close()
+
+
+async def ack(event_ids: list[str]) -> None:
+    """
+    Forget acknowledged events. Ones still buffered are never written. An event acked while its batch
+    is being written can outlive the DELETE and be replayed once; veil dedupes on the envelope id.
+    """
+    if not event_ids:
+        return
+    acked = set(event_ids)
+    _writer.discard(lambda row: row["event_id"] in acked)
+    try:
+        async with get_session() as db:
+            await db.execute(delete(VeilOutboxEvent).where(VeilOutboxEvent.event_id.in_(event_ids)))
+    except Exception:
+        log.error("Failed to ack %d veil outbox event(s)", len(event_ids), exc_info=True)
+
+
+async def pending(after_id: int, limit: int) -> list[VeilOutboxEvent]:
+    """This process's unacknowledged events with id > after_id, oldest first."""
+    async with get_session() as db:
+        result = await db.execute(
+            select(VeilOutboxEvent)
+            .where((VeilOutboxEvent.owner == _owner) & (VeilOutboxEvent.id > after_id))
+            .order_by(VeilOutboxEvent.id)
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
+
+async def purge_stale() -> int:
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=VeilConfig.OUTBOX_MAX_AGE_HOURS)
+    async with get_session() as db:
+        result = await db.execute(delete(VeilOutboxEvent).where(VeilOutboxEvent.created_at < cutoff))
+        return result.rowcount or 0
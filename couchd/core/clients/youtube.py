@@ -3,6 +3,7 @@ import aiohttp
 import logging
 import xml.etree.ElementTree as ET
 
+from couchd.core.clients import http_pool
 from couchd.core.config import settings
 from couchd.core.constants import YouTubeConfig
 
@@ -32,17 +33,17 @@ class YouTubeRSSClient:
         url = YouTubeConfig.RSS_URL.format(channel_id=self.channel_id)
         headers = {"User-Agent": "Mozilla/5.0 (compatible; BonelessCouchBot/1.0)"}
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=headers) as response:
-                    if response.status == 404:
-                        return None
-                    if response.status != 200:
-                        raise aiohttp.ClientResponseError(
-                            response.request_info,
-                            response.history,
-                            status=response.status,
-                        )
-                    text = await response.text()
+            session = http_pool.get_session(url)
+            async with session.get(url, headers=headers) as response:
+                if response.status == 404:
+                    return None
+                if response.status != 200:
+                    raise aiohttp.ClientResponseError(
+                        response.request_info,
+                        response.history,
+                        status=response.status,
+                    )
+                text = await response.text()
 
             root = ET.fromstring(text)
             entry = root.find("atom:entry", _RSS_NS)
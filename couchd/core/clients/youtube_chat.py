@@ -4,11 +4,11 @@ import logging
 import pickle
 from pathlib import Path
 
-import aiohttp
 from google.auth.exceptions import RefreshError
 from google.auth.transport.requests import Request
 from google_auth_oauthlib.flow import InstalledAppFlow
 
+from couchd.core.clients import http_pool
 from couchd.core.constants import YouTubeChatConfig
 
 log = logging.getLogger(__name__)
@@ -86,15 +86,15 @@ class YouTubeChatClient:
             "broadcastType": "all",
             "maxResults": 5,
         }
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=self._headers(), params=params) as resp:
-                if resp.status == 401:
-                    self._creds = None
-                    await self._ensure_creds()
-                    async with session.get(url, headers=self._headers(), params=params) as retry:
-                        data = await retry.json()
-                else:
-                    data = await resp.json()
+        session = http_pool.get_session(url)
+        async with session.get(url, headers=self._headers(), params=params) as resp:
+            if resp.status == 401:
+                self._creds = None
+                await self._ensure_creds()
+                async with session.get(url, headers=self._headers(), params=params) as retry:
+                    data = await retry.json()
+            else:
+                data = await resp.json()
 
         items = data.get("items", [])
         if not items:
@@ -122,18 +122,18 @@ class YouTubeChatClient:
         if page_token:
             params["pageToken"] = page_token
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=self._headers(), params=params) as resp:
-                if resp.status == 401:
-                    self._creds = None
-                    await self._ensure_creds()
-                    async with session.get(url, headers=self._headers(), params=params) as retry:
-                        data = await retry.json()
-                elif resp.status != 200:
-                    log.error("poll_messages HTTP %s: %s", resp.status, await resp.text())
-                    return [], page_token, YouTubeChatConfig.DEFAULT_POLL_MS
-                else:
-                    data = await resp.json()
+        session = http_pool.get_session(url)
+        async with session.get(url, headers=self._headers(), params=params) as resp:
+            if resp.status == 401:
+                self._creds = None
+                await self._ensure_creds()
+                async with session.get(url, headers=self._headers(), params=params) as retry:
+                    data = await retry.json()
+            elif resp.status != 200:
+                log.error("poll_messages HTTP %s: %s", resp.status, await resp.text())
+                return [], page_token, YouTubeChatConfig.DEFAULT_POLL_MS
+            else:
+                data = await resp.json()
 
         messages = data.get("items", [])
         next_token = data.get("nextPageToken")
@@ -151,13 +151,13 @@ class YouTubeChatClient:
                 "textMessageDetails": {"messageText": text},
             }
         }
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                url, headers=self._headers(), params=params, json=body
-            ) as resp:
-                if resp.status not in (200, 204):
-                    log.error("send_message HTTP %s: %s", resp.status, await resp.text())
-                    return False
+        session = http_pool.get_session(url)
+        async with session.post(
+            url, headers=self._headers(), params=params, json=body
+        ) as resp:
+            if resp.status not in (200, 204):
+                log.error("send_message HTTP %s: %s", resp.status, await resp.text())
+                return False
         return True
 
     # ------------------------------------------------------------------
@@ -167,13 +167,13 @@ class YouTubeChatClient:
     async def delete_message(self, message_id: str) -> bool:
         await self._ensure_creds()
         url = f"{YouTubeChatConfig.API_BASE}/liveChat/messages"
-        async with aiohttp.ClientSession() as session:
-            async with session.delete(
-                url, headers=self._headers(), params={"id": message_id}
-            ) as resp:
-                if resp.status not in (200, 204):
-                    log.error("delete_message HTTP %s", resp.status)
-                    return False
+        session = http_pool.get_session(url)
+        async with session.delete(
+            url, headers=self._headers(), params={"id": message_id}
+        ) as resp:
+            if resp.status not in (200, 204):
+                log.error("delete_message HTTP %s", resp.status)
+                return False
         return True
 
     async def ban_user(
@@ -194,23 +194,23 @@ class YouTubeChatClient:
         else:
             body["snippet"]["type"] = "permanent"
 
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                url, headers=self._headers(), params={"part": "snippet"}, json=body
-            ) as resp:
-                if resp.status not in (200, 204):
-                    log.error("ban_user HTTP %s: %s", resp.status, await resp.text())
-                    return False
+        session = http_pool.get_session(url)
+        async with session.post(
+            url, headers=self._headers(), params={"part": "snippet"}, json=body
+        ) as resp:
+            if resp.status not in (200, 204):
+                log.error("ban_user HTTP %s: %s", resp.status, await resp.text())
+                return False
         return True
 
     async def unban_user(self, ban_id: str) -> bool:
         await self._ensure_creds()
         url = f"{YouTubeChatConfig.API_BASE}/liveChat/bans"
-        async with aiohttp.ClientSession() as session:
-            async with session.delete(
-                url, headers=self._headers(), params={"id": ban_id}
-            ) as resp:
-                if resp.status not in (200, 204):
-                    log.error("unban_user HTTP %s", resp.status)
-                    return False
+        session = http_pool.get_session(url)
+        async with session.delete(
+            url, headers=self._headers(), params={"id": ban_id}
+        ) as resp:
+            if resp.status not in (200, 204):
+                log.error("unban_user HTTP %s", resp.status)
+                return False
         return True
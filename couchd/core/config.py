@@ -51,6 +51,8 @@ class Settings(BaseSettings):
     DB_HOST: str
     DB_PORT: int = 5432  # Default to 5432 if not specified
     DB_NAME: str
+    # Dev only: log EXPLAIN ANALYZE for slow SELECTs (re-runs the query)
+    DB_EXPLAIN_SLOW_QUERIES: bool = False
 
     # Configurable polling rate (defaults to 2 minutes if not in .env)
     TWITCH_POLL_RATE_MINUTES: float = 2.0
@@ -77,16 +79,32 @@ class Settings(BaseSettings):
     # Example: [{"name":"Twitch","url":"https://twitch.tv/..."},{"name":"TikTok","url":"https://tiktok.com/..."}]
     SOCIAL_LINKS: list[dict[str, str]] = []
 
+    # Chat spikes: also clip / drop a stream marker when Twitch chat bursts (always recorded for the recap)
+    CHAT_SPIKE_CLIPS: bool = False
+    CHAT_SPIKE_MARKERS: bool = False
+
+    # Follow-bot waves always mute per-follow alerts; optionally also ban the bots / go followers-only
+    FOLLOW_DEFENSE_BANS: bool = False
+    FOLLOW_DEFENSE_FOLLOWERS_ONLY: bool = False
+
     # Chat timer interval: how often periodic promo messages are sent (minutes)
     CHAT_TIMER_INTERVAL_MINUTES: float = 20.0
 
     # Observability (optional)
     SENTRY_DSN: str | None = None
     BOT_LOGS_WEBHOOK_URL: str | None = None
+    # Local Prometheus /metrics and /healthz endpoint — omit METRICS_PORT to disable
+    METRICS_HOST: str = "127.0.0.1"
+    METRICS_PORT: int | None = None
 
     # Veil integration (optional — omit to disable event forwarding)
     VEIL_URL: str | None = None
     VEIL_SECRET: str | None = None
+    # Persist alert-class events in the veil_outbox table until veil acknowledges them
+    VEIL_OUTBOX_ENABLED: bool = False
+
+    # Archive every chat line into the chat_messages table
+    CHAT_ARCHIVE_ENABLED: bool = True
 
     # StreamElements (optional — omit to disable tip alerts)
     STREAMELEMENTS_JWT: str | None = None
@@ -12,6 +12,7 @@ class EventType(str, Enum):
     EDIT = "edit"
     TOPIC = "topic"
     TASK = "task"
+    CHAT_SPIKE = "chat_spike"
 
 
 class InteractionType(str, Enum):
@@ -41,6 +42,17 @@ class Platform(str, Enum):
     YOUTUBE = "youtube"
 
 
+class PostKind(str, Enum):
+    # discord_posts.kind; ref is the source row key noted alongside.
+    GO_LIVE = "go_live"         # stream_sessions.id
+    VIDEO = "video"             # YouTube video id
+    CLIP = "clip"               # clip_logs.id
+    IDEA = "idea"               # idea_posts.id
+    LC_THREAD = "lc_thread"     # problem slug
+    CF_THREAD = "cf_thread"     # Codeforces problem id, e.g. "1900A"
+    SOLUTION = "solution"       # solution_posts.id
+
+
 class StreamDefaults(str, Enum):
     TITLE = "No Title Provided"
     CATEGORY = "Just Chatting"
@@ -52,6 +64,13 @@ class TwitchConfig:
     THUMBNAIL_PLACEHOLDER_W = "{width}"
     THUMBNAIL_PLACEHOLDER_H = "{height}"
     BASE_URL = "https://twitch.tv/"
+    HELIX_URL = "https://api.twitch.tv/helix"
+    TOKEN_URL = "https://id.twitch.tv/oauth2/token"
+    TOKEN_REFRESH_MARGIN_SECONDS = 300  # refresh the app token this long before it expires
+    RATELIMIT_RESERVE = 5               # hold requests once Ratelimit-Remaining drops to this
+    RATELIMIT_MAX_WAIT_SECONDS = 60
+    HELIX_MAX_IDS = 100                 # ids/logins per request on /streams, /users, /clips
+    BATCH_WINDOW_SECONDS = 0.005        # single lookups issued within this window share one request
 
 
 class TwitchAdDuration(int, Enum):
@@ -83,8 +102,26 @@ class ZerotracConfig:
 
 
 class ChatMetrics:
+    # couchd.core.chat_velocity
     VELOCITY_WINDOW_MINUTES = 2
-    HIGH_VELOCITY_THRESHOLD = 20  # msgs/min
+    HIGH_VELOCITY_THRESHOLD = 20  # msgs/min over VELOCITY_WINDOW_MINUTES
+    RING_SECONDS = 901            # per-second slots; one more than the longest window
+    WINDOWS_SECONDS = (10, 60, 300, 900)
+    EWMA_HALF_LIFE_SECONDS = 300
+    SPIKE_WINDOW_SECONDS = 10
+    MIN_STDDEV = 0.5              # msgs/s; keeps a near-silent chat from scoring every message as a spike
+
+
+class SpikeConfig:
+    # couchd.core.chat_spikes; z-scores come from ChatVelocity.zscore()
+    ENTER_Z = 4.0
+    EXIT_Z = 1.5
+    MIN_RATE = 0.5              # msg/s over ChatMetrics.SPIKE_WINDOW_SECONDS
+    WARMUP_SECONDS = 120        # baseline age before anything counts as a spike
+    EXIT_HOLD_SECONDS = 15      # must stay under EXIT_Z this long to close
+    COOLDOWN_SECONDS = 120
+    TICK_SECONDS = 1
+    CLIP_TITLE = "Chat went off 🔥"
 
 
 class GitHubConfig:
@@ -123,44 +160,212 @@ class CommandCooldowns:
     SIMPLE = Cooldown(user_seconds=15, global_seconds=5)
 
 
+class CooldownConfig:
+    # couchd.core.cooldowns.CooldownManager
+    MAX_USERS_PER_COMMAND = 2000        # least recent user's cooldown is cut short past this
+    DEFAULT_USER_SECONDS = 120          # how long to remember users of a command record() saw before any check()
+
+
 class ClipConfig:
     DURATION = 30
     URL_BASE = "https://clips.twitch.tv/"
     DEFAULT_TITLE = "No context provided. Just vibes. ✨"
+    RECONCILE_MINUTES: float = 15.0     # fallback; NOTIFY triggers drive posting normally
 
 
 class RaidConfig:
     SHOUTOUT_MIN_VIEWERS = 5
 
 
+class FollowGuardConfig:
+    # couchd.platforms.twitch.components.follow_guard
+    WINDOW_SECONDS = 60
+    TRIP_SUSPICIOUS = 15                # suspicious follows in the window that switch defense mode on
+    TRIP_FOLLOWS = 60                   # ...or follows of any kind
+    EXIT_FOLLOWS = 5                    # defense ends once the window holds no more than this
+    CALM_SECONDS = 120                  # ...for this long
+    YOUNG_ACCOUNT_DAYS = 7
+    PREFIX_CHARS = 5                    # logins sharing this prefix in the window are one name pattern
+    PREFIX_REPEATS = 3
+    LOOKUP_BATCH = 100                  # Helix Get Users takes at most 100 ids
+    LOOKUP_INTERVAL_SECONDS = 2.0
+    HELIX_CONCURRENCY = 4               # ban/chat-settings calls in flight at once
+    FOLLOWERS_ONLY_MINUTES = 10         # follow age required while followers-only mode is on
+    TICK_SECONDS = 5
+    BAN_REASON = "Follow-bot wave"
+
+
 class BotConfig:
     USER_AGENT = "BonelessCouchBot/1.0"
 
 
+class HttpConfig:
+    # One long-lived aiohttp session per upstream host (see couchd.core.clients.http_pool).
+    TOTAL_TIMEOUT_SECONDS = 15
+    CONNECT_TIMEOUT_SECONDS = 5
+    LIMIT_PER_HOST = 10
+    DNS_CACHE_TTL_SECONDS = 300
+    KEEPALIVE_SECONDS = 60
+
+
+class BatchWriterConfig:
+    # Defaults for couchd.core.batch_writer.BatchWriter
+    BATCH_ROWS = 200
+    FLUSH_INTERVAL_SECONDS = 0.5
+    MAX_BUFFER_ROWS = 10_000
+
+
+class ChatArchiveConfig:
+    BATCH_ROWS = 1000
+    FLUSH_INTERVAL_SECONDS = 1.0
+    MAX_BUFFER_ROWS = 50_000
+    PARTITIONS_AHEAD = 1        # monthly chat_messages partitions created ahead of need
+
+
+class RecapConfig:
+    REFRESH_SECONDS = 60        # how often the Discord bot folds new events into the live recap
+
+
+class OverlayConfig:
+    LIST_SIZE = 5               # recent_subs / longest_subs entries in stream.stats.bootstrap
+
+
+class ListenerConfig:
+    KEEPALIVE_SECONDS = 60
+    RECONNECT_MAX_DELAY_SECONDS = 30
+
+
+class BusConfig:
+    # couchd.core.bus
+    CHANNEL = "couchd_bus"
+    INLINE_MAX_BYTES = 7000             # NOTIFY payloads cap at 8000 bytes; larger events go by reference
+    CATCHUP_MAX_AGE_MINUTES = 60        # reconnecting subscribers replay at most this far back
+    GAP_GRACE_SECONDS = 30              # an unseen seq older than this is a rolled-back insert, not in flight
+    RETENTION_DAYS = 7
+
+
+class FanoutConfig:
+    # Guilds an announcement is sent to at once; Discord calls are further paced by DiscordSchedulerConfig.
+    MAX_CONCURRENT_GUILDS = 10
+
+
+class NotifyChannel:
+    # Fired by AFTER INSERT triggers (migration n4o5p6q7r8s9); payload is the new row id.
+    PROBLEM_ATTEMPT = "problem_attempt_created"
+    CF_PROBLEM_ATTEMPT = "cf_problem_attempt_created"
+    SOLUTION_POST = "solution_post_created"
+    CLIP_LOG = "clip_log_created"
+    IDEA_POST = "idea_post_created"
+
+
+class SessionCacheConfig:
+    # Active StreamSession cache (couchd.core.utils); NOTIFY invalidates, TTL is the safety net.
+    TTL_SECONDS = 60
+    NEGATIVE_TTL_SECONDS = 5    # short: the Discord bot creates the row just after StreamOnline
+
+
+class GuildConfigCacheConfig:
+    # GuildConfig cache (couchd.core.guild_config); GuildConfigChanged invalidates, TTL is the safety net.
+    TTL_SECONDS = 900
+
+
+class MetricsConfig:
+    # /metrics and /healthz (couchd.core.metrics); served only when METRICS_PORT is set.
+    LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+    LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+    LOOP_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 15.0, 60.0)
+    LAG_SAMPLE_SECONDS = 1.0
+    HEALTHY_MAX_LAG_SECONDS = 1.0   # /healthz answers 503 while the loop is this far behind
+
+
+class QueryStatsConfig:
+    # Statement timing (couchd.core.query_stats); report with `python -m scripts.query_report`.
+    SLOW_QUERY_SECONDS = 0.25
+    SUMMARY_INTERVAL_MINUTES = 15
+    SUMMARY_TOP = 5
+    MAX_FINGERPRINTS = 500      # later distinct statements are pooled under one "other" entry
+    LOG_STATEMENT_CHARS = 500
+
+
+class VeilConfig:
+    POST_TIMEOUT_SECONDS = 5
+    BATCH_MAX = 50
+    LINGER_SECONDS = 0.05       # wait this long to fill a batch unless an alert is queued
+    LANE_MAX = {"alert": 500, "default": 1000, "chat": 500}
+    ALERT_EVENTS = frozenset({
+        "twitch.sub",
+        "twitch.resub",
+        "twitch.giftbomb",
+        "twitch.bits",
+        "twitch.raid",
+        "twitch.follower",
+        "streamelements.tip",
+        "twitch.channel_point_redeem",
+        "modqueue.pending",
+        "modqueue.update",
+        "modqueue.resolved",
+    })
+    CHAT_EVENTS = frozenset({
+        "twitch.chat.message",
+        "youtube.chat.message",
+        "discord.voice.speaking",
+    })
+    # Outbox replay (ALERT_EVENTS only, when settings.VEIL_OUTBOX_ENABLED)
+    REPLAY_BATCH = 20
+    REPLAY_INTERVAL_SECONDS = 1.0
+    OUTBOX_MAX_AGE_HOURS = 6    # older alerts are stale for the overlay and discarded
+    DEFAULT_OUTBOX_OWNER = "twitch"     # veil_outbox.owner until a bot calls veil_outbox.set_owner()
+    # event type → payload field that identifies the entity (None = single latest value).
+    # A queued event with the same key is replaced in place instead of queued again.
+    COALESCE_KEYS = {
+        "discord.voice.speaking": "user_id",
+        "emotes.update": None,
+        "stream.stats.bootstrap": None,
+    }
+
+
 class CFConfig:
     BASE_URL = "https://codeforces.com"
     API_BASE = "https://codeforces.com/api"
 
 
 class CFProblemsConfig:
-    POLL_RATE_MINUTES: float = 1.0
+    POLL_RATE_MINUTES: float = 1.0      # streamer submission polling (Codeforces API)
+    RECONCILE_MINUTES: float = 15.0     # forum sync fallback; NOTIFY triggers drive it normally
     TITLE_MAX_LEN: int = 100
 
 
 class ProblemsConfig:
-    POLL_RATE_MINUTES: float = 1.0
+    POLL_RATE_MINUTES: float = 1.0      # streamer submission polling (LeetCode API)
+    RECONCILE_MINUTES: float = 15.0     # forum sync fallback; NOTIFY triggers drive it normally
     TAG_EASY = "Easy"
     TAG_MEDIUM = "Medium"
     TAG_HARD = "Hard"
     TITLE_MAX_LEN: int = 100
 
 
+class ThreadSyncConfig:
+    # couchd.platforms.discord.components.render_cache
+    DEBOUNCE_SECONDS: float = 2.0       # bursts of updates to one forum thread collapse into one edit
+    RENDER_CACHE_MAX: int = 2048        # remembered thread/message digests
+
+
+class DiscordSchedulerConfig:
+    # couchd.platforms.discord.components.scheduler
+    MAX_CONCURRENCY = 4         # channels/routes written to in parallel
+    MAX_RETRIES = 3
+    BACKOFF_BASE_SECONDS = 1.0
+    BACKOFF_MAX_SECONDS = 30.0
+    JITTER_SECONDS = 0.5
+    DRAIN_TIMEOUT_SECONDS = 10.0
+
+
 class StatusConfig:
     POLL_RATE_MINUTES: int = 5
 
 
 class IdeaConfig:
-    POLL_RATE_MINUTES: float = 1.0
+    RECONCILE_MINUTES: float = 15.0     # fallback; NOTIFY triggers drive posting normally
     REACTION_SUPPORT = "✅"
     REACTION_AGAINST = "❌"
 
@@ -168,6 +373,25 @@ class IdeaConfig:
 class HoldSource:
     BONELESS_COUCH = "boneless_couch"
     TWITCH_AUTOMOD = "twitch_automod"
+    DUPLICATE_FLOOD = "duplicate_flood"
+
+
+class ModerationConfig:
+    PENDING_TTL_SECONDS = 3 * 60 * 60   # held messages veil never decided on are dropped after this
+    MAX_PENDING = 5000                  # oldest held message is evicted past this
+    ANCHOR_MIN_CHARS = 3                # shortest literal regex prefix worth prefiltering on
+    HOLD_CLEANUP_MINUTES = 15           # how often expired mod_holds rows are deleted
+
+
+class FloodConfig:
+    # couchd.core.moderation.FloodDetector
+    WINDOW_SECONDS = 30                 # how far back repeats are counted
+    USER_REPEATS = 3                    # near-duplicates from one chatter in the window, this one included
+    CHANNEL_REPEATS = 8                 # near-duplicates across chat in the window, this one included
+    MAX_HAMMING = 11                    # SimHash bits two messages may differ by and still be "the same"
+    MIN_CHARS = 12                      # shorter messages ("W", "LUL LUL") are never flood-checked
+    USER_HISTORY = 16                   # fingerprints kept per chatter
+    MAX_ENTRIES = 10_000                # fingerprints held; the oldest are dropped first past this
 
 
 class BrandColors:
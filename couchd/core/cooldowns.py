@@ -1,10 +1,17 @@
 # couchd/core/cooldowns.py
 import time
 import logging
-from couchd.core.constants import Cooldown
+from collections import OrderedDict
+from collections.abc import Callable
+from weakref import WeakSet
+
+from couchd.core import metrics
+from couchd.core.constants import Cooldown, CooldownConfig
 
 log = logging.getLogger(__name__)
 
+_managers: WeakSet["CooldownManager"] = WeakSet()
+
 
 class CooldownManager:
     """
@@ -13,26 +20,73 @@ class CooldownManager:
     Both cooldowns must be clear for a command to proceed.
     Global cooldown prevents chat spam regardless of who is asking.
     User cooldown prevents a single viewer from hammering a command.
+
+    Each command keeps its users in last-use order, so everyone whose cooldown has run out sits at the
+    front and record() sweeps them off; past max_users_per_command the least recent user is forgotten
+    early. Memory follows who used a command lately, not everyone who ever did.
+    One instance per process (`cooldowns`): every component of a bot shares it.
     """
 
-    def __init__(self):
-        self._user_last: dict[str, dict[str, float]] = {}  # cmd -> {user_id -> timestamp}
-        self._global_last: dict[str, float] = {}           # cmd -> timestamp
+    def __init__(
+        self,
+        max_users_per_command: int = CooldownConfig.MAX_USERS_PER_COMMAND,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_users_per_command = max_users_per_command
+        self._clock = clock
+        self._user_last: dict[str, OrderedDict[str, float]] = {}  # cmd -> {user_id -> timestamp}, oldest first
+        self._user_seconds: dict[str, float] = {}                 # cmd -> user cooldown it was last checked against
+        self._global_last: dict[str, float] = {}                  # cmd -> timestamp
+        _managers.add(self)
 
     def check(self, cmd: str, user_id: str, cooldown: Cooldown) -> bool:
         """Returns True if the command is on cooldown and should be silently blocked."""
-        now = time.monotonic()
+        now = self._clock()
+        self._user_seconds[cmd] = cooldown.user_seconds
 
-        if now - self._global_last.get(cmd, 0.0) < cooldown.global_seconds:
+        last = self._global_last.get(cmd)
+        if last is not None and now - last < cooldown.global_seconds:
             return True
 
-        if now - self._user_last.get(cmd, {}).get(user_id, 0.0) < cooldown.user_seconds:
+        last = self._user_last.get(cmd, {}).get(user_id)
+        if last is not None and now - last < cooldown.user_seconds:
             return True
 
         return False
 
     def record(self, cmd: str, user_id: str) -> None:
         """Mark a command as just used by this user."""
-        now = time.monotonic()
+        now = self._clock()
+        self._sweep(now)
         self._global_last[cmd] = now
-        self._user_last.setdefault(cmd, {})[user_id] = now
+        users = self._user_last.setdefault(cmd, OrderedDict())
+        users.pop(user_id, None)
+        while len(users) >= self.max_users_per_command:
+            users.popitem(last=False)
+            cooldown_evictions.inc("capacity")
+        users[user_id] = now
+
+    def _sweep(self, now: float) -> None:
+        """Drop users whose cooldown has run out; they are always at the front of their command's dict."""
+        expired = 0
+        for cmd, users in self._user_last.items():
+            cutoff = now - self._user_seconds.get(cmd, CooldownConfig.DEFAULT_USER_SECONDS)
+            while users and next(iter(users.values())) <= cutoff:
+                users.popitem(last=False)
+                expired += 1
+        if expired:
+            cooldown_evictions.inc("expired", amount=expired)
+
+    def __len__(self) -> int:
+        return sum(len(users) for users in self._user_last.values())
+
+
+cooldowns = CooldownManager()
+
+cooldown_evictions = metrics.counter(
+    "couchd_cooldown_evictions_total", "Per-user cooldown entries dropped, by reason.", ("reason",),
+)
+metrics.gauge(
+    "couchd_cooldown_users", "Per-user cooldown entries currently held.",
+    lambda: sum(len(m) for m in list(_managers)),
+)
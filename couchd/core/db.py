@@ -6,6 +6,7 @@ import asyncpg
 from sqlalchemy.engine import URL
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import DeclarativeBase
+from couchd.core import query_stats
 from couchd.core.config import settings
 
 log = logging.getLogger(__name__)
@@ -35,12 +36,21 @@ except Exception as e:
     raise
 
 
+# Per-statement latency, slow-query log and periodic summary (couchd.core.query_stats).
+query_stats.instrument(engine.sync_engine)
+
+
 class Base(DeclarativeBase):
     pass
 
 
 async def get_listener_connection() -> asyncpg.Connection:
     """Raw asyncpg connection for LISTEN/NOTIFY. Caller owns the lifecycle."""
+    return await get_raw_connection()
+
+
+async def get_raw_connection() -> asyncpg.Connection:
+    """Raw asyncpg connection outside the SQLAlchemy pool (LISTEN, COPY). Caller owns the lifecycle."""
     return await asyncpg.connect(
         host=settings.DB_HOST,
         port=settings.DB_PORT,
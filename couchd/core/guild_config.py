@@ -0,0 +1,94 @@
+# couchd/core/guild_config.py
+import asyncio
+import logging
+import time
+
+from sqlalchemy import select
+
+from couchd.core.bus import GuildConfigChanged, bus, publish
+from couchd.core.constants import GuildConfigCacheConfig
+from couchd.core.db import get_session
+from couchd.core.listener import listener
+from couchd.core.models import GuildConfig
+
+log = logging.getLogger(__name__)
+
+
+class GuildConfigCache:
+    """
+    In-memory copy of guild_configs keyed by guild id, so watcher loops and event handlers
+    can find their channel without a query. The whole table is reloaded on the first read
+    after an invalidation: changed() after a /setup write, a GuildConfigChanged bus event
+    from another process, a listener reconnect, or the TTL running out.
+    Until start() has run (or while the listener is down) every read goes to the database.
+    """
+
+    def __init__(self) -> None:
+        self._configs: dict[int, GuildConfig] = {}
+        self._loaded_at = 0.0
+        self._loaded_generation = -1
+        self._generation = 0
+        self._enabled = False
+        self._lock = asyncio.Lock()
+
+    async def start(self) -> None:
+        """Load the table and subscribe to invalidations. Safe to call more than once."""
+        if self._enabled:
+            return
+        bus.subscribe(GuildConfigChanged, lambda _event: self.invalidate())
+        listener.on_reconnect(self.invalidate)
+        await bus.start()
+        self._enabled = True
+        await self._snapshot()
+        log.info("GuildConfig cache loaded (%d guild(s)).", len(self._configs))
+
+    def invalidate(self) -> None:
+        self._generation += 1
+
+    async def changed(self, guild_id: int) -> None:
+        """Call after committing a GuildConfig write: drops this process's copy and tells the others."""
+        self.invalidate()
+        try:
+            await publish(GuildConfigChanged(guild_id=guild_id))
+        except Exception:
+            log.error("Failed to publish GuildConfigChanged for guild %d", guild_id, exc_info=True)
+
+    async def get(self, guild_id: int) -> GuildConfig | None:
+        return (await self._snapshot()).get(guild_id)
+
+    async def all_with(self, field: str) -> list[GuildConfig]:
+        """Configs whose `field` (e.g. "ideas_channel_id") is set, in guild id order."""
+        configs = await self._snapshot()
+        return [c for _, c in sorted(configs.items()) if getattr(c, field) is not None]
+
+    async def first_with(self, field: str) -> GuildConfig | None:
+        configs = await self.all_with(field)
+        return configs[0] if configs else None
+
+    def _fresh(self) -> bool:
+        return (
+            self._enabled
+            and listener.connected
+            and self._loaded_generation == self._generation
+            and time.monotonic() - self._loaded_at < GuildConfigCacheConfig.TTL_SECONDS
+        )
+
+    async def _snapshot(self) -> dict[int, GuildConfig]:
+        if self._fresh():
+            return self._configs
+        async with self._lock:
+            if self._fresh():
+                return self._configs
+            generation = self._generation
+            async with get_session() as db:
+                rows = (await db.execute(select(GuildConfig))).scalars().all()
+            configs = {c.guild_id: c for c in rows}
+            if self._enabled:
+                self._configs = configs
+                self._loaded_at = time.monotonic()
+                # An invalidation during the query leaves the cache stale; the next read reloads.
+                self._loaded_generation = generation
+            return configs
+
+
+guild_configs = GuildConfigCache()
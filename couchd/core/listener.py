@@ -0,0 +1,159 @@
+# couchd/core/listener.py
+import asyncio
+import inspect
+import logging
+from collections.abc import Awaitable, Callable
+
+import asyncpg
+
+from couchd.core.constants import ListenerConfig
+from couchd.core.db import get_listener_connection
+
+log = logging.getLogger(__name__)
+
+Handler = Callable[[str], Awaitable[None] | None]
+
+
+class PgListener:
+    """
+    One LISTEN connection per process, shared by every subscriber.
+    Handlers receive the raw NOTIFY payload; async handlers run as tasks.
+    The connection is health-checked periodically and re-established with backoff;
+    on_reconnect callbacks fire afterwards so subscribers can resync anything missed.
+    """
+
+    def __init__(self) -> None:
+        self._handlers: dict[str, list[Handler]] = {}
+        self._reconnect_hooks: list[Callable[[], None]] = []
+        self._conn: asyncpg.Connection | None = None
+        self._task: asyncio.Task | None = None
+        self._pending: set[asyncio.Task] = set()
+        self._start_lock = asyncio.Lock()
+
+    def subscribe(self, channel: str, handler: Handler) -> None:
+        first = channel not in self._handlers
+        self._handlers.setdefault(channel, []).append(handler)
+        if first and self._conn is not None and not self._conn.is_closed():
+            self._spawn(self._conn.add_listener(channel, self._dispatch))
+
+    def unsubscribe(self, channel: str, handler: Handler) -> None:
+        handlers = self._handlers.get(channel, [])
+        if handler in handlers:
+            handlers.remove(handler)
+
+    def on_reconnect(self, hook: Callable[[], None]) -> None:
+        self._reconnect_hooks.append(hook)
+
+    @property
+    def connected(self) -> bool:
+        return self._conn is not None and not self._conn.is_closed()
+
+    async def start(self) -> None:
+        """Connect and start the keepalive loop. Safe to call more than once, concurrently."""
+        async with self._start_lock:
+            if self._task is not None and not self._task.done():
+                return
+            try:
+                await self._connect()
+                log.info("PostgreSQL listener connected (%s).", ", ".join(self._handlers) or "no channels")
+            except Exception:
+                log.error("Failed to connect PostgreSQL listener — will retry.", exc_info=True)
+            self._task = asyncio.create_task(self._keepalive())
+
+    async def close(self) -> None:
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        if self._conn is not None:
+            try:
+                await self._conn.close()
+            except Exception:
+                pass
+            self._conn = None
+
+    async def _connect(self) -> None:
+        conn = await get_listener_connection()
+        added: set[str] = set()
+        # subscribe() can run while we await here; loop until every channel is registered.
+        while missing := set(self._handlers) - added:
+            for channel in missing:
+                await conn.add_listener(channel, self._dispatch)
+                added.add(channel)
+        self._conn = conn
+
+    async def _keepalive(self) -> None:
+        delay = 1
+        while True:
+            await asyncio.sleep(ListenerConfig.KEEPALIVE_SECONDS if self.connected else delay)
+            try:
+                if self.connected:
+                    await self._conn.fetchval("SELECT 1")
+                    continue
+            except Exception:
+                log.warning("Listener connection lost — reconnecting.")
+            try:
+                if self._conn is not None:
+                    try:
+                        await self._conn.close()
+                    except Exception:
+                        pass
+                    self._conn = None
+                await self._connect()
+                delay = 1
+                log.info("Listener connection re-established.")
+                for hook in self._reconnect_hooks:
+                    hook()
+            except Exception:
+                delay = min(delay * 2, ListenerConfig.RECONNECT_MAX_DELAY_SECONDS)
+                log.warning("Listener reconnect failed. Retrying in %ds.", delay)
+
+    def _dispatch(self, _conn, _pid, channel: str, payload: str) -> None:
+        for handler in self._handlers.get(channel, []):
+            try:
+                result = handler(payload)
+                if inspect.isawaitable(result):
+                    self._spawn(result)
+            except Exception:
+                log.error("Listener handler for %s failed", channel, exc_info=True)
+
+    def _spawn(self, coro) -> None:
+        task = asyncio.get_running_loop().create_task(coro)
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+
+class SingleFlight:
+    """
+    Runs an async job on request, one run at a time. Requests that arrive mid-run collapse
+    into a single follow-up run, so a burst of NOTIFYs costs at most two passes.
+    request() takes and ignores a payload so it can be subscribed to a channel directly.
+    """
+
+    def __init__(self, job: Callable[[], Awaitable[None]], name: str) -> None:
+        self._job = job
+        self._name = name
+        self._task: asyncio.Task | None = None
+        self._again = False
+
+    def request(self, _payload: str | None = None) -> None:
+        if self._task is not None and not self._task.done():
+            self._again = True
+            return
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def wait(self) -> None:
+        if self._task is not None:
+            await self._task
+
+    async def _run(self) -> None:
+        while True:
+            self._again = False
+            try:
+                await self._job()
+            except Exception:
+                log.error("%s failed", self._name, exc_info=True)
+            if not self._again:
+                return
+
+
+listener = PgListener()
@@ -0,0 +1,304 @@
+# couchd/core/metrics.py
+import asyncio
+import bisect
+import functools
+import logging
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+
+from aiohttp import web
+
+from couchd.core.config import settings
+from couchd.core.constants import MetricsConfig
+
+log = logging.getLogger(__name__)
+
+Labels = tuple[str, ...]
+
+_registry: list = []
+_json_routes: dict[str, Callable[[], object]] = {}
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _series(name: str, labelnames: tuple[str, ...], labels: Labels, value: float, extra: str = "") -> str:
+    pairs = [f'{k}="{_escape(v)}"' for k, v in zip(labelnames, labels)]
+    if extra:
+        pairs.append(extra)
+    label_str = "{" + ",".join(pairs) + "}" if pairs else ""
+    return f"{name}{label_str} {_number(value)}"
+
+
+def _number(value: float) -> str:
+    # repr keeps full precision (unix timestamps); whole numbers drop the trailing ".0".
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Counter:
+    """Monotonic count per label set. inc() is a dict update."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._values: dict[Labels, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0.0)
+
+    def lines(self) -> Iterator[str]:
+        for labels, value in self._values.items():
+            yield _series(self.name, self.labelnames, labels, value)
+
+
+class Histogram:
+    """
+    Bucketed observations per label set. observe() is one bisect and three increments;
+    buckets are only made cumulative when rendered.
+    """
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = MetricsConfig.LATENCY_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets = buckets
+        self._series: dict[Labels, list[float]] = {}  # per-bucket counts, +Inf, sum, count
+
+    def observe(self, value: float, *labels: str) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [0] * (len(self.buckets) + 3)
+        series[bisect.bisect_left(self.buckets, value)] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    def count(self, *labels: str) -> int:
+        series = self._series.get(labels)
+        return int(series[-1]) if series else 0
+
+    def lines(self) -> Iterator[str]:
+        for labels, series in self._series.items():
+            cumulative = 0
+            for bound, n in zip((*self.buckets, "+Inf"), series):
+                cumulative += n
+                le = bound if isinstance(bound, str) else f"{bound:g}"
+                yield _series(f"{self.name}_bucket", self.labelnames, labels, cumulative, f'le="{le}"')
+            yield _series(f"{self.name}_sum", self.labelnames, labels, series[-2])
+            yield _series(f"{self.name}_count", self.labelnames, labels, series[-1])
+
+
+class Gauge:
+    """
+    Read at scrape time from fn, which returns a number or {labels: number}; costs nothing in between.
+    kind="counter" exposes a running total that some other object already keeps (e.g. a stats dataclass).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        fn: Callable[[], float | dict[Labels, float]],
+        labelnames: tuple[str, ...] = (),
+        kind: str = "gauge",
+    ) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.fn = fn
+        self.kind = kind
+
+    def lines(self) -> Iterator[str]:
+        try:
+            values = self.fn()
+        except Exception:
+            log.debug("Gauge %s failed to read", self.name, exc_info=True)
+            return
+        if not isinstance(values, dict):
+            values = {(): values}
+        for labels, value in values.items():
+            yield _series(self.name, self.labelnames, labels, value)
+
+
+def counter(name: str, help: str, labelnames: tuple[str, ...] = ()) -> Counter:
+    metric = Counter(name, help, labelnames)
+    _registry.append(metric)
+    return metric
+
+
+def histogram(
+    name: str, help: str, labelnames: tuple[str, ...] = (), buckets: tuple[float, ...] = MetricsConfig.LATENCY_BUCKETS
+) -> Histogram:
+    metric = Histogram(name, help, labelnames, buckets)
+    _registry.append(metric)
+    return metric
+
+
+def gauge(
+    name: str,
+    help: str,
+    fn: Callable[[], float | dict[Labels, float]],
+    labelnames: tuple[str, ...] = (),
+    kind: str = "gauge",
+) -> Gauge:
+    metric = Gauge(name, help, fn, labelnames, kind)
+    _registry.append(metric)
+    return metric
+
+
+def json_route(path: str, fn: Callable[[], object]) -> None:
+    """Serve fn() as JSON at path alongside /metrics, for reports too detailed for Prometheus labels."""
+    _json_routes[path] = fn
+
+
+def render() -> str:
+    """Every registered metric in the Prometheus text exposition format."""
+    out = []
+    for metric in _registry:
+        out.append(f"# HELP {metric.name} {metric.help}")
+        out.append(f"# TYPE {metric.name} {metric.kind}")
+        out.extend(metric.lines())
+    return "\n".join(out) + "\n"
+
+
+# ── Shared instruments ───────────────────────────────────────────────────────
+
+_started_at = time.time()
+_last_lag = 0.0
+_last_runs: dict[Labels, float] = {}
+
+loop_lag = histogram(
+    "couchd_event_loop_lag_seconds", "How late the event loop woke a sleeping task.",
+    buckets=MetricsConfig.LAG_BUCKETS,
+)
+gauge("couchd_event_loop_lag_last_seconds", "Most recent event-loop lag sample.", lambda: _last_lag)
+gauge("couchd_uptime_seconds", "Seconds since the process started.", lambda: time.time() - _started_at)
+
+http_latency = histogram(
+    "couchd_http_request_duration_seconds", "Outbound HTTP request latency by upstream.", ("upstream",)
+)
+http_errors = counter(
+    "couchd_http_request_errors_total", "Outbound HTTP requests that raised (timeouts, resets).", ("upstream",)
+)
+db_latency = histogram("couchd_db_query_duration_seconds", "Database statement latency by verb.", ("op",))
+chat_messages = counter(
+    "couchd_chat_messages_total", "Chat messages received; rate() gives messages per second.", ("platform",)
+)
+loop_duration = histogram(
+    "couchd_background_loop_duration_seconds", "Duration of one background loop iteration.", ("loop",),
+    buckets=MetricsConfig.LOOP_BUCKETS,
+)
+loop_errors = counter("couchd_background_loop_errors_total", "Background loop iterations that raised.", ("loop",))
+gauge(
+    "couchd_background_loop_last_run_timestamp_seconds", "Unix time the loop last finished an iteration.",
+    lambda: dict(_last_runs), ("loop",),
+)
+
+
+@contextmanager
+def track(name: str):
+    """Time one iteration of a background loop: `with metrics.track("twitch.metrics_poll"):`."""
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        loop_errors.inc(name)
+        raise
+    finally:
+        loop_duration.observe(time.perf_counter() - start, name)
+        _last_runs[(name,)] = time.time()
+
+
+def timed(name: str):
+    """Decorator form of track() for coroutine functions, e.g. under @tasks.loop."""
+    def wrap(fn):
+        @functools.wraps(fn)
+        async def run(*args, **kwargs):
+            with track(name):
+                return await fn(*args, **kwargs)
+        return run
+    return wrap
+
+
+# ── Endpoint ─────────────────────────────────────────────────────────────────
+
+async def _monitor_lag() -> None:
+    global _last_lag
+    loop = asyncio.get_running_loop()
+    interval = MetricsConfig.LAG_SAMPLE_SECONDS
+    while True:
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        _last_lag = max(0.0, loop.time() - expected)
+        loop_lag.observe(_last_lag)
+
+
+async def _metrics(_request: web.Request) -> web.Response:
+    return web.Response(text=render(), content_type="text/plain", charset="utf-8")
+
+
+async def _healthz(_request: web.Request) -> web.Response:
+    healthy = _last_lag < MetricsConfig.HEALTHY_MAX_LAG_SECONDS
+    return web.json_response(
+        {"status": "ok" if healthy else "degraded", "loop_lag_seconds": round(_last_lag, 4),
+         "uptime_seconds": round(time.time() - _started_at)},
+        status=200 if healthy else 503,
+    )
+
+
+def _json_handler(fn: Callable[[], object]):
+    async def handle(_request: web.Request) -> web.Response:
+        return web.json_response(fn())
+    return handle
+
+
+_runner: web.AppRunner | None = None
+_lag_task: asyncio.Task | None = None
+
+
+async def start_server() -> None:
+    """Serve /metrics and /healthz on METRICS_HOST:METRICS_PORT. Does nothing unless METRICS_PORT is set."""
+    global _runner, _lag_task
+    if not settings.METRICS_PORT or _runner is not None:
+        return
+    app = web.Application()
+    app.router.add_get("/metrics", _metrics)
+    app.router.add_get("/healthz", _healthz)
+    for path, fn in _json_routes.items():
+        app.router.add_get(path, _json_handler(fn))
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    try:
+        await web.TCPSite(runner, settings.METRICS_HOST, settings.METRICS_PORT).start()
+    except OSError:
+        log.error("Could not bind metrics endpoint on port %s", settings.METRICS_PORT, exc_info=True)
+        await runner.cleanup()
+        return
+    _runner = runner
+    _lag_task = asyncio.create_task(_monitor_lag())
+    log.info("Metrics endpoint listening on %s:%s.", settings.METRICS_HOST, settings.METRICS_PORT)
+
+
+async def stop_server() -> None:
+    global _runner, _lag_task
+    if _lag_task is not None:
+        _lag_task.cancel()
+        _lag_task = None
+    if _runner is not None:
+        await _runner.cleanup()
+        _runner = None
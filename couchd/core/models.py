@@ -8,8 +8,10 @@ from sqlalchemy import (
     Boolean,
     DateTime,
     ForeignKey,
+    Identity,
     Index,
     Integer,
+    JSON,
     UniqueConstraint,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -176,6 +178,7 @@ class CFProblemAttempt(Base):
 
 
 class CFProblemPost(Base):
+    # Single-guild predecessor of discord_posts (kind cf_thread); no longer written.
     __tablename__ = "cf_problem_posts"
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
@@ -184,6 +187,7 @@ class CFProblemPost(Base):
 
 
 class ProblemPost(Base):
+    # Single-guild predecessor of discord_posts (kind lc_thread); no longer written.
     __tablename__ = "problem_posts"
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
@@ -191,6 +195,32 @@ class ProblemPost(Base):
     forum_thread_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
 
 
+class DiscordPost(Base):
+    """
+    One announcement or forum thread in one guild. kind/ref name the source row
+    (see PostKind); message_id is the posted message, thread_id its thread if any
+    (forum threads share their starter message's id).
+    """
+
+    __tablename__ = "discord_posts"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    kind: Mapped[str] = mapped_column(String(32), nullable=False)
+    ref: Mapped[str] = mapped_column(String, nullable=False)
+    guild_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    channel_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    message_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    thread_id: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+    )
+
+    __table_args__ = (
+        UniqueConstraint("kind", "ref", "guild_id"),
+        Index("ix_discord_posts_message_id", "message_id"),
+    )
+
+
 class SolutionPost(Base):
     __tablename__ = "solution_posts"
 
@@ -245,3 +275,75 @@ class ViewerInteraction(Base):
         Index("ix_viewer_interactions_type_ts", "interaction_type", "timestamp"),
         Index("ix_viewer_interactions_username", "username"),
     )
+
+
+class ChatMessage(Base):
+    """
+    Archived chat line. Range-partitioned by month on sent_at (see migration m3n4o5p6q7r8);
+    partitions are created ahead of time by couchd.core.chat_archive.
+    """
+
+    __tablename__ = "chat_messages"
+
+    id: Mapped[int] = mapped_column(BigInteger, Identity(), primary_key=True)
+    sent_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    session_id: Mapped[int | None] = mapped_column(ForeignKey("stream_sessions.id"), nullable=True)
+    platform: Mapped[str] = mapped_column(String(16), nullable=False)
+    message_id: Mapped[str] = mapped_column(String, nullable=False)
+    user_id: Mapped[str | None] = mapped_column(String, nullable=True)
+    username: Mapped[str] = mapped_column(String, nullable=False)
+    message: Mapped[str] = mapped_column(String, nullable=False)
+    # Non-text fragments only: [[start, length, kind, ref], ...]; kind e=emote, c=cheermote, m=mention
+    fragments: Mapped[list | None] = mapped_column(JSON, nullable=True)
+
+    __table_args__ = (
+        Index("ix_chat_messages_session_sent", "session_id", "sent_at"),
+        {"postgresql_partition_by": "RANGE (sent_at)"},
+    )
+
+
+class VeilOutboxEvent(Base):
+    __tablename__ = "veil_outbox"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    event_id: Mapped[str] = mapped_column(String(32), nullable=False, unique=True)
+    owner: Mapped[str] = mapped_column(String(16), nullable=False)   # bot process that replays it
+    event_type: Mapped[str] = mapped_column(String, nullable=False)
+    payload: Mapped[dict] = mapped_column(JSON, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+    )
+
+    __table_args__ = (Index("ix_veil_outbox_owner_id", "owner", "id"),)
+
+
+class BusEvent(Base):
+    """Sequence log behind couchd.core.bus; id is the monotonic sequence subscribers catch up from."""
+
+    __tablename__ = "bus_events"
+
+    # INTEGER on SQLite so the test database treats it as the rowid and autoincrements it.
+    id: Mapped[int] = mapped_column(BigInteger().with_variant(Integer, "sqlite"), Identity(), primary_key=True)
+    topic: Mapped[str] = mapped_column(String(64), nullable=False)
+    payload: Mapped[dict] = mapped_column(JSON, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), index=True
+    )
+
+
+class ModHold(Base):
+    """
+    A chat message held for moderation until veil decides on it. Mirrors ModerationEngine's in-memory
+    pending store so holds survive a restart and every process can resolve them.
+    """
+
+    __tablename__ = "mod_holds"
+
+    platform: Mapped[str] = mapped_column(String(16), primary_key=True)
+    message_id: Mapped[str] = mapped_column(String, primary_key=True)
+    payload: Mapped[dict] = mapped_column(JSON, nullable=False)
+    hold_sources: Mapped[list] = mapped_column(JSON, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+    )
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
@@ -1,7 +1,368 @@
 # couchd/core/moderation.py
+import hashlib
+import logging
 import re
+import time
+import weakref
+from collections import OrderedDict, deque
+from collections.abc import Callable
 from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 
+from sqlalchemy import delete, insert, select, update
+
+from couchd.core import metrics
+from couchd.core.batch_writer import BatchWriter
+from couchd.core.bus import ModHoldResolved, bus, publish as bus_publish
+from couchd.core.constants import FloodConfig, HoldSource, ModerationConfig, Platform
+from couchd.core.db import get_session
+from couchd.core.models import ModHold
+
+log = logging.getLogger(__name__)
+
+_stores: weakref.WeakSet = weakref.WeakSet()
+_detectors: weakref.WeakSet = weakref.WeakSet()
+
+# ── Patterns ─────────────────────────────────────────────────────────────────
+
+# Look-alike characters folded onto the ASCII letter they imitate (applied after casefold()).
+_CONFUSABLES = {
+    # Cyrillic
+    "а": "a", "в": "b", "е": "e", "ё": "e", "к": "k", "м": "m", "н": "h", "о": "o", "р": "p",
+    "с": "c", "т": "t", "у": "y", "х": "x", "і": "i", "ї": "i", "ј": "j", "ѕ": "s", "ԁ": "d",
+    # Greek
+    "α": "a", "β": "b", "ε": "e", "η": "n", "ι": "i", "κ": "k", "ν": "v", "ο": "o", "ρ": "p",
+    "τ": "t", "υ": "u", "χ": "x",
+    # Fullwidth ASCII
+    **{chr(c): chr(c - 0xFEE0) for c in range(0xFF01, 0xFF5F)},
+}
+_LEETSPEAK = {
+    "0": "o", "1": "i", "!": "i", "|": "i", "3": "e", "4": "a", "@": "a",
+    "5": "s", "$": "s", "7": "t", "+": "t", "8": "b", "9": "g",
+}
+_INVISIBLE = "\u00ad\u200b\u200c\u200d\u2060\ufeff"
+
+
+def _build_table() -> dict[int, str | None]:
+    table: dict[int, str | None] = {ord(c): None for c in _INVISIBLE}
+    for src, dst in _CONFUSABLES.items():
+        table[ord(src)] = _LEETSPEAK.get(dst, dst)
+    for src, dst in _LEETSPEAK.items():
+        table[ord(src)] = dst
+    return table
+
+
+_TABLE = _build_table()
+
+
+def normalize(text: str) -> str:
+    """Casefold, fold confusables and leetspeak onto plain letters and drop invisible characters."""
+    return text.casefold().translate(_TABLE)
+
+
+def _is_word(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+def _raw_positions(text: str) -> list[int]:
+    """Index into text of the character each character of normalize(text) came from."""
+    positions: list[int] = []
+    for i, ch in enumerate(text):
+        positions.extend([i] * len(ch.casefold().translate(_TABLE)))
+    return positions
+
+
+_META = frozenset(".^$*+?{}[]|()")
+_GROUP_REFS = re.compile(r"\\[1-9]|\(\?P[<=]|\(\?<[a-zA-Z_]")
+_GLOBAL_FLAGS = re.compile(r"^\(\?([aiLmsux]+)\)")
+
+
+def _as_literal(pattern: str) -> tuple[str, bool, bool] | None:
+    """
+    (term, boundary before, boundary after) when the pattern is a plain string, optionally wrapped
+    in \\b, otherwise None. A \\b next to a non-word character means something else, so those stay regexes.
+    """
+    start = pattern.startswith(r"\b")
+    end = pattern.endswith(r"\b") and not pattern.endswith(r"\\b")
+    body = pattern[2 if start else 0:len(pattern) - 2 if end else len(pattern)]
+    chars = []
+    escaped = False
+    for ch in body:
+        if escaped:
+            if ch.isalnum():
+                return None             # \d, \w, \s, ...
+            chars.append(ch)
+            escaped = False
+        elif ch == "\\":
+            escaped = True
+        elif ch in _META:
+            return None
+        else:
+            chars.append(ch)
+    term = "".join(chars)
+    if escaped or not term:
+        return None
+    if (start and not _is_word(term[0])) or (end and not _is_word(term[-1])):
+        return None
+    return term, start, end
+
+
+def _anchor(pattern: str) -> str | None:
+    """
+    The literal run every match of the regex must start with, for the automaton to prefilter on, or None
+    when there is no usable one (alternations, a leading class or group, fewer than ANCHOR_MIN_CHARS).
+    """
+    if "|" in pattern:
+        return None
+    pattern = pattern.removeprefix("^").removeprefix(r"\b")
+    chars: list[str] = []
+    i = 0
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch == "\\":
+            nxt = pattern[i + 1:i + 2]
+            if not nxt or nxt.isalnum():
+                break
+            chars.append(nxt)
+            i += 2
+            continue
+        if ch in _META:
+            if ch in "?*{":
+                chars = chars[:-1]      # the quantified character may be absent
+            break
+        chars.append(ch)
+        i += 1
+    anchor = normalize("".join(chars))
+    return anchor if len(anchor) >= ModerationConfig.ANCHOR_MIN_CHARS else None
+
+
+class _Automaton:
+    """
+    Aho-Corasick over normalized terms: one pass over the message whatever the number of terms.
+    Boundary flags are checked against the raw characters either side of a match, so "spam!" still ends
+    at a word boundary even though normalize() reads the "!" as an "i".
+    A term tagged with a regex index is a prefilter anchor rather than a match of its own.
+    """
+
+    def __init__(self, terms: list[tuple[str, bool, bool, int]]) -> None:
+        self._goto: list[dict[str, int]] = [{}]
+        outputs: list[list[tuple[int, bool, bool, int]]] = [[]]
+        for term, start, end, regex in terms:
+            node = 0
+            for ch in term:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = self._goto[node][ch] = len(self._goto)
+                    self._goto.append({})
+                    outputs.append([])
+                node = nxt
+            outputs[node].append((len(term), start, end, regex))
+
+        self._fail = [0] * len(self._goto)
+        queue = list(self._goto[0].values())
+        for node in queue:
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                outputs[child].extend(outputs[self._fail[child]])
+        self._out = [tuple(o) for o in outputs]
+
+    def search(self, raw: str, anchored: set[int]) -> bool:
+        """True on a term match in raw; regex indices whose anchor appeared are added to `anchored`."""
+        goto, fail, out = self._goto, self._fail, self._out
+        text = normalize(raw)
+        last = len(text) - 1
+        positions: list[int] | None = None     # built on the first boundary check, which most messages never reach
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                for length, start, end, regex in out[state]:
+                    if regex >= 0:
+                        anchored.add(regex)
+                        continue
+                    if (start and i >= length) or (end and i < last):
+                        if positions is None:
+                            positions = _raw_positions(raw)
+                        if start and i >= length and _is_word(raw[positions[i - length]]):
+                            continue
+                        if end and i < last and _is_word(raw[positions[i + 1]]):
+                            continue
+                    return True
+        return False
+
+
+# ── Duplicate floods ─────────────────────────────────────────────────────────
+
+# Multi-index hashing: two fingerprints within MAX_HAMMING bits differ in at most MAX_HAMMING // _BANDS
+# bits of some band, so probing each band's bucket at every value that close finds every candidate.
+_BANDS = 4
+_BAND_BITS = 16
+_BAND_MASK = (1 << _BAND_BITS) - 1
+_PROBES = [0] + [
+    mask for mask in range(1, 1 << _BAND_BITS)
+    if mask.bit_count() <= FloodConfig.MAX_HAMMING // _BANDS
+]
+_MAX_GRAMS = 255                        # per-bit counters are 8-bit lanes
+_NON_TEXT = re.compile(r"[^\w ]+")
+_SPACES = re.compile(r"\s+")
+
+
+_EXPAND = [bytes((b >> i) & 1 for i in range(8)) for b in range(256)]
+
+
+@lru_cache(maxsize=1 << 16)
+def _spread(gram: str) -> int:
+    """The gram's 64-bit hash with bit i moved to the bottom of byte i, so sums count every bit at once."""
+    digest = hashlib.blake2b(gram.encode(), digest_size=8).digest()
+    return int.from_bytes(b"".join(map(_EXPAND.__getitem__, digest)), "little")
+
+
+@lru_cache(maxsize=_MAX_GRAMS + 1)
+def _majority(n: int) -> bytes:
+    """Translation table from a lane count to b"1" when more than half of n grams set that bit."""
+    return bytes(0x31 if 2 * c > n else 0x30 for c in range(256))
+
+
+def simhash(text: str) -> int | None:
+    """
+    64-bit SimHash over the character trigrams of the normalized text, punctuation and spacing
+    stripped, or None when it is too short to judge. Near-duplicates differ in a few bits.
+    """
+    flat = _SPACES.sub(" ", _NON_TEXT.sub("", normalize(text))).strip()[:_MAX_GRAMS + 2]
+    if len(flat) < FloodConfig.MIN_CHARS:
+        return None
+    grams = {flat[i:i + 3] for i in range(len(flat) - 2)}
+    lanes = sum(map(_spread, grams)).to_bytes(64, "little")
+    return int(lanes.translate(_majority(len(grams)))[::-1], 2)
+
+
+@dataclass(slots=True)
+class _Entry:
+    seq: int
+    user_id: str
+    fingerprint: int
+
+
+class FloodDetector:
+    """
+    Repeat and near-duplicate detection over the last WINDOW_SECONDS of chat. Fingerprints are indexed
+    by each 16-bit band, so a message costs a fixed number of bucket probes rather than a scan of the
+    window, and identical spam collapses to one counted key per bucket. A time wheel of per-second slots
+    retires entries as they age out, and past MAX_ENTRIES the oldest go first, so memory and the number of
+    candidates per message stay bounded however fast chat runs.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self._slots: list[deque[_Entry]] = [deque() for _ in range(FloodConfig.WINDOW_SECONDS)]
+        self._head = int(clock())
+        self._seq = 0
+        self._size = 0
+        # Per band: band value -> fingerprint -> messages in the window.
+        self._bands: list[dict[int, dict[int, int]]] = [{} for _ in range(_BANDS)]
+        self._users: dict[str, deque[tuple[int, int]]] = {}  # user -> (seq, fingerprint), oldest first
+        _detectors.add(self)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def check(self, user_id: str, text: str) -> bool:
+        """Record the message; True when it repeats this chatter or a flood across chat."""
+        fingerprint = simhash(text)
+        if fingerprint is None:
+            return False
+        self._advance()
+        recent = self._users.get(user_id, ())
+        user_repeats = 1 + sum(
+            1 for _, other in recent if (fingerprint ^ other).bit_count() <= FloodConfig.MAX_HAMMING
+        )
+        channel_repeats = 1 + self._near(fingerprint, FloodConfig.CHANNEL_REPEATS - 1)
+        self._remember(user_id, fingerprint)
+        if user_repeats >= FloodConfig.USER_REPEATS:
+            flood_flags.inc("user")
+            return True
+        if channel_repeats >= FloodConfig.CHANNEL_REPEATS:
+            flood_flags.inc("channel")
+            return True
+        return False
+
+    def _near(self, fingerprint: int, limit: int) -> int:
+        """Messages in the window within MAX_HAMMING bits, counting no further than limit."""
+        seen: set[int] = set()
+        count = 0
+        for band, buckets in enumerate(self._bands):
+            value = fingerprint >> band * _BAND_BITS & _BAND_MASK
+            for bucket in filter(None, map(buckets.get, map(value.__xor__, _PROBES))):
+                for other, messages in bucket.items():
+                    # Only a real match can turn up under more than one band, so dedupe those alone.
+                    if (fingerprint ^ other).bit_count() > FloodConfig.MAX_HAMMING or other in seen:
+                        continue
+                    seen.add(other)
+                    count += messages
+                    if count >= limit:
+                        return count
+        return count
+
+    def _remember(self, user_id: str, fingerprint: int) -> None:
+        if self._size >= FloodConfig.MAX_ENTRIES:
+            self._evict_oldest()
+        self._seq += 1
+        self._size += 1
+        self._slots[self._head % len(self._slots)].append(_Entry(self._seq, user_id, fingerprint))
+        for band, buckets in enumerate(self._bands):
+            bucket = buckets.setdefault(fingerprint >> band * _BAND_BITS & _BAND_MASK, {})
+            bucket[fingerprint] = bucket.get(fingerprint, 0) + 1
+        recent = self._users.get(user_id)
+        if recent is None:
+            recent = self._users[user_id] = deque(maxlen=FloodConfig.USER_HISTORY)
+        recent.append((self._seq, fingerprint))
+
+    def _advance(self) -> None:
+        now = int(self._clock())
+        size = len(self._slots)
+        for second in range(self._head + 1, self._head + 1 + min(now - self._head, size)):
+            slot = self._slots[second % size]
+            for entry in slot:
+                self._forget(entry)
+            slot.clear()
+        self._head = max(self._head, now)
+
+    def _evict_oldest(self) -> None:
+        size = len(self._slots)
+        for second in range(self._head + 1, self._head + 1 + size):
+            slot = self._slots[second % size]
+            if slot:
+                self._forget(slot.popleft())
+                return
+
+    def _forget(self, entry: _Entry) -> None:
+        self._size -= 1
+        for band, buckets in enumerate(self._bands):
+            value = entry.fingerprint >> band * _BAND_BITS & _BAND_MASK
+            bucket = buckets[value]
+            left = bucket[entry.fingerprint] - 1
+            if left:
+                bucket[entry.fingerprint] = left
+            else:
+                del bucket[entry.fingerprint]
+                if not bucket:
+                    del buckets[value]
+        recent = self._users.get(entry.user_id)
+        if recent and recent[0][0] == entry.seq:
+            recent.popleft()        # already gone if USER_HISTORY pushed it out
+        if not recent:
+            self._users.pop(entry.user_id, None)
+
+
+# ── Pending holds ────────────────────────────────────────────────────────────
 
 @dataclass
 class PendingMessage:
@@ -10,17 +371,185 @@ class PendingMessage:
     hold_sources: list[str] = field(default_factory=list)
 
 
+@dataclass
+class PendingStats:
+    expired: int = 0
+    evicted: int = 0
+
+
+class PendingStore:
+    """
+    Held messages keyed by message id, in deadline order. Entries expire ttl_seconds after they were
+    held (veil may never send a decision) and the oldest is evicted past max_entries. Expiry is lazy:
+    it happens on access, so there is no task to run.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = ModerationConfig.PENDING_TTL_SECONDS,
+        max_entries: int = ModerationConfig.MAX_PENDING,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.stats = PendingStats()
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, PendingMessage]] = OrderedDict()
+        _stores.add(self)
+
+    def _expire(self) -> None:
+        now = self._clock()
+        expired = 0
+        while self._entries:
+            deadline, _ = next(iter(self._entries.values()))
+            if deadline > now:
+                break
+            self._entries.popitem(last=False)
+            expired += 1
+        if expired:
+            self.stats.expired += expired
+            pending_evictions.inc("expired", amount=expired)
+            log.debug("Expired %d held message(s) with no moderation decision", expired)
+
+    def put(self, msg: PendingMessage, ttl_seconds: float | None = None) -> None:
+        self._expire()
+        self._entries.pop(msg.message_id, None)
+        while len(self._entries) >= self.max_entries:
+            message_id, _ = self._entries.popitem(last=False)
+            self.stats.evicted += 1
+            pending_evictions.inc("capacity")
+            log.warning("Pending moderation store full, evicted held message %s", message_id)
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        deadline = self._clock() + ttl
+        # _expire() stops at the first live entry, so keep deadline order: a shorter TTL (a re-hydrated
+        # hold with little time left) goes in front of the entries that outlive it.
+        later = []
+        for message_id, (other, _) in reversed(self._entries.items()):
+            if other <= deadline:
+                break
+            later.append(message_id)
+        self._entries[msg.message_id] = (deadline, msg)
+        for message_id in reversed(later):
+            self._entries.move_to_end(message_id)
+
+    def get(self, message_id: str) -> PendingMessage | None:
+        self._expire()
+        entry = self._entries.get(message_id)
+        return entry[1] if entry else None
+
+    def pop(self, message_id: str) -> PendingMessage | None:
+        self._expire()
+        entry = self._entries.pop(message_id, None)
+        return entry[1] if entry else None
+
+    def __contains__(self, message_id: str) -> bool:
+        return self.get(message_id) is not None
+
+    def __len__(self) -> int:
+        self._expire()
+        return len(self._entries)
+
+
+class _HoldWriter(BatchWriter):
+    """
+    Write-behind for one platform's mod_holds rows. A batch replaces rows it shares a message id with,
+    keeping the last write per id, and every HOLD_CLEANUP_MINUTES also deletes expired rows.
+    """
+
+    def __init__(self, platform: Platform) -> None:
+        super().__init__(ModHold)
+        self.platform = platform
+        self.last_cleanup = time.monotonic()
+
+    async def _write(self, rows: list[dict]) -> None:
+        latest = {row["message_id"]: row for row in rows}
+        async with get_session() as db:
+            await db.execute(
+                delete(ModHold).where(
+                    (ModHold.platform == self.platform.value) & ModHold.message_id.in_(list(latest))
+                )
+            )
+            await db.execute(insert(ModHold), list(latest.values()))
+            if time.monotonic() - self.last_cleanup >= ModerationConfig.HOLD_CLEANUP_MINUTES * 60:
+                await db.execute(delete(ModHold).where(ModHold.expires_at <= datetime.now(timezone.utc)))
+                self.last_cleanup = time.monotonic()
+
+
 class ModerationEngine:
-    def __init__(self, patterns: list[str]):
-        self._regexes = [re.compile(p, re.IGNORECASE) for p in patterns]
-        self._pending: dict[str, PendingMessage] = {}
+    """
+    Plain terms in `patterns` (optionally wrapped in \\b) go into one Aho-Corasick automaton that runs
+    over the normalized message, so "b4dw0rd" and Cyrillic look-alikes still hit. A regex with a literal
+    prefix adds that prefix to the automaton and only runs when it shows up; the rest are merged into a
+    single alternation. Regexes always run over the raw text, as before. Patterns that use backreferences,
+    named groups or inline flags other than (?i) cannot share an alternation and are searched on their own.
+
+    Given a platform, holds are also kept in mod_holds: start() re-hydrates them after a restart, hold()
+    writes behind through a BatchWriter (a raid of held messages costs no database round trip each), and
+    the async add_source()/resolve() flush it before writing through, so any process can resolve a hold
+    and a ModHoldResolved on the bus drops it everywhere. add_pending()/add_hold_source()/pop() only
+    touch memory. Call close() on shutdown to write out buffered holds.
+    """
+
+    def __init__(
+        self,
+        patterns: list[str],
+        pending: PendingStore | None = None,
+        platform: Platform | None = None,
+    ):
+        terms: list[tuple[str, bool, bool, int]] = []
+        merged: list[str] = []
+        self._anchored: list[re.Pattern] = []
+        self._separate: list[re.Pattern] = []
+        for pattern in patterns:
+            compiled = re.compile(pattern, re.IGNORECASE)   # fail at startup on a bad pattern, as before
+            literal = _as_literal(pattern)
+            if literal:
+                term, start, end = literal
+                terms.append((normalize(term), start, end, -1))
+                continue
+            flags = _GLOBAL_FLAGS.match(pattern)
+            if flags and flags.group(1) != "i":
+                self._separate.append(compiled)
+                continue
+            if flags:
+                pattern = pattern[flags.end():]
+            anchor = _anchor(pattern)
+            if anchor:
+                terms.append((anchor, False, False, len(self._anchored)))
+                self._anchored.append(compiled)
+            elif _GROUP_REFS.search(pattern):
+                self._separate.append(compiled)
+            else:
+                merged.append(f"(?:{pattern})")
+        self._automaton = _Automaton(terms) if terms else None
+        self._regex = re.compile("|".join(merged), re.IGNORECASE) if merged else None
+        self._pending = pending if pending is not None else PendingStore()
+        self.flood = FloodDetector()
+        self.platform = platform
+        self._writes = _HoldWriter(platform) if platform is not None else None
 
     def is_flagged(self, text: str) -> bool:
-        return any(r.search(text) for r in self._regexes)
+        if self._automaton:
+            anchored: set[int] = set()
+            if self._automaton.search(text, anchored):
+                return True
+            if any(self._anchored[i].search(text) for i in anchored):
+                return True
+        if self._regex and self._regex.search(text):
+            return True
+        return any(r.search(text) for r in self._separate)
+
+    def screen(self, user_id: str, text: str, trusted: bool = False) -> str | None:
+        """The hold source a chat message should be held under, or None to let it through."""
+        if self.is_flagged(text):
+            return HoldSource.BONELESS_COUCH
+        if not trusted and self.flood.check(user_id, text):
+            return HoldSource.DUPLICATE_FLOOD
+        return None
 
     def add_pending(self, message_id: str, payload: dict, source: str) -> PendingMessage:
         msg = PendingMessage(message_id=message_id, payload=payload, hold_sources=[source])
-        self._pending[message_id] = msg
+        self._pending.put(msg)
         return msg
 
     def add_hold_source(self, message_id: str, source: str) -> PendingMessage | None:
@@ -30,10 +559,150 @@ class ModerationEngine:
         return msg
 
     def pop(self, message_id: str) -> PendingMessage | None:
-        return self._pending.pop(message_id, None)
+        return self._pending.pop(message_id)
 
     def has(self, message_id: str) -> bool:
         return message_id in self._pending
 
     def get(self, message_id: str) -> PendingMessage | None:
         return self._pending.get(message_id)
+
+    # ── Persistence ──────────────────────────────────────────────────────────
+
+    async def start(self) -> None:
+        """Re-hydrate this platform's unexpired holds and follow resolutions made by other processes."""
+        if self.platform is None:
+            return
+        try:
+            count = await self.hydrate()
+            log.info("Re-hydrated %d held %s message(s).", count, self.platform.value)
+        except Exception:
+            log.error("Failed to re-hydrate held %s messages", self.platform.value, exc_info=True)
+        bus.subscribe(ModHoldResolved, self._on_resolved)
+        await bus.start()
+
+    async def hydrate(self) -> int:
+        """Delete expired holds and load the rest for this platform into memory; returns how many."""
+        now = datetime.now(timezone.utc)
+        async with get_session() as db:
+            await db.execute(delete(ModHold).where(ModHold.expires_at <= now))
+            rows = (
+                await db.execute(
+                    select(ModHold)
+                    .where((ModHold.platform == self.platform.value) & (ModHold.expires_at > now))
+                    .order_by(ModHold.created_at)
+                )
+            ).scalars().all()
+        for row in rows:
+            self._remember(row, now)
+        self._writes.last_cleanup = time.monotonic()
+        return len(rows)
+
+    def hold(self, message_id: str, payload: dict, source: str) -> PendingMessage:
+        """add_pending(), with the mod_holds row buffered for the next write-behind flush."""
+        msg = self.add_pending(message_id, payload, source)
+        if self._writes is not None:
+            now = datetime.now(timezone.utc)
+            self._writes.add({
+                "platform": self.platform.value,
+                "message_id": message_id,
+                "payload": payload,
+                "hold_sources": list(msg.hold_sources),
+                "created_at": now,
+                "expires_at": now + timedelta(seconds=self._pending.ttl_seconds),
+            })
+        return msg
+
+    async def flush(self) -> None:
+        """Write buffered holds now, after any batch already being written."""
+        if self._writes is not None:
+            await self._writes.flush()
+
+    async def close(self) -> None:
+        if self._writes is not None:
+            await self._writes.close()
+
+    async def add_source(self, message_id: str, source: str) -> PendingMessage | None:
+        """add_hold_source(), falling back to mod_holds for a hold this process has not seen."""
+        await self.flush()
+        msg = self.get(message_id)
+        if msg is None and self.platform is not None:
+            try:
+                async with get_session() as db:
+                    row = await db.get(ModHold, (self.platform.value, message_id))
+                now = datetime.now(timezone.utc)
+                if row is not None and _aware(row.expires_at) > now:
+                    msg = self._remember(row, now)
+            except Exception:
+                log.error("Failed to load hold %s", message_id, exc_info=True)
+        if msg is None or source in msg.hold_sources:
+            return msg
+        msg.hold_sources.append(source)
+        if self.platform is not None:
+            try:
+                async with get_session() as db:
+                    await db.execute(
+                        update(ModHold)
+                        .where((ModHold.platform == self.platform.value) & (ModHold.message_id == message_id))
+                        .values(hold_sources=list(msg.hold_sources))
+                    )
+            except Exception:
+                log.error("Failed to persist hold sources for %s", message_id, exc_info=True)
+        return msg
+
+    async def resolve(self, message_id: str, resolution: str) -> PendingMessage | None:
+        """
+        Remove a hold from memory and mod_holds and tell other processes; returns it, or None when
+        nothing held it (including a hold another process already resolved).
+        """
+        msg = self.pop(message_id)
+        if self.platform is None:
+            return msg
+        try:
+            await self.flush()
+            async with get_session() as db:
+                row = (
+                    await db.execute(
+                        delete(ModHold)
+                        .where((ModHold.platform == self.platform.value) & (ModHold.message_id == message_id))
+                        .returning(ModHold.payload, ModHold.hold_sources)
+                    )
+                ).first()
+                if row is None and msg is None:
+                    return None
+                await bus_publish(ModHoldResolved(self.platform.value, message_id, resolution), db)
+            if msg is None:
+                msg = PendingMessage(message_id=message_id, payload=row.payload, hold_sources=list(row.hold_sources))
+        except Exception:
+            log.error("Failed to resolve hold %s", message_id, exc_info=True)
+        return msg
+
+    def _remember(self, row: ModHold, now: datetime) -> PendingMessage:
+        msg = PendingMessage(message_id=row.message_id, payload=row.payload, hold_sources=list(row.hold_sources))
+        self._pending.put(msg, ttl_seconds=(_aware(row.expires_at) - now).total_seconds())
+        return msg
+
+    def _on_resolved(self, event: ModHoldResolved) -> None:
+        if self.platform is not None and event.platform == self.platform.value:
+            self.pop(event.message_id)
+
+
+def _aware(dt: datetime) -> datetime:
+    # SQLite hands back naive datetimes; Postgres timestamptz values are already aware.
+    return dt if dt.tzinfo is not None else dt.replace(tzinfo=timezone.utc)
+
+
+flood_flags = metrics.counter(
+    "couchd_moderation_flood_flags_total", "Messages held as duplicate floods, by scope.", ("scope",),
+)
+pending_evictions = metrics.counter(
+    "couchd_moderation_pending_evictions_total", "Held messages dropped without a decision.", ("reason",),
+)
+metrics.gauge(
+    "couchd_moderation_pending", "Held messages awaiting a moderation decision.",
+    lambda: sum(len(s) for s in list(_stores)),
+)
+metrics.gauge(
+    "couchd_moderation_flood_window_messages", "Message fingerprints in the duplicate-flood window.",
+    lambda: sum(len(d) for d in list(_detectors)),
+)
@@ -0,0 +1,164 @@
+# couchd/core/overlay.py
+import asyncio
+import logging
+from collections import deque
+from datetime import datetime
+
+from sqlalchemy import func, select
+
+from couchd.core.batch_writer import BatchWriter
+from couchd.core.config import settings
+from couchd.core.constants import InteractionType, OverlayConfig
+from couchd.core.db import get_session
+from couchd.core.models import ViewerInteraction
+
+log = logging.getLogger(__name__)
+
+_SUB_TYPES = {InteractionType.SUB.value, InteractionType.RESUB.value}
+_RECENT_SUB_TYPES = _SUB_TYPES | {InteractionType.GIFTBOMB.value}
+_ROW_FIELDS = (
+    "username", "display_name", "interaction_type", "tier",
+    "cumulative_months", "gift_count", "bits", "viewer_count",
+)
+
+
+def _entry(row: dict) -> dict:
+    entry = {field: row.get(field) for field in _ROW_FIELDS}
+    ts = row.get("timestamp")
+    entry["timestamp"] = ts.isoformat() if isinstance(ts, datetime) else ts
+    return entry
+
+
+def _model_row(v: ViewerInteraction) -> dict:
+    return {field: getattr(v, field) for field in (*_ROW_FIELDS, "timestamp")}
+
+
+class OverlayState:
+    """
+    In-memory overlay stats (last follower/raider/bits, recent subs, longest subs).
+    Hydrated from viewer_interactions once, then kept current by apply() for every new
+    interaction, so snapshot() never touches the database. apply() is a no-op until hydrate()
+    has succeeded. Given the write-behind writer those rows go through, hydrate() pauses it
+    while it queries, so each earlier row is either in the query or still unwritten, and folds
+    the unwritten ones in before going live.
+    """
+
+    def __init__(self, writer: BatchWriter | None = None) -> None:
+        self._writer = writer
+        self.last_follower: dict = {}
+        self.last_raider: dict = {}
+        self.last_bits: dict = {}
+        self.recent_subs: deque[dict] = deque(maxlen=OverlayConfig.LIST_SIZE)
+        self._sub_months: dict[str, list] = {}  # username → [display_name, sub row count]
+        self._longest: list[str] = []           # top LIST_SIZE usernames by sub row count
+        self._hydrated = False
+        self._hydrate_lock = asyncio.Lock()
+
+    @property
+    def hydrated(self) -> bool:
+        return self._hydrated
+
+    async def hydrate(self) -> None:
+        async with self._hydrate_lock:
+            if self._hydrated:
+                return
+            if self._writer is None:
+                await self._load()
+                self._hydrated = True
+                return
+            async with self._writer.paused():
+                await self._load()
+                self._hydrated = True
+                for row in self._writer.unwritten():
+                    self.apply(row)
+
+    async def _load(self) -> None:
+        def latest(*types):
+            return (
+                select(ViewerInteraction)
+                .where(ViewerInteraction.interaction_type.in_(types))
+                .order_by(ViewerInteraction.timestamp.desc())
+            )
+
+        async with get_session() as db:
+            follow = (await db.execute(latest(InteractionType.FOLLOW).limit(1))).scalars().first()
+            raid = (await db.execute(latest(InteractionType.RAID).limit(1))).scalars().first()
+            bits = (await db.execute(latest(InteractionType.BITS).limit(1))).scalars().first()
+            recent = (
+                await db.execute(latest(*_RECENT_SUB_TYPES).limit(OverlayConfig.LIST_SIZE))
+            ).scalars().all()
+            counts = (
+                await db.execute(
+                    select(
+                        ViewerInteraction.username,
+                        func.max(ViewerInteraction.display_name),
+                        func.count(),
+                    )
+                    .where(
+                        ViewerInteraction.interaction_type.in_(_SUB_TYPES)
+                        & (ViewerInteraction.username != settings.TWITCH_CHANNEL)
+                    )
+                    .group_by(ViewerInteraction.username)
+                )
+            ).all()
+
+        self.last_follower = _entry(_model_row(follow)) if follow else {}
+        self.last_raider = _entry(_model_row(raid)) if raid else {}
+        self.last_bits = _entry(_model_row(bits)) if bits else {}
+        self.recent_subs.clear()
+        self.recent_subs.extend(_entry(_model_row(v)) for v in recent)
+        self._sub_months = {username: [display, count] for username, display, count in counts}
+        self._longest = sorted(self._sub_months, key=lambda u: self._sub_months[u][1], reverse=True)[
+            :OverlayConfig.LIST_SIZE
+        ]
+        log.info("Overlay state hydrated (%d subscribers tracked).", len(self._sub_months))
+
+    def apply(self, row: dict) -> None:
+        """Fold one new ViewerInteraction row (column → value dict) into the aggregate."""
+        if not self._hydrated:
+            return
+        kind = row.get("interaction_type")
+        if kind == InteractionType.FOLLOW.value:
+            self.last_follower = self._newer(self.last_follower, row)
+        elif kind == InteractionType.RAID.value:
+            self.last_raider = self._newer(self.last_raider, row)
+        elif kind == InteractionType.BITS.value:
+            self.last_bits = self._newer(self.last_bits, row)
+        if kind in _RECENT_SUB_TYPES:
+            self.recent_subs.appendleft(_entry(row))
+        if kind in _SUB_TYPES and row.get("username") and row["username"] != settings.TWITCH_CHANNEL:
+            self._count_sub(row["username"], row.get("display_name"))
+
+    @staticmethod
+    def _newer(current: dict, row: dict) -> dict:
+        entry = _entry(row)
+        if current and entry["timestamp"] and current.get("timestamp") and entry["timestamp"] < current["timestamp"]:
+            return current
+        return entry
+
+    def _count_sub(self, username: str, display_name: str | None) -> None:
+        record = self._sub_months.setdefault(username, [display_name, 0])
+        record[1] += 1
+        if display_name and (record[0] is None or display_name > record[0]):
+            record[0] = display_name  # mirrors max(display_name) in the hydrate query
+        # Counts only grow, so the new count can only push this user up the top list.
+        if username not in self._longest:
+            self._longest.append(username)
+        self._longest.sort(key=lambda u: self._sub_months[u][1], reverse=True)
+        del self._longest[OverlayConfig.LIST_SIZE:]
+
+    def snapshot(self) -> dict:
+        return {
+            "last_follower": self.last_follower,
+            "last_raider": self.last_raider,
+            "last_bits": self.last_bits,
+            "recent_subs": list(self.recent_subs),
+            "longest_subs": [
+                {
+                    "username": u,
+                    "display_name": self._sub_months[u][0],
+                    "cumulative_months": self._sub_months[u][1],
+                }
+                for u in self._longest
+            ],
+        }
@@ -0,0 +1,203 @@
+# couchd/core/query_stats.py
+import bisect
+import functools
+import logging
+import re
+import time
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+
+from couchd.core import metrics
+from couchd.core.config import settings
+from couchd.core.constants import MetricsConfig, QueryStatsConfig
+
+log = logging.getLogger(__name__)
+
+_BUCKETS = MetricsConfig.LATENCY_BUCKETS
+_OVERFLOW = "(other statements)"
+
+_WHITESPACE = re.compile(r"\s+")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_PLACEHOLDER = re.compile(r"\$\d+|%\(\w+\)s|%s")
+_CAST = re.compile(r"\?::(?:(?:TIMESTAMP|TIME) WITH(?:OUT)? TIME ZONE|\w+(?:\(\d+\))?(?:\[\])?)", re.I)
+_NUMBER = re.compile(r"(?<![\w$])-?\d+(?:\.\d+)?\b")
+_LIST = re.compile(r"\(\?(?:, \?)+\)")
+_ROWS = re.compile(r"(\([^()]*\))(?:, \1)+")
+
+
+@functools.lru_cache(maxsize=2048)
+def fingerprint(statement: str) -> str:
+    """
+    Statement with literals and placeholders replaced by ?, so every execution of the same query
+    shares one key regardless of its parameters. IN lists and multi-row VALUES collapse to one entry.
+    """
+    fp = _WHITESPACE.sub(" ", statement).strip()
+    fp = _STRING.sub("?", fp)
+    fp = _PLACEHOLDER.sub("?", fp)
+    fp = _CAST.sub("?", fp)
+    fp = _NUMBER.sub("?", fp)
+    fp = _LIST.sub("(?, ...)", fp)
+    return _ROWS.sub(r"\1, ...", fp)
+
+
+def redact(parameters, executemany: bool = False) -> str:
+    """Parameter shapes without their values, e.g. (int, str, datetime)."""
+    if executemany:
+        return f"[{len(parameters)} rows]"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{k}: {type(v).__name__}" for k, v in parameters.items()) + "}"
+    if isinstance(parameters, (list, tuple)):
+        return "(" + ", ".join(type(v).__name__ for v in parameters) + ")"
+    return type(parameters).__name__
+
+
+@dataclass
+class QueryStat:
+    fingerprint: str
+    count: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    slow: int = 0
+    buckets: list[int] = field(default_factory=lambda: [0] * (len(_BUCKETS) + 1))
+
+    def observe(self, elapsed: float) -> None:
+        self.count += 1
+        self.total_seconds += elapsed
+        if elapsed > self.max_seconds:
+            self.max_seconds = elapsed
+        self.buckets[bisect.bisect_left(_BUCKETS, elapsed)] += 1
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th observation; the max if it is past the last bucket."""
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(_BUCKETS, self.buckets):
+            seen += n
+            if seen >= rank:
+                return min(bound, self.max_seconds)
+        return self.max_seconds
+
+    def as_dict(self) -> dict:
+        return {
+            "fingerprint": self.fingerprint,
+            "count": self.count,
+            "total_seconds": round(self.total_seconds, 6),
+            "mean_seconds": round(self.total_seconds / self.count, 6) if self.count else 0.0,
+            "p95_seconds": round(self.quantile(0.95), 6),
+            "max_seconds": round(self.max_seconds, 6),
+            "slow": self.slow,
+        }
+
+
+_stats: dict[str, QueryStat] = {}
+_last_summary = time.monotonic()
+
+
+def _stat_for(fp: str) -> QueryStat:
+    stat = _stats.get(fp)
+    if stat is None:
+        if len(_stats) >= QueryStatsConfig.MAX_FINGERPRINTS:
+            fp = _OVERFLOW
+            stat = _stats.get(fp)
+        if stat is None:
+            stat = _stats[fp] = QueryStat(fp)
+    return stat
+
+
+def _explain(conn, statement: str, parameters) -> str:
+    """
+    Re-run a SELECT under EXPLAIN ANALYZE on a raw DBAPI cursor, so neither these hooks nor the
+    caller's result set see it. The savepoint keeps a failed EXPLAIN from aborting the transaction.
+    """
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute("SAVEPOINT couchd_explain")
+        try:
+            cursor.execute(f"EXPLAIN ANALYZE {statement}", parameters)
+            plan = "\n".join(str(row[0]) for row in cursor.fetchall())
+        except Exception:
+            cursor.execute("ROLLBACK TO SAVEPOINT couchd_explain")
+            raise
+        cursor.execute("RELEASE SAVEPOINT couchd_explain")
+        return plan
+    finally:
+        cursor.close()
+
+
+def record(statement: str, elapsed: float, parameters=None, executemany: bool = False, conn=None) -> None:
+    fp = fingerprint(statement)
+    metrics.db_latency.observe(elapsed, fp.split(" ", 1)[0].upper())
+    stat = _stat_for(fp)
+    stat.observe(elapsed)
+
+    if elapsed >= QueryStatsConfig.SLOW_QUERY_SECONDS:
+        stat.slow += 1
+        log.warning(
+            "Slow query (%.0f ms): %s params=%s",
+            elapsed * 1000, fp[:QueryStatsConfig.LOG_STATEMENT_CHARS], redact(parameters, executemany),
+        )
+        explainable = conn is not None and not executemany and fp.upper().startswith("SELECT")
+        if settings.DB_EXPLAIN_SLOW_QUERIES and explainable:
+            try:
+                log.info("EXPLAIN ANALYZE for slow query %s:\n%s", fp[:120], _explain(conn, statement, parameters))
+            except Exception:
+                log.warning("EXPLAIN ANALYZE failed for %s", fp[:120], exc_info=True)
+
+    if time.monotonic() - _last_summary >= QueryStatsConfig.SUMMARY_INTERVAL_MINUTES * 60:
+        log_summary()
+
+
+def snapshot() -> list[dict]:
+    """Per-fingerprint stats since process start, slowest total first."""
+    return [s.as_dict() for s in sorted(_stats.values(), key=lambda s: s.total_seconds, reverse=True)]
+
+
+def log_summary() -> None:
+    global _last_summary
+    _last_summary = time.monotonic()
+    if not _stats:
+        return
+    top = sorted(_stats.values(), key=lambda s: s.total_seconds, reverse=True)[:QueryStatsConfig.SUMMARY_TOP]
+    log.info(
+        "DB summary: %d statements, %d slow, %d fingerprints. Top by total time: %s",
+        sum(s.count for s in _stats.values()),
+        sum(s.slow for s in _stats.values()),
+        len(_stats),
+        "; ".join(
+            f"[{s.count}x {s.total_seconds * 1000:.0f}ms p95={s.quantile(0.95) * 1000:.0f}ms] {s.fingerprint[:80]}"
+            for s in top
+        ),
+    )
+
+
+def format_report(rows: list[dict], sort: str = "total_seconds", top: int = 20) -> str:
+    """Fixed-width table of snapshot() rows for the CLI."""
+    rows = sorted(rows, key=lambda r: r[sort], reverse=True)[:top]
+    lines = [f"{'count':>8} {'total ms':>10} {'mean ms':>9} {'p95 ms':>9} {'max ms':>9} {'slow':>5}  statement"]
+    for r in rows:
+        lines.append(
+            f"{r['count']:>8} {r['total_seconds'] * 1000:>10.1f} {r['mean_seconds'] * 1000:>9.2f} "
+            f"{r['p95_seconds'] * 1000:>9.2f} {r['max_seconds'] * 1000:>9.2f} {r['slow']:>5}  {r['fingerprint']}"
+        )
+    return "\n".join(lines)
+
+
+def _before_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._couchd_started = time.perf_counter()
+
+
+def _after_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_couchd_started", None)
+    if started is not None:
+        record(statement, time.perf_counter() - started, parameters, executemany, conn)
+
+
+def instrument(sync_engine) -> None:
+    """Time every statement run through sync_engine (use engine.sync_engine for an AsyncEngine)."""
+    event.listen(sync_engine, "before_cursor_execute", _before_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_execute)
+
+
+metrics.json_route("/queries", snapshot)
@@ -1,13 +1,22 @@
 # couchd/core/utils.py
-import asyncio
+import logging
+import time
 from datetime import datetime, timezone
 
-from sqlalchemy import func, select
+from sqlalchemy import select
 
-from couchd.core.config import settings
 from couchd.core.db import get_session
-from couchd.core.models import StreamSession, ViewerInteraction
-from couchd.core.constants import Platform, InteractionType
+from couchd.core.models import StreamSession
+from couchd.core.constants import Platform, SessionCacheConfig
+from couchd.core.bus import StreamOffline, StreamOnline, bus
+from couchd.core.listener import listener
+
+log = logging.getLogger(__name__)
+
+# platform → (expires_at monotonic, session or None). Only used once enable_active_session_cache()
+# has subscribed this process to StreamOnline/StreamOffline bus events; otherwise every call hits the DB.
+_active_cache: dict[Platform, tuple[float, StreamSession | None]] = {}
+_cache_enabled = False
 
 
 def compute_vod_timestamp(start_time: datetime) -> str:
@@ -21,6 +30,10 @@ def compute_vod_timestamp(start_time: datetime) -> str:
 
 
 async def get_active_session(platform: Platform = Platform.TWITCH) -> StreamSession | None:
+    if _cache_enabled and listener.connected:
+        cached = _active_cache.get(platform)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
     async with get_session() as db:
         result = await db.execute(
             select(StreamSession)
@@ -30,68 +43,29 @@ async def get_active_session(platform: Platform = Platform.TWITCH) -> StreamSess
             )
             .order_by(StreamSession.start_time.desc())
         )
-        return result.scalars().first()
+        session = result.scalars().first()
+    if _cache_enabled:
+        ttl = SessionCacheConfig.TTL_SECONDS if session else SessionCacheConfig.NEGATIVE_TTL_SECONDS
+        _active_cache[platform] = (time.monotonic() + ttl, session)
+    return session
 
 
-async def get_overlay_stats() -> dict:
-    async with get_session() as db:
-        last_follow_r, last_raid_r, last_bits_r, recent_subs_r, longest_subs_r = await asyncio.gather(
-            db.execute(
-                select(ViewerInteraction)
-                .where(ViewerInteraction.interaction_type == InteractionType.FOLLOW)
-                .order_by(ViewerInteraction.timestamp.desc()).limit(1)
-            ),
-            db.execute(
-                select(ViewerInteraction)
-                .where(ViewerInteraction.interaction_type == InteractionType.RAID)
-                .order_by(ViewerInteraction.timestamp.desc()).limit(1)
-            ),
-            db.execute(
-                select(ViewerInteraction)
-                .where(ViewerInteraction.interaction_type == InteractionType.BITS)
-                .order_by(ViewerInteraction.timestamp.desc()).limit(1)
-            ),
-            db.execute(
-                select(ViewerInteraction)
-                .where(ViewerInteraction.interaction_type.in_([
-                    InteractionType.SUB, InteractionType.RESUB, InteractionType.GIFTBOMB,
-                ]))
-                .order_by(ViewerInteraction.timestamp.desc()).limit(5)
-            ),
-            db.execute(
-                select(
-                    ViewerInteraction.username,
-                    func.max(ViewerInteraction.display_name).label("display_name"),
-                    func.count().label("months"),
-                )
-                .where(
-                    ViewerInteraction.interaction_type.in_([InteractionType.SUB, InteractionType.RESUB])
-                    & (ViewerInteraction.username != settings.TWITCH_CHANNEL)
-                )
-                .group_by(ViewerInteraction.username)
-                .order_by(func.count().desc())
-                .limit(5)
-            ),
-        )
-        last_follow = last_follow_r.scalars().first()
-        last_raid = last_raid_r.scalars().first()
-        last_bits = last_bits_r.scalars().first()
-        recent_subs = recent_subs_r.scalars().all()
-        longest_subs = longest_subs_r.all()
+def invalidate_active_session(platform: Platform | None = None) -> None:
+    """Drop the cached active session (all platforms by default). Call after writing StreamSession rows."""
+    if platform is None:
+        _active_cache.clear()
+    else:
+        _active_cache.pop(platform, None)
 
-    def _row(v: ViewerInteraction) -> dict:
-        return {
-            "username": v.username, "display_name": v.display_name,
-            "interaction_type": v.interaction_type, "tier": v.tier,
-            "cumulative_months": v.cumulative_months, "gift_count": v.gift_count,
-            "bits": v.bits, "viewer_count": v.viewer_count,
-            "timestamp": v.timestamp.isoformat(),
-        }
 
-    return {
-        "last_follower": _row(last_follow) if last_follow else {},
-        "last_raider": _row(last_raid) if last_raid else {},
-        "last_bits": _row(last_bits) if last_bits else {},
-        "recent_subs": [_row(r) for r in recent_subs],
-        "longest_subs": [{"username": r.username, "display_name": r.display_name, "cumulative_months": r.months} for r in longest_subs],
-    }
+async def enable_active_session_cache() -> None:
+    """Cache get_active_session() in this process, invalidated by StreamOnline/StreamOffline."""
+    global _cache_enabled
+    if _cache_enabled:
+        return
+    bus.subscribe(StreamOnline, lambda _event: invalidate_active_session())
+    bus.subscribe(StreamOffline, lambda _event: invalidate_active_session())
+    listener.on_reconnect(invalidate_active_session)
+    await bus.start()
+    _cache_enabled = True
+    log.info("Active-session cache enabled.")
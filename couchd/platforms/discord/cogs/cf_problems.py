@@ -4,12 +4,16 @@ import discord
 from discord.ext import commands, tasks
 from sqlalchemy import select, func
 
+from couchd.core import metrics
 from couchd.core.config import settings
 from couchd.core.db import get_session
-from couchd.core.models import GuildConfig, StreamEvent, CFProblemAttempt
-from couchd.core.constants import CFProblemsConfig
+from couchd.core.guild_config import guild_configs
+from couchd.core.listener import SingleFlight, listener
+from couchd.core.models import StreamEvent, CFProblemAttempt
+from couchd.core.constants import CFProblemsConfig, NotifyChannel
 from couchd.core.clients import codeforces as cf_client
 from couchd.core.utils import get_active_session, compute_vod_timestamp
+from couchd.platforms.discord.components.fanout import fan_out
 from couchd.platforms.discord.components.cf_problems_forum import sync_cf_problem
 
 log = logging.getLogger(__name__)
@@ -19,14 +23,25 @@ class CFProblemsWatcherCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.last_processed_attempt_id: int = 0
+        self._subscribed = False
+        self._forum_sync = SingleFlight(self._sync_forum, "Codeforces forum sync")
         self.check_cf_problems.start()
+        self.reconcile_forum.start()
 
     def cog_unload(self):
         self.check_cf_problems.cancel()
+        self.reconcile_forum.cancel()
+        listener.unsubscribe(NotifyChannel.CF_PROBLEM_ATTEMPT, self._forum_sync.request)
 
     @commands.Cog.listener()
     async def on_ready(self):
         await self._seed_watermark()
+        if self._subscribed:
+            return
+        self._subscribed = True
+        listener.subscribe(NotifyChannel.CF_PROBLEM_ATTEMPT, self._forum_sync.request)
+        listener.on_reconnect(self._forum_sync.request)
+        await listener.start()
 
     async def _seed_watermark(self):
         async with get_session() as db:
@@ -39,25 +54,30 @@ class CFProblemsWatcherCog(commands.Cog):
         )
 
     @tasks.loop(minutes=CFProblemsConfig.POLL_RATE_MINUTES)
+    @metrics.timed("discord.cf_problems.check_cf_problems")
     async def check_cf_problems(self):
         await self.bot.wait_until_ready()
-
-        async with get_session() as db:
-            config = (
-                await db.execute(
-                    select(GuildConfig).where(GuildConfig.cf_problems_forum_id.isnot(None))
-                )
-            ).scalar_one_or_none()
-
         if settings.CODEFORCES_HANDLE:
             await self._poll_streamer_submissions()
 
-        if not config:
-            return
-
-        forum = self.bot.get_channel(config.cf_problems_forum_id)
-        if not isinstance(forum, discord.ForumChannel):
+    @tasks.loop(minutes=CFProblemsConfig.RECONCILE_MINUTES)
+    @metrics.timed("discord.cf_problems.reconcile_forum")
+    async def reconcile_forum(self):
+        """Fallback for NOTIFYs missed while the listener was down."""
+        await self.bot.wait_until_ready()
+        self._forum_sync.request()
+        await self._forum_sync.wait()
+
+    async def _sync_forum(self):
+        configs = await guild_configs.all_with("cf_problems_forum_id")
+        forums = {
+            c.guild_id: forum
+            for c in configs
+            if isinstance(forum := self.bot.get_channel(c.cf_problems_forum_id), discord.ForumChannel)
+        }
+        if not forums:
             return
+        configs = [c for c in configs if c.guild_id in forums]
 
         async with get_session() as db:
             new_attempts = (
@@ -70,9 +90,13 @@ class CFProblemsWatcherCog(commands.Cog):
             ).scalars().all()
 
         if new_attempts:
-            problem_ids = {a.problem_id for a in new_attempts}
-            for pid in problem_ids:
-                await sync_cf_problem(forum, pid, self.bot)
+            problem_ids = list(dict.fromkeys(a.problem_id for a in new_attempts))
+
+            async def sync_guild(config):
+                for pid in problem_ids:
+                    await sync_cf_problem(forums[config.guild_id], pid, self.bot, config.guild_id)
+
+            await fan_out(configs, sync_guild, "Codeforces forum sync")
             self.last_processed_attempt_id = new_attempts[-1].id
 
     async def _poll_streamer_submissions(self):
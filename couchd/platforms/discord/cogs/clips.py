@@ -6,10 +6,15 @@ import discord
 from discord.ext import commands, tasks
 from sqlalchemy import select
 
+from couchd.core import metrics
 from couchd.core.clients.twitch import TwitchClient
-from couchd.core.constants import BrandColors
+from couchd.core.constants import BrandColors, ClipConfig, NotifyChannel, PostKind
 from couchd.core.db import get_session
-from couchd.core.models import ClipLog, GuildConfig, StreamEvent
+from couchd.core.guild_config import guild_configs
+from couchd.core.listener import SingleFlight, listener
+from couchd.platforms.discord.components.fanout import load_posts, new_post, save_first_post
+from couchd.platforms.discord.components.scheduler import Priority, discord_writes
+from couchd.core.models import ClipLog, StreamEvent
 
 log = logging.getLogger(__name__)
 
@@ -24,27 +29,37 @@ class ClipWatcherCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.twitch = TwitchClient()
+        self._subscribed = False
+        self._clip_sync = SingleFlight(self._post_unposted, "Clip showcase sync")
         self.post_clips.start()
 
     def cog_unload(self):
         self.post_clips.cancel()
-
-    @tasks.loop(minutes=1)
+        listener.unsubscribe(NotifyChannel.CLIP_LOG, self._clip_sync.request)
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        if self._subscribed:
+            return
+        self._subscribed = True
+        listener.subscribe(NotifyChannel.CLIP_LOG, self._clip_sync.request)
+        listener.on_reconnect(self._clip_sync.request)
+        await listener.start()
+
+    @tasks.loop(minutes=ClipConfig.RECONCILE_MINUTES)
+    @metrics.timed("discord.clips.post_clips")
     async def post_clips(self):
+        """Fallback for NOTIFYs missed while the listener was down."""
         await self.bot.wait_until_ready()
+        self._clip_sync.request()
+        await self._clip_sync.wait()
 
-        async with get_session() as session:
-            config = (
-                await session.execute(
-                    select(GuildConfig).where(
-                        GuildConfig.clip_showcase_channel_id.isnot(None)
-                    )
-                )
-            ).scalar_one_or_none()
-
-            if not config:
-                return
+    async def _post_unposted(self):
+        configs = await guild_configs.all_with("clip_showcase_channel_id")
+        if not configs:
+            return
 
+        async with get_session() as session:
             unposted = (
                 (
                     await session.execute(
@@ -57,49 +72,63 @@ class ClipWatcherCog(commands.Cog):
                 .all()
             )
 
-            if not unposted:
-                return
-
-            channel = self.bot.get_channel(config.clip_showcase_channel_id)
-            if not channel:
-                log.warning(
-                    "clip_showcase_channel_id %d not visible to bot",
-                    config.clip_showcase_channel_id,
-                )
-                return
-
-            for clip in unposted:
-                clip_data = await self.twitch.get_clip(clip.clip_id)
-                thumbnail = (
-                    _full_res_thumbnail(clip_data["thumbnail_url"])
-                    if clip_data and clip_data.get("thumbnail_url")
-                    else None
-                )
+        if not unposted:
+            return
+
+        clips_data = await self.twitch.get_clips([c.clip_id for c in unposted])
+        posted = await load_posts(PostKind.CLIP, [c.id for c in unposted])
+        for clip in unposted:
+            clip_data = clips_data.get(clip.clip_id)
+            thumbnail = (
+                _full_res_thumbnail(clip_data["thumbnail_url"])
+                if clip_data and clip_data.get("thumbnail_url")
+                else None
+            )
 
-                embed = discord.Embed(
-                    title=clip.title,
-                    url=clip.url,
-                    color=BrandColors.TWITCH,
-                )
-                if clip.clipped_by:
-                    embed.set_footer(text=f"Clipped by {clip.clipped_by}")
-                if thumbnail:
-                    embed.set_image(url=thumbnail)
-
-                try:
-                    msg = await channel.send(embed=embed)
-                    clip.discord_message_id = msg.id
-                    log.info("Posted clip to #%s: %s", channel.name, clip.title)
-                except Exception:
-                    log.error("Failed to post clip %s", clip.clip_id, exc_info=True)
+            embed = discord.Embed(
+                title=clip.title,
+                url=clip.url,
+                color=BrandColors.TWITCH,
+            )
+            if clip.clipped_by:
+                embed.set_footer(text=f"Clipped by {clip.clipped_by}")
+            if thumbnail:
+                embed.set_image(url=thumbnail)
+
+            # One keyed job per guild, not awaited: a sync pass that runs while earlier jobs are still
+            # queued finds their keys and does not queue the same clip for the same guild again.
+            for config in configs:
+                if (str(clip.id), config.guild_id) in posted:
                     continue
+                channel = self.bot.get_channel(config.clip_showcase_channel_id)
+                if not channel:
+                    log.warning(
+                        "clip_showcase_channel_id %d not visible to bot",
+                        config.clip_showcase_channel_id,
+                    )
+                    continue
+                discord_writes.submit(
+                    channel.id,
+                    lambda config=config, channel=channel, clip=clip, embed=embed: self._post_clip(
+                        config, channel, clip, embed
+                    ),
+                    Priority.CLIPS,
+                    key=(PostKind.CLIP, clip.id, config.guild_id),
+                )
 
-                try:
-                    await msg.create_thread(name=f"💬 {clip.title}"[:100])
-                except Exception:
-                    log.error("Failed to create thread for clip %s", clip.clip_id, exc_info=True)
-
-            await session.commit()
+    async def _post_clip(self, config, channel, clip: ClipLog, embed: discord.Embed) -> None:
+        msg = await channel.send(embed=embed)
+        log.info("Posted clip to #%s: %s", channel.name, clip.title)
+        try:
+            await save_first_post(new_post(PostKind.CLIP, clip.id, config.guild_id, channel.id, msg.id), ClipLog, clip.id)
+        except Exception:
+            # The clip is already up; raising would have the scheduler retry and post it again.
+            log.error("Posted clip %d to guild %d but could not record it", clip.id, config.guild_id, exc_info=True)
+        discord_writes.submit(
+            channel.id,
+            lambda: msg.create_thread(name=f"💬 {clip.title}"[:100]),
+            Priority.CLIPS,
+        )
 
 
 def setup(bot):
@@ -5,6 +5,7 @@ from discord.ext import commands
 import logging
 
 from couchd.core.db import get_session
+from couchd.core.guild_config import guild_configs
 from couchd.core.models import GuildConfig
 from sqlalchemy import select
 
@@ -59,6 +60,7 @@ class GeneralCog(commands.Cog):
         guild_id = ctx.guild.id
 
         # Use our new async context manager!
+        created = False
         try:
             async with get_session() as session:
                 stmt = select(GuildConfig).where(GuildConfig.guild_id == guild_id)
@@ -75,10 +77,14 @@ class GeneralCog(commands.Cog):
                     session.add(new_config)
                     # Notice we removed `await session.commit()`.
                     # The get_session() context manager handles it for us now!
-                    await ctx.followup.send(
-                        "✅ Successfully created new server config record!",
-                        ephemeral=True,
-                    )
+                    created = True
+
+            if created:
+                await guild_configs.changed(guild_id)
+                await ctx.followup.send(
+                    "✅ Successfully created new server config record!",
+                    ephemeral=True,
+                )
 
         except Exception as e:
             # Our context manager already rolled back the database and logged the error,
@@ -6,9 +6,14 @@ import discord
 from discord.ext import commands, tasks
 from sqlalchemy import select
 
+from couchd.core import metrics
 from couchd.core.db import get_session
-from couchd.core.models import GuildConfig, IdeaPost
-from couchd.core.constants import BrandColors, IdeaConfig
+from couchd.core.guild_config import guild_configs
+from couchd.core.listener import SingleFlight, listener
+from couchd.core.models import DiscordPost, IdeaPost
+from couchd.core.constants import BrandColors, IdeaConfig, NotifyChannel, PostKind
+from couchd.platforms.discord.components.fanout import load_posts, new_post, save_first_post
+from couchd.platforms.discord.components.scheduler import Priority, discord_writes
 
 log = logging.getLogger(__name__)
 
@@ -16,27 +21,35 @@ log = logging.getLogger(__name__)
 class IdeasWatcherCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self._subscribed = False
+        self._idea_sync = SingleFlight(self._post_unposted, "Ideas channel sync")
         self.check_ideas.start()
 
     def cog_unload(self):
         self.check_ideas.cancel()
+        listener.unsubscribe(NotifyChannel.IDEA_POST, self._idea_sync.request)
 
-    @tasks.loop(minutes=IdeaConfig.POLL_RATE_MINUTES)
+    @commands.Cog.listener()
+    async def on_ready(self):
+        if self._subscribed:
+            return
+        self._subscribed = True
+        listener.subscribe(NotifyChannel.IDEA_POST, self._idea_sync.request)
+        listener.on_reconnect(self._idea_sync.request)
+        await listener.start()
+
+    @tasks.loop(minutes=IdeaConfig.RECONCILE_MINUTES)
+    @metrics.timed("discord.ideas.check_ideas")
     async def check_ideas(self):
+        """Fallback for NOTIFYs missed while the listener was down."""
         await self.bot.wait_until_ready()
+        self._idea_sync.request()
+        await self._idea_sync.wait()
 
-        async with get_session() as db:
-            config = (
-                await db.execute(
-                    select(GuildConfig).where(GuildConfig.ideas_channel_id.isnot(None))
-                )
-            ).scalar_one_or_none()
-
-        if not config:
-            return
+    async def _post_unposted(self):
+        configs = await guild_configs.all_with("ideas_channel_id")
 
-        channel = self.bot.get_channel(config.ideas_channel_id)
-        if not isinstance(channel, discord.TextChannel):
+        if not configs:
             return
 
         async with get_session() as db:
@@ -53,20 +66,32 @@ class IdeasWatcherCog(commands.Cog):
                 .all()
             )
 
+        posted = await load_posts(PostKind.IDEA, [i.id for i in unposted])
+        # Keyed and not awaited, as for clips: a pass that overlaps queued jobs does not repeat them.
         for idea in unposted:
-            try:
-                msg = await channel.send(embed=self._build_embed(idea))
-                await msg.add_reaction(IdeaConfig.REACTION_SUPPORT)
-                await msg.add_reaction(IdeaConfig.REACTION_AGAINST)
-                async with get_session() as db:
-                    row = await db.get(IdeaPost, idea.id)
-                    row.discord_message_id = msg.id
-                    await db.commit()
-                log.info(
-                    "Posted idea %d to channel %d", idea.id, config.ideas_channel_id
+            for config in configs:
+                if (str(idea.id), config.guild_id) in posted:
+                    continue
+                channel = self.bot.get_channel(config.ideas_channel_id)
+                if not isinstance(channel, discord.TextChannel):
+                    continue
+                discord_writes.submit(
+                    channel.id,
+                    lambda config=config, channel=channel, idea=idea: self._post_idea(config, channel, idea),
+                    Priority.IDEAS,
+                    key=(PostKind.IDEA, idea.id, config.guild_id),
                 )
-            except Exception:
-                log.error("Failed to post idea %d", idea.id, exc_info=True)
+
+    async def _post_idea(self, config, channel: discord.TextChannel, idea: IdeaPost) -> None:
+        msg = await channel.send(embed=self._build_embed(idea))
+        log.info("Posted idea %d to channel %d", idea.id, channel.id)
+        try:
+            await save_first_post(new_post(PostKind.IDEA, idea.id, config.guild_id, channel.id, msg.id), IdeaPost, idea.id)
+        except Exception:
+            # As for clips: the idea is already up, so a failed save must not send it again.
+            log.error("Posted idea %d to guild %d but could not record it", idea.id, config.guild_id, exc_info=True)
+        for emoji in (IdeaConfig.REACTION_SUPPORT, IdeaConfig.REACTION_AGAINST):
+            discord_writes.submit(("reactions", channel.id), lambda e=emoji: msg.add_reaction(e), Priority.REACTIONS)
 
     def _build_embed(self, idea: IdeaPost) -> discord.Embed:
         embed = discord.Embed(
@@ -80,14 +105,16 @@ class IdeasWatcherCog(commands.Cog):
     @commands.Cog.listener()
     async def on_raw_message_delete(self, payload: discord.RawMessageDeleteEvent):
         async with get_session() as db:
-            idea = (
+            post = (
                 await db.execute(
-                    select(IdeaPost).where(
-                        IdeaPost.discord_message_id == payload.message_id
+                    select(DiscordPost).where(
+                        (DiscordPost.kind == PostKind.IDEA.value)
+                        & (DiscordPost.message_id == payload.message_id)
                     )
                 )
             ).scalar_one_or_none()
-            if idea:
+            idea = await db.get(IdeaPost, int(post.ref)) if post else None
+            if idea and idea.removed_at is None:
                 idea.removed_at = datetime.now(timezone.utc)
                 await db.commit()
                 log.info(
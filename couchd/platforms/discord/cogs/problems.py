@@ -4,12 +4,16 @@ import discord
 from discord.ext import commands, tasks
 from sqlalchemy import select, func
 
+from couchd.core import metrics
 from couchd.core.config import settings
 from couchd.core.db import get_session
-from couchd.core.models import GuildConfig, StreamEvent, ProblemAttempt, SolutionPost
-from couchd.core.constants import LeetCodeConfig, ProblemsConfig
+from couchd.core.guild_config import guild_configs
+from couchd.core.listener import SingleFlight, listener
+from couchd.core.models import StreamEvent, ProblemAttempt, SolutionPost
+from couchd.core.constants import LeetCodeConfig, NotifyChannel, ProblemsConfig
 from couchd.core.clients.leetcode import LeetCodeClient
 from couchd.core.utils import get_active_session, compute_vod_timestamp
+from couchd.platforms.discord.components.fanout import fan_out
 from couchd.platforms.discord.components.problems_forum import (
     sync_problem,
     flush_pending_solutions,
@@ -23,14 +27,27 @@ class ProblemsWatcherCog(commands.Cog):
         self.bot = bot
         self.lc_client = LeetCodeClient()
         self.last_processed_attempt_id: int = 0
+        self._subscribed = False
+        self._forum_sync = SingleFlight(self._sync_forum, "Problems forum sync")
         self.check_problems.start()
+        self.reconcile_forum.start()
 
     def cog_unload(self):
         self.check_problems.cancel()
+        self.reconcile_forum.cancel()
+        listener.unsubscribe(NotifyChannel.PROBLEM_ATTEMPT, self._forum_sync.request)
+        listener.unsubscribe(NotifyChannel.SOLUTION_POST, self._forum_sync.request)
 
     @commands.Cog.listener()
     async def on_ready(self):
         await self._seed_watermark()
+        if self._subscribed:
+            return
+        self._subscribed = True
+        listener.subscribe(NotifyChannel.PROBLEM_ATTEMPT, self._forum_sync.request)
+        listener.subscribe(NotifyChannel.SOLUTION_POST, self._forum_sync.request)
+        listener.on_reconnect(self._forum_sync.request)
+        await listener.start()
 
     async def _seed_watermark(self):
         async with get_session() as db:
@@ -43,23 +60,29 @@ class ProblemsWatcherCog(commands.Cog):
         )
 
     @tasks.loop(minutes=ProblemsConfig.POLL_RATE_MINUTES)
+    @metrics.timed("discord.problems.check_problems")
     async def check_problems(self):
         await self.bot.wait_until_ready()
-
-        async with get_session() as db:
-            cfg_result = await db.execute(
-                select(GuildConfig).where(GuildConfig.problems_forum_id.isnot(None))
-            )
-            config = cfg_result.scalar_one_or_none()
-
         await self._poll_streamer_solutions()
 
-        if not config:
-            return
-
-        forum = self.bot.get_channel(config.problems_forum_id)
-        if not isinstance(forum, discord.ForumChannel):
+    @tasks.loop(minutes=ProblemsConfig.RECONCILE_MINUTES)
+    @metrics.timed("discord.problems.reconcile_forum")
+    async def reconcile_forum(self):
+        """Fallback for NOTIFYs missed while the listener was down."""
+        await self.bot.wait_until_ready()
+        self._forum_sync.request()
+        await self._forum_sync.wait()
+
+    async def _sync_forum(self):
+        configs = await guild_configs.all_with("problems_forum_id")
+        forums = {
+            c.guild_id: forum
+            for c in configs
+            if isinstance(forum := self.bot.get_channel(c.problems_forum_id), discord.ForumChannel)
+        }
+        if not forums:
             return
+        configs = [c for c in configs if c.guild_id in forums]
 
         async with get_session() as db:
             new_attempts = (
@@ -75,14 +98,16 @@ class ProblemsWatcherCog(commands.Cog):
                 .all()
             )
 
+        async def sync_guild(config):
+            forum = forums[config.guild_id]
+            for slug in dict.fromkeys(a.slug for a in new_attempts):
+                await sync_problem(forum, slug, self.bot, config.guild_id)
+            await flush_pending_solutions(forum, self.bot, config.guild_id)
+
+        await fan_out(configs, sync_guild, "Problems forum sync")
         if new_attempts:
-            slugs = {a.slug for a in new_attempts}
-            for slug in slugs:
-                await sync_problem(forum, slug, self.bot)
             self.last_processed_attempt_id = new_attempts[-1].id
 
-        await flush_pending_solutions(forum, self.bot)
-
     async def _poll_streamer_solutions(self):
         if not settings.LEETCODE_USERNAME:
             return
@@ -4,6 +4,7 @@ from discord.ext import commands
 import logging
 from sqlalchemy import select
 from couchd.core.db import get_session
+from couchd.core.guild_config import guild_configs
 from couchd.core.models import GuildConfig
 from couchd.core.constants import BrandColors
 
@@ -49,6 +50,8 @@ class SetupCog(commands.Cog):
 
                 # Context manager automatically commits here
 
+            await guild_configs.changed(guild_id)
+
             # 4. Send success message
             embed = discord.Embed(
                 title="Configuration Updated ✅",
@@ -197,6 +200,8 @@ class SetupCog(commands.Cog):
 
                 config.video_updates_role_id = role.id
 
+            await guild_configs.changed(guild_id)
+
             embed = discord.Embed(
                 title="Configuration Updated ✅",
                 description=f"The **Video Updates Role** has been set to {role.mention}.",
@@ -8,14 +8,16 @@ from typing import Awaitable, Callable
 import aiohttp
 import discord
 from discord.ext import commands, tasks
-from sqlalchemy import select, text
+from sqlalchemy import text
 
+from couchd.core import metrics
+from couchd.core.clients import http_pool
 from couchd.core.clients.twitch import TwitchClient
 from couchd.core.clients.youtube import YouTubeRSSClient
 from couchd.core.config import settings
 from couchd.core.constants import BrandColors, LeetCodeConfig, StatusConfig
 from couchd.core.db import get_session
-from couchd.core.models import GuildConfig
+from couchd.core.guild_config import guild_configs
 
 log = logging.getLogger(__name__)
 
@@ -43,6 +45,7 @@ class StatusWatcherCog(commands.Cog):
         self.update_status.cancel()
 
     @tasks.loop(minutes=StatusConfig.POLL_RATE_MINUTES)
+    @metrics.timed("discord.status.update_status")
     async def update_status(self):
         await self.bot.wait_until_ready()
 
@@ -51,13 +54,7 @@ class StatusWatcherCog(commands.Cog):
         )
         embed = self._build_embed(results)
 
-        async with get_session() as session:
-            result = await session.execute(
-                select(GuildConfig).where(GuildConfig.status_channel_id.isnot(None))
-            )
-            configs = result.scalars().all()
-
-        for config in configs:
+        for config in await guild_configs.all_with("status_channel_id"):
             await self._post_or_edit(config.guild_id, config.status_channel_id, embed)
 
     async def _check_database(self) -> tuple[bool, str]:
@@ -87,13 +84,13 @@ class StatusWatcherCog(commands.Cog):
     async def _check_leetcode(self) -> tuple[bool, str]:
         try:
             timeout = aiohttp.ClientTimeout(total=5)
-            async with aiohttp.ClientSession() as session:
-                async with session.head(
-                    LeetCodeConfig.BASE_URL, timeout=timeout
-                ) as resp:
-                    if resp.status < 500:
-                        return True, "Reachable"
-                    return False, f"HTTP {resp.status}"
+            session = http_pool.get_session(LeetCodeConfig.BASE_URL)
+            async with session.head(
+                LeetCodeConfig.BASE_URL, timeout=timeout
+            ) as resp:
+                if resp.status < 500:
+                    return True, "Reachable"
+                return False, f"HTTP {resp.status}"
         except Exception as e:
             return False, str(e)
 
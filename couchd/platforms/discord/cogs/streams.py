@@ -1,21 +1,25 @@
 # couchd/platforms/discord/cogs/streams.py
 import asyncio
-import json
-import asyncpg
+import dataclasses
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 import logging
 import random
 
 
+from couchd.core import metrics
 from couchd.core.config import settings
-from couchd.core.db import get_session, get_listener_connection
-from couchd.core.models import StreamSession, GuildConfig
-from couchd.core.constants import Platform, StreamDefaults, TwitchConfig, BrandColors
-from couchd.core.utils import get_active_session
+from couchd.core.db import get_session
+from couchd.core.bus import StreamOffline, StreamOnline, bus
+from couchd.core.guild_config import guild_configs
+from couchd.core.models import StreamSession
+from couchd.core.constants import Platform, PostKind, StreamDefaults, TwitchConfig, BrandColors, RecapConfig
+from couchd.core.utils import enable_active_session_cache, get_active_session, invalidate_active_session
 from couchd.core.clients.twitch import TwitchClient
 from sqlalchemy import select
-from couchd.platforms.discord.components.streams_recap import post_stream_recap
+from couchd.platforms.discord.components.fanout import fan_out, new_post
+from couchd.platforms.discord.components.streams_recap import RecapBuilder, post_stream_recap
+from couchd.platforms.discord.components.scheduler import Priority, discord_writes
 
 log = logging.getLogger(__name__)
 
@@ -24,73 +28,61 @@ class StreamWatcherCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.channel = settings.TWITCH_CHANNEL
-        self._listener_conn: asyncpg.Connection | None = None
-        self._keepalive_task: asyncio.Task | None = None
+        self._subscribed = False
+        self._recap: RecapBuilder | None = None
+        self.refresh_recap.start()
 
     @commands.Cog.listener()
     async def on_ready(self):
-        if self._listener_conn is not None:
+        if self._subscribed:
             return  # already initialized on a previous on_ready
-        try:
-            await self._connect_listener()
-            self._keepalive_task = asyncio.create_task(self._keepalive_listener())
-            log.info("Listening for stream events via PostgreSQL NOTIFY.")
-        except Exception:
-            log.error("Failed to set up PostgreSQL listener", exc_info=True)
+        self._subscribed = True
+        bus.subscribe(StreamOnline, self._handle_stream_online)
+        bus.subscribe(StreamOffline, self._handle_stream_offline)
+        await enable_active_session_cache()
+        log.info("Listening for stream events on the event bus.")
         asyncio.create_task(self._startup_live_check())
 
     def cog_unload(self):
-        if self._keepalive_task:
-            self._keepalive_task.cancel()
-        if self._listener_conn:
-            asyncio.get_event_loop().create_task(self._listener_conn.close())
-
-    async def _connect_listener(self):
-        self._listener_conn = await get_listener_connection()
-        await self._listener_conn.add_listener("stream_online", self._on_stream_online)
-        await self._listener_conn.add_listener("stream_offline", self._on_stream_offline)
-
-    async def _keepalive_listener(self):
-        while True:
-            await asyncio.sleep(60)
-            try:
-                await self._listener_conn.fetchval("SELECT 1")
-            except Exception:
-                log.warning("Listener connection lost — reconnecting.")
-                try:
-                    await self._listener_conn.close()
-                except Exception:
-                    pass
-                await self._connect_listener()
-                log.info("Listener connection re-established.")
-
-    def _on_stream_online(self, _conn, _pid, _channel, payload):
-        log.info("Received stream_online pg_notify.")
-        asyncio.get_event_loop().create_task(self._handle_stream_online(payload))
-
-    def _on_stream_offline(self, _conn, _pid, _channel, payload):
-        log.info("Received stream_offline pg_notify.")
-        asyncio.get_event_loop().create_task(self._handle_stream_offline(payload))
-
-    async def _handle_stream_online(self, payload: str):
+        self.refresh_recap.cancel()
+        bus.unsubscribe(StreamOnline, self._handle_stream_online)
+        bus.unsubscribe(StreamOffline, self._handle_stream_offline)
+
+    @tasks.loop(seconds=RecapConfig.REFRESH_SECONDS)
+    @metrics.timed("discord.streams.refresh_recap")
+    async def refresh_recap(self):
+        """Keep the live session's recap current so the offline recap only loads the tail."""
+        await self.bot.wait_until_ready()
+        try:
+            active = await get_active_session(Platform.TWITCH)
+            if active is None:
+                return
+            if self._recap is None or self._recap.session_id != active.id:
+                self._recap = RecapBuilder(active.id, active.start_time)
+            await self._recap.refresh()
+        except Exception:
+            log.error("Failed to refresh live stream recap", exc_info=True)
+
+    async def _handle_stream_online(self, event: StreamOnline):
+        log.info("Received StreamOnline (%s).", event.platform)
         try:
             await self.bot.wait_until_ready()
-            await self.handle_stream_start(json.loads(payload))
+            await self.handle_stream_start(dataclasses.asdict(event))
         except Exception:
-            log.error("Error handling stream_online notification", exc_info=True)
+            log.error("Error handling StreamOnline", exc_info=True)
 
-    async def _handle_stream_offline(self, payload: str):
+    async def _handle_stream_offline(self, event: StreamOffline):
+        log.info("Received StreamOffline (%s).", event.platform)
         try:
             await self.bot.wait_until_ready()
-            data = json.loads(payload) if payload else {}
-            await self.handle_stream_end(data.get("session_id"))
+            await self.handle_stream_end(event.session_id)
         except Exception:
-            log.error("Error handling stream_offline notification", exc_info=True)
+            log.error("Error handling StreamOffline", exc_info=True)
 
     async def _startup_live_check(self):
-        """Independent startup check — detects live stream without relying on pg_notify."""
+        """Independent startup check — detects live stream without relying on the event bus."""
         await self.bot.wait_until_ready()
-        await asyncio.sleep(10)  # let pg_notify path arrive and commit first
+        await asyncio.sleep(10)  # let a bus delivery arrive and commit first
         try:
             existing = await get_active_session()
             if existing:
@@ -139,44 +131,23 @@ class StreamWatcherCog(commands.Cog):
             log.error("Failed to check existing StreamSession", exc_info=e)
             return
 
-        # Post go-live embed
-        message_id = None
+        # Post go-live embed to every configured guild
+        embed = discord.Embed(
+            title=f"🟢 {self.channel} is LIVE on Twitch!",
+            description=f"**{title}**\nPlaying: {category}",
+            url=stream_url,
+            color=BrandColors.TWITCH,
+        )
+        if thumbnail_url:
+            embed.set_image(url=f"{thumbnail_url}?r={random.randint(1, 99999)}")
+
+        posts: dict = {}
         try:
-            async with get_session() as session:
-                config = (
-                    await session.execute(
-                        select(GuildConfig).where(
-                            GuildConfig.stream_updates_channel_id.isnot(None)
-                        )
-                    )
-                ).scalar_one_or_none()
-
-            if config and config.stream_updates_channel_id:
-                discord_channel = self.bot.get_channel(config.stream_updates_channel_id)
-                if discord_channel:
-                    embed = discord.Embed(
-                        title=f"🟢 {self.channel} is LIVE on Twitch!",
-                        description=f"**{title}**\nPlaying: {category}",
-                        url=stream_url,
-                        color=BrandColors.TWITCH,
-                    )
-                    if thumbnail_url:
-                        embed.set_image(url=f"{thumbnail_url}?r={random.randint(1, 99999)}")
-
-                    msg = await discord_channel.send(embed=embed)
-                    message_id = msg.id
-
-                    try:
-                        await msg.create_thread(name=f"🟢 {self.channel} — {title}"[:100])
-                    except Exception as e:
-                        log.warning("Failed to create thread for go-live message", exc_info=e)
-
-                    log.info("Sent go-live announcement to #%s", discord_channel.name)
-                else:
-                    log.warning(
-                        "Configured stream updates channel (%d) is invisible to the bot.",
-                        config.stream_updates_channel_id,
-                    )
+            configs = await guild_configs.all_with("stream_updates_channel_id")
+            if configs:
+                posts = await fan_out(
+                    configs, lambda config: self._announce_live(config, embed, title), "Go-live announcement"
+                )
             else:
                 log.warning("No server has configured a stream_updates_channel_id. Skipping announcement.")
         except Exception as e:
@@ -185,19 +156,51 @@ class StreamWatcherCog(commands.Cog):
         # Save session
         try:
             async with get_session() as session:
-                session.add(
-                    StreamSession(
-                        platform=Platform.TWITCH.value,
-                        title=title,
-                        category=category,
-                        is_active=True,
-                        discord_notification_message_id=message_id,
-                    )
+                stream_session = StreamSession(
+                    platform=Platform.TWITCH.value,
+                    title=title,
+                    category=category,
+                    is_active=True,
+                    # Per-guild ids live in discord_posts; this keeps the first for older readers.
+                    discord_notification_message_id=posts[min(posts)].message_id if posts else None,
                 )
-            log.info("Created StreamSession in DB (message_id=%s).", message_id)
+                session.add(stream_session)
+                await session.flush()
+                for post in posts.values():
+                    post.ref = str(stream_session.id)
+                session.add_all(posts.values())
+            invalidate_active_session(Platform.TWITCH)
+            log.info("Created StreamSession in DB (announced in %d guild(s)).", len(posts))
         except Exception as e:
             log.error("Failed to create StreamSession in DB", exc_info=e)
 
+    async def _announce_live(self, config, embed: discord.Embed, title: str):
+        discord_channel = self.bot.get_channel(config.stream_updates_channel_id)
+        if not discord_channel:
+            log.warning(
+                "Configured stream updates channel (%d) is invisible to the bot.",
+                config.stream_updates_channel_id,
+            )
+            return None
+
+        msg = await discord_writes.run(
+            discord_channel.id, lambda: discord_channel.send(embed=embed), Priority.GO_LIVE
+        )
+        thread_id = None
+        try:
+            thread = await discord_writes.run(
+                discord_channel.id,
+                lambda: msg.create_thread(name=f"🟢 {self.channel} — {title}"[:100]),
+                Priority.GO_LIVE,
+            )
+            thread_id = thread.id
+        except Exception as e:
+            log.warning("Failed to create thread for go-live message", exc_info=e)
+
+        log.info("Sent go-live announcement to #%s", discord_channel.name)
+        # ref is filled in once the StreamSession row exists.
+        return new_post(PostKind.GO_LIVE, "", config.guild_id, discord_channel.id, msg.id, thread_id)
+
     async def handle_stream_end(self, session_id: int | None = None):
         stream_session = None
 
@@ -222,32 +225,8 @@ class StreamWatcherCog(commands.Cog):
             log.error("Failed to fetch StreamSession for recap", exc_info=e)
             return
 
-        try:
-            async with get_session() as session:
-                config = (
-                    await session.execute(
-                        select(GuildConfig).where(
-                            GuildConfig.stream_updates_channel_id.isnot(None)
-                        )
-                    )
-                ).scalar_one_or_none()
-
-            if not config or not config.stream_updates_channel_id:
-                log.warning("No stream_updates_channel_id configured. Skipping stream summary.")
-                return
-
-            discord_channel = self.bot.get_channel(config.stream_updates_channel_id)
-            if not discord_channel:
-                log.warning(
-                    "Configured stream updates channel (%d) is invisible to the bot. Skipping summary.",
-                    config.stream_updates_channel_id,
-                )
-                return
-        except Exception as e:
-            log.error("Failed to fetch GuildConfig for stream summary", exc_info=e)
-            return
-
-        await post_stream_recap(stream_session, discord_channel)
+        builder, self._recap = self._recap, None
+        await post_stream_recap(stream_session, self.bot, builder)
 
 
 def setup(bot):
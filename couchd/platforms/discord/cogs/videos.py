@@ -3,12 +3,14 @@ import discord
 from discord.ext import commands, tasks
 import logging
 
+from couchd.core import metrics
 from couchd.core.config import settings
 from couchd.core.clients.youtube import YouTubeRSSClient
-from couchd.core.db import get_session
+from couchd.core.guild_config import guild_configs
 from couchd.core.models import GuildConfig
-from couchd.core.constants import BrandColors
-from sqlalchemy import select
+from couchd.core.constants import BrandColors, PostKind
+from couchd.platforms.discord.components.fanout import fan_out, load_posts, new_post, save_posts
+from couchd.platforms.discord.components.scheduler import Priority, discord_writes
 
 log = logging.getLogger(__name__)
 
@@ -29,6 +31,7 @@ class VideoWatcherCog(commands.Cog):
         self.check_youtube_uploads.cancel()
 
     @tasks.loop(minutes=settings.YOUTUBE_POLL_RATE_MINUTES)
+    @metrics.timed("discord.videos.check_youtube_uploads")
     async def check_youtube_uploads(self):
         await self.bot.wait_until_ready()
 
@@ -75,43 +78,61 @@ class VideoWatcherCog(commands.Cog):
             embed.set_image(url=video["thumbnail_url"])
 
         try:
-            async with get_session() as session:
-                stmt = select(GuildConfig).where(
-                    GuildConfig.video_updates_channel_id.isnot(None)
-                )
-                result = await session.execute(stmt)
-                config = result.scalar_one_or_none()
-
-            if not config or not config.video_updates_channel_id:
+            configs = await guild_configs.all_with("video_updates_channel_id")
+            if not configs:
                 log.warning(
                     "No video_updates_channel_id configured. Skipping announcement."
                 )
                 return
 
-            channel = self.bot.get_channel(config.video_updates_channel_id)
-            if not channel:
-                log.warning(
-                    f"Configured video updates channel ({config.video_updates_channel_id}) is invisible to the bot."
-                )
-                return
+            # Skip guilds that already have this video (e.g. re-detected after a restart).
+            posted = await load_posts(PostKind.VIDEO, [video["video_id"]])
+            configs = [c for c in configs if (video["video_id"], c.guild_id) not in posted]
+            posts = await fan_out(
+                configs,
+                lambda config: self._announce_to_guild(config, video, embed),
+                "YouTube video announcement",
+            )
+            await save_posts(posts.values())
+        except Exception as e:
+            log.error("Failed to send YouTube video announcement", exc_info=e)
 
-            mentions = self._build_mentions(config, video)
-            content = (
-                f"{mentions} New video just dropped!"
-                if mentions
-                else "New video just dropped!"
+    async def _announce_to_guild(self, config: GuildConfig, video: dict, embed: discord.Embed):
+        channel = self.bot.get_channel(config.video_updates_channel_id)
+        if not channel:
+            log.warning(
+                f"Configured video updates channel ({config.video_updates_channel_id}) is invisible to the bot."
             )
-            message = await channel.send(content=content, embed=embed)
-            log.info(f"Sent YouTube video announcement to #{channel.name}")
+            return None
+
+        mentions = self._build_mentions(config, video)
+        content = (
+            f"{mentions} New video just dropped!"
+            if mentions
+            else "New video just dropped!"
+        )
+        message = await discord_writes.run(
+            channel.id, lambda: channel.send(content=content, embed=embed), Priority.VIDEOS
+        )
+        log.info(f"Sent YouTube video announcement to #{channel.name}")
 
-            thread = await message.create_thread(
-                name=video["title"][:100],
-                auto_archive_duration=1440,
+        post = new_post(PostKind.VIDEO, video["video_id"], config.guild_id, channel.id, message.id)
+        try:
+            thread = await discord_writes.run(
+                channel.id,
+                lambda: message.create_thread(name=video["title"][:100], auto_archive_duration=1440),
+                Priority.VIDEOS,
+            )
+            post.thread_id = thread.id
+            await discord_writes.run(
+                thread.id,
+                lambda: thread.send("What did you think? Drop your thoughts below!"),
+                Priority.VIDEOS,
             )
-            await thread.send("What did you think? Drop your thoughts below!")
             log.info(f"Created discussion thread: {thread.name}")
         except Exception as e:
-            log.error("Failed to send YouTube video announcement", exc_info=e)
+            log.warning("Failed to create discussion thread for video announcement", exc_info=e)
+        return post
 
 
 def setup(bot):
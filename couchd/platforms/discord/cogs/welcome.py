@@ -3,9 +3,7 @@
 import discord
 import logging
 from discord.ext import commands
-from sqlalchemy import select
-from couchd.core.db import get_session
-from couchd.core.models import GuildConfig
+from couchd.core.guild_config import guild_configs
 from couchd.core.constants import BrandColors
 
 # Get the logger for this specific cog
@@ -30,10 +28,7 @@ class WelcomeCog(commands.Cog):
         guild = member.guild
 
         try:
-            async with get_session() as session:
-                stmt = select(GuildConfig).where(GuildConfig.guild_id == guild.id)
-                result = await session.execute(stmt)
-                config = result.scalar_one_or_none()
+            config = await guild_configs.get(guild.id)
         except Exception as e:
             log.error("Database error while fetching welcome config.", exc_info=e)
             return
@@ -4,8 +4,11 @@ import discord
 from sqlalchemy import select
 
 from couchd.core.db import get_session
-from couchd.core.models import CFProblemAttempt, CFProblemPost, StreamEvent
-from couchd.core.constants import BrandColors, CFProblemsConfig
+from couchd.core.models import CFProblemAttempt, DiscordPost, StreamEvent
+from couchd.core.constants import BrandColors, CFProblemsConfig, PostKind
+from couchd.platforms.discord.components.fanout import load_posts, new_post, save_posts
+from couchd.platforms.discord.components.render_cache import render_cache, render_hash, thread_edits
+from couchd.platforms.discord.components.scheduler import Priority, discord_writes
 
 log = logging.getLogger(__name__)
 
@@ -43,57 +46,64 @@ async def build_cf_embed(problem_id: str):
     return thread_name, embed, attempts
 
 
-async def sync_cf_problem(forum: discord.ForumChannel, problem_id: str, bot) -> None:
-    async with get_session() as db:
-        post = (
-            await db.execute(
-                select(CFProblemPost).where(CFProblemPost.problem_id == problem_id)
-            )
-        ).scalar_one_or_none()
+async def sync_cf_problem(forum: discord.ForumChannel, problem_id: str, bot, guild_id: int) -> None:
+    post = (await load_posts(PostKind.CF_THREAD, [problem_id])).get((problem_id, guild_id))
 
     if post:
-        await _update_cf_thread(forum, problem_id, post, bot)
+        # Debounced: a burst of attempts on one problem becomes a single render pass.
+        thread_edits.schedule(
+            ("cf", post.thread_id), lambda: _update_cf_thread(forum, problem_id, post, bot)
+        )
     else:
-        await _create_cf_thread(forum, problem_id)
+        await _create_cf_thread(forum, problem_id, guild_id)
 
 
-async def _create_cf_thread(forum: discord.ForumChannel, problem_id: str) -> None:
+async def _create_cf_thread(forum: discord.ForumChannel, problem_id: str, guild_id: int) -> None:
     thread_name, embed, _ = await build_cf_embed(problem_id)
     if not embed:
         return
 
     try:
-        thread = await forum.create_thread(
-            name=thread_name,
-            embed=embed,
-            auto_archive_duration=discord.ThreadArchiveDuration.one_week,
+        thread = await discord_writes.run(
+            forum.id,
+            lambda: forum.create_thread(
+                name=thread_name,
+                embed=embed,
+                auto_archive_duration=discord.ThreadArchiveDuration.one_week,
+            ),
+            Priority.FORUM,
         )
-        async with get_session() as db:
-            db.add(CFProblemPost(problem_id=problem_id, forum_thread_id=thread.id))
-            await db.commit()
-        log.info("Created CF forum thread for %s (thread_id=%d)", problem_id, thread.id)
+        render_cache.remember(("thread", thread.id), render_hash(thread_name, embed))
+        await save_posts([new_post(PostKind.CF_THREAD, problem_id, guild_id, forum.id, thread.id, thread.id)])
+        log.info("Created CF forum thread for %s in guild %d (thread_id=%d)", problem_id, guild_id, thread.id)
     except Exception:
-        log.error("Failed to create CF forum thread for %s", problem_id, exc_info=True)
+        log.error("Failed to create CF forum thread for %s in guild %d", problem_id, guild_id, exc_info=True)
 
 
 async def _update_cf_thread(
-    forum: discord.ForumChannel, problem_id: str, post: CFProblemPost, bot
+    forum: discord.ForumChannel, problem_id: str, post: DiscordPost, bot
 ) -> None:
     thread_name, embed, _ = await build_cf_embed(problem_id)
     if not embed:
         return
 
+    key = ("thread", post.thread_id)
+    digest = render_hash(thread_name, embed)
+    if not render_cache.changed(key, digest):
+        return
+
     try:
-        thread = forum.get_thread(post.forum_thread_id)
+        thread = forum.get_thread(post.thread_id)
         if not thread:
-            thread = await bot.fetch_channel(post.forum_thread_id)
-
-        if thread.archived:
-            await thread.edit(archived=False)
+            thread = await bot.fetch_channel(post.thread_id)
 
-        starter_msg = await thread.fetch_message(thread.id)
-        await starter_msg.edit(embed=embed)
-        await thread.edit(name=thread_name)
-        log.info("Updated CF forum thread for %s", problem_id)
+        await discord_writes.run(
+            thread.id, lambda: thread.edit(archived=False, name=thread_name), Priority.FORUM
+        )
+        await discord_writes.run(
+            thread.id, lambda: thread.get_partial_message(thread.id).edit(embed=embed), Priority.FORUM
+        )
+        render_cache.remember(key, digest)
+        log.info("Updated CF forum thread for %s in guild %d", problem_id, post.guild_id)
     except Exception:
-        log.error("Failed to update CF forum thread for %s", problem_id, exc_info=True)
+        log.error("Failed to update CF forum thread for %s in guild %d", problem_id, post.guild_id, exc_info=True)
@@ -0,0 +1,94 @@
+# couchd/platforms/discord/components/fanout.py
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable, Iterable
+
+from sqlalchemy import select
+
+from couchd.core.constants import FanoutConfig, PostKind
+from couchd.core.db import get_session
+from couchd.core.models import DiscordPost, GuildConfig
+
+log = logging.getLogger(__name__)
+
+GuildJob = Callable[[GuildConfig], Awaitable[DiscordPost | None]]
+
+
+async def fan_out(
+    configs: Iterable[GuildConfig],
+    job: GuildJob,
+    label: str,
+    limit: int = FanoutConfig.MAX_CONCURRENT_GUILDS,
+) -> dict[int, DiscordPost]:
+    """
+    Run job(config) for every guild, at most `limit` at a time. A guild whose job raises is
+    logged and skipped without affecting the rest. Returns the posts the jobs produced, by guild id;
+    saving them is up to the caller.
+    """
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(config: GuildConfig) -> tuple[int, DiscordPost | None]:
+        async with semaphore:
+            try:
+                return config.guild_id, await job(config)
+            except Exception:
+                log.error("%s failed for guild %d", label, config.guild_id, exc_info=True)
+                return config.guild_id, None
+
+    results = await asyncio.gather(*(run(c) for c in configs))
+    return {guild_id: post for guild_id, post in results if post is not None}
+
+
+def new_post(
+    kind: PostKind, ref, guild_id: int, channel_id: int, message_id: int, thread_id: int | None = None
+) -> DiscordPost:
+    return DiscordPost(
+        kind=kind.value, ref=str(ref), guild_id=guild_id,
+        channel_id=channel_id, message_id=message_id, thread_id=thread_id,
+    )
+
+
+async def load_posts(kind: PostKind, refs: Iterable) -> dict[tuple[str, int], DiscordPost]:
+    """Existing posts of one kind for the given refs, keyed by (ref, guild_id)."""
+    refs = [str(r) for r in refs]
+    if not refs:
+        return {}
+    async with get_session() as db:
+        rows = (
+            await db.execute(
+                select(DiscordPost).where(
+                    (DiscordPost.kind == kind.value) & DiscordPost.ref.in_(refs)
+                )
+            )
+        ).scalars().all()
+    return {(p.ref, p.guild_id): p for p in rows}
+
+
+async def save_posts(posts: Iterable[DiscordPost]) -> None:
+    posts = list(posts)
+    if not posts:
+        return
+    async with get_session() as db:
+        db.add_all(posts)
+        await db.commit()
+
+
+async def save_first_post(post: DiscordPost, model, row_id: int) -> None:
+    """
+    Save one guild's post for a clip/idea row and point the row's discord_message_id at its
+    lowest guild's post, so the row counts as posted once any guild has it.
+    """
+    async with get_session() as db:
+        db.add(post)
+        await db.flush()
+        first = (
+            await db.execute(
+                select(DiscordPost.message_id)
+                .where((DiscordPost.kind == post.kind) & (DiscordPost.ref == post.ref))
+                .order_by(DiscordPost.guild_id)
+                .limit(1)
+            )
+        ).scalar_one()
+        row = await db.get(model, row_id)
+        row.discord_message_id = first
+        await db.commit()
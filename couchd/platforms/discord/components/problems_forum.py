@@ -1,11 +1,14 @@
 # couchd/platforms/discord/components/problems_forum.py
 import logging
 import discord
-from sqlalchemy import select, func
+from sqlalchemy import String, cast, select, func
 
 from couchd.core.db import get_session
-from couchd.core.models import ProblemPost, ProblemAttempt, SolutionPost, StreamEvent
-from couchd.core.constants import BrandColors, ProblemsConfig
+from couchd.core.models import DiscordPost, ProblemAttempt, SolutionPost, StreamEvent
+from couchd.core.constants import BrandColors, PostKind, ProblemsConfig
+from couchd.platforms.discord.components.fanout import load_posts, new_post, save_posts
+from couchd.platforms.discord.components.render_cache import render_cache, render_hash, thread_edits
+from couchd.platforms.discord.components.scheduler import Priority, discord_writes
 
 log = logging.getLogger(__name__)
 
@@ -67,75 +70,91 @@ def resolve_tags(forum: discord.ForumChannel, difficulty: str | None):
     return [t for t in forum.available_tags if t.name == difficulty]
 
 
-async def create_problem_thread(forum: discord.ForumChannel, slug: str):
+async def create_problem_thread(forum: discord.ForumChannel, slug: str, guild_id: int):
     thread_name, embed, attempts = await build_problem_embed(slug)
     if not embed:
         return None, None
 
     tags = resolve_tags(forum, attempts[0].difficulty if attempts else None)
     try:
-        thread = await forum.create_thread(
-            name=thread_name,
-            embed=embed,
-            applied_tags=tags,
-            auto_archive_duration=discord.ThreadArchiveDuration.one_week,
+        thread = await discord_writes.run(
+            forum.id,
+            lambda: forum.create_thread(
+                name=thread_name,
+                embed=embed,
+                applied_tags=tags,
+                auto_archive_duration=discord.ThreadArchiveDuration.one_week,
+            ),
+            Priority.FORUM,
         )
-        async with get_session() as db:
-            post = ProblemPost(platform_id=slug, forum_thread_id=thread.id)
-            db.add(post)
-            await db.commit()
-            await db.refresh(post)
-        log.info("Created forum thread for %s (thread_id=%d)", slug, thread.id)
+        render_cache.remember(("thread", thread.id), render_hash(thread_name, embed, [t.id for t in tags]))
+        post = new_post(PostKind.LC_THREAD, slug, guild_id, forum.id, thread.id, thread.id)
+        await save_posts([post])
+        log.info("Created forum thread for %s in guild %d (thread_id=%d)", slug, guild_id, thread.id)
         return thread, post
     except Exception:
-        log.error("Failed to create forum thread for %s", slug, exc_info=True)
+        log.error("Failed to create forum thread for %s in guild %d", slug, guild_id, exc_info=True)
         return None, None
 
 
 async def update_problem_thread(
-    forum: discord.ForumChannel, slug: str, post: ProblemPost, bot
+    forum: discord.ForumChannel, slug: str, post: DiscordPost, bot
 ):
     thread_name, embed, attempts = await build_problem_embed(slug)
     if not embed:
         return None
 
     tags = resolve_tags(forum, attempts[0].difficulty if attempts else None)
+    key = ("thread", post.thread_id)
+    digest = render_hash(thread_name, embed, [t.id for t in tags])
     try:
-        thread = forum.get_thread(post.forum_thread_id)
+        thread = forum.get_thread(post.thread_id)
         if not thread:
-            thread = await bot.fetch_channel(post.forum_thread_id)
-
-        if thread.archived:
-            await thread.edit(archived=False)
+            thread = await bot.fetch_channel(post.thread_id)
+        if not render_cache.changed(key, digest):
+            return thread
 
-        starter_msg = await thread.fetch_message(thread.id)
-        await starter_msg.edit(embed=embed)
-        await thread.edit(applied_tags=tags, name=thread_name)
-        log.info("Updated forum thread for %s", slug)
+        # Unarchive and retitle in one call; the starter message shares the thread's id.
+        await discord_writes.run(
+            thread.id, lambda: thread.edit(archived=False, applied_tags=tags, name=thread_name), Priority.FORUM
+        )
+        await discord_writes.run(
+            thread.id, lambda: thread.get_partial_message(thread.id).edit(embed=embed), Priority.FORUM
+        )
+        render_cache.remember(key, digest)
+        log.info("Updated forum thread for %s in guild %d", slug, post.guild_id)
         return thread
     except Exception:
-        log.error("Failed to update forum thread for %s", slug, exc_info=True)
+        log.error("Failed to update forum thread for %s in guild %d", slug, post.guild_id, exc_info=True)
         return None
 
 
-async def sync_problem(forum: discord.ForumChannel, slug: str, bot):
-    async with get_session() as db:
-        post = (
-            await db.execute(
-                select(ProblemPost).where(ProblemPost.platform_id == slug)
-            )
-        ).scalar_one_or_none()
+async def refresh_problem_thread(forum: discord.ForumChannel, slug: str, post: DiscordPost, bot):
+    thread = await update_problem_thread(forum, slug, post, bot)
+    if thread:
+        await sync_solution_comments(thread, slug, post.guild_id)
+
+
+def schedule_problem_refresh(forum: discord.ForumChannel, slug: str, post: DiscordPost, bot) -> None:
+    """Debounced refresh: a burst of updates to one thread becomes a single render pass."""
+    thread_edits.schedule(
+        ("lc", post.thread_id), lambda: refresh_problem_thread(forum, slug, post, bot)
+    )
+
+
+async def sync_problem(forum: discord.ForumChannel, slug: str, bot, guild_id: int):
+    post = (await load_posts(PostKind.LC_THREAD, [slug])).get((slug, guild_id))
 
     if post:
-        thread = await update_problem_thread(forum, slug, post, bot)
-    else:
-        thread, post = await create_problem_thread(forum, slug)
+        schedule_problem_refresh(forum, slug, post, bot)
+        return
 
+    thread, post = await create_problem_thread(forum, slug, guild_id)
     if thread and post:
-        await sync_solution_comments(thread, slug)
+        await sync_solution_comments(thread, slug, guild_id)
 
 
-async def sync_solution_comments(thread: discord.Thread, slug: str):
+async def sync_solution_comments(thread: discord.Thread, slug: str, guild_id: int):
     async with get_session() as db:
         rows = (
             (
@@ -146,55 +165,63 @@ async def sync_solution_comments(thread: discord.Thread, slug: str):
             .scalars()
             .all()
         )
+    posted = await load_posts(PostKind.SOLUTION, [sol.id for sol in rows])
 
     for sol in rows:
         content = (
             f"**{sol.username}** solved this (via {sol.platform})!\n"
             f"[View Submission]({sol.url})"
         )
-        if sol.discord_message_id:
+        digest = render_hash(content)
+        post = posted.get((str(sol.id), guild_id))
+        if post:
+            key = ("message", post.message_id)
+            if not render_cache.changed(key, digest):
+                continue
             try:
-                msg = await thread.fetch_message(sol.discord_message_id)
-                await msg.edit(content=content)
+                partial = thread.get_partial_message(post.message_id)
+                await discord_writes.run(thread.id, lambda: partial.edit(content=content), Priority.FORUM)
+                render_cache.remember(key, digest)
                 continue
             except discord.NotFound:
-                pass  # message deleted — fall through to post new
+                render_cache.forget(key)  # message deleted — fall through to post new
 
-        msg = await thread.send(content)
+        msg = await discord_writes.run(thread.id, lambda: thread.send(content), Priority.FORUM)
+        render_cache.remember(("message", msg.id), digest)
         async with get_session() as db:
-            row = await db.get(SolutionPost, sol.id)
-            row.discord_message_id = msg.id
+            if post:
+                row = await db.get(DiscordPost, post.id)
+                row.message_id = msg.id
+            else:
+                db.add(new_post(PostKind.SOLUTION, sol.id, guild_id, thread.id, msg.id))
             await db.commit()
 
 
-async def flush_pending_solutions(forum: discord.ForumChannel, bot):
+async def flush_pending_solutions(forum: discord.ForumChannel, bot, guild_id: int):
+    """Refresh this guild's threads that have solutions not yet commented there."""
+    commented = (
+        select(DiscordPost.id)
+        .where(
+            (DiscordPost.kind == PostKind.SOLUTION.value)
+            & (DiscordPost.guild_id == guild_id)
+            & (DiscordPost.ref == cast(SolutionPost.id, String))
+        )
+        .exists()
+    )
     async with get_session() as db:
-        slugs = (
+        posts = (
             (
                 await db.execute(
-                    select(SolutionPost.problem_slug)
-                    .distinct()
-                    .where(SolutionPost.discord_message_id.is_(None))
+                    select(DiscordPost).where(
+                        (DiscordPost.kind == PostKind.LC_THREAD.value)
+                        & (DiscordPost.guild_id == guild_id)
+                        & DiscordPost.ref.in_(select(SolutionPost.problem_slug).where(~commented))
+                    )
                 )
             )
             .scalars()
             .all()
         )
 
-    for slug in slugs:
-        async with get_session() as db:
-            post = (
-                await db.execute(
-                    select(ProblemPost).where(ProblemPost.platform_id == slug)
-                )
-            ).scalar_one_or_none()
-        if not post:
-            continue
-        thread = forum.get_thread(post.forum_thread_id)
-        if not thread:
-            try:
-                thread = await bot.fetch_channel(post.forum_thread_id)
-            except Exception:
-                log.warning("Could not fetch thread for slug %s", slug)
-                continue
-        await sync_solution_comments(thread, slug)
+    for post in posts:
+        schedule_problem_refresh(forum, post.ref, post, bot)
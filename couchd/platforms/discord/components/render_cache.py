@@ -0,0 +1,118 @@
+# couchd/platforms/discord/components/render_cache.py
+import asyncio
+import hashlib
+import json
+import logging
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+
+import discord
+
+from couchd.core.constants import ThreadSyncConfig
+
+log = logging.getLogger(__name__)
+
+
+def render_hash(*parts) -> str:
+    """Stable digest of what a message or thread would look like (embeds, content, names, tag ids)."""
+    payload = [p.to_dict() if isinstance(p, discord.Embed) else p for p in parts]
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode()
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+class RenderCache:
+    """
+    Last rendered digest per Discord object, so identical re-renders skip the edit call.
+    In-process and LRU-bounded; after a restart each object is edited once, then cached.
+    """
+
+    def __init__(self, max_entries: int = ThreadSyncConfig.RENDER_CACHE_MAX) -> None:
+        self.max_entries = max_entries
+        self._digests: OrderedDict[Hashable, str] = OrderedDict()
+
+    def changed(self, key: Hashable, digest: str) -> bool:
+        return self._digests.get(key) != digest
+
+    def remember(self, key: Hashable, digest: str) -> None:
+        self._digests[key] = digest
+        self._digests.move_to_end(key)
+        while len(self._digests) > self.max_entries:
+            self._digests.popitem(last=False)
+
+    def forget(self, key: Hashable) -> None:
+        self._digests.pop(key, None)
+
+
+class Debouncer:
+    """
+    Per-key trailing debounce: a job runs `delay` seconds after the last schedule() for its key,
+    and only the most recently scheduled job runs. Jobs for one key never overlap; scheduling
+    while a job runs queues one more run after it.
+    """
+
+    def __init__(self, delay: float = ThreadSyncConfig.DEBOUNCE_SECONDS) -> None:
+        self.delay = delay
+        self._jobs: dict[Hashable, Callable[[], Awaitable[None]]] = {}
+        self._deadlines: dict[Hashable, float] = {}
+        self._timers: dict[Hashable, asyncio.Task] = {}
+        self._running: set[Hashable] = set()
+
+    def schedule(self, key: Hashable, job: Callable[[], Awaitable[None]]) -> None:
+        loop = asyncio.get_running_loop()
+        self._jobs[key] = job
+        self._deadlines[key] = loop.time() + self.delay
+        if key not in self._timers:
+            self._timers[key] = loop.create_task(self._fire(key))
+
+    def pending(self) -> int:
+        return len(self._jobs)
+
+    async def _fire(self, key: Hashable) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            while key in self._jobs:
+                # Every schedule() pushes the deadline back; sleep until it stops moving.
+                while (remaining := self._deadlines[key] - loop.time()) > 0:
+                    await asyncio.sleep(remaining)
+                job = self._jobs.pop(key)
+                del self._deadlines[key]
+                self._running.add(key)
+                try:
+                    await job()
+                except Exception:
+                    log.error("Debounced job for %s failed", key, exc_info=True)
+                finally:
+                    self._running.discard(key)
+        finally:
+            if self._timers.get(key) is asyncio.current_task():
+                del self._timers[key]
+
+    async def flush(self) -> None:
+        """
+        Run every pending job now instead of waiting out its delay. Jobs already running are
+        awaited rather than cancelled, and anything queued behind them runs as soon as they finish.
+        """
+        running = []
+        for key, timer in list(self._timers.items()):
+            if key in self._running:
+                running.append(timer)
+                if key in self._deadlines:
+                    self._deadlines[key] = 0.0
+            else:
+                del self._timers[key]
+                timer.cancel()
+        jobs = {key: job for key, job in self._jobs.items() if key not in self._running}
+        for key in jobs:
+            del self._jobs[key]
+            del self._deadlines[key]
+        for key, job in jobs.items():
+            try:
+                await job()
+            except Exception:
+                log.error("Debounced job for %s failed", key, exc_info=True)
+        if running:
+            await asyncio.gather(*running)
+
+
+render_cache = RenderCache()
+thread_edits = Debouncer()
@@ -0,0 +1,188 @@
+# couchd/platforms/discord/components/scheduler.py
+import asyncio
+import heapq
+import itertools
+import logging
+import random
+import time
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass, field
+from enum import IntEnum
+
+import discord
+
+from couchd.core import metrics
+from couchd.core.constants import DiscordSchedulerConfig
+
+log = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    # Lower runs first when several routes are ready.
+    GO_LIVE = 0     # go-live announcement, stream recap
+    CLIPS = 1
+    VIDEOS = 2
+    FORUM = 3       # problem / CF forum threads and solution comments
+    IDEAS = 4
+    REACTIONS = 5
+
+
+@dataclass
+class SchedulerStats:
+    submitted: int = 0
+    completed: int = 0
+    failed: int = 0
+    retried: int = 0
+    deduplicated: int = 0
+    total_wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+
+
+@dataclass(order=True)
+class _Job:
+    priority: int
+    seq: int
+    route: Hashable = field(compare=False)
+    fn: Callable[[], Awaitable] = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+    key: Hashable | None = field(compare=False, default=None)
+    enqueued_at: float = field(compare=False, default=0.0)
+    attempts: int = field(compare=False, default=0)
+
+
+def _retry_delay(exc: Exception, attempt: int) -> float | None:
+    """Seconds to wait before retrying, or None if the error is not worth retrying."""
+    if isinstance(exc, discord.HTTPException):
+        if exc.status == 429:
+            retry_after = getattr(exc, "retry_after", None)
+            if retry_after:
+                return float(retry_after) + random.uniform(0, DiscordSchedulerConfig.JITTER_SECONDS)
+        elif exc.status < 500:
+            return None
+    elif not isinstance(exc, (asyncio.TimeoutError, OSError)):
+        return None
+    backoff = DiscordSchedulerConfig.BACKOFF_BASE_SECONDS * 2 ** (attempt - 1)
+    return min(backoff, DiscordSchedulerConfig.BACKOFF_MAX_SECONDS) + random.uniform(
+        0, DiscordSchedulerConfig.JITTER_SECONDS
+    )
+
+
+class DiscordScheduler:
+    """
+    Central queue for Discord writes (sends, edits, reactions, thread creation).
+    Jobs on one route (usually a channel id) run one at a time in priority/submission order,
+    so a 429 on one channel only holds that channel back. At most max_concurrency routes run
+    at once. Transient failures (429, 5xx, timeouts) are retried with backoff and jitter while
+    the route stays reserved. A job submitted with a key already queued or running is not
+    queued again; the caller gets the existing job's future.
+    """
+
+    def __init__(self, max_concurrency: int = DiscordSchedulerConfig.MAX_CONCURRENCY) -> None:
+        self.max_concurrency = max_concurrency
+        self.stats = SchedulerStats()
+        self._heap: list[_Job] = []
+        self._seq = itertools.count()
+        self._busy_routes: set[Hashable] = set()
+        self._running: set[asyncio.Task] = set()
+        self._keys: dict[Hashable, asyncio.Future] = {}
+
+    def submit(
+        self,
+        route: Hashable,
+        fn: Callable[[], Awaitable],
+        priority: Priority,
+        *,
+        key: Hashable | None = None,
+    ) -> asyncio.Future:
+        """Queue fn() on route. Returns a future for its result; callers may ignore it."""
+        if key is not None and key in self._keys:
+            self.stats.deduplicated += 1
+            return self._keys[key]
+        future = asyncio.get_running_loop().create_future()
+        # Fire-and-forget callers never read the result; don't let failures warn as unretrieved.
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        if key is not None:
+            self._keys[key] = future
+            future.add_done_callback(lambda _f: self._keys.pop(key, None))
+        heapq.heappush(self._heap, _Job(
+            int(priority), next(self._seq), route, fn, future, key, time.monotonic(),
+        ))
+        self.stats.submitted += 1
+        self._pump()
+        return future
+
+    async def run(self, route: Hashable, fn: Callable[[], Awaitable], priority: Priority):
+        """submit() and wait for the result."""
+        return await self.submit(route, fn, priority)
+
+    def pending(self) -> int:
+        return len(self._heap)
+
+    def _pump(self) -> None:
+        skipped = []
+        while self._heap and len(self._running) < self.max_concurrency:
+            job = heapq.heappop(self._heap)
+            if job.route in self._busy_routes:
+                skipped.append(job)
+                continue
+            self._busy_routes.add(job.route)
+            task = asyncio.get_running_loop().create_task(self._execute(job))
+            self._running.add(task)
+            task.add_done_callback(self._on_done)
+        for job in skipped:
+            heapq.heappush(self._heap, job)
+
+    def _on_done(self, task: asyncio.Task) -> None:
+        self._running.discard(task)
+        self._pump()
+
+    async def _execute(self, job: _Job) -> None:
+        if job.attempts == 0:
+            wait = time.monotonic() - job.enqueued_at
+            self.stats.total_wait_seconds += wait
+            self.stats.max_wait_seconds = max(self.stats.max_wait_seconds, wait)
+        job.attempts += 1
+        try:
+            result = await job.fn()
+        except Exception as exc:
+            delay = _retry_delay(exc, job.attempts)
+            if delay is not None and job.attempts <= DiscordSchedulerConfig.MAX_RETRIES:
+                self.stats.retried += 1
+                log.warning("Discord write on %s failed (%s); retry %d in %.1fs",
+                            job.route, exc, job.attempts, delay)
+                # Keep the route reserved through the backoff; the slot is freed for other routes.
+                asyncio.get_running_loop().call_later(delay, self._requeue, job)
+                return
+            self.stats.failed += 1
+            log.error("Discord write on %s failed", job.route, exc_info=exc)
+            self._busy_routes.discard(job.route)
+            if not job.future.done():
+                job.future.set_exception(exc)
+            return
+        self.stats.completed += 1
+        self._busy_routes.discard(job.route)
+        if not job.future.done():
+            job.future.set_result(result)
+
+    def _requeue(self, job: _Job) -> None:
+        self._busy_routes.discard(job.route)
+        heapq.heappush(self._heap, job)
+        self._pump()
+
+    async def drain(self, timeout: float = DiscordSchedulerConfig.DRAIN_TIMEOUT_SECONDS) -> None:
+        """Wait for queued writes to finish (used on shutdown); gives up after timeout."""
+        deadline = time.monotonic() + timeout
+        while (self._heap or self._running or self._busy_routes) and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+
+
+discord_writes = DiscordScheduler()
+metrics.gauge("couchd_discord_writes_pending", "Discord writes queued or in flight.", lambda: discord_writes.pending())
+metrics.gauge(
+    "couchd_discord_writes_failed_total", "Discord writes that gave up after retries.",
+    lambda: discord_writes.stats.failed, kind="counter",
+)
+metrics.gauge(
+    "couchd_discord_writes_max_wait_seconds", "Longest a Discord write has waited for its route.",
+    lambda: discord_writes.stats.max_wait_seconds,
+)
@@ -1,14 +1,19 @@
 # couchd/platforms/discord/components/streams_recap.py
+import asyncio
 import logging
 from dataclasses import dataclass, field as dc_field
 from datetime import datetime
 
 import discord
 from sqlalchemy import select
+from sqlalchemy.orm import joinedload
 
 from couchd.core.db import get_session
-from couchd.core.models import StreamSession, ProblemAttempt, ProjectLog, StreamEvent, CFProblemAttempt
-from couchd.core.constants import StreamDefaults, BrandColors, MACRO_EVENT_TYPES, EventType, TASK_DONE
+from couchd.core.guild_config import guild_configs
+from couchd.core.models import DiscordPost, StreamSession, StreamEvent
+from couchd.core.constants import StreamDefaults, BrandColors, MACRO_EVENT_TYPES, EventType, PostKind, TASK_DONE
+from couchd.platforms.discord.components.fanout import fan_out, load_posts
+from couchd.platforms.discord.components.scheduler import Priority, discord_writes
 
 log = logging.getLogger(__name__)
 
@@ -102,64 +107,74 @@ def _add_field(embed: discord.Embed, name: str, segs: list[_Segment], renderer)
     embed.add_field(name=name, value=value, inline=False)
 
 
-async def post_stream_recap(stream_session: StreamSession, channel):
+_DETAIL_LOADS = (
+    joinedload(StreamEvent.problem_attempt),
+    joinedload(StreamEvent.cf_problem_attempt),
+    joinedload(StreamEvent.project_log),
+)
+_RECAP_EVENT_TYPES = MACRO_EVENT_TYPES | {EventType.TASK, EventType.CHAT_SPIKE}
+
+
+async def load_recap_events(session_id: int, after_id: int = 0) -> list[StreamEvent]:
+    """Recap-relevant events (with their attempt/project rows) in one outer-join query."""
     async with get_session() as db:
-        all_events = (
+        return (
             await db.execute(
                 select(StreamEvent)
-                .where(StreamEvent.session_id == stream_session.id)
-                .order_by(StreamEvent.timestamp)
+                .options(*_DETAIL_LOADS)
+                .where(
+                    (StreamEvent.session_id == session_id)
+                    & (StreamEvent.id > after_id)
+                    & StreamEvent.event_type.in_(_RECAP_EVENT_TYPES)
+                )
+                .order_by(StreamEvent.timestamp, StreamEvent.id)
             )
         ).scalars().all()
 
-        attempts_by_event = {
-            a.stream_event_id: a
-            for a in (
-                await db.execute(
-                    select(ProblemAttempt)
-                    .join(StreamEvent)
-                    .where(StreamEvent.session_id == stream_session.id)
-                )
-            ).scalars().all()
-        }
-        cf_attempts_by_event = {
-            a.stream_event_id: a
-            for a in (
-                await db.execute(
-                    select(CFProblemAttempt)
-                    .join(StreamEvent)
-                    .where(StreamEvent.session_id == stream_session.id)
-                )
-            ).scalars().all()
-        }
-        projects_by_event = {
-            p.stream_event_id: p
-            for p in (
-                await db.execute(
-                    select(ProjectLog)
-                    .join(StreamEvent)
-                    .where(StreamEvent.session_id == stream_session.id)
-                )
-            ).scalars().all()
-        }
 
-    start = stream_session.start_time
-    segments: list[_Segment] = []
-    for event in all_events:
-        time_str = _format_elapsed(event.timestamp, start) if start else None
+class RecapBuilder:
+    """
+    Incrementally maintained recap segments for one StreamSession.
+    refresh() only loads events newer than the last one seen, so keeping a builder
+    warm during the stream leaves just the tail to fetch when the recap is posted.
+    """
+
+    def __init__(self, session_id: int, start_time: datetime | None) -> None:
+        self.session_id = session_id
+        self.start_time = start_time
+        self.last_event_id = 0
+        self.segments: list[_Segment] = []
+        self.highlights: list[_Segment] = []
+        self._lock = asyncio.Lock()
+
+    def add(self, event: StreamEvent) -> None:
+        self.last_event_id = max(self.last_event_id, event.id)
+        time_str = _format_elapsed(event.timestamp, self.start_time) if self.start_time else None
         if event.event_type in MACRO_EVENT_TYPES:
-            detail = (
-                attempts_by_event.get(event.id)
-                or cf_attempts_by_event.get(event.id)
-                or projects_by_event.get(event.id)
-            )
-            segments.append(_Segment(event.event_type, event.notes, detail, time_str))
+            detail = event.problem_attempt or event.cf_problem_attempt or event.project_log
+            self.segments.append(_Segment(event.event_type, event.notes, detail, time_str))
+        elif event.event_type == EventType.CHAT_SPIKE:
+            self.highlights.append(_Segment(event.event_type, event.notes, None, time_str))
         elif event.event_type == EventType.TASK and event.notes and event.notes.lower() != TASK_DONE:
-            if segments:
-                segments[-1].tasks.append((event.notes, time_str))
+            if self.segments:
+                self.segments[-1].tasks.append((event.notes, time_str))
+
+    async def refresh(self) -> int:
+        """Fold in events added since the last refresh. Returns how many were loaded."""
+        async with self._lock:
+            events = await load_recap_events(self.session_id, self.last_event_id)
+            for event in events:
+                self.add(event)
+            return len(events)
+
+
+async def build_recap_embed(stream_session: StreamSession, builder: RecapBuilder | None = None) -> discord.Embed:
+    if builder is None or builder.session_id != stream_session.id:
+        builder = RecapBuilder(stream_session.id, stream_session.start_time)
+    await builder.refresh()
 
     by_type: dict[str, list[_Segment]] = {}
-    for seg in segments:
+    for seg in builder.segments:
         by_type.setdefault(seg.event_type, []).append(seg)
 
     title = stream_session.title or StreamDefaults.TITLE.value
@@ -193,23 +208,57 @@ async def post_stream_recap(stream_session: StreamSession, channel):
     if EventType.GAME in by_type:
         _add_field(embed, "Gaming", by_type[EventType.GAME], _render_simple)
 
+    if builder.highlights:
+        _add_field(embed, f"Highlights ({len(builder.highlights)} chat spikes)", builder.highlights, _render_simple)
+
+    return embed
+
+
+async def post_stream_recap(stream_session: StreamSession, bot, builder: RecapBuilder | None = None):
+    """Post the recap in every guild with a stream updates channel, in the go-live thread where there is one."""
+    try:
+        configs = await guild_configs.all_with("stream_updates_channel_id")
+    except Exception as e:
+        log.error("Failed to fetch GuildConfig for stream summary", exc_info=e)
+        return
+    if not configs:
+        log.warning("No stream_updates_channel_id configured. Skipping stream summary.")
+        return
+
+    embed = await build_recap_embed(stream_session, builder)
+    live_posts = await load_posts(PostKind.GO_LIVE, [stream_session.id])
+    await fan_out(
+        configs,
+        lambda config: _post_recap(
+            bot, config, embed, live_posts.get((str(stream_session.id), config.guild_id))
+        ),
+        "Stream recap",
+    )
+
+
+async def _post_recap(bot, config, embed: discord.Embed, live_post: DiscordPost | None) -> None:
+    channel = bot.get_channel(config.stream_updates_channel_id)
+    if not channel:
+        log.warning(
+            "Configured stream updates channel (%d) is invisible to the bot. Skipping summary.",
+            config.stream_updates_channel_id,
+        )
+        return
+
     target = channel
-    if stream_session.discord_notification_message_id:
+    if live_post:
         try:
-            live_msg = await channel.fetch_message(
-                stream_session.discord_notification_message_id
-            )
+            live_msg = await channel.fetch_message(live_post.message_id)
             if live_msg.embeds:
                 updated = live_msg.embeds[0].copy()
                 updated.title = (updated.title or "").replace("🟢", "🔴")
-                await live_msg.edit(embed=updated)
+                await discord_writes.run(
+                    channel.id, lambda: live_msg.edit(embed=updated), Priority.GO_LIVE
+                )
             if live_msg.thread:
                 target = live_msg.thread
         except Exception:
             log.warning("Could not fetch go-live message/thread; posting recap to channel.")
 
-    try:
-        await target.send(embed=embed)
-        log.info("Sent stream recap to %s.", getattr(target, "name", str(target.id)))
-    except Exception as e:
-        log.error("Failed to send stream recap embed", exc_info=e)
+    await discord_writes.run(target.id, lambda: target.send(embed=embed), Priority.GO_LIVE)
+    log.info("Sent stream recap to %s.", getattr(target, "name", str(target.id)))
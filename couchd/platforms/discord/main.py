@@ -8,6 +8,12 @@ from discord.ext import commands
 from couchd.core.config import settings
 from couchd.core.logger import setup_logging
 from couchd.core.db import engine, Base
+from couchd.core import metrics
+from couchd.core.clients import http_pool, veil
+from couchd.core.guild_config import guild_configs
+from couchd.core.listener import listener
+from couchd.platforms.discord.components.render_cache import thread_edits
+from couchd.platforms.discord.components.scheduler import discord_writes
 
 if settings.SENTRY_DSN:
     sentry_sdk.init(dsn=settings.SENTRY_DSN)
@@ -26,14 +32,37 @@ intents.members = True
 # We will also need message content intent later for text commands, so let's enable it now.
 intents.message_content = True
 
+
+class CouchBot(commands.Bot):
+    async def close(self):
+        await listener.close()
+        await thread_edits.flush()
+        await discord_writes.drain()
+        await veil.close()
+        await http_pool.close_all()
+        await metrics.stop_server()
+        await super().close()
+
+
 # Pass the configured intents to the bot.
-bot = commands.Bot(command_prefix="/", intents=intents)
+bot = CouchBot(command_prefix="/", intents=intents)
 
 
 @bot.event
 async def on_ready():
     """This event is triggered when the bot successfully connects to Discord."""
     log.info(f"Logged in as {bot.user} (ID: {bot.user.id})")
+    await metrics.start_server()
+    try:
+        await guild_configs.start()
+    except Exception:
+        log.error("Failed to load GuildConfig cache; reads will query the database.", exc_info=True)
+
+
+@bot.listen("on_message")
+async def count_message(message: discord.Message):
+    if not message.author.bot:
+        metrics.chat_messages.inc("discord")
 
 
 def load_cogs():
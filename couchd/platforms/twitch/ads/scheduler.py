@@ -4,6 +4,7 @@ import logging
 from datetime import datetime, timedelta, timezone
 
 from couchd.core.config import settings
+from couchd.core import metrics
 from couchd.core.models import StreamSession
 from couchd.core.constants import AdConfig
 from couchd.core.clients.youtube import YouTubeRSSClient
@@ -59,31 +60,32 @@ class AdScheduler:
         while True:
             await asyncio.sleep(60)
             try:
-                session = await get_active_session()
-                if not session or self._ad_manager.has_pending():
-                    continue
-
-                remaining = await self._ad_manager.get_remaining(session.id, session.start_time)
-                if remaining == 0:
-                    continue
-
-                # Fire when enough time has passed that the full budget has nearly accumulated.
-                # Window is 3600 + req (Twitch 60-min cooldown starts after ad ends).
-                req = self._ad_manager._required_seconds
-                window = self._ad_manager.window_seconds
-                fire_threshold = req * window / (window + req)
-                if remaining < fire_threshold:
-                    continue
-
-                log.info(
-                    "Ad scheduler: remaining=%.0fs >= threshold=%.0fs — scheduling auto-ad (%ds).",
-                    remaining,
-                    fire_threshold,
-                    remaining,
-                )
-                self._ad_manager._pending_task = asyncio.create_task(
-                    self._warn_then_ad(session, self._ad_manager._required_seconds)
-                )
+                with metrics.track("twitch.ad_scheduler"):
+                    session = await get_active_session()
+                    if not session or self._ad_manager.has_pending():
+                        continue
+
+                    remaining = await self._ad_manager.get_remaining(session.id, session.start_time)
+                    if remaining == 0:
+                        continue
+
+                    # Fire when enough time has passed that the full budget has nearly accumulated.
+                    # Window is 3600 + req (Twitch 60-min cooldown starts after ad ends).
+                    req = self._ad_manager._required_seconds
+                    window = self._ad_manager.window_seconds
+                    fire_threshold = req * window / (window + req)
+                    if remaining < fire_threshold:
+                        continue
+
+                    log.info(
+                        "Ad scheduler: remaining=%.0fs >= threshold=%.0fs — scheduling auto-ad (%ds).",
+                        remaining,
+                        fire_threshold,
+                        remaining,
+                    )
+                    self._ad_manager._pending_task = asyncio.create_task(
+                        self._warn_then_ad(session, self._ad_manager._required_seconds)
+                    )
             except Exception:
                 log.error("Error in ad scheduler loop", exc_info=True)
 
@@ -6,7 +6,7 @@ from sqlalchemy import select
 from couchd.core.db import get_session
 from couchd.core.models import StreamEvent, ProblemAttempt, ProjectLog, CFProblemAttempt
 from couchd.core.constants import CommandCooldowns, MACRO_EVENT_TYPES, EventType, TASK_DONE
-from couchd.platforms.twitch.components.cooldowns import CooldownManager
+from couchd.platforms.twitch.components.cooldowns import cooldowns
 from couchd.core.utils import get_active_session
 
 log = logging.getLogger(__name__)
@@ -14,7 +14,7 @@ log = logging.getLogger(__name__)
 
 class ActivityCommands(commands.Component):
     def __init__(self):
-        self.cooldowns = CooldownManager()
+        self.cooldowns = cooldowns
 
     async def _simple_event_command(
         self, ctx: commands.Context, event_type: str, label: str
@@ -7,7 +7,7 @@ from couchd.core.db import get_session
 from couchd.core.models import StreamEvent, CFProblemAttempt
 from couchd.core.constants import CommandCooldowns, EventType
 from couchd.core.clients import codeforces as cf_client
-from couchd.platforms.twitch.components.cooldowns import CooldownManager
+from couchd.platforms.twitch.components.cooldowns import cooldowns
 from couchd.core.utils import get_active_session, compute_vod_timestamp
 
 log = logging.getLogger(__name__)
@@ -15,7 +15,7 @@ log = logging.getLogger(__name__)
 
 class CFCommands(commands.Component):
     def __init__(self):
-        self.cooldowns = CooldownManager()
+        self.cooldowns = cooldowns
 
     @commands.command(name="cf")
     async def cf_command(self, ctx: commands.Context):
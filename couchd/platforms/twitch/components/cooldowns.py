@@ -1,4 +1,4 @@
 # couchd/platforms/twitch/components/cooldowns.py
-from couchd.core.cooldowns import CooldownManager
+from couchd.core.cooldowns import CooldownManager, cooldowns
 
-__all__ = ["CooldownManager"]
+__all__ = ["CooldownManager", "cooldowns"]
@@ -0,0 +1,254 @@
+# couchd/platforms/twitch/components/follow_guard.py
+import asyncio
+import logging
+import re
+import time
+from collections import Counter, deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+
+from couchd.core import metrics
+from couchd.core.clients import veil
+from couchd.core.config import settings
+from couchd.core.constants import FollowGuardConfig
+
+log = logging.getLogger(__name__)
+
+# Logins follow-bot farms tend to mint: word + long number, or a long run of consonants.
+_BOT_LOGIN = re.compile(r"^[a-z]+_?\d{4,}$|[bcdfghjklmnpqrstvwxz]{6,}")
+
+
+@dataclass(slots=True)
+class _Follow:
+    at: float
+    user_id: str
+    login: str
+    prefix: str
+    bot_name: bool          # login matches _BOT_LOGIN
+    patterned: bool         # PREFIX_REPEATS logins in the window share its prefix
+    young: bool = False     # account under YOUNG_ACCOUNT_DAYS old, once the lookup is back
+    suspicious: bool = False
+    live: bool = True       # still in the window
+
+
+@dataclass
+class _Wave:
+    started_at: float
+    follows: int = 0
+    suspicious: int = 0
+    banned: int = 0
+
+
+class FollowGuard:
+    """
+    Sliding window over recent follows, each scored on its login (bot-farm shape, a prefix shared with
+    other follows in the window) and, once a batched Helix lookup returns, its account age. When enough
+    suspicious follows (or simply too many) land in WINDOW_SECONDS the guard switches into defense mode:
+    observe() stops announcing follows until the window stays quiet for CALM_SECONDS, then a single
+    summary goes to veil. Defense can also ban young pattern-named followers and turn on followers-only
+    chat, both through Helix with at most HELIX_CONCURRENCY calls in flight.
+    """
+
+    def __init__(self, bot, clock: Callable[[], float] = time.monotonic) -> None:
+        self._bot = bot
+        self._clock = clock
+        self._window: deque[_Follow] = deque()
+        self._prefixes: Counter[str] = Counter()
+        self._suspicious = 0
+        self._lookups: dict[str, _Follow] = {}     # user id -> follow awaiting its account-age lookup
+        self._banned: set[str] = set()
+        self._helix = asyncio.Semaphore(FollowGuardConfig.HELIX_CONCURRENCY)
+        self._tasks: set[asyncio.Task] = set()
+        self._calm_since: float | None = None
+        self._followers_only = False
+        self.wave: _Wave | None = None
+
+    @property
+    def active(self) -> bool:
+        return self.wave is not None
+
+    def start(self) -> None:
+        self._spawn(self._lookup_loop())
+        self._spawn(self._tick_loop())
+        log.info("FollowGuard: watching follows over a %ds window.", FollowGuardConfig.WINDOW_SECONDS)
+
+    def observe(self, user_id: str, login: str) -> bool:
+        """Record a follow; True when it should be announced, False while a wave is being absorbed."""
+        now = self._clock()
+        self._expire(now)
+        prefix = login[:FollowGuardConfig.PREFIX_CHARS]
+        self._prefixes[prefix] += 1
+        follow = _Follow(
+            at=now,
+            user_id=user_id,
+            login=login,
+            prefix=prefix,
+            bot_name=bool(_BOT_LOGIN.search(login)),
+            patterned=self._prefixes[prefix] >= FollowGuardConfig.PREFIX_REPEATS,
+        )
+        self._window.append(follow)
+        self._lookups[user_id] = follow
+        if follow.bot_name or follow.patterned:
+            self._mark_suspicious(follow)
+        self._check_trip(now)
+
+        if self.wave is None:
+            follows_seen.inc("announced")
+            return True
+        self.wave.follows += 1
+        follows_seen.inc("suppressed")
+        return False
+
+    # ── Window ───────────────────────────────────────────────────────────────
+
+    def _expire(self, now: float) -> None:
+        cutoff = now - FollowGuardConfig.WINDOW_SECONDS
+        while self._window and self._window[0].at <= cutoff:
+            follow = self._window.popleft()
+            follow.live = False
+            self._prefixes[follow.prefix] -= 1
+            if not self._prefixes[follow.prefix]:
+                del self._prefixes[follow.prefix]
+            if follow.suspicious:
+                self._suspicious -= 1
+
+    def _mark_suspicious(self, follow: _Follow) -> None:
+        if follow.suspicious or not follow.live:
+            return
+        follow.suspicious = True
+        self._suspicious += 1
+        if self.wave is not None:
+            self.wave.suspicious += 1
+
+    def _check_trip(self, now: float) -> None:
+        if self.wave is not None:
+            return
+        if (
+            self._suspicious < FollowGuardConfig.TRIP_SUSPICIOUS
+            and len(self._window) < FollowGuardConfig.TRIP_FOLLOWS
+        ):
+            return
+        self.wave = _Wave(started_at=now, suspicious=self._suspicious)
+        self._calm_since = None
+        log.warning(
+            "FollowGuard: follow-bot wave detected (%d follows, %d suspicious in %ds) — muting follow alerts.",
+            len(self._window), self._suspicious, FollowGuardConfig.WINDOW_SECONDS,
+        )
+        if settings.FOLLOW_DEFENSE_FOLLOWERS_ONLY:
+            self._spawn(self._set_followers_only(True))
+        for follow in self._window:
+            self._maybe_ban(follow)
+
+    def tick(self) -> None:
+        """Expire the window and stand down once it has stayed quiet for CALM_SECONDS."""
+        now = self._clock()
+        self._expire(now)
+        if self.wave is None:
+            return
+        if len(self._window) > FollowGuardConfig.EXIT_FOLLOWS:
+            self._calm_since = None
+            return
+        if self._calm_since is None:
+            self._calm_since = now
+        if now - self._calm_since < FollowGuardConfig.CALM_SECONDS:
+            return
+        wave, self.wave = self.wave, None
+        self._banned.clear()
+        summary = {
+            "follows": wave.follows,
+            "suspicious": wave.suspicious,
+            "banned": wave.banned,
+            "seconds": int(now - wave.started_at),
+        }
+        log.warning("FollowGuard: wave over — %s.", summary)
+        self._spawn(veil.post_event("twitch.follower.wave", summary))
+        if self._followers_only:
+            self._spawn(self._set_followers_only(False))
+
+    # ── Helix ────────────────────────────────────────────────────────────────
+
+    async def _lookup_loop(self) -> None:
+        while True:
+            await asyncio.sleep(FollowGuardConfig.LOOKUP_INTERVAL_SECONDS)
+            while self._lookups:
+                batch = dict(islice(self._lookups.items(), FollowGuardConfig.LOOKUP_BATCH))
+                for user_id in batch:
+                    del self._lookups[user_id]
+                try:
+                    self.apply_lookup(batch, await self._bot.fetch_users(ids=list(batch)))
+                except Exception:
+                    log.error("FollowGuard: account lookup for %d follower(s) failed", len(batch), exc_info=True)
+
+    def apply_lookup(self, batch: dict[str, _Follow], users) -> None:
+        """Fold fetched accounts into their follows: young ones turn suspicious and may be banned."""
+        young_after = datetime.now(timezone.utc) - timedelta(days=FollowGuardConfig.YOUNG_ACCOUNT_DAYS)
+        for user in users:
+            follow = batch.get(str(user.id))
+            if follow is None or user.created_at < young_after:
+                continue
+            follow.young = True
+            self._mark_suspicious(follow)
+            self._maybe_ban(follow)
+        self._check_trip(self._clock())
+
+    async def _tick_loop(self) -> None:
+        while True:
+            await asyncio.sleep(FollowGuardConfig.TICK_SECONDS)
+            try:
+                self.tick()
+            except Exception:
+                log.error("Error in FollowGuard tick", exc_info=True)
+
+    def _maybe_ban(self, follow: _Follow) -> None:
+        """Ban only a young account with a bot-farm login, and only while a wave is on."""
+        if (
+            self.wave is None
+            or not settings.FOLLOW_DEFENSE_BANS
+            or not follow.young
+            or not (follow.bot_name or follow.patterned)
+            or follow.user_id in self._banned
+        ):
+            return
+        self._banned.add(follow.user_id)
+        self._spawn(self._ban(follow))
+
+    async def _ban(self, follow: _Follow) -> None:
+        async with self._helix:
+            try:
+                broadcaster = self._bot.create_partialuser(user_id=settings.TWITCH_OWNER_ID)
+                await broadcaster.ban_user(
+                    moderator=settings.TWITCH_BOT_ID, user=follow.user_id, reason=FollowGuardConfig.BAN_REASON,
+                )
+                follow_bans.inc()
+                if self.wave is not None:
+                    self.wave.banned += 1
+                log.info("FollowGuard: banned %s.", follow.login)
+            except Exception:
+                log.error("FollowGuard: failed to ban %s", follow.login, exc_info=True)
+
+    async def _set_followers_only(self, enabled: bool) -> None:
+        async with self._helix:
+            try:
+                broadcaster = self._bot.create_partialuser(user_id=settings.TWITCH_OWNER_ID)
+                await broadcaster.update_chat_settings(
+                    moderator=settings.TWITCH_BOT_ID,
+                    follower_mode=enabled,
+                    follower_mode_duration=FollowGuardConfig.FOLLOWERS_ONLY_MINUTES if enabled else None,
+                )
+                self._followers_only = enabled
+                log.info("FollowGuard: followers-only chat %s.", "on" if enabled else "off")
+            except Exception:
+                log.error("FollowGuard: failed to switch followers-only chat", exc_info=True)
+
+    def _spawn(self, coro) -> None:
+        task = asyncio.get_running_loop().create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+
+follows_seen = metrics.counter(
+    "couchd_twitch_follows_total", "Follows received, by whether they were announced.", ("outcome",),
+)
+follow_bans = metrics.counter("couchd_twitch_follow_bans_total", "Accounts banned during follow-bot waves.")
@@ -5,20 +5,53 @@ from twitchio.ext import commands
 from couchd.core.db import get_session
 from couchd.core import socials
 from couchd.core.config import settings
-from couchd.core.models import StreamEvent, ClipLog, IdeaPost
+from couchd.core.models import StreamEvent, StreamSession, ClipLog, IdeaPost
 from couchd.core.clients.youtube import YouTubeRSSClient
 from couchd.core.constants import CommandCooldowns, ClipConfig
-from couchd.platforms.twitch.components.cooldowns import CooldownManager
+from couchd.platforms.twitch.components.cooldowns import cooldowns
 from couchd.core.utils import get_active_session, compute_vod_timestamp
 
 log = logging.getLogger(__name__)
 
 
+async def create_clip(bot: commands.Bot, session: StreamSession, title: str, clipped_by: str) -> str:
+    """Clip the broadcast and log it against the session. Returns the clip URL; raises if Twitch refuses."""
+    users = await bot.fetch_users(ids=[settings.TWITCH_OWNER_ID])
+    created = await users[0].create_clip(
+        token_for=settings.TWITCH_OWNER_ID,
+        title=title,
+        duration=ClipConfig.DURATION,
+    )
+    url = ClipConfig.URL_BASE + created.id
+    vod_ts = compute_vod_timestamp(session.start_time)
+
+    try:
+        async with get_session() as db:
+            event = StreamEvent(session_id=session.id, event_type="clip")
+            db.add(event)
+            await db.flush()
+            db.add(
+                ClipLog(
+                    stream_event_id=event.id,
+                    clip_id=created.id,
+                    title=title,
+                    url=url,
+                    clipped_by=clipped_by,
+                    platform="twitch",
+                    vod_timestamp=vod_ts,
+                )
+            )
+            await db.commit()
+    except Exception:
+        log.error("DB error logging clip", exc_info=True)
+    return url
+
+
 class GeneralCommands(commands.Component):
     def __init__(self, bot: commands.Bot, youtube_client: YouTubeRSSClient | None):
         self.bot = bot
         self.youtube_client = youtube_client
-        self.cooldowns = CooldownManager()
+        self.cooldowns = cooldowns
 
     @commands.command(name="commands")
     async def commands_list(self, ctx: commands.Context):
@@ -64,40 +97,12 @@ class GeneralCommands(commands.Component):
             return
 
         try:
-            users = await self.bot.fetch_users(ids=[settings.TWITCH_OWNER_ID])
-            created = await users[0].create_clip(
-                token_for=settings.TWITCH_OWNER_ID,
-                title=title,
-                duration=ClipConfig.DURATION,
-            )
+            url = await create_clip(self.bot, active_session, title, ctx.author.name)
         except Exception:
             log.error("Failed to create Twitch clip", exc_info=True)
             await ctx.reply("❌ Could not create clip.")
             return
 
-        url = ClipConfig.URL_BASE + created.id
-        vod_ts = compute_vod_timestamp(active_session.start_time)
-
-        try:
-            async with get_session() as db:
-                event = StreamEvent(session_id=active_session.id, event_type="clip")
-                db.add(event)
-                await db.flush()
-                db.add(
-                    ClipLog(
-                        stream_event_id=event.id,
-                        clip_id=created.id,
-                        title=title,
-                        url=url,
-                        clipped_by=ctx.author.name,
-                        platform="twitch",
-                        vod_timestamp=vod_ts,
-                    )
-                )
-                await db.commit()
-        except Exception:
-            log.error("DB error logging clip", exc_info=True)
-
         await ctx.reply(f"✂️ Clip created: {url}")
         log.info("Clip created: %s (%s)", title, url)
 
@@ -5,14 +5,15 @@ import twitchio
 from twitchio.ext import commands
 from sqlalchemy import select
 
+from couchd.core.chat_archive import ChatArchive
+from couchd.core.chat_velocity import ChatVelocity
 from couchd.core.config import settings
 from couchd.core.db import get_session
-from couchd.core.models import StreamEvent, ProblemAttempt, SolutionPost, ProblemPost
+from couchd.core.models import StreamEvent, ProblemAttempt, SolutionPost, DiscordPost
 from couchd.core.clients.leetcode import LeetCodeClient
-from couchd.core.constants import CommandCooldowns, HoldSource
+from couchd.core.constants import CommandCooldowns, Platform, PostKind
 from couchd.core.moderation import ModerationEngine
-from couchd.platforms.twitch.components.metrics_tracker import ChatVelocityTracker
-from couchd.platforms.twitch.components.cooldowns import CooldownManager
+from couchd.platforms.twitch.components.cooldowns import cooldowns
 from couchd.core.utils import get_active_session, compute_vod_timestamp
 from couchd.core.clients import veil
 
@@ -27,20 +28,22 @@ class LCCommands(commands.Component):
     def __init__(
         self,
         lc_client: LeetCodeClient,
-        metrics_tracker: ChatVelocityTracker,
+        metrics_tracker: ChatVelocity,
         mod_engine: ModerationEngine,
+        chat_archive: ChatArchive | None = None,
     ):
         self.lc_client = lc_client
         self.metrics_tracker = metrics_tracker
         self.mod_engine = mod_engine
-        self.cooldowns = CooldownManager()
+        self.chat_archive = chat_archive
+        self.cooldowns = cooldowns
 
     @commands.Component.listener()
     async def event_message(self, payload: twitchio.ChatMessage) -> None:
         if payload.chatter.id == settings.TWITCH_BOT_ID:
             return
         log.info(f"[CHAT] {payload.chatter.name}: {payload.text}")
-        self.metrics_tracker.record_message()
+        self.metrics_tracker.record(Platform.TWITCH)
         await self._check_solution_url(payload)
 
         chat_payload = {
@@ -57,10 +60,24 @@ class LCCommands(commands.Component):
             ],
         }
 
-        if self.mod_engine.is_flagged(payload.text):
-            self.mod_engine.add_pending(payload.id, chat_payload, HoldSource.BONELESS_COUCH)
-            log.info("[MOD] Held message %s from %s", payload.id, payload.chatter.name)
-            await veil.post_event("modqueue.pending", {**chat_payload, "hold_sources": [HoldSource.BONELESS_COUCH]})
+        if self.chat_archive:
+            self.chat_archive.record(
+                Platform.TWITCH,
+                payload.id,
+                payload.chatter.id,
+                payload.chatter.name,
+                payload.text,
+                chat_payload["fragments"],
+                payload.timestamp,
+            )
+
+        hold_source = self.mod_engine.screen(
+            payload.chatter.id, payload.text, trusted=payload.chatter.moderator or payload.chatter.broadcaster
+        )
+        if hold_source:
+            self.mod_engine.hold(payload.id, chat_payload, hold_source)
+            log.info("[MOD] Held message %s from %s (%s)", payload.id, payload.chatter.name, hold_source)
+            await veil.post_event("modqueue.pending", {**chat_payload, "hold_sources": [hold_source]})
             return
 
         await veil.post_event("twitch.chat.message", chat_payload)
@@ -83,9 +100,15 @@ class LCCommands(commands.Component):
 
         async with get_session() as db:
             if slug:
+                # Any guild's forum thread for the problem makes it eligible.
                 post = (
                     await db.execute(
-                        select(ProblemPost).where(ProblemPost.platform_id == slug)
+                        select(DiscordPost.id)
+                        .where(
+                            (DiscordPost.kind == PostKind.LC_THREAD.value)
+                            & (DiscordPost.ref == slug)
+                        )
+                        .limit(1)
                     )
                 ).scalar_one_or_none()
                 if not post:
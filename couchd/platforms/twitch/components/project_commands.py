@@ -7,7 +7,7 @@ from couchd.core.db import get_session
 from couchd.core.models import StreamEvent, ProjectLog
 from couchd.core.clients.github import GitHubClient
 from couchd.core.constants import CommandCooldowns
-from couchd.platforms.twitch.components.cooldowns import CooldownManager
+from couchd.platforms.twitch.components.cooldowns import cooldowns
 from couchd.core.utils import get_active_session
 
 log = logging.getLogger(__name__)
@@ -16,7 +16,7 @@ log = logging.getLogger(__name__)
 class ProjectCommands(commands.Component):
     def __init__(self, github_client: GitHubClient):
         self.github_client = github_client
-        self.cooldowns = CooldownManager()
+        self.cooldowns = cooldowns
 
     @commands.command(name="project")
     async def project_command(self, ctx: commands.Context):
@@ -3,6 +3,7 @@ import asyncio
 import logging
 
 from couchd.core.config import settings
+from couchd.core import metrics
 from couchd.core import socials
 from couchd.core.utils import get_active_session
 from couchd.platforms.twitch.components.utils import send_chat_message
@@ -32,10 +33,11 @@ class ChatTimers:
         while True:
             await asyncio.sleep(interval)
             try:
-                if not await get_active_session():
-                    continue
-                msg = self._messages[self._index % len(self._messages)]
-                self._index += 1
-                await send_chat_message(self._bot, msg)
+                with metrics.track("twitch.chat_timers"):
+                    if not await get_active_session():
+                        continue
+                    msg = self._messages[self._index % len(self._messages)]
+                    self._index += 1
+                    await send_chat_message(self._bot, msg)
             except Exception:
                 log.error("Error in Twitch chat timer loop", exc_info=True)
@@ -1,40 +1,52 @@
 # couchd/platforms/twitch/main.py
 import asyncio
-import json
 import logging
 from datetime import datetime, timezone
 import twitchio
 from twitchio import eventsub
 from twitchio.ext import commands
 from twitchio.ext.commands.exceptions import CommandNotFound
-from sqlalchemy import select, text
+from sqlalchemy import select
 
 import sentry_sdk
 from couchd.core.config import settings
 from couchd.core.logger import setup_logging
 from couchd.core.db import get_session
 from couchd.core.models import StreamSession, ViewerInteraction
-from couchd.core.constants import ChatMetrics, HoldSource, InteractionType, RaidConfig
+from couchd.core.constants import ChatMetrics, HoldSource, InteractionType, Platform, RaidConfig, SpikeConfig
 from couchd.core.moderation import ModerationEngine
 from couchd.core.clients.twitch import TwitchClient
 from couchd.core.clients.emotes import EmoteClient
 from couchd.core.clients.youtube import YouTubeRSSClient
 from couchd.core.clients.leetcode import LeetCodeClient
 from couchd.core.clients.github import GitHubClient
-from couchd.core.clients import veil
+from couchd.core.clients import veil, veil_outbox
 from couchd.core.clients import streamelements
+from couchd.core.clients import http_pool
+from couchd.core import metrics
 from couchd.platforms.twitch.ads.manager import AdBudgetManager
 from couchd.platforms.twitch.ads.scheduler import AdScheduler
-from couchd.platforms.twitch.components.metrics_tracker import ChatVelocityTracker
 from couchd.platforms.twitch.components.lc_commands import LCCommands
 from couchd.platforms.twitch.components.project_commands import ProjectCommands
 from couchd.platforms.twitch.components.activity_commands import ActivityCommands
 from couchd.platforms.twitch.components.ad_commands import AdCommands
-from couchd.platforms.twitch.components.general_commands import GeneralCommands
+from couchd.platforms.twitch.components.general_commands import GeneralCommands, create_clip
 from couchd.platforms.twitch.components.alert_commands import AlertCommands
 from couchd.platforms.twitch.components.cf_commands import CFCommands
 from couchd.platforms.twitch.components.timers import ChatTimers
-from couchd.core.utils import get_active_session, get_overlay_stats
+from couchd.platforms.twitch.components.follow_guard import FollowGuard
+from couchd.core.batch_writer import BatchWriter
+from couchd.core.chat_archive import ChatArchive
+from couchd.core.chat_spikes import Spike, run_spike_monitor
+from couchd.core.chat_velocity import chat_velocity
+from couchd.core.bus import StreamOffline, StreamOnline, publish as bus_publish
+from couchd.core.listener import listener
+from couchd.core.overlay import OverlayState
+from couchd.core.utils import (
+    enable_active_session_cache,
+    get_active_session,
+    invalidate_active_session,
+)
 from couchd.platforms.twitch.components.utils import send_chat_message
 from couchd.platforms.twitch.components.welcome_messages import (
     follow_message,
@@ -50,6 +62,7 @@ if settings.SENTRY_DSN:
     sentry_sdk.init(dsn=settings.SENTRY_DSN)
 
 setup_logging(webhook_url=settings.BOT_LOGS_WEBHOOK_URL, bot_name="twitch")
+veil_outbox.set_owner(Platform.TWITCH.value)
 log = logging.getLogger(__name__)
 
 
@@ -105,19 +118,32 @@ class TwitchBot(commands.Bot):
         )
         self.lc_client = LeetCodeClient()
         self.ad_manager = AdBudgetManager(settings.TWITCH_AD_MINUTES_PER_HOUR)
-        self.metrics_tracker = ChatVelocityTracker()
+        self.metrics_tracker = chat_velocity
         self.github_client = GitHubClient()
         self.twitch_client = TwitchClient()
         self.emote_client = EmoteClient()
         self.youtube_client = YouTubeRSSClient() if settings.YOUTUBE_CHANNEL_ID else None
         self.ad_scheduler = AdScheduler(self, self.ad_manager, self.youtube_client)
         self.chat_timers = ChatTimers(self)
-        self.mod_engine = ModerationEngine(settings.MODERATION_PATTERNS)
+        self.follow_guard = FollowGuard(self)
+        self.mod_engine = ModerationEngine(settings.MODERATION_PATTERNS, platform=Platform.TWITCH)
+        self.interaction_writer = BatchWriter(ViewerInteraction)
+        self.overlay_state = OverlayState(self.interaction_writer)
+        self.chat_archive = ChatArchive() if settings.CHAT_ARCHIVE_ENABLED else None
 
     async def setup_hook(self) -> None:
+        await metrics.start_server()
         await self.lc_client.load_ratings()
+        await enable_active_session_cache()
+        await self.mod_engine.start()
+        try:
+            await self.overlay_state.hydrate()
+        except Exception:
+            log.error("Failed to hydrate overlay stats — will retry on next push.", exc_info=True)
 
-        await self.add_component(LCCommands(self.lc_client, self.metrics_tracker, self.mod_engine))
+        await self.add_component(
+            LCCommands(self.lc_client, self.metrics_tracker, self.mod_engine, self.chat_archive)
+        )
         await self.add_component(ProjectCommands(self.github_client))
         await self.add_component(ActivityCommands())
         await self.add_component(AdCommands(self, self.ad_manager, self.youtube_client))
@@ -143,6 +169,17 @@ class TwitchBot(commands.Bot):
                     e,
                 )
 
+    async def close(self, **options) -> None:
+        await listener.close()
+        await self.interaction_writer.close()
+        await self.mod_engine.close()
+        if self.chat_archive:
+            await self.chat_archive.close()
+        await veil.close()
+        await http_pool.close_all()
+        await metrics.stop_server()
+        await super().close(**options)
+
     async def event_ready(self) -> None:
         log.info("-" * 40)
         log.info("Twitch Bot is ONLINE!")
@@ -151,7 +188,9 @@ class TwitchBot(commands.Bot):
         log.info("-" * 40)
         self.ad_scheduler.start()
         self.chat_timers.start()
+        self.follow_guard.start()
         asyncio.create_task(self._run_metrics_loop())
+        asyncio.create_task(run_spike_monitor(Platform.TWITCH, on_start=self._on_chat_spike))
         asyncio.create_task(self._check_live_on_ready())
         asyncio.create_task(veil.listen_decisions(
             self._on_modqueue_decision,
@@ -159,6 +198,22 @@ class TwitchBot(commands.Bot):
         ))
         asyncio.create_task(streamelements.listen_tips(self._on_tip))
 
+    async def _on_chat_spike(self, spike: Spike) -> None:
+        """Mark and/or clip a chat burst while it is still on screen, if enabled."""
+        if settings.CHAT_SPIKE_MARKERS:
+            try:
+                owner = self.create_partialuser(user_id=settings.TWITCH_OWNER_ID)
+                await owner.create_stream_marker(token_for=settings.TWITCH_OWNER_ID, description=spike.describe())
+            except Exception:
+                log.warning("Could not create stream marker for chat spike", exc_info=True)
+        if settings.CHAT_SPIKE_CLIPS:
+            session = await get_active_session()
+            if session:
+                try:
+                    spike.clip_url = await create_clip(self, session, SpikeConfig.CLIP_TITLE, "chat spike")
+                except Exception:
+                    log.warning("Could not clip chat spike", exc_info=True)
+
     async def _check_live_on_ready(self) -> None:
         """On startup, notify Discord if stream is already live (handles mid-stream restarts)."""
         try:
@@ -172,20 +227,22 @@ class TwitchBot(commands.Bot):
                 log.info("Startup live-check: %s is offline.", settings.TWITCH_CHANNEL)
                 return
 
-            log.info("Startup live-check: stream already live — firing stream_online notify.")
-            notify_payload = json.dumps({
-                "title": stream_data.get("title", ""),
-                "category": stream_data.get("game_name", ""),
-                "thumbnail_url": stream_data.get("thumbnail_url", ""),
-            })
-            async with get_session() as db:
-                await db.execute(text("SELECT pg_notify('stream_online', :p)"), {"p": notify_payload})
+            log.info("Startup live-check: stream already live — publishing StreamOnline.")
+            await bus_publish(StreamOnline(
+                platform=Platform.TWITCH.value,
+                title=stream_data.get("title", ""),
+                category=stream_data.get("game_name", ""),
+                thumbnail_url=stream_data.get("thumbnail_url", ""),
+            ))
         except Exception:
             log.error("Error in startup live-check", exc_info=True)
 
     async def _push_overlay_stats(self) -> None:
         try:
-            stats = await get_overlay_stats()
+            if not self.overlay_state.hydrated:
+                await self.interaction_writer.flush()
+                await self.overlay_state.hydrate()
+            stats = self.overlay_state.snapshot()
             await veil.post_event("stream.stats.bootstrap", stats)
             log.info("Pushed overlay stats to veil.")
         except Exception:
@@ -242,14 +299,14 @@ class TwitchBot(commands.Bot):
         self.ad_scheduler.fire_opener()
 
         stream_data = await self.twitch_client.get_stream_status(settings.TWITCH_CHANNEL)
-        notify_payload = json.dumps({
-            "title": stream_data.get("title", "") if stream_data else "",
-            "category": stream_data.get("game_name", "") if stream_data else "",
-            "thumbnail_url": stream_data.get("thumbnail_url", "") if stream_data else "",
-        })
-        async with get_session() as db:
-            await db.execute(text("SELECT pg_notify('stream_online', :p)"), {"p": notify_payload})
-        log.info("Notified stream_online.")
+        stream_data = stream_data or {}
+        await bus_publish(StreamOnline(
+            platform=Platform.TWITCH.value,
+            title=stream_data.get("title", ""),
+            category=stream_data.get("game_name", ""),
+            thumbnail_url=stream_data.get("thumbnail_url", ""),
+        ))
+        log.info("Published StreamOnline.")
 
     async def _trigger_offline(self) -> None:
         async with get_session() as db:
@@ -265,11 +322,9 @@ class TwitchBot(commands.Bot):
             session.is_active = False
             session.end_time = datetime.now(timezone.utc)
             log.info("Marked StreamSession id=%d as inactive.", session.id)
-            await db.execute(
-                text("SELECT pg_notify('stream_offline', :p)"),
-                {"p": json.dumps({"session_id": session.id})},
-            )
-        log.info("Notified stream_offline.")
+            await bus_publish(StreamOffline(platform=Platform.TWITCH.value, session_id=session.id), db)
+        invalidate_active_session(Platform.TWITCH)
+        log.info("Published StreamOffline.")
 
     async def event_stream_offline(self, _payload: twitchio.StreamOffline) -> None:
         log.info("Stream offline — closing session and notifying Discord bot.")
@@ -310,13 +365,12 @@ class TwitchBot(commands.Bot):
 
     async def event_automod_message_hold(self, payload: twitchio.AutomodMessageHold) -> None:
         mid = payload.message_id
-        if self.mod_engine.has(mid):
-            pending = self.mod_engine.add_hold_source(mid, HoldSource.TWITCH_AUTOMOD)
-            if pending:
-                await veil.post_event("modqueue.update", {
-                    "message_id": mid,
-                    "hold_sources": pending.hold_sources,
-                })
+        pending = await self.mod_engine.add_source(mid, HoldSource.TWITCH_AUTOMOD)
+        if pending:
+            await veil.post_event("modqueue.update", {
+                "message_id": mid,
+                "hold_sources": pending.hold_sources,
+            })
         else:
             chat_payload = {
                 "message_id": mid,
@@ -327,7 +381,7 @@ class TwitchBot(commands.Bot):
                 "badges": [],
                 "platform": "twitch",
             }
-            self.mod_engine.add_pending(mid, chat_payload, HoldSource.TWITCH_AUTOMOD)
+            self.mod_engine.hold(mid, chat_payload, HoldSource.TWITCH_AUTOMOD)
             await veil.post_event("modqueue.pending", {
                 **chat_payload,
                 "hold_sources": [HoldSource.TWITCH_AUTOMOD],
@@ -335,9 +389,8 @@ class TwitchBot(commands.Bot):
 
     async def event_automod_message_update(self, payload: twitchio.AutomodMessageUpdate) -> None:
         mid = payload.message_id
-        if not self.mod_engine.has(mid):
+        if await self.mod_engine.resolve(mid, payload.status.lower()) is None:
             return
-        self.mod_engine.pop(mid)
         await veil.post_event("modqueue.resolved", {
             "message_id": mid,
             "resolution": payload.status.lower(),
@@ -346,7 +399,7 @@ class TwitchBot(commands.Bot):
     async def _on_modqueue_decision(self, message_id: str, decision: str, platform: str) -> None:
         if platform != "twitch":
             return
-        pending = self.mod_engine.get(message_id)
+        pending = await self.mod_engine.resolve(message_id, decision)
         if not pending:
             return
         if HoldSource.TWITCH_AUTOMOD in pending.hold_sources:
@@ -362,7 +415,19 @@ class TwitchBot(commands.Bot):
                         log.info("AutoMod denied message %s via Twitch API.", message_id)
             except Exception:
                 log.error("Failed to call Twitch AutoMod API for %s", message_id, exc_info=True)
-        self.mod_engine.pop(message_id)
+
+    def _record_interaction(
+        self, session: StreamSession | None, interaction_type: InteractionType, **fields
+    ) -> None:
+        """Queue a ViewerInteraction row and fold it into the in-memory overlay stats."""
+        row = {
+            "session_id": session.id if session else None,
+            "interaction_type": interaction_type.value,
+            "timestamp": fields.pop("timestamp", None) or datetime.now(timezone.utc),
+            **fields,
+        }
+        self.interaction_writer.add(row)
+        self.overlay_state.apply(row)
 
     async def event_subscription(self, payload: twitchio.ChannelSubscribe) -> None:
         if payload.gift:
@@ -375,14 +440,13 @@ class TwitchBot(commands.Bot):
         })
         await send_chat_message(self, sub_message(payload.user.display_name, payload.tier))
         session = await get_active_session()
-        async with get_session() as db:
-            db.add(ViewerInteraction(
-                session_id=session.id if session else None,
-                interaction_type=InteractionType.SUB,
-                username=payload.user.name,
-                display_name=payload.user.display_name,
-                tier=payload.tier,
-            ))
+        self._record_interaction(
+            session,
+            InteractionType.SUB,
+            username=payload.user.name,
+            display_name=payload.user.display_name,
+            tier=payload.tier,
+        )
 
     async def event_subscription_message(self, payload: twitchio.ChannelSubscriptionMessage) -> None:
         await veil.post_event("twitch.resub", {
@@ -395,16 +459,15 @@ class TwitchBot(commands.Bot):
         })
         await send_chat_message(self, resub_message(payload.user.display_name, payload.cumulative_months, payload.tier))
         session = await get_active_session()
-        async with get_session() as db:
-            db.add(ViewerInteraction(
-                session_id=session.id if session else None,
-                interaction_type=InteractionType.RESUB,
-                username=payload.user.name,
-                display_name=payload.user.display_name,
-                tier=payload.tier,
-                cumulative_months=payload.cumulative_months,
-                streak_months=payload.streak_months,
-            ))
+        self._record_interaction(
+            session,
+            InteractionType.RESUB,
+            username=payload.user.name,
+            display_name=payload.user.display_name,
+            tier=payload.tier,
+            cumulative_months=payload.cumulative_months,
+            streak_months=payload.streak_months,
+        )
 
     async def event_subscription_gift(self, payload: twitchio.ChannelSubscriptionGift) -> None:
         gifter = payload.user
@@ -417,15 +480,14 @@ class TwitchBot(commands.Bot):
         })
         await send_chat_message(self, giftbomb_message(gifter_name, payload.total))
         session = await get_active_session()
-        async with get_session() as db:
-            db.add(ViewerInteraction(
-                session_id=session.id if session else None,
-                interaction_type=InteractionType.GIFTBOMB,
-                username=gifter.name if gifter else None,
-                display_name=gifter.display_name if gifter else None,
-                tier=payload.tier,
-                gift_count=payload.total,
-            ))
+        self._record_interaction(
+            session,
+            InteractionType.GIFTBOMB,
+            username=gifter.name if gifter else None,
+            display_name=gifter.display_name if gifter else None,
+            tier=payload.tier,
+            gift_count=payload.total,
+        )
 
     async def event_cheer(self, payload: twitchio.ChannelCheer) -> None:
         user = payload.user
@@ -438,14 +500,13 @@ class TwitchBot(commands.Bot):
         })
         await send_chat_message(self, bits_message(display_name, payload.bits))
         session = await get_active_session()
-        async with get_session() as db:
-            db.add(ViewerInteraction(
-                session_id=session.id if session else None,
-                interaction_type=InteractionType.BITS,
-                username=user.name if user else None,
-                display_name=user.display_name if user else None,
-                bits=payload.bits,
-            ))
+        self._record_interaction(
+            session,
+            InteractionType.BITS,
+            username=user.name if user else None,
+            display_name=user.display_name if user else None,
+            bits=payload.bits,
+        )
 
     async def _send_auto_shoutout(self, broadcaster: twitchio.PartialUser) -> None:
         try:
@@ -470,31 +531,32 @@ class TwitchBot(commands.Bot):
         if payload.viewer_count >= RaidConfig.SHOUTOUT_MIN_VIEWERS:
             await self._send_auto_shoutout(payload.from_broadcaster)
         session = await get_active_session()
-        async with get_session() as db:
-            db.add(ViewerInteraction(
-                session_id=session.id if session else None,
-                interaction_type=InteractionType.RAID,
-                username=payload.from_broadcaster.name,
-                display_name=payload.from_broadcaster.display_name,
-                viewer_count=payload.viewer_count,
-            ))
+        self._record_interaction(
+            session,
+            InteractionType.RAID,
+            username=payload.from_broadcaster.name,
+            display_name=payload.from_broadcaster.display_name,
+            viewer_count=payload.viewer_count,
+        )
 
     async def event_follow(self, payload: twitchio.ChannelFollow) -> None:
+        announce = self.follow_guard.observe(str(payload.user.id), payload.user.name)
+        session = await get_active_session()
+        self._record_interaction(
+            session,
+            InteractionType.FOLLOW,
+            username=payload.user.name,
+            display_name=payload.user.display_name,
+            timestamp=payload.followed_at,
+        )
+        if not announce:
+            return
         await veil.post_event("twitch.follower", {
             "username": payload.user.name,
             "display_name": payload.user.display_name,
         })
-        session = await get_active_session()
         if session:
             await send_chat_message(self, follow_message(payload.user.display_name))
-        async with get_session() as db:
-            db.add(ViewerInteraction(
-                session_id=session.id if session else None,
-                interaction_type=InteractionType.FOLLOW,
-                username=payload.user.name,
-                display_name=payload.user.display_name,
-                timestamp=payload.followed_at,
-            ))
 
     async def _on_tip(self, data: dict) -> None:
         username = data.get("username", "Anonymous")
@@ -514,15 +576,14 @@ class TwitchBot(commands.Bot):
             await send_chat_message(self, f"{username} says: {message}")
 
         session = await get_active_session()
-        async with get_session() as db:
-            db.add(ViewerInteraction(
-                session_id=session.id if session else None,
-                interaction_type=InteractionType.TIP,
-                username=username.lower(),
-                display_name=username,
-                tip_amount=amount,
-                tip_currency=currency,
-            ))
+        self._record_interaction(
+            session,
+            InteractionType.TIP,
+            username=username.lower(),
+            display_name=username,
+            tip_amount=amount,
+            tip_currency=currency,
+        )
 
     async def event_custom_redemption_add(self, payload: twitchio.ChannelPointsRedemptionAdd) -> None:
         await veil.post_event("twitch.channel_point_redeem", {
@@ -566,35 +627,40 @@ class TwitchBot(commands.Bot):
         while True:
             await asyncio.sleep(poll_interval)
             try:
-                stream_data = await self.twitch_client.get_stream_status(
-                    settings.TWITCH_CHANNEL
-                )
-                if not stream_data:
-                    if await get_active_session():
-                        log.info("Metrics poll: stream offline with active session — triggering offline fallback.")
-                        await self._trigger_offline()
-                    continue
-
-                viewer_count = stream_data.get("viewer_count", 0)
-                session = await get_active_session()
-
-                if session and viewer_count > (session.peak_viewers or 0):
-                    async with get_session() as db:
-                        stmt = select(StreamSession).where(StreamSession.id == session.id)
-                        result = await db.execute(stmt)
-                        live_session = result.scalar_one_or_none()
-                        if live_session:
-                            live_session.peak_viewers = viewer_count
-                            await db.commit()
-                    log.info("Peak viewers updated: %d.", viewer_count)
-
-                rate = self.metrics_tracker.get_rate_per_minute()
-                if rate >= ChatMetrics.HIGH_VELOCITY_THRESHOLD:
-                    log.info(
-                        "High chat velocity: %.1f msg/min, %d viewers.",
-                        rate,
-                        viewer_count,
+                with metrics.track("twitch.metrics_poll"):
+                    stream_data = await self.twitch_client.get_stream_status(
+                        settings.TWITCH_CHANNEL
                     )
+                    if not stream_data:
+                        if await get_active_session():
+                            log.info("Metrics poll: stream offline with active session — triggering offline fallback.")
+                            await self._trigger_offline()
+                        continue
+
+                    viewer_count = stream_data.get("viewer_count", 0)
+                    session = await get_active_session()
+
+                    if session and viewer_count > (session.peak_viewers or 0):
+                        async with get_session() as db:
+                            stmt = select(StreamSession).where(StreamSession.id == session.id)
+                            result = await db.execute(stmt)
+                            live_session = result.scalar_one_or_none()
+                            if live_session:
+                                live_session.peak_viewers = viewer_count
+                                await db.commit()
+                        session.peak_viewers = viewer_count  # keep the cached copy in step
+                        log.info("Peak viewers updated: %d.", viewer_count)
+
+                    window = ChatMetrics.VELOCITY_WINDOW_MINUTES * 60
+                    rate = self.metrics_tracker.rate(window, Platform.TWITCH) * 60
+                    if rate >= ChatMetrics.HIGH_VELOCITY_THRESHOLD:
+                        rates = self.metrics_tracker.rates(Platform.TWITCH)
+                        log.info(
+                            "High chat velocity: %.1f msg/min, %d viewers (msg/s %s).",
+                            rate,
+                            viewer_count,
+                            ", ".join(f"{w}s={r:.2f}" for w, r in rates.items()),
+                        )
             except Exception:
                 log.error("Error in metrics loop", exc_info=True)
 
@@ -5,7 +5,7 @@ from sqlalchemy import select
 from couchd.core.db import get_session
 from couchd.core.models import StreamEvent, ProblemAttempt, ProjectLog
 from couchd.core.constants import CommandCooldowns, MACRO_EVENT_TYPES, EventType, TASK_DONE, Platform
-from couchd.core.cooldowns import CooldownManager
+from couchd.core.cooldowns import cooldowns
 from couchd.core.utils import get_active_session
 
 log = logging.getLogger(__name__)
@@ -13,7 +13,7 @@ log = logging.getLogger(__name__)
 
 class ActivityCommands:
     def __init__(self):
-        self.cooldowns = CooldownManager()
+        self.cooldowns = cooldowns
 
     async def _simple_event_command(self, ctx, event_type: str, label: str) -> None:
         args = ctx.content.split(maxsplit=1)
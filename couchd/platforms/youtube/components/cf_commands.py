@@ -6,7 +6,7 @@ from couchd.core.db import get_session
 from couchd.core.models import StreamEvent, CFProblemAttempt
 from couchd.core.constants import CommandCooldowns, EventType
 from couchd.core.clients import codeforces as cf_client
-from couchd.core.cooldowns import CooldownManager
+from couchd.core.cooldowns import cooldowns
 from couchd.core.utils import get_active_session, compute_vod_timestamp
 
 log = logging.getLogger(__name__)
@@ -14,7 +14,7 @@ log = logging.getLogger(__name__)
 
 class CFCommands:
     def __init__(self):
-        self.cooldowns = CooldownManager()
+        self.cooldowns = cooldowns
 
     async def cmd_cf(self, ctx) -> None:
         """!cf — show current CF problem. !cf <url> — log CF problem (mod/broadcaster only)."""
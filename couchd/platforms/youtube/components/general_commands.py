@@ -6,7 +6,7 @@ from couchd.core import socials
 from couchd.core.models import IdeaPost
 from couchd.core.clients.youtube import YouTubeRSSClient
 from couchd.core.constants import CommandCooldowns, Platform
-from couchd.core.cooldowns import CooldownManager
+from couchd.core.cooldowns import cooldowns
 
 log = logging.getLogger(__name__)
 
@@ -14,7 +14,7 @@ log = logging.getLogger(__name__)
 class GeneralCommands:
     def __init__(self, youtube_client: YouTubeRSSClient | None):
         self.youtube_client = youtube_client
-        self.cooldowns = CooldownManager()
+        self.cooldowns = cooldowns
 
     async def cmd_commands(self, ctx) -> None:
         """!commands — list all available bot commands."""
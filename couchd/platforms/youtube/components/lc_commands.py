@@ -4,11 +4,11 @@ import re
 from sqlalchemy import select
 
 from couchd.core.db import get_session
-from couchd.core.models import StreamEvent, ProblemAttempt, SolutionPost, ProblemPost
+from couchd.core.models import StreamEvent, ProblemAttempt, SolutionPost, DiscordPost
 from couchd.core.clients.leetcode import LeetCodeClient
 from couchd.core.clients.youtube_chat import YouTubeChatClient
-from couchd.core.constants import CommandCooldowns, Platform
-from couchd.core.cooldowns import CooldownManager
+from couchd.core.constants import CommandCooldowns, Platform, PostKind
+from couchd.core.cooldowns import cooldowns
 from couchd.core.moderation import ModerationEngine
 from couchd.core.utils import get_active_session, compute_vod_timestamp
 
@@ -29,7 +29,7 @@ class LCCommands:
         self.lc_client = lc_client
         self.mod_engine = mod_engine
         self.chat_client = chat_client
-        self.cooldowns = CooldownManager()
+        self.cooldowns = cooldowns
 
     async def on_message(self, raw: dict, text: str) -> None:
         await self._check_solution_url(raw, text)
@@ -54,9 +54,15 @@ class LCCommands:
 
         async with get_session() as db:
             if slug:
+                # Any guild's forum thread for the problem makes it eligible.
                 post = (
                     await db.execute(
-                        select(ProblemPost).where(ProblemPost.platform_id == slug)
+                        select(DiscordPost.id)
+                        .where(
+                            (DiscordPost.kind == PostKind.LC_THREAD.value)
+                            & (DiscordPost.ref == slug)
+                        )
+                        .limit(1)
                     )
                 ).scalar_one_or_none()
                 if not post:
@@ -6,7 +6,7 @@ from couchd.core.db import get_session
 from couchd.core.models import StreamEvent, ProjectLog
 from couchd.core.clients.github import GitHubClient
 from couchd.core.constants import CommandCooldowns, Platform
-from couchd.core.cooldowns import CooldownManager
+from couchd.core.cooldowns import cooldowns
 from couchd.core.utils import get_active_session
 
 log = logging.getLogger(__name__)
@@ -15,7 +15,7 @@ log = logging.getLogger(__name__)
 class ProjectCommands:
     def __init__(self, github_client: GitHubClient):
         self.github_client = github_client
-        self.cooldowns = CooldownManager()
+        self.cooldowns = cooldowns
 
     async def cmd_project(self, ctx) -> None:
         """
@@ -3,6 +3,7 @@ import asyncio
 import logging
 
 from couchd.core.config import settings
+from couchd.core import metrics
 from couchd.core import socials
 
 log = logging.getLogger(__name__)
@@ -30,11 +31,12 @@ class ChatTimers:
         while True:
             await asyncio.sleep(interval)
             try:
-                live_chat_id = self._bot._live_chat_id
-                if not live_chat_id:
-                    continue
-                msg = self._messages[self._index % len(self._messages)]
-                self._index += 1
-                await self._bot.chat_client.send_message(live_chat_id, msg)
+                with metrics.track("youtube.chat_timers"):
+                    live_chat_id = self._bot._live_chat_id
+                    if not live_chat_id:
+                        continue
+                    msg = self._messages[self._index % len(self._messages)]
+                    self._index += 1
+                    await self._bot.chat_client.send_message(live_chat_id, msg)
             except Exception:
                 log.error("Error in YouTube chat timer loop", exc_info=True)
@@ -1,12 +1,9 @@
 # couchd/platforms/youtube/main.py
 import asyncio
-import json
 import logging
 from dataclasses import dataclass
 from datetime import datetime, timezone
 
-from sqlalchemy import text
-
 import sentry_sdk
 from couchd.core.config import settings
 from couchd.core.logger import setup_logging
@@ -18,11 +15,16 @@ from couchd.core.clients.youtube_chat import YouTubeChatClient
 from couchd.core.clients.youtube import YouTubeRSSClient
 from couchd.core.clients.leetcode import LeetCodeClient
 from couchd.core.clients.github import GitHubClient
-from couchd.core.clients import veil
-from couchd.core.cooldowns import CooldownManager
+from couchd.core.clients import veil, veil_outbox
+from couchd.core.clients import http_pool
+from couchd.core import metrics
+from couchd.core.chat_archive import ChatArchive
+from couchd.core.chat_spikes import run_spike_monitor
+from couchd.core.chat_velocity import chat_velocity
 from couchd.core.moderation import ModerationEngine
-from couchd.core.constants import HoldSource
-from couchd.core.utils import get_active_session
+from couchd.core.bus import StreamOffline, StreamOnline, publish as bus_publish
+from couchd.core.listener import listener
+from couchd.core.utils import enable_active_session_cache, get_active_session, invalidate_active_session
 from couchd.platforms.youtube.components.lc_commands import LCCommands
 from couchd.platforms.youtube.components.general_commands import GeneralCommands
 from couchd.platforms.youtube.components.activity_commands import ActivityCommands
@@ -35,6 +37,7 @@ if settings.SENTRY_DSN:
     sentry_sdk.init(dsn=settings.SENTRY_DSN)
 
 setup_logging(webhook_url=settings.BOT_LOGS_WEBHOOK_URL, bot_name="youtube")
+veil_outbox.set_owner(Platform.YOUTUBE.value)
 log = logging.getLogger(__name__)
 
 COMMAND_PREFIX = "!"
@@ -70,6 +73,13 @@ class YouTubeChatContext:
         await self._client.send_message(self._live_chat_id, text)
 
 
+def _parse_published_at(value: str | None) -> datetime | None:
+    try:
+        return datetime.fromisoformat(value) if value else None
+    except ValueError:
+        return None
+
+
 class YouTubeBot:
     def __init__(self):
         self.chat_client = YouTubeChatClient(
@@ -79,7 +89,8 @@ class YouTubeBot:
         self.lc_client = LeetCodeClient()
         self.github_client = GitHubClient()
         self.youtube_client = YouTubeRSSClient() if settings.YOUTUBE_CHANNEL_ID else None
-        self.mod_engine = ModerationEngine(settings.MODERATION_PATTERNS)
+        self.mod_engine = ModerationEngine(settings.MODERATION_PATTERNS, platform=Platform.YOUTUBE)
+        self.chat_archive = ChatArchive() if settings.CHAT_ARCHIVE_ENABLED else None
 
         self._components: list = []
         self._live_chat_id: str | None = None
@@ -113,7 +124,17 @@ class YouTubeBot:
         if msg_type != "textMessageEvent":
             return
 
+        chat_velocity.record(Platform.YOUTUBE)
         text = snippet.get("textMessageDetails", {}).get("messageText", "").strip()
+        if self.chat_archive:
+            self.chat_archive.record(
+                Platform.YOUTUBE,
+                raw.get("id", ""),
+                author_details.get("channelId"),
+                author_details.get("displayName", ""),
+                text,
+                sent_at=_parse_published_at(snippet.get("publishedAt")),
+            )
         if not text.startswith(COMMAND_PREFIX):
             await self._handle_chat_message(raw, text)
             return
@@ -163,10 +184,13 @@ class YouTubeBot:
             "is_owner": author_details.get("isChatOwner", False),
         }
 
-        if self.mod_engine.is_flagged(text):
-            self.mod_engine.add_pending(message_id, chat_payload, HoldSource.BONELESS_COUCH)
-            log.info("[MOD] Held YouTube message %s from %s", message_id, display_name)
-            await veil.post_event("modqueue.pending", {**chat_payload, "hold_sources": [HoldSource.BONELESS_COUCH]})
+        hold_source = self.mod_engine.screen(
+            chat_payload["channel_id"], text, trusted=chat_payload["is_moderator"] or chat_payload["is_owner"]
+        )
+        if hold_source:
+            self.mod_engine.hold(message_id, chat_payload, hold_source)
+            log.info("[MOD] Held YouTube message %s from %s (%s)", message_id, display_name, hold_source)
+            await veil.post_event("modqueue.pending", {**chat_payload, "hold_sources": [hold_source]})
             return
 
         await veil.post_event("youtube.chat.message", chat_payload)
@@ -181,20 +205,18 @@ class YouTubeBot:
     async def _poll_loop(self) -> None:
         while True:
             try:
-                live_chat_id = await self._get_or_refresh_chat_id()
-                if not live_chat_id:
-                    await asyncio.sleep(30)
-                    continue
-
-                messages, next_token, poll_ms = await self.chat_client.poll_messages(
-                    live_chat_id, self._page_token
-                )
-                self._page_token = next_token
+                with metrics.track("youtube.chat_poll"):
+                    live_chat_id = await self._get_or_refresh_chat_id()
+                    if live_chat_id:
+                        messages, next_token, poll_ms = await self.chat_client.poll_messages(
+                            live_chat_id, self._page_token
+                        )
+                        self._page_token = next_token
 
-                for msg in messages:
-                    await self._dispatch(msg)
+                        for msg in messages:
+                            await self._dispatch(msg)
 
-                await asyncio.sleep(poll_ms / 1000)
+                await asyncio.sleep(poll_ms / 1000 if live_chat_id else 30)
             except RefreshError:
                 log.critical("YouTube OAuth token revoked — restart the bot after re-authenticating.")
                 await asyncio.sleep(3600)
@@ -205,57 +227,59 @@ class YouTubeBot:
     async def _on_modqueue_decision(self, message_id: str, decision: str, platform: str) -> None:
         if platform != Platform.YOUTUBE.value:
             return
-        pending = self.mod_engine.get(message_id)
+        pending = await self.mod_engine.resolve(message_id, decision)
         if not pending:
             return
         if decision == "deny":
             await self.chat_client.delete_message(message_id)
             log.info("Deleted modqueue message %s from YouTube chat.", message_id)
-        self.mod_engine.pop(message_id)
 
     async def _broadcast_lifecycle_loop(self) -> None:
-        """Polls for broadcast start/end and mirrors the Twitch pg_notify pattern."""
+        """Polls for broadcast start/end and publishes the same bus events as the Twitch bot."""
         was_live = False
         while True:
             try:
-                chat_id = await self.chat_client.get_live_chat_id()
-                is_live = chat_id is not None
-
-                if is_live and not was_live:
-                    log.info("YouTube broadcast started.")
-                    async with get_session() as db:
-                        existing = await get_active_session(Platform.YOUTUBE)
-                        if not existing:
-                            db.add(StreamSession(
-                                platform=Platform.YOUTUBE.value,
-                                title="YouTube Stream",
-                                is_active=True,
-                                start_time=datetime.now(timezone.utc),
-                            ))
-                            await db.flush()
-                            notify_payload = json.dumps({"title": "YouTube Stream", "category": "", "thumbnail_url": ""})
-                            await db.execute(text("SELECT pg_notify('stream_online', :p)"), {"p": notify_payload})
-                    was_live = True
-
-                elif not is_live and was_live:
-                    log.info("YouTube broadcast ended.")
-                    async with get_session() as db:
-                        from sqlalchemy import select
-                        result = await db.execute(
-                            select(StreamSession).where(
-                                (StreamSession.is_active == True)
-                                & (StreamSession.platform == Platform.YOUTUBE.value)
-                            ).order_by(StreamSession.start_time.desc())
-                        )
-                        session = result.scalars().first()
-                        if session:
-                            session.is_active = False
-                            session.end_time = datetime.now(timezone.utc)
-                            await db.execute(
-                                text("SELECT pg_notify('stream_offline', :p)"),
-                                {"p": json.dumps({"session_id": session.id})},
+                with metrics.track("youtube.broadcast_lifecycle"):
+                    chat_id = await self.chat_client.get_live_chat_id()
+                    is_live = chat_id is not None
+
+                    if is_live and not was_live:
+                        log.info("YouTube broadcast started.")
+                        async with get_session() as db:
+                            existing = await get_active_session(Platform.YOUTUBE)
+                            if not existing:
+                                db.add(StreamSession(
+                                    platform=Platform.YOUTUBE.value,
+                                    title="YouTube Stream",
+                                    is_active=True,
+                                    start_time=datetime.now(timezone.utc),
+                                ))
+                                await db.flush()
+                                await bus_publish(
+                                    StreamOnline(platform=Platform.YOUTUBE.value, title="YouTube Stream"), db
+                                )
+                        invalidate_active_session(Platform.YOUTUBE)
+                        was_live = True
+
+                    elif not is_live and was_live:
+                        log.info("YouTube broadcast ended.")
+                        async with get_session() as db:
+                            from sqlalchemy import select
+                            result = await db.execute(
+                                select(StreamSession).where(
+                                    (StreamSession.is_active == True)
+                                    & (StreamSession.platform == Platform.YOUTUBE.value)
+                                ).order_by(StreamSession.start_time.desc())
                             )
-                    was_live = False
+                            session = result.scalars().first()
+                            if session:
+                                session.is_active = False
+                                session.end_time = datetime.now(timezone.utc)
+                                await bus_publish(
+                                    StreamOffline(platform=Platform.YOUTUBE.value, session_id=session.id), db
+                                )
+                        invalidate_active_session(Platform.YOUTUBE)
+                        was_live = False
 
             except RefreshError:
                 log.critical("YouTube OAuth token revoked — restart the bot after re-authenticating.")
@@ -266,12 +290,27 @@ class YouTubeBot:
             await asyncio.sleep(60)
 
     async def run(self) -> None:
+        try:
+            await metrics.start_server()
+            await self._run()
+        finally:
+            await metrics.stop_server()
+            if self.chat_archive:
+                await self.chat_archive.close()
+            await self.mod_engine.close()
+            await listener.close()
+            await veil.close()
+            await http_pool.close_all()
+
+    async def _run(self) -> None:
         try:
             await self.chat_client.authenticate()
         except RefreshError:
             log.critical("YouTube OAuth token revoked — delete the token file and re-authenticate before restarting.")
             return
         await self.lc_client.load_ratings()
+        await enable_active_session_cache()
+        await self.mod_engine.start()
         self._setup_components()
 
         log.info("-" * 40)
@@ -282,6 +321,7 @@ class YouTubeBot:
         await asyncio.gather(
             self._poll_loop(),
             self._broadcast_lifecycle_loop(),
+            run_spike_monitor(Platform.YOUTUBE),
             veil.listen_decisions(self._on_modqueue_decision),
         )
 
@@ -19,6 +19,7 @@ from sqlalchemy import func, select
 
 from couchd.core.config import settings
 from couchd.core.constants import InteractionType
+from couchd.core.clients import http_pool
 from couchd.core.clients.twitch import TwitchClient
 from couchd.core.db import get_session
 from couchd.core.models import ViewerInteraction
@@ -165,10 +166,13 @@ async def main() -> None:
     broadcaster_token = args.token or await _refresh_token(settings.TWITCH_OWNER_ID)
     bot_token = await _refresh_token(settings.TWITCH_BOT_ID)
     client = TwitchClient()
-    # followers needs moderator:read:followers — lives on the bot token
-    await backfill_followers(client, bot_token, dry_run=args.dry_run, force=args.force)
-    await backfill_subscribers(client, broadcaster_token, dry_run=args.dry_run, force=args.force)
-    await backfill_bits(client, broadcaster_token, dry_run=args.dry_run, force=args.force)
+    try:
+        # followers needs moderator:read:followers — lives on the bot token
+        await backfill_followers(client, bot_token, dry_run=args.dry_run, force=args.force)
+        await backfill_subscribers(client, broadcaster_token, dry_run=args.dry_run, force=args.force)
+        await backfill_bits(client, broadcaster_token, dry_run=args.dry_run, force=args.force)
+    finally:
+        await http_pool.close_all()
     log.info("Backfill finished.")
 
 
@@ -0,0 +1,79 @@
+"""Measure get_active_session() with and without the NOTIFY-invalidated cache.
+
+Usage:
+    python -m scripts.bench_active_session [--calls 2000]            # configured Postgres (read-only)
+    python -m scripts.bench_active_session --sqlite [--calls 2000]   # in-memory SQLite, no server needed
+
+Against Postgres the cache is enabled for real (LISTEN connection included).
+The SQLite mode has no LISTEN support, so it marks the cache as enabled directly.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from couchd.core import utils
+from couchd.core.db import Base
+from couchd.core.listener import listener
+from couchd.core.models import StreamSession
+
+
+async def _measure(calls: int) -> list[float]:
+    latencies = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        await utils.get_active_session()
+        latencies.append((time.perf_counter() - start) * 1_000_000)
+    return latencies
+
+
+def _report(label: str, latencies: list[float]) -> None:
+    q = statistics.quantiles(latencies, n=100)
+    print(f"{label:<9} mean={statistics.mean(latencies):8.1f}µs p50={q[49]:8.1f}µs p99={q[98]:8.1f}µs")
+
+
+async def _use_sqlite() -> None:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+    async with factory() as db:
+        db.add(StreamSession(platform="twitch", is_active=True))
+        await db.commit()
+
+    @asynccontextmanager
+    async def _get_session():
+        async with factory() as session:
+            yield session
+
+    utils.get_session = _get_session
+
+
+async def main(calls: int, sqlite: bool) -> None:
+    if sqlite:
+        await _use_sqlite()
+
+    _report("uncached", await _measure(calls))
+
+    if sqlite:
+        utils._cache_enabled = True
+        utils.listener = SimpleNamespace(connected=True)
+    else:
+        await utils.enable_active_session_cache()
+    try:
+        _report("cached", await _measure(calls))
+    finally:
+        await listener.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--sqlite", action="store_true")
+    args = parser.parse_args()
+    asyncio.run(main(args.calls, args.sqlite))
@@ -0,0 +1,109 @@
+"""Burst benchmark: one transaction per ViewerInteraction vs the BatchWriter.
+
+Usage:
+    python -m scripts.bench_batch_writer [--events 2000] [--concurrency 50]            # configured Postgres
+    python -m scripts.bench_batch_writer --sqlite [--events 2000] [--concurrency 50]   # temporary SQLite file
+
+Simulates a gift bomb / follow wave: `--events` handlers fire at once, at most `--concurrency`
+in flight. Reports handler latency (time until the handler returns), wall time until every row
+is durable, and transactions committed per second.
+Against Postgres the rows are written to viewer_interactions and deleted afterwards.
+"""
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from couchd.core import batch_writer
+from couchd.core.batch_writer import BatchWriter
+from couchd.core.db import Base, get_session
+from couchd.core.models import ViewerInteraction
+
+_BENCH_TYPE = "bench"
+
+
+def _row(n: int) -> dict:
+    return {
+        "interaction_type": _BENCH_TYPE,
+        "username": f"bench{n}",
+        "timestamp": datetime.now(timezone.utc),
+    }
+
+
+async def _burst(handler, events: int, concurrency: int) -> list[float]:
+    sem = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def one(n: int):
+        async with sem:
+            start = time.perf_counter()
+            await handler(n)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    await asyncio.gather(*(one(n) for n in range(events)))
+    return latencies
+
+
+def _report(label: str, latencies: list[float], wall: float, commits: int) -> None:
+    q = statistics.quantiles(latencies, n=100)
+    print(
+        f"{label:<12} handler p50={q[49]:7.3f}ms p99={q[98]:7.3f}ms  "
+        f"wall={wall:6.2f}s  commits={commits:<5} ({commits / wall:8.1f}/s)  "
+        f"rows/s={len(latencies) / wall:9.1f}"
+    )
+
+
+async def main(events: int, concurrency: int, sqlite: bool) -> None:
+    session_factory = get_session
+    if sqlite:
+        path = tempfile.NamedTemporaryFile(suffix=".db", delete=False).name
+        engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        factory = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+
+        @asynccontextmanager
+        async def session_factory():
+            async with factory() as session:
+                yield session
+                await session.commit()
+
+        batch_writer.get_session = session_factory
+
+    try:
+        async def per_row(n: int):
+            async with session_factory() as db:
+                db.add(ViewerInteraction(**_row(n)))
+
+        start = time.perf_counter()
+        latencies = await _burst(per_row, events, concurrency)
+        _report("per-row", latencies, time.perf_counter() - start, events)
+
+        writer = BatchWriter(ViewerInteraction)
+
+        async def buffered(n: int):
+            writer.add(_row(n))
+
+        start = time.perf_counter()
+        latencies = await _burst(buffered, events, concurrency)
+        await writer.close()
+        _report("batch-writer", latencies, time.perf_counter() - start, writer.stats.flushes)
+    finally:
+        async with session_factory() as db:
+            await db.execute(delete(ViewerInteraction).where(ViewerInteraction.interaction_type == _BENCH_TYPE))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--sqlite", action="store_true")
+    args = parser.parse_args()
+    asyncio.run(main(args.events, args.concurrency, args.sqlite))
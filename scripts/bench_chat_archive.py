@@ -0,0 +1,71 @@
+"""Chat archive ingestion benchmark.
+
+Usage:
+    python -m scripts.bench_chat_archive [--messages 50000]             # COPY into configured Postgres
+    python -m scripts.bench_chat_archive --dry-run [--messages 50000]   # in-process pipeline only
+
+Feeds synthetic raid-style chat (emote fragments included) through ChatArchive.record() as fast
+as possible, then waits for every row to be flushed. Reports record() latency and end-to-end
+messages/second. Against Postgres the benchmark rows are deleted afterwards.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from couchd.core.chat_archive import ChatArchive
+from couchd.core.constants import Platform
+from couchd.core.db import get_raw_connection
+
+_PREFIX = "bench-"
+_FRAGMENTS = [
+    {"type": "text", "text": "LETS GO "},
+    {"type": "emote", "text": "PogChamp", "id": "305954156"},
+    {"type": "text", "text": " raid hype "},
+    {"type": "emote", "text": "Kappa", "id": "25"},
+]
+_TEXT = "".join(f["text"] for f in _FRAGMENTS)
+
+
+async def main(messages: int, dry_run: bool) -> None:
+    archive = ChatArchive()
+    if dry_run:
+        async def _discard(_rows):
+            await asyncio.sleep(0)
+        archive._write = _discard
+
+    latencies = []
+    start = time.perf_counter()
+    for n in range(messages):
+        t = time.perf_counter()
+        archive.record(Platform.TWITCH, f"{_PREFIX}{n}", str(n % 5000), f"viewer{n % 5000}", _TEXT, _FRAGMENTS)
+        latencies.append((time.perf_counter() - t) * 1_000_000)
+        if n % 500 == 0:
+            await asyncio.sleep(0)  # let the flush task run, as the event loop would between messages
+    await archive.close()
+    elapsed = time.perf_counter() - start
+
+    q = statistics.quantiles(latencies, n=100)
+    stats = archive.stats
+    print(
+        f"{'dry-run' if dry_run else 'postgres'}: {stats.rows_written} rows in {elapsed:.2f}s "
+        f"= {stats.rows_written / elapsed:,.0f} msg/s  ({stats.flushes} COPY batches, "
+        f"{stats.dropped} dropped, {stats.failed} failed)"
+    )
+    print(f"record() p50={q[49]:.1f}µs p99={q[98]:.1f}µs")
+
+    if not dry_run:
+        conn = await get_raw_connection()
+        try:
+            await conn.execute("DELETE FROM chat_messages WHERE message_id LIKE $1", f"{_PREFIX}%")
+        finally:
+            await conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=50_000)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+    asyncio.run(main(args.messages, args.dry_run))
@@ -0,0 +1,85 @@
+"""Compare the old deque-of-datetimes chat tracker with the per-second ring in couchd.core.chat_velocity.
+
+Usage:
+    python -m scripts.bench_chat_velocity [--seconds 600] [--rates 10,100,1000,5000]
+
+Replays `seconds` of simulated chat at each rate on a fake clock and reports ns per recorded
+message, ns per rate() read, and how many entries each tracker holds at the end.
+"""
+
+import argparse
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+
+from couchd.core.chat_velocity import ChatVelocity
+from couchd.core.constants import ChatMetrics, Platform
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _DequeTracker:
+    """The previous ChatVelocityTracker, with its clock injected."""
+
+    def __init__(self, clock: _Clock) -> None:
+        self._clock = clock
+        self._epoch = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        self._timestamps: deque[datetime] = deque()
+
+    def record_message(self) -> None:
+        now = self._epoch + timedelta(seconds=self._clock())
+        self._timestamps.append(now)
+        cutoff = now - timedelta(minutes=ChatMetrics.VELOCITY_WINDOW_MINUTES)
+        while self._timestamps and self._timestamps[0] < cutoff:
+            self._timestamps.popleft()
+
+    def get_rate_per_minute(self) -> float:
+        return len(self._timestamps) / ChatMetrics.VELOCITY_WINDOW_MINUTES
+
+
+def _replay(record, clock: _Clock, rate: int, seconds: int) -> float:
+    step = 1 / rate
+    elapsed = 0.0
+    for _ in range(seconds):
+        start = time.perf_counter()
+        for _ in range(rate):
+            record()
+            clock.now += step
+        elapsed += time.perf_counter() - start
+    return elapsed * 1e9 / (rate * seconds)
+
+
+def _read_ns(read, reps: int = 200) -> float:
+    start = time.perf_counter()
+    for _ in range(reps):
+        read()
+    return (time.perf_counter() - start) * 1e9 / reps
+
+
+def main(seconds: int, rates: list[int]) -> None:
+    print(f"{'msg/s':>7} {'tracker':<8} {'ns/msg':>8} {'ns/read':>10} {'entries':>9}")
+    for rate in rates:
+        clock = _Clock()
+        old = _DequeTracker(clock)
+        ns = _replay(old.record_message, clock, rate, seconds)
+        print(f"{rate:>7} {'deque':<8} {ns:>8.0f} {_read_ns(old.get_rate_per_minute):>10.0f} {len(old._timestamps):>9}")
+
+        clock = _Clock()
+        ring = ChatVelocity(clock=clock)
+        ns = _replay(lambda: ring.record(Platform.TWITCH), clock, rate, seconds)
+        read = _read_ns(lambda: ring.rates(Platform.TWITCH))
+        print(f"{rate:>7} {'ring':<8} {ns:>8.0f} {read:>10.0f} {ring.ring_seconds:>9}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=int, default=600)
+    parser.add_argument("--rates", default="10,100,1000,5000")
+    args = parser.parse_args()
+    main(args.seconds, [int(r) for r in args.rates.split(",")])
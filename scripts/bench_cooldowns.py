@@ -0,0 +1,97 @@
+"""Soak the old unbounded cooldown dict and the CooldownManager in couchd.core.cooldowns.
+
+Usage:
+    python -m scripts.bench_cooldowns [--hours 24] [--rate 2] [--report-minutes 120]
+
+Replays `rate` commands per second for `hours` on a fake clock, almost every one from a viewer never
+seen before (raids, drive-by chatters), and reports per-user entries and traced memory for both stores
+every `report-minutes`. The old store grows with every new viewer; the new one should stay flat.
+"""
+
+import argparse
+import random
+import time
+import tracemalloc
+
+from couchd.core.constants import CommandCooldowns
+from couchd.core.cooldowns import CooldownManager
+
+_COMMANDS = {
+    "lc": CommandCooldowns.LC,
+    "commands": CommandCooldowns.COMMANDS,
+    "socials": CommandCooldowns.SIMPLE,
+    "idea": CommandCooldowns.IDEA,
+}
+
+
+class _Unbounded:
+    """The previous CooldownManager."""
+
+    def __init__(self, clock) -> None:
+        self._clock = clock
+        self._user_last: dict[str, dict[str, float]] = {}
+        self._global_last: dict[str, float] = {}
+
+    def check(self, cmd, user_id, cooldown) -> bool:
+        now = self._clock()
+        if now - self._global_last.get(cmd, 0.0) < cooldown.global_seconds:
+            return True
+        return now - self._user_last.get(cmd, {}).get(user_id, 0.0) < cooldown.user_seconds
+
+    def record(self, cmd, user_id) -> None:
+        now = self._clock()
+        self._global_last[cmd] = now
+        self._user_last.setdefault(cmd, {})[user_id] = now
+
+    def __len__(self) -> int:
+        return sum(len(users) for users in self._user_last.values())
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _soak(name: str, make, hours: float, rate: float, report_minutes: int) -> None:
+    rng = random.Random(7)
+    clock = _Clock()
+    tracemalloc.start()
+    store = make(clock)
+    base = tracemalloc.get_traced_memory()[0]
+    names = list(_COMMANDS)
+    step = 1 / rate
+    next_report = report_minutes * 60
+    user = 0
+    start = time.perf_counter()
+    print(f"{name}:")
+    while clock.now < hours * 3600:
+        # Cooldowns are per command, so spread the commands out to let most of them through.
+        cmd = rng.choice(names)
+        user += 1
+        if not store.check(cmd, f"u{user}", _COMMANDS[cmd]):
+            store.record(cmd, f"u{user}")
+        clock.now += step
+        if clock.now >= next_report:
+            kib = (tracemalloc.get_traced_memory()[0] - base) / 1024
+            print(f"  {clock.now / 3600:6.1f}h  {len(store):>8} entries  {kib:10.1f} KiB")
+            next_report += report_minutes * 60
+    tracemalloc.stop()
+    print(f"  {(time.perf_counter() - start) * 1e9 / user:.0f} ns per command (traced)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--hours", type=float, default=24)
+    parser.add_argument("--rate", type=float, default=2, help="commands per second")
+    parser.add_argument("--report-minutes", type=int, default=120)
+    args = parser.parse_args()
+
+    _soak("unbounded dict", _Unbounded, args.hours, args.rate, args.report_minutes)
+    _soak("CooldownManager", lambda clock: CooldownManager(clock=clock), args.hours, args.rate, args.report_minutes)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Compare per-call ClientSession vs the shared http_pool against a local server.
+
+Usage:
+    python -m scripts.bench_http_pool [--requests 500] [--concurrency 10]
+
+Reports connections opened and p50/p99 request latency for each mode.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import aiohttp
+from aiohttp import web
+
+from couchd.core.clients import http_pool
+
+
+async def _handler(_request: web.Request) -> web.Response:
+    return web.json_response({"ok": True})
+
+
+async def _start_server() -> tuple[web.AppRunner, str]:
+    app = web.Application()
+    app.router.add_get("/", _handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}/"
+
+
+async def _run(fetch, total: int, concurrency: int) -> list[float]:
+    sem = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def one():
+        async with sem:
+            start = time.perf_counter()
+            await fetch()
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    await asyncio.gather(*(one() for _ in range(total)))
+    return latencies
+
+
+def _report(label: str, latencies: list[float], connections: int) -> None:
+    q = statistics.quantiles(latencies, n=100)
+    print(f"{label:<10} connections={connections:<5} p50={q[49]:.2f}ms p99={q[98]:.2f}ms")
+
+
+async def main(total: int, concurrency: int) -> None:
+    runner, url = await _start_server()
+    try:
+        created = 0
+
+        async def on_create(_s, _c, _p):
+            nonlocal created
+            created += 1
+
+        trace = aiohttp.TraceConfig()
+        trace.on_connection_create_end.append(on_create)
+
+        async def fresh():
+            async with aiohttp.ClientSession(trace_configs=[trace]) as session:
+                async with session.get(url) as resp:
+                    await resp.json()
+
+        _report("fresh", await _run(fresh, total, concurrency), created)
+
+        async def pooled():
+            async with http_pool.get_session(url).get(url) as resp:
+                await resp.json()
+
+        latencies = await _run(pooled, total, concurrency)
+        stats = http_pool.stats()[url.rstrip("/")]
+        _report("pooled", latencies, stats.connections_created)
+    finally:
+        await http_pool.close_all()
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency))
@@ -0,0 +1,116 @@
+"""Compare the old one-regex-per-pattern loop with the combined ModerationEngine in couchd.core.moderation.
+
+Usage:
+    python -m scripts.bench_moderation [--patterns 10,100,1000] [--messages 2000] [--regex-share 0.1]
+                                       [--raid-rates 50,500,2000] [--raid-seconds 60]
+
+Builds a synthetic pattern list (mostly \\bterm\\b literals, `regex-share` of them real regexes) and
+reports ns per message for each engine at each size, on chat lines that mostly do not match.
+Then replays chat at each raid rate (a fifth of it near-duplicate spam from distinct bots) through the
+FloodDetector on a fake clock and reports ns per message, share flagged and fingerprints held.
+"""
+
+import argparse
+import random
+import re
+import string
+import time
+
+from couchd.core.moderation import FloodDetector, ModerationEngine
+
+
+class _RegexLoop:
+    """The previous ModerationEngine.is_flagged."""
+
+    def __init__(self, patterns: list[str]) -> None:
+        self._regexes = [re.compile(p, re.IGNORECASE) for p in patterns]
+
+    def is_flagged(self, text: str) -> bool:
+        return any(r.search(text) for r in self._regexes)
+
+
+def _word(rng: random.Random, length: int) -> str:
+    return "".join(rng.choices(string.ascii_lowercase, k=length))
+
+
+def _patterns(rng: random.Random, count: int, regex_share: float) -> list[str]:
+    out = []
+    for _ in range(count):
+        if rng.random() < regex_share:
+            out.append(rf"{_word(rng, 4)}\s+{_word(rng, 5)}\d*")
+        else:
+            out.append(rf"\b{_word(rng, rng.randint(5, 10))}\b")
+    return out
+
+
+def _messages(rng: random.Random, count: int) -> list[str]:
+    return [" ".join(_word(rng, rng.randint(2, 8)) for _ in range(rng.randint(3, 15))) for _ in range(count)]
+
+
+def _ns_per_message(engine, messages: list[str]) -> float:
+    start = time.perf_counter()
+    for text in messages:
+        engine.is_flagged(text)
+    return (time.perf_counter() - start) * 1e9 / len(messages)
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _raid(rng: random.Random, rate: int, seconds: int) -> tuple[float, float, int]:
+    clock = _Clock()
+    flood = FloodDetector(clock=clock)
+    flagged = 0
+    elapsed = 0.0
+    for second in range(seconds):
+        clock.now = second
+        batch = [
+            (f"bot{second}-{i}", f"Wanna become famous? Buy followers on example dot com {_word(rng, 4)}")
+            if rng.random() < 0.2 else (f"user{rng.randrange(5000)}", text)
+            for i, text in enumerate(_messages(rng, rate))
+        ]
+        start = time.perf_counter()
+        for user_id, text in batch:
+            flagged += flood.check(user_id, text)
+        elapsed += time.perf_counter() - start
+    total = rate * seconds
+    return elapsed * 1e9 / total, flagged / total, len(flood)
+
+
+def main(sizes: list[int], message_count: int, regex_share: float, raid_rates: list[int], raid_seconds: int) -> None:
+    rng = random.Random(0)
+    messages = _messages(rng, message_count)
+    print(f"{'patterns':>9} {'loop ns/msg':>12} {'engine ns/msg':>14} {'speedup':>8}")
+    for size in sizes:
+        patterns = _patterns(rng, size, regex_share)
+        old = _ns_per_message(_RegexLoop(patterns), messages)
+        new = _ns_per_message(ModerationEngine(patterns), messages)
+        print(f"{size:>9} {old:>12.0f} {new:>14.0f} {old / new:>7.1f}x")
+
+    print()
+    print(f"{'msg/s':>9} {'flood ns/msg':>12} {'flagged':>8} {'held fps':>9}")
+    for rate in raid_rates:
+        ns, share, held = _raid(rng, rate, raid_seconds)
+        print(f"{rate:>9} {ns:>12.0f} {share:>8.1%} {held:>9}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--patterns", default="10,100,1000")
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--regex-share", type=float, default=0.1)
+    parser.add_argument("--raid-rates", default="50,500,2000")
+    parser.add_argument("--raid-seconds", type=int, default=60)
+    args = parser.parse_args()
+    main(
+        [int(n) for n in args.patterns.split(",")],
+        args.messages,
+        args.regex_share,
+        [int(r) for r in args.raid_rates.split(",")],
+        args.raid_seconds,
+    )
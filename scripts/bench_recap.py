@@ -0,0 +1,120 @@
+"""Measure stream recap loading: the old four-query load vs. the single joined query vs. a warm RecapBuilder.
+
+Usage:
+    python -m scripts.bench_recap [--events 5000] [--tail 20] [--runs 10]
+
+Runs against in-memory SQLite, so no server is needed. The seeded session mixes LeetCode,
+Codeforces and project segments with task notes and chat noise.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from couchd.core.db import Base
+from couchd.core.models import CFProblemAttempt, ProblemAttempt, ProjectLog, StreamEvent, StreamSession
+from couchd.platforms.discord.components import streams_recap
+from couchd.platforms.discord.components.streams_recap import RecapBuilder
+
+_START = datetime(2024, 1, 1, 12, 0)  # naive: SQLite hands timestamps back without tzinfo
+
+
+def _rows(session_id: int, first: int, count: int) -> list:
+    rows = []
+    for n in range(first, first + count):
+        ts = _START + timedelta(seconds=n)
+        kind = ("problem_attempt", "cf_problem", "project", "task", "task", "chat")[n % 6]
+        event = StreamEvent(session_id=session_id, event_type=kind, timestamp=ts, notes=f"note {n}")
+        if kind == "problem_attempt":
+            event.problem_attempt = ProblemAttempt(slug=f"p{n}", title=f"{n}. Problem", difficulty="Easy")
+        elif kind == "cf_problem":
+            event.cf_problem_attempt = CFProblemAttempt(contest_id=n, index="A", title=f"CF {n}", url="u")
+        elif kind == "project":
+            event.project_log = ProjectLog(title=f"project {n}")
+        rows.append(event)
+    return rows
+
+
+async def _legacy_load(session_id: int, factory) -> int:
+    """The pre-RecapBuilder loader: events plus one query per detail table."""
+    async with factory() as db:
+        events = (
+            await db.execute(
+                select(StreamEvent).where(StreamEvent.session_id == session_id).order_by(StreamEvent.timestamp)
+            )
+        ).scalars().all()
+        details = {}
+        for model in (ProblemAttempt, CFProblemAttempt, ProjectLog):
+            for row in (
+                await db.execute(select(model).join(StreamEvent).where(StreamEvent.session_id == session_id))
+            ).scalars().all():
+                details.setdefault(row.stream_event_id, row)
+    return len(events) + len(details)
+
+
+async def _time(fn, runs: int) -> list[float]:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        await fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def _report(label: str, samples: list[float]) -> None:
+    print(f"{label:<22} mean={statistics.mean(samples):8.2f}ms min={min(samples):8.2f}ms")
+
+
+async def main(events: int, tail: int, runs: int) -> None:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+
+    @asynccontextmanager
+    async def _get_session():
+        async with factory() as session:
+            yield session
+
+    streams_recap.get_session = _get_session
+
+    async with factory() as db:
+        session = StreamSession(platform="twitch", start_time=_START)
+        db.add(session)
+        await db.flush()
+        db.add_all(_rows(session.id, 0, events))
+        await db.commit()
+
+    async def cold_builder():
+        await RecapBuilder(session.id, _START).refresh()
+
+    print(f"{events} events in session")
+    _report("legacy (4 queries)", await _time(lambda: _legacy_load(session.id, factory), runs))
+    _report("single joined query", await _time(cold_builder, runs))
+
+    # Warm builders that have seen everything but the final `tail` events, as at stream end.
+    warm = []
+    for _ in range(runs):
+        builder = RecapBuilder(session.id, _START)
+        await builder.refresh()
+        warm.append(builder)
+    async with factory() as db:
+        db.add_all(_rows(session.id, events, tail))
+        await db.commit()
+    _report(f"warm builder (+{tail})", await _time(lambda: warm.pop().refresh(), runs))
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=5000)
+    parser.add_argument("--tail", type=int, default=20)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(main(args.events, args.tail, args.runs))
@@ -0,0 +1,44 @@
+"""Print per-statement database timings from a running bot.
+
+Usage:
+    python -m scripts.query_report [--url http://127.0.0.1:9100] [--sort total|mean|p95|max|count|slow] [--top 20]
+
+Reads the /queries endpoint the bot serves next to /metrics (set METRICS_PORT to enable it).
+Statements are fingerprinted, so literals and parameters never appear in the output.
+"""
+
+import argparse
+import asyncio
+
+import aiohttp
+
+from couchd.core.query_stats import format_report
+
+_SORT_KEYS = {
+    "total": "total_seconds",
+    "mean": "mean_seconds",
+    "p95": "p95_seconds",
+    "max": "max_seconds",
+    "count": "count",
+    "slow": "slow",
+}
+
+
+async def main(url: str, sort: str, top: int) -> None:
+    async with aiohttp.ClientSession() as session:
+        async with session.get(f"{url.rstrip('/')}/queries") as resp:
+            resp.raise_for_status()
+            rows = await resp.json()
+    if not rows:
+        print("No statements recorded yet.")
+        return
+    print(format_report(rows, _SORT_KEYS[sort], top))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="http://127.0.0.1:9100")
+    parser.add_argument("--sort", choices=sorted(_SORT_KEYS), default="total")
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.url, args.sort, args.top))
@@ -20,6 +20,12 @@ _mock_settings.DB_PASSWORD = "test"
 _mock_settings.DB_HOST = "localhost"
 _mock_settings.DB_PORT = 5432
 _mock_settings.DB_NAME = "test"
+_mock_settings.METRICS_PORT = None
+_mock_settings.DB_EXPLAIN_SLOW_QUERIES = False
+_mock_settings.CHAT_SPIKE_CLIPS = False
+_mock_settings.CHAT_SPIKE_MARKERS = False
+_mock_settings.FOLLOW_DEFENSE_BANS = False
+_mock_settings.FOLLOW_DEFENSE_FOLLOWERS_ONLY = False
 
 _config_mod = MagicMock()
 _config_mod.settings = _mock_settings
@@ -66,6 +72,20 @@ def get_session_fn(db_engine):
     return _get_session
 
 
+@pytest.fixture
+def committing_session_fn(db_engine):
+    """Like get_session_fn, but commits on exit as the real get_session does."""
+    factory = async_sessionmaker(db_engine, expire_on_commit=False, class_=AsyncSession)
+
+    @asynccontextmanager
+    async def _get_session():
+        async with factory() as session:
+            yield session
+            await session.commit()
+
+    return _get_session
+
+
 @pytest.fixture
 async def stream_session(db_session):
     obj = StreamSession(
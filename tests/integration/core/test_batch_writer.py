@@ -0,0 +1,65 @@
+# tests/integration/core/test_batch_writer.py
+#
+# Tests BatchWriter flushing ViewerInteraction rows into a real SQLite in-memory database.
+import asyncio
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, patch
+
+from sqlalchemy import func, select
+
+from couchd.core.batch_writer import BatchWriter
+from couchd.core.models import ViewerInteraction
+
+_PATCH = "couchd.core.batch_writer.get_session"
+_UTC = timezone.utc
+
+
+def _row(n: int, **extra) -> dict:
+    return {
+        "interaction_type": "follow",
+        "username": f"user{n}",
+        "timestamp": datetime(2024, 1, 1, tzinfo=_UTC),
+        **extra,
+    }
+
+
+async def _count(db_session) -> int:
+    return (await db_session.execute(select(func.count()).select_from(ViewerInteraction))).scalar()
+
+
+async def test_close_flushes_mixed_rows(committing_session_fn, db_session):
+    writer = BatchWriter(ViewerInteraction, flush_interval=60)
+    with patch(_PATCH, committing_session_fn):
+        writer.add(_row(1))
+        writer.add(_row(2, bits=100))
+        assert await _count(db_session) == 0
+        await writer.close()
+
+    assert await _count(db_session) == 2
+    assert writer.stats.rows_written == 2
+
+
+async def test_full_batch_flushes_without_waiting(committing_session_fn, db_session):
+    writer = BatchWriter(ViewerInteraction, batch_rows=10, flush_interval=60)
+    with patch(_PATCH, committing_session_fn):
+        for n in range(10):
+            writer.add(_row(n))
+        for _ in range(50):
+            if writer.stats.flushes:
+                break
+            await asyncio.sleep(0.01)
+        await writer.close()
+
+    assert writer.stats.flushes == 1
+    assert await _count(db_session) == 10
+
+
+async def test_rows_over_cap_are_dropped():
+    writer = BatchWriter(ViewerInteraction, max_buffer=3, flush_interval=60)
+    writer._write = AsyncMock()
+    results = [writer.add(_row(n)) for n in range(5)]
+    await writer.close()
+
+    assert results == [True, True, True, False, False]
+    assert writer.stats.dropped == 2
+    writer._write.assert_awaited_once()
@@ -0,0 +1,69 @@
+# tests/integration/core/test_bus.py
+#
+# Tests the event bus log, by-reference delivery and catch-up against SQLite in-memory.
+# pg_notify is Postgres-only, so _notify is replaced with a recorder.
+from unittest.mock import patch
+
+import pytest
+
+from couchd.core import bus as bus_mod
+from couchd.core.bus import EventBus, StreamOffline, StreamOnline, publish
+
+_PATCH = "couchd.core.bus.get_session"
+
+
+@pytest.fixture
+def sent(committing_session_fn):
+    bodies = []
+
+    async def record(_db, body):
+        bodies.append(body)
+
+    with patch(_PATCH, committing_session_fn), patch.object(bus_mod, "_notify", record):
+        yield bodies
+
+
+@pytest.fixture
+def started_bus():
+    subscriber = EventBus()
+    subscriber._floor = 0
+    received = []
+    subscriber.subscribe(StreamOnline, received.append)
+    subscriber.subscribe(StreamOffline, received.append)
+    return subscriber, received
+
+
+async def test_notify_delivers_typed_event_once(sent, started_bus):
+    subscriber, received = started_bus
+    seq = await publish(StreamOffline(platform="twitch", session_id=7))
+
+    await subscriber._on_notify(sent[0])
+    await subscriber._on_notify(sent[0])
+
+    assert seq == 1
+    assert received == [StreamOffline(platform="twitch", session_id=7)]
+
+
+async def test_large_payload_goes_by_reference(sent, started_bus):
+    subscriber, received = started_bus
+    title = "x" * 10_000
+    await publish(StreamOnline(title=title))
+
+    assert "payload" not in sent[0]
+    await subscriber._on_notify(sent[0])
+    assert received[0].title == title
+
+
+async def test_catch_up_replays_missed_events_in_order(sent, started_bus):
+    subscriber, received = started_bus
+    await publish(StreamOnline(title="first"))
+    await publish(StreamOffline(session_id=1))
+    await publish(StreamOnline(title="second"))
+
+    await subscriber._on_notify(sent[2])  # only the last NOTIFY arrived
+    await subscriber.catch_up()
+    await subscriber.catch_up()
+
+    assert [type(e).__name__ for e in received] == ["StreamOnline", "StreamOnline", "StreamOffline"]
+    assert received[0].title == "second"
+    assert subscriber._delivered == set() and subscriber._floor == 3
@@ -3,12 +3,13 @@
 # Tests get_active_session() against a real SQLite in-memory database.
 # Patches couchd.core.utils.get_session with the test fixture.
 from datetime import datetime, timezone
-from unittest.mock import patch
+from unittest.mock import PropertyMock, patch
 
 import pytest
 
+from couchd.core.listener import PgListener
 from couchd.core.models import StreamSession
-from couchd.core.utils import get_active_session
+from couchd.core.utils import get_active_session, invalidate_active_session
 
 _PATCH = "couchd.core.utils.get_session"
 _UTC = timezone.utc
@@ -68,3 +69,58 @@ async def test_get_active_session_returns_most_recent_when_multiple(get_session_
 
     assert result is not None
     assert result.id == newer.id
+
+
+@pytest.fixture
+def session_cache():
+    """Enable the active-session cache as if the NOTIFY listener were connected."""
+    invalidate_active_session()
+    with patch("couchd.core.utils._cache_enabled", True), \
+            patch.object(PgListener, "connected", new_callable=PropertyMock, return_value=True):
+        yield
+    invalidate_active_session()
+
+
+async def test_cached_active_session_skips_db_until_invalidated(get_session_fn, db_session, session_cache):
+    db_session.add(StreamSession(platform="twitch", is_active=True, start_time=datetime(2024, 1, 1, tzinfo=_UTC)))
+    await db_session.commit()
+
+    calls = 0
+
+    def counting_session():
+        nonlocal calls
+        calls += 1
+        return get_session_fn()
+
+    with patch(_PATCH, counting_session):
+        first = await get_active_session()
+        second = await get_active_session()
+        assert calls == 1
+        assert second is first
+
+        first_row = await db_session.get(StreamSession, first.id)
+        first_row.is_active = False
+        await db_session.commit()
+        invalidate_active_session()
+
+        assert await get_active_session() is None
+        assert calls == 2
+
+
+async def test_negative_result_uses_short_ttl(get_session_fn, session_cache):
+    calls = 0
+    clock = [0.0]
+
+    def counting_session():
+        nonlocal calls
+        calls += 1
+        return get_session_fn()
+
+    with patch(_PATCH, counting_session), patch("couchd.core.utils.time.monotonic", lambda: clock[0]):
+        assert await get_active_session() is None
+        clock[0] = 1.0
+        assert await get_active_session() is None
+        assert calls == 1
+        clock[0] = 10.0
+        assert await get_active_session() is None
+        assert calls == 2
@@ -0,0 +1,72 @@
+# tests/integration/core/test_guild_config.py
+#
+# Tests the GuildConfig cache against SQLite in-memory, counting how often it queries.
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from couchd.core import guild_config as guild_config_mod
+from couchd.core.bus import GuildConfigChanged
+from couchd.core.guild_config import GuildConfigCache
+from couchd.core.models import GuildConfig
+
+
+@pytest.fixture
+async def counted_sessions(db_session, get_session_fn):
+    db_session.add_all([
+        GuildConfig(guild_id=2, ideas_channel_id=20, status_channel_id=200),
+        GuildConfig(guild_id=1, status_channel_id=100),
+    ])
+    await db_session.commit()
+    calls = []
+
+    @asynccontextmanager
+    async def _counting():
+        calls.append(1)
+        async with get_session_fn() as session:
+            yield session
+
+    with patch.object(guild_config_mod, "get_session", _counting):
+        yield calls
+
+
+@pytest.fixture
+def cache():
+    cache = GuildConfigCache()
+    with (
+        patch.object(guild_config_mod.bus, "start", AsyncMock()),
+        patch.object(guild_config_mod.bus, "subscribe"),
+        patch.object(guild_config_mod.listener, "on_reconnect"),
+        patch.object(type(guild_config_mod.listener), "connected", True),
+    ):
+        yield cache
+
+
+async def test_reads_hit_db_until_started(counted_sessions, cache):
+    assert (await cache.get(2)).ideas_channel_id == 20
+    assert await cache.get(3) is None
+    assert len(counted_sessions) == 2
+
+
+async def test_started_cache_serves_lookups_from_memory(counted_sessions, cache):
+    await cache.start()
+
+    assert [c.guild_id for c in await cache.all_with("status_channel_id")] == [1, 2]
+    assert (await cache.first_with("ideas_channel_id")).guild_id == 2
+    assert await cache.first_with("problems_forum_id") is None
+    assert (await cache.get(1)).status_channel_id == 100
+    assert len(counted_sessions) == 1
+
+
+async def test_changed_reloads_and_publishes(counted_sessions, cache, db_session):
+    await cache.start()
+    db_session.add(GuildConfig(guild_id=3, problems_forum_id=30))
+    await db_session.commit()
+
+    with patch.object(guild_config_mod, "publish", AsyncMock()) as publish:
+        await cache.changed(3)
+
+    publish.assert_awaited_once_with(GuildConfigChanged(guild_id=3))
+    assert (await cache.first_with("problems_forum_id")).guild_id == 3
+    assert len(counted_sessions) == 2
@@ -0,0 +1,127 @@
+# tests/integration/core/test_mod_holds.py
+#
+# ModerationEngine holds written through to mod_holds, against SQLite in-memory.
+# pg_notify is Postgres-only, so bus._notify is replaced with a recorder.
+import json
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import select
+
+from couchd.core import bus as bus_mod
+from couchd.core.bus import ModHoldResolved
+from couchd.core.constants import HoldSource, Platform
+from couchd.core.models import ModHold
+from couchd.core.moderation import ModerationEngine
+
+_PAYLOAD = {"message_id": "m1", "message": "buy followers", "platform": "twitch"}
+
+
+@pytest.fixture
+def notified(committing_session_fn):
+    bodies = []
+
+    async def record(_db, body):
+        bodies.append(json.loads(body))
+
+    with (
+        patch("couchd.core.moderation.get_session", committing_session_fn),
+        patch("couchd.core.bus.get_session", committing_session_fn),
+        patch.object(bus_mod, "_notify", record),
+    ):
+        yield bodies
+
+
+def _engine() -> ModerationEngine:
+    return ModerationEngine([], platform=Platform.TWITCH)
+
+
+async def _held(message_id: str = "m1") -> ModerationEngine:
+    engine = _engine()
+    engine.hold(message_id, _PAYLOAD, HoldSource.BONELESS_COUCH)
+    await engine.close()
+    return engine
+
+
+async def test_holds_survive_a_restart(notified, db_session):
+    await _held()
+
+    restarted = _engine()
+    assert await restarted.hydrate() == 1
+    assert restarted.get("m1").payload == _PAYLOAD
+
+    pending = await restarted.resolve("m1", "approve")
+    assert pending.hold_sources == [HoldSource.BONELESS_COUCH]
+    assert (await db_session.execute(select(ModHold))).scalars().all() == []
+    assert notified[0]["topic"] == ModHoldResolved.topic
+    assert notified[0]["payload"]["message_id"] == "m1"
+
+
+async def test_any_process_resolves_a_hold_once(notified):
+    await _held()
+    other = _engine()
+
+    assert (await other.resolve("m1", "deny")).payload == _PAYLOAD
+    assert await other.resolve("m1", "deny") is None
+    assert len(notified) == 1
+
+
+async def test_add_source_reaches_holds_made_elsewhere(notified):
+    await _held()
+    other = _engine()
+
+    pending = await other.add_source("m1", HoldSource.TWITCH_AUTOMOD)
+    assert pending.hold_sources == [HoldSource.BONELESS_COUCH, HoldSource.TWITCH_AUTOMOD]
+    assert await other.add_source("unknown", HoldSource.TWITCH_AUTOMOD) is None
+
+    restarted = _engine()
+    await restarted.hydrate()
+    assert restarted.get("m1").hold_sources == [HoldSource.BONELESS_COUCH, HoldSource.TWITCH_AUTOMOD]
+
+
+async def test_hydrate_drops_expired_holds_and_other_platforms(notified, db_session):
+    now = datetime.now(timezone.utc)
+    db_session.add_all([
+        ModHold(platform="twitch", message_id="old", payload={}, hold_sources=[], expires_at=now - timedelta(seconds=1)),
+        ModHold(platform="youtube", message_id="yt", payload={}, hold_sources=[], expires_at=now + timedelta(hours=1)),
+    ])
+    await db_session.commit()
+
+    engine = _engine()
+    assert await engine.hydrate() == 0
+    remaining = (await db_session.execute(select(ModHold.message_id))).scalars().all()
+    assert remaining == ["yt"]
+
+
+async def test_resolution_on_the_bus_drops_the_local_copy(notified):
+    engine = await _held()
+
+    engine._on_resolved(ModHoldResolved(platform="youtube", message_id="m1"))
+    assert engine.has("m1")
+    engine._on_resolved(ModHoldResolved(platform="twitch", message_id="m1"))
+    assert not engine.has("m1")
+
+
+async def test_holds_are_written_behind_in_one_batch(notified, db_session):
+    engine = _engine()
+    for n in range(50):
+        engine.hold(f"m{n}", _PAYLOAD, HoldSource.DUPLICATE_FLOOD)
+    engine.hold("m0", _PAYLOAD, HoldSource.BONELESS_COUCH)    # re-held in the same batch: last write wins
+    assert (await db_session.execute(select(ModHold))).scalars().all() == []
+
+    await engine.flush()
+    rows = {r.message_id: r for r in (await db_session.execute(select(ModHold))).scalars().all()}
+    assert len(rows) == 50
+    assert rows["m0"].hold_sources == [HoldSource.BONELESS_COUCH]
+    assert engine._writes.stats.flushes == 1
+    await engine.close()
+
+
+async def test_resolving_a_buffered_hold_leaves_no_row(notified, db_session):
+    engine = _engine()
+    engine.hold("m1", _PAYLOAD, HoldSource.DUPLICATE_FLOOD)
+
+    assert (await engine.resolve("m1", "deny")).payload == _PAYLOAD
+    await engine.close()
+    assert (await db_session.execute(select(ModHold))).scalars().all() == []
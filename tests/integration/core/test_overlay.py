@@ -0,0 +1,124 @@
+# tests/integration/core/test_overlay.py
+#
+# Tests OverlayState hydration against a real SQLite in-memory database, and that
+# incremental apply() ends up where a fresh hydrate over the same rows would.
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from couchd.core.batch_writer import BatchWriter
+from couchd.core.models import ViewerInteraction
+from couchd.core.overlay import OverlayState
+
+_PATCH = "couchd.core.overlay.get_session"
+_BASE = datetime(2024, 1, 1, 12, 0)
+
+
+def _row(n: int, kind: str, username: str, **extra) -> dict:
+    return {
+        "interaction_type": kind,
+        "username": username,
+        "display_name": username.title(),
+        "timestamp": _BASE + timedelta(minutes=n),
+        **extra,
+    }
+
+
+_HISTORY = [
+    _row(0, "follow", "alice"),
+    _row(1, "sub", "bob", tier="1000"),
+    _row(2, "resub", "bob", tier="1000", cumulative_months=2),
+    _row(3, "raid", "carol", viewer_count=12),
+    _row(4, "sub", "streamer", tier="1000"),
+    _row(5, "bits", "dave", bits=100),
+    _row(6, "giftbomb", "erin", gift_count=5),
+]
+
+_NEW = [
+    _row(10, "follow", "frank"),
+    _row(11, "resub", "carol", tier="2000", cumulative_months=3),
+    _row(12, "sub", "carol", tier="2000"),
+    _row(13, "resub", "carol", tier="2000", cumulative_months=4),
+    _row(14, "bits", "gina", bits=500),
+    _row(15, "sub", "hank", tier="1000"),
+    _row(16, "sub", "ivan", tier="1000"),
+    _row(17, "sub", "judy", tier="1000"),
+    _row(18, "chat", "kim"),
+]
+
+
+async def _insert(db_session, rows: list[dict]) -> None:
+    db_session.add_all(ViewerInteraction(**row) for row in rows)
+    await db_session.commit()
+
+
+async def _hydrated(get_session_fn) -> OverlayState:
+    state = OverlayState()
+    with patch(_PATCH, get_session_fn), patch("couchd.core.overlay.settings.TWITCH_CHANNEL", "streamer"):
+        await state.hydrate()
+    return state
+
+
+async def test_hydrate_builds_stats(db_session, get_session_fn):
+    await _insert(db_session, _HISTORY)
+    stats = (await _hydrated(get_session_fn)).snapshot()
+
+    assert stats["last_follower"]["username"] == "alice"
+    assert stats["last_raider"]["viewer_count"] == 12
+    assert stats["last_bits"]["bits"] == 100
+    assert [r["username"] for r in stats["recent_subs"]] == ["erin", "streamer", "bob", "bob"]
+    assert stats["longest_subs"] == [{"username": "bob", "display_name": "Bob", "cumulative_months": 2}]
+
+
+async def test_apply_matches_fresh_hydrate(db_session, get_session_fn):
+    await _insert(db_session, _HISTORY)
+    state = await _hydrated(get_session_fn)
+    with patch("couchd.core.overlay.settings.TWITCH_CHANNEL", "streamer"):
+        for row in _NEW:
+            state.apply(row)
+
+    await _insert(db_session, _NEW)
+    expected = (await _hydrated(get_session_fn)).snapshot()
+    actual = state.snapshot()
+
+    assert actual["last_follower"] == expected["last_follower"]
+    assert actual["last_bits"] == expected["last_bits"]
+    assert actual["recent_subs"] == expected["recent_subs"]
+    assert actual["longest_subs"][0] == {"username": "carol", "display_name": "Carol", "cumulative_months": 3}
+    assert {r["username"]: r["cumulative_months"] for r in actual["longest_subs"]} == {
+        r["username"]: r["cumulative_months"] for r in expected["longest_subs"]
+    }
+
+
+async def test_apply_before_hydrate_is_ignored():
+    state = OverlayState()
+    state.apply(_row(0, "follow", "alice"))
+    assert state.snapshot()["last_follower"] == {}
+
+
+async def test_rows_recorded_before_hydrate_are_counted_once(db_session, get_session_fn, committing_session_fn):
+    writer = BatchWriter(ViewerInteraction)
+    state = OverlayState(writer)
+    written, unwritten = _NEW[:4], _NEW[4:]
+    with (
+        patch(_PATCH, get_session_fn),
+        patch("couchd.core.batch_writer.get_session", committing_session_fn),
+        patch("couchd.core.overlay.settings.TWITCH_CHANNEL", "streamer"),
+    ):
+        await _insert(db_session, _HISTORY)
+        for row in written:
+            writer.add(row)
+            state.apply(row)
+        await writer.flush()
+        for row in unwritten:                   # still buffered when the hydrate query runs
+            writer.add(row)
+            state.apply(row)
+        await state.hydrate()
+        await writer.close()
+
+    expected = (await _hydrated(get_session_fn)).snapshot()
+    actual = state.snapshot()
+    assert actual["last_bits"]["username"] == "gina"
+    assert actual["recent_subs"] == expected["recent_subs"]
+    assert {r["username"]: r["cumulative_months"] for r in actual["longest_subs"]} == {
+        r["username"]: r["cumulative_months"] for r in expected["longest_subs"]
+    }
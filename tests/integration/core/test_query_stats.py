@@ -0,0 +1,62 @@
+# tests/integration/core/test_query_stats.py
+#
+# Tests statement timing hooks on a SQLite in-memory engine.
+import logging
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from couchd.core import query_stats
+from couchd.core.db import Base
+from couchd.core.models import GuildConfig
+from couchd.core.query_stats import fingerprint, format_report, redact
+
+
+@pytest.fixture
+async def engine():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    query_stats.instrument(engine.sync_engine)
+    with patch.object(query_stats, "_stats", {}):
+        yield engine
+    await engine.dispose()
+
+
+def test_fingerprint_strips_literals_and_collapses_lists():
+    assert fingerprint(
+        "SELECT a FROM t\n  WHERE x = $1::VARCHAR AND y IN ($2::INTEGER, $3::INTEGER) AND z = 'it''s' LIMIT 10"
+    ) == "SELECT a FROM t WHERE x = ? AND y IN (?, ...) AND z = ? LIMIT ?"
+    assert fingerprint("INSERT INTO t (a, b) VALUES ($1, 2), ($3, 4)") == "INSERT INTO t (a, b) VALUES (?, ...), ..."
+
+
+def test_redact_keeps_only_types():
+    assert redact((1, "secret", None)) == "(int, str, NoneType)"
+    assert redact({"token": "secret"}) == "{token: str}"
+    assert redact([(1,), (2,)], executemany=True) == "[2 rows]"
+
+
+async def test_repeated_statements_share_one_fingerprint(engine):
+    async with engine.connect() as conn:
+        for guild_id in (1, 2, 3):
+            await conn.execute(select(GuildConfig).where(GuildConfig.guild_id == guild_id))
+
+    [row] = [r for r in query_stats.snapshot() if "FROM guild_configs" in r["fingerprint"]]
+    assert row["count"] == 3
+    assert row["slow"] == 0
+    assert format_report([row]).splitlines()[1].split()[0] == "3"
+
+
+async def test_slow_query_logs_redacted_params(engine, caplog):
+    with (
+        patch.object(query_stats.QueryStatsConfig, "SLOW_QUERY_SECONDS", 0),
+        caplog.at_level(logging.WARNING, logger="couchd.core.query_stats"),
+    ):
+        async with engine.connect() as conn:
+            await conn.execute(select(GuildConfig).where(GuildConfig.ideas_channel_id == 424242))
+
+    [message] = [r.getMessage() for r in caplog.records if "FROM guild_configs" in r.getMessage()]
+    assert message.startswith("Slow query")
+    assert "424242" not in message and "params=(int" in message
@@ -0,0 +1,90 @@
+# tests/integration/core/test_veil_outbox.py
+#
+# Tests the veil outbox save/ack/replay cycle against a real SQLite in-memory database.
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+from couchd.core.clients import veil, veil_outbox
+from couchd.core.models import VeilOutboxEvent
+
+
+@contextmanager
+def _outbox_db(session_fn):
+    with patch("couchd.core.clients.veil_outbox.get_session", session_fn), \
+            patch("couchd.core.batch_writer.get_session", session_fn):
+        yield
+
+
+async def test_save_then_ack_removes_event(committing_session_fn):
+    with _outbox_db(committing_session_fn):
+        assert veil_outbox.save("e1", "twitch.raid", {"from": "a"})
+        assert veil_outbox.save("e2", "twitch.sub", {"user": "b"})
+        await veil_outbox.flush()
+        await veil_outbox.ack(["e1"])
+        rows = await veil_outbox.pending(0, 10)
+
+    assert [r.event_id for r in rows] == ["e2"]
+
+
+async def test_ack_before_flush_never_writes_the_event(committing_session_fn):
+    with _outbox_db(committing_session_fn):
+        veil_outbox.save("e1", "twitch.raid", {})
+        veil_outbox.save("e2", "twitch.sub", {})
+        await veil_outbox.ack(["e1"])
+        await veil_outbox.close()
+        rows = await veil_outbox.pending(0, 10)
+
+    assert [r.event_id for r in rows] == ["e2"]
+
+
+async def test_purge_stale_drops_old_events(committing_session_fn, db_session):
+    db_session.add(VeilOutboxEvent(
+        event_id="old", owner="twitch", event_type="twitch.raid", payload={},
+        created_at=datetime.now(timezone.utc) - timedelta(days=2),
+    ))
+    await db_session.commit()
+
+    with _outbox_db(committing_session_fn):
+        veil_outbox.save("new", "twitch.raid", {})
+        await veil_outbox.flush()
+        assert await veil_outbox.purge_stale() == 1
+        rows = await veil_outbox.pending(0, 10)
+
+    assert [r.event_id for r in rows] == ["new"]
+
+
+async def test_replay_requeues_in_order_without_duplicates(committing_session_fn, mock_settings):
+    queue = veil._EventQueue()
+    with _outbox_db(committing_session_fn), \
+            patch.object(mock_settings, "VEIL_OUTBOX_ENABLED", True), \
+            patch.object(veil, "_queue", queue), \
+            patch.object(veil._EventQueue, "_ensure_sender"), \
+            patch.object(queue, "_wakeup", create=True), \
+            patch("couchd.core.constants.VeilConfig.REPLAY_INTERVAL_SECONDS", 0):
+        for n in range(3):
+            veil_outbox.save(f"e{n}", "twitch.sub", {"n": n})
+        await veil_outbox.flush()
+        await veil.replay_outbox()
+        await veil.replay_outbox()
+
+    assert [eid for _, _, eid in queue.take(10)] == ["e0", "e1", "e2"]
+
+
+async def test_replay_skips_events_another_bot_wrote(committing_session_fn, mock_settings):
+    queue = veil._EventQueue()
+    with _outbox_db(committing_session_fn), \
+            patch.object(mock_settings, "VEIL_OUTBOX_ENABLED", True), \
+            patch.object(veil, "_queue", queue), \
+            patch.object(veil._EventQueue, "_ensure_sender"), \
+            patch.object(queue, "_wakeup", create=True), \
+            patch("couchd.core.constants.VeilConfig.REPLAY_INTERVAL_SECONDS", 0):
+        veil_outbox.set_owner("youtube")
+        veil_outbox.save("yt", "modqueue.pending", {})
+        await veil_outbox.flush()
+        veil_outbox.set_owner("twitch")
+        veil_outbox.save("tw", "twitch.raid", {})
+        await veil_outbox.flush()
+        await veil.replay_outbox()
+
+    assert [eid for _, _, eid in queue.take(10)] == ["tw"]
@@ -0,0 +1,142 @@
+# tests/integration/platforms/discord/test_fanout.py
+#
+# Tests multi-guild announcement fan-out with dozens of mock guilds against SQLite in-memory.
+# Discord channels are mocks; writes go through the real scheduler.
+import asyncio
+from itertools import count
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from discord.ext import tasks
+from sqlalchemy import select
+
+from couchd.core.constants import PostKind
+from couchd.core.guild_config import guild_configs
+from couchd.core.models import ClipLog, DiscordPost, GuildConfig, StreamEvent, StreamSession
+from couchd.platforms.discord.cogs.clips import ClipWatcherCog
+from couchd.platforms.discord.cogs.streams import StreamWatcherCog
+from couchd.platforms.discord.components.fanout import fan_out
+from couchd.platforms.discord.components.scheduler import Priority, discord_writes
+
+_GUILDS = 40
+_BROKEN_GUILD = 7
+_message_ids = count(1000)
+
+
+def _configs(field: str) -> list[GuildConfig]:
+    return [GuildConfig(guild_id=g, **{field: 100 + g}) for g in range(1, _GUILDS + 1)]
+
+
+def _channel(channel_id: int) -> MagicMock:
+    channel = MagicMock(id=channel_id)
+    channel.name = f"channel-{channel_id}"
+    if channel_id == 100 + _BROKEN_GUILD:
+        channel.send = AsyncMock(side_effect=RuntimeError("Missing Access"))
+    else:
+        channel.send = AsyncMock(
+            side_effect=lambda *a, **k: MagicMock(
+                id=next(_message_ids), create_thread=AsyncMock(return_value=MagicMock(id=next(_message_ids)))
+            )
+        )
+    return channel
+
+
+@pytest.fixture
+def bot():
+    channels: dict[int, MagicMock] = {}
+    bot = MagicMock()
+    bot.get_channel.side_effect = lambda cid: channels.setdefault(cid, _channel(cid))
+    bot.channels = channels
+    return bot
+
+
+async def _posts(db_session, kind: PostKind) -> list[DiscordPost]:
+    return (
+        await db_session.execute(select(DiscordPost).where(DiscordPost.kind == kind.value))
+    ).scalars().all()
+
+
+async def test_fan_out_bounds_concurrency_and_isolates_failures():
+    running = peak = 0
+
+    async def job(config):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.001)
+        running -= 1
+        if config.guild_id == _BROKEN_GUILD:
+            raise RuntimeError("boom")
+        return DiscordPost(guild_id=config.guild_id)
+
+    results = await fan_out(_configs("clip_showcase_channel_id"), job, "test", limit=6)
+
+    assert peak == 6
+    assert sorted(results) == [g for g in range(1, _GUILDS + 1) if g != _BROKEN_GUILD]
+
+
+async def test_clips_post_to_every_guild_once(bot, committing_session_fn, db_session, stream_session):
+    event = StreamEvent(session_id=stream_session.id, event_type="clip")
+    db_session.add(event)
+    await db_session.flush()
+    db_session.add(ClipLog(stream_event_id=event.id, clip_id="c1", title="Nice", url="u", platform="twitch"))
+    await db_session.commit()
+
+    with patch.object(tasks.Loop, "start"):
+        cog = ClipWatcherCog(bot)
+    cog.twitch.get_clips = AsyncMock(return_value={})
+    configs = AsyncMock(return_value=_configs("clip_showcase_channel_id"))
+    with (
+        patch("couchd.platforms.discord.cogs.clips.get_session", committing_session_fn),
+        patch("couchd.platforms.discord.components.fanout.get_session", committing_session_fn),
+        patch.object(guild_configs, "all_with", configs),
+        # Every session shares the one in-memory SQLite connection, so let jobs commit one at a time.
+        patch.object(discord_writes, "max_concurrency", 1),
+    ):
+        deduplicated = discord_writes.stats.deduplicated
+        await cog._post_unposted()
+        await cog._post_unposted()      # overlaps the first pass's queued jobs
+        await discord_writes.drain()
+        assert discord_writes.stats.deduplicated > deduplicated
+        await cog._post_unposted()      # clip is marked posted by now
+
+    posts = await _posts(db_session, PostKind.CLIP)
+    assert sorted(p.guild_id for p in posts) == [g for g in range(1, _GUILDS + 1) if g != _BROKEN_GUILD]
+    assert len({p.message_id for p in posts}) == _GUILDS - 1
+    assert all(bot.channels[100 + g].send.await_count == 1 for g in range(1, _GUILDS + 1))
+    clip = (await db_session.execute(select(ClipLog))).scalar_one()
+    await db_session.refresh(clip)
+    assert clip.discord_message_id == next(p.message_id for p in posts if p.guild_id == 1)
+
+
+async def test_go_live_records_per_guild_messages(bot, committing_session_fn, db_session):
+    with patch.object(tasks.Loop, "start"):
+        cog = StreamWatcherCog(bot)
+    configs = AsyncMock(return_value=_configs("stream_updates_channel_id"))
+    with (
+        patch("couchd.platforms.discord.cogs.streams.get_session", committing_session_fn),
+        patch.object(guild_configs, "all_with", configs),
+    ):
+        await cog.handle_stream_start({"title": "Grinding", "category": "Software"})
+
+    session = (await db_session.execute(select(StreamSession))).scalar_one()
+    posts = await _posts(db_session, PostKind.GO_LIVE)
+    assert len(posts) == _GUILDS - 1
+    assert {p.ref for p in posts} == {str(session.id)}
+    assert all(p.thread_id is not None for p in posts)
+
+
+async def test_failed_save_does_not_resend_clip(bot):
+    with patch.object(tasks.Loop, "start"):
+        cog = ClipWatcherCog(bot)
+    clip = ClipLog(id=1, clip_id="c1", title="Nice", url="u")
+    config = GuildConfig(guild_id=1, clip_showcase_channel_id=101)
+    channel = bot.get_channel(101)
+    save = AsyncMock(side_effect=OSError("database went away"))
+
+    with patch("couchd.platforms.discord.cogs.clips.save_first_post", save):
+        await discord_writes.run(channel.id, lambda: cog._post_clip(config, channel, clip, MagicMock()), Priority.CLIPS)
+        await discord_writes.drain()
+
+    channel.send.assert_awaited_once()
+    save.assert_awaited_once()
@@ -8,8 +8,11 @@ import pytest
 from discord.ext import tasks
 from sqlalchemy import select
 
+from couchd.core.constants import PostKind
 from couchd.core.models import SolutionPost
 from couchd.platforms.discord.cogs.problems import ProblemsWatcherCog
+from couchd.platforms.discord.components import problems_forum
+from couchd.platforms.discord.components.fanout import new_post
 from couchd.platforms.discord.components.problems_forum import build_problem_embed
 
 _FORUM_PATCH = "couchd.platforms.discord.components.problems_forum.get_session"
@@ -134,3 +137,27 @@ async def test_poll_does_not_insert_duplicate(
         solutions = (await verify_session.execute(select(SolutionPost))).scalars().all()
 
     assert len(solutions) == 1  # still just the original, no duplicate
+
+
+# ── flush_pending_solutions ───────────────────────────────────────────────────
+
+
+async def test_flush_pending_solutions_is_per_guild(get_session_fn, db_session, lc_event):
+    solution = SolutionPost(problem_slug="two-sum", platform="twitch", username="viewer", url="u")
+    db_session.add(solution)
+    await db_session.flush()
+    db_session.add_all([
+        new_post(PostKind.LC_THREAD, "two-sum", 1, 10, 11, 11),
+        new_post(PostKind.LC_THREAD, "two-sum", 2, 20, 21, 21),
+        new_post(PostKind.SOLUTION, solution.id, 1, 11, 12),
+    ])
+    await db_session.commit()
+
+    with (
+        patch(_FORUM_PATCH, get_session_fn),
+        patch.object(problems_forum, "schedule_problem_refresh") as schedule,
+    ):
+        await problems_forum.flush_pending_solutions(MagicMock(), MagicMock(), 1)
+        await problems_forum.flush_pending_solutions(MagicMock(), MagicMock(), 2)
+
+    assert [(c.args[1], c.args[2].guild_id) for c in schedule.call_args_list] == [("two-sum", 2)]
@@ -0,0 +1,127 @@
+# tests/integration/platforms/discord/test_streams_recap.py
+#
+# Tests the single-query recap loader and incremental RecapBuilder against SQLite in-memory.
+from datetime import timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy import update
+
+from couchd.core.chat_spikes import Spike, record_spike
+from couchd.core.constants import Platform
+from couchd.core.guild_config import guild_configs
+from couchd.core.models import CFProblemAttempt, GuildConfig, ProjectLog, StreamEvent
+from couchd.platforms.discord.components.streams_recap import (
+    RecapBuilder, build_recap_embed, post_stream_recap,
+)
+
+_PATCH = "couchd.platforms.discord.components.streams_recap.get_session"
+_FANOUT_PATCH = "couchd.platforms.discord.components.fanout.get_session"
+
+
+@pytest.fixture
+async def lc_event(db_session, stream_session, lc_event):
+    """The shared LC attempt, moved to ten minutes into the stream."""
+    await db_session.execute(
+        update(StreamEvent)
+        .where(StreamEvent.id == lc_event.stream_event_id)
+        .values(timestamp=stream_session.start_time + timedelta(minutes=10))
+    )
+    await db_session.commit()
+    return lc_event
+
+
+async def _event(db_session, stream_session, minutes: int, event_type: str, notes: str | None = None):
+    event = StreamEvent(
+        session_id=stream_session.id,
+        event_type=event_type,
+        notes=notes,
+        timestamp=stream_session.start_time + timedelta(minutes=minutes),
+    )
+    db_session.add(event)
+    await db_session.flush()
+    return event
+
+
+async def _seed_tail(db_session, stream_session) -> None:
+    await _event(db_session, stream_session, 20, "task", "binary search")
+    cf = await _event(db_session, stream_session, 30, "cf_problem")
+    db_session.add(CFProblemAttempt(
+        stream_event_id=cf.id, contest_id=1900, index="A", title="Cover in Water",
+        url="https://codeforces.com/contest/1900/problem/A", rating=800,
+    ))
+    await _event(db_session, stream_session, 35, "task", "done")
+    project = await _event(db_session, stream_session, 40, "project")
+    db_session.add(ProjectLog(stream_event_id=project.id, title="couchd", description="bot"))
+    await _event(db_session, stream_session, 45, "chat")
+    await db_session.commit()
+
+
+async def test_refresh_loads_segments_with_details(get_session_fn, db_session, stream_session, lc_event):
+    await _seed_tail(db_session, stream_session)
+    builder = RecapBuilder(stream_session.id, stream_session.start_time)
+    with patch(_PATCH, get_session_fn):
+        loaded = await builder.refresh()
+
+    assert loaded == 5  # the chat event is filtered out by the query
+    assert [s.event_type for s in builder.segments] == ["problem_attempt", "cf_problem", "project"]
+    assert builder.segments[0].detail.title == "1. Two Sum"
+    assert builder.segments[0].tasks == [("binary search", "20:00")]
+    assert builder.segments[1].detail.rating == 800
+    assert builder.segments[1].tasks == []
+    assert builder.segments[2].detail.title == "couchd"
+
+
+async def test_incremental_refresh_matches_full_load(get_session_fn, db_session, stream_session, lc_event):
+    live = RecapBuilder(stream_session.id, stream_session.start_time)
+    with patch(_PATCH, get_session_fn):
+        assert await live.refresh() == 1
+        await _seed_tail(db_session, stream_session)
+        assert await live.refresh() == 4
+        assert await live.refresh() == 0
+
+        full = RecapBuilder(stream_session.id, stream_session.start_time)
+        await full.refresh()
+
+    assert [(s.event_type, s.tasks) for s in live.segments] == [(s.event_type, s.tasks) for s in full.segments]
+
+
+async def test_post_recap_uses_warm_builder(get_session_fn, db_session, stream_session, lc_event):
+    stream_session.end_time = stream_session.start_time + timedelta(hours=1)
+    builder = RecapBuilder(stream_session.id, stream_session.start_time)
+    channel = MagicMock(id=10)
+    channel.send = AsyncMock()
+    bot = MagicMock()
+    bot.get_channel.return_value = channel
+    configs = AsyncMock(return_value=[GuildConfig(guild_id=1, stream_updates_channel_id=10)])
+    with (
+        patch(_PATCH, get_session_fn),
+        patch(_FANOUT_PATCH, get_session_fn),
+        patch.object(guild_configs, "all_with", configs),
+    ):
+        await builder.refresh()
+        await post_stream_recap(stream_session, bot, builder)
+
+    embed = channel.send.call_args.kwargs["embed"]
+    fields = {f.name: f.value for f in embed.fields}
+    assert fields["Duration"] == "1h 0m"
+    assert "Two Sum" in fields["LeetCode (1 attempted)"]
+
+
+async def test_chat_spikes_render_as_highlights(get_session_fn, committing_session_fn, stream_session, lc_event):
+    spike = Spike(
+        Platform.TWITCH, stream_session.start_time + timedelta(minutes=12), peak_rate=9.5, peak_z=7.25,
+        ended_at=stream_session.start_time + timedelta(minutes=12, seconds=40), session_id=stream_session.id,
+        clip_url="https://clips.twitch.tv/abc",
+    )
+    with patch("couchd.core.chat_spikes.get_session", committing_session_fn):
+        await record_spike(spike)
+    builder = RecapBuilder(stream_session.id, stream_session.start_time)
+    with patch(_PATCH, get_session_fn):
+        embed = await build_recap_embed(stream_session, builder)
+
+    assert [s.event_type for s in builder.segments] == ["problem_attempt"]
+    fields = {f.name: f.value for f in embed.fields}
+    assert fields["Highlights (1 chat spikes)"] == (
+        "- 9.5 msg/s (z 7.2) for 40s · [clip](https://clips.twitch.tv/abc) · `12:00`"
+    )
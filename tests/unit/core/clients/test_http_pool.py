@@ -0,0 +1,30 @@
+# tests/unit/core/clients/test_http_pool.py
+from couchd.core.clients import http_pool
+
+
+async def test_same_host_shares_session():
+    try:
+        a = http_pool.get_session("https://api.example.com/one")
+        b = http_pool.get_session("https://API.example.com/two?x=1")
+        c = http_pool.get_session("https://other.example.com/")
+        assert a is b
+        assert a is not c
+    finally:
+        await http_pool.close_all()
+
+
+async def test_closed_session_is_replaced():
+    try:
+        first = http_pool.get_session("https://api.example.com/")
+        await first.close()
+        second = http_pool.get_session("https://api.example.com/")
+        assert second is not first
+        assert not second.closed
+    finally:
+        await http_pool.close_all()
+
+
+async def test_close_all_closes_sessions():
+    session = http_pool.get_session("https://api.example.com/")
+    await http_pool.close_all()
+    assert session.closed
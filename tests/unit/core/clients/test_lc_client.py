@@ -23,11 +23,7 @@ def _make_aiohttp_mock(status: int, json_data: dict):
     mock_http = AsyncMock()
     mock_http.post = MagicMock(return_value=mock_post_cm)
 
-    mock_session_cm = AsyncMock()
-    mock_session_cm.__aenter__ = AsyncMock(return_value=mock_http)
-    mock_session_cm.__aexit__ = AsyncMock(return_value=False)
-
-    return MagicMock(return_value=mock_session_cm)
+    return MagicMock(return_value=mock_http)
 
 
 async def test_fetch_recent_ac_returns_parsed_list(client):
@@ -37,7 +33,7 @@ async def test_fetch_recent_ac_returns_parsed_list(client):
     ]
     mock_session = _make_aiohttp_mock(200, {"data": {"recentAcSubmissionList": submissions}})
 
-    with patch("aiohttp.ClientSession", mock_session):
+    with patch("couchd.core.clients.http_pool.get_session", mock_session):
         result = await client.fetch_recent_ac_submissions("testuser")
 
     assert result == submissions
@@ -46,14 +42,14 @@ async def test_fetch_recent_ac_returns_parsed_list(client):
 async def test_fetch_recent_ac_http_error_returns_empty(client):
     mock_session = _make_aiohttp_mock(500, {})
 
-    with patch("aiohttp.ClientSession", mock_session):
+    with patch("couchd.core.clients.http_pool.get_session", mock_session):
         result = await client.fetch_recent_ac_submissions("testuser")
 
     assert result == []
 
 
 async def test_fetch_recent_ac_network_exception_returns_empty(client):
-    with patch("aiohttp.ClientSession", side_effect=Exception("network error")):
+    with patch("couchd.core.clients.http_pool.get_session", side_effect=Exception("network error")):
         result = await client.fetch_recent_ac_submissions("testuser")
 
     assert result == []
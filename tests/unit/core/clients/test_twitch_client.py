@@ -1,4 +1,6 @@
 # tests/unit/core/clients/test_twitch_client.py
+import asyncio
+import time
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -13,9 +15,10 @@ def client():
     return c
 
 
-def _make_aiohttp_mock(status: int, json_data: dict):
+def _make_aiohttp_mock(status: int, json_data: dict, headers: dict | None = None):
     mock_resp = AsyncMock()
     mock_resp.status = status
+    mock_resp.headers = headers or {}
     mock_resp.json = AsyncMock(return_value=json_data)
 
     mock_get_cm = AsyncMock()
@@ -25,11 +28,7 @@ def _make_aiohttp_mock(status: int, json_data: dict):
     mock_http = AsyncMock()
     mock_http.get = MagicMock(return_value=mock_get_cm)
 
-    mock_session_cm = AsyncMock()
-    mock_session_cm.__aenter__ = AsyncMock(return_value=mock_http)
-    mock_session_cm.__aexit__ = AsyncMock(return_value=False)
-
-    return MagicMock(return_value=mock_session_cm)
+    return MagicMock(return_value=mock_http)
 
 
 def _make_post_mock(status: int, json_data: dict):
@@ -46,11 +45,7 @@ def _make_post_mock(status: int, json_data: dict):
     mock_http = AsyncMock()
     mock_http.post = MagicMock(return_value=mock_post_cm)
 
-    mock_session_cm = AsyncMock()
-    mock_session_cm.__aenter__ = AsyncMock(return_value=mock_http)
-    mock_session_cm.__aexit__ = AsyncMock(return_value=False)
-
-    return MagicMock(return_value=mock_session_cm)
+    return MagicMock(return_value=mock_http)
 
 
 # ── get_stream_status ─────────────────────────────────────────────────────────
@@ -59,7 +54,7 @@ async def test_get_stream_status_live_returns_stream_data(client):
     stream_data = {"user_login": "teststreamer", "type": "live"}
     mock_session = _make_aiohttp_mock(200, {"data": [stream_data]})
 
-    with patch("aiohttp.ClientSession", mock_session):
+    with patch("couchd.core.clients.http_pool.get_session", mock_session):
         result = await client.get_stream_status("teststreamer")
 
     assert result == stream_data
@@ -68,7 +63,7 @@ async def test_get_stream_status_live_returns_stream_data(client):
 async def test_get_stream_status_offline_returns_none(client):
     mock_session = _make_aiohttp_mock(200, {"data": []})
 
-    with patch("aiohttp.ClientSession", mock_session):
+    with patch("couchd.core.clients.http_pool.get_session", mock_session):
         result = await client.get_stream_status("teststreamer")
 
     assert result is None
@@ -77,7 +72,7 @@ async def test_get_stream_status_offline_returns_none(client):
 async def test_get_stream_status_non_200_returns_none(client):
     mock_session = _make_aiohttp_mock(500, {})
 
-    with patch("aiohttp.ClientSession", mock_session):
+    with patch("couchd.core.clients.http_pool.get_session", mock_session):
         result = await client.get_stream_status("teststreamer")
 
     assert result is None
@@ -88,7 +83,7 @@ async def test_get_stream_status_no_token_returns_none():
     client.app_token = None
     mock_session = _make_post_mock(500, {})  # token fetch fails
 
-    with patch("aiohttp.ClientSession", mock_session):
+    with patch("couchd.core.clients.http_pool.get_session", mock_session):
         result = await client.get_stream_status("teststreamer")
 
     assert result is None
@@ -100,7 +95,7 @@ async def test_get_clip_returns_clip_data(client):
     clip_data = {"id": "clip123", "url": "https://clips.twitch.tv/clip123"}
     mock_session = _make_aiohttp_mock(200, {"data": [clip_data]})
 
-    with patch("aiohttp.ClientSession", mock_session):
+    with patch("couchd.core.clients.http_pool.get_session", mock_session):
         result = await client.get_clip("clip123")
 
     assert result == clip_data
@@ -109,7 +104,114 @@ async def test_get_clip_returns_clip_data(client):
 async def test_get_clip_non_200_returns_none(client):
     mock_session = _make_aiohttp_mock(404, {})
 
-    with patch("aiohttp.ClientSession", mock_session):
+    with patch("couchd.core.clients.http_pool.get_session", mock_session):
         result = await client.get_clip("clip123")
 
     assert result is None
+
+
+# ── Helix request core ────────────────────────────────────────────────────────
+
+def _response(status: int, json_data: dict | None = None, headers: dict | None = None):
+    resp = AsyncMock()
+    resp.status = status
+    resp.headers = headers or {}
+    resp.json = AsyncMock(return_value=json_data or {})
+    cm = AsyncMock()
+    cm.__aenter__ = AsyncMock(return_value=resp)
+    cm.__aexit__ = AsyncMock(return_value=False)
+    return cm
+
+
+async def test_401_refreshes_token_and_retries(client):
+    http = AsyncMock()
+    http.get = MagicMock(side_effect=[_response(401), _response(200, {"data": [{"id": "42", "login": "someone"}]})])
+
+    async def refresh():
+        client.app_token = "fresh"
+        return "fresh"
+
+    with patch("couchd.core.clients.http_pool.get_session", MagicMock(return_value=http)), \
+            patch.object(client, "_get_app_token", AsyncMock(side_effect=refresh)) as get_token:
+        result = await client.get_user_id("someone")
+
+    assert result == "42"
+    get_token.assert_awaited_once()
+    assert http.get.call_args.kwargs["headers"]["Authorization"] == "Bearer fresh"
+
+
+async def test_concurrent_callers_share_one_token_refresh():
+    client = TwitchClient()
+    calls = 0
+
+    async def slow_refresh():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        client.app_token = "tok"
+        return "tok"
+
+    with patch.object(client, "_get_app_token", AsyncMock(side_effect=slow_refresh)):
+        tokens = await asyncio.gather(*(client._ensure_token() for _ in range(10)))
+
+    assert calls == 1
+    assert tokens == ["tok"] * 10
+
+
+async def test_token_refreshes_before_expiry(client):
+    client._token_expires_at = time.monotonic() + 60  # inside the refresh margin
+
+    with patch.object(client, "_get_app_token", AsyncMock(return_value="new")) as get_token:
+        await client._ensure_token()
+
+    get_token.assert_awaited_once()
+
+
+async def test_waits_for_reset_when_ratelimit_exhausted(client):
+    reset_at = str(time.time() + 2)
+    mock_session = _make_aiohttp_mock(
+        200, {"data": []}, {"Ratelimit-Remaining": "0", "Ratelimit-Reset": reset_at}
+    )
+
+    with patch("couchd.core.clients.http_pool.get_session", mock_session), \
+            patch("couchd.core.clients.twitch.asyncio.sleep", AsyncMock()) as sleep:
+        await client.get_stream_status("teststreamer")
+        sleep.assert_not_awaited()
+        await client.get_stream_status("teststreamer")
+
+    sleep.assert_awaited_once()
+    assert 0 < sleep.await_args.args[0] <= 2
+
+
+# ── batched lookups ───────────────────────────────────────────────────────────
+
+async def test_get_clips_chunks_by_100(client):
+    ids = [f"c{n}" for n in range(150)]
+    http = AsyncMock()
+    http.get = MagicMock(side_effect=[
+        _response(200, {"data": [{"id": i} for i in ids[:100]]}),
+        _response(200, {"data": [{"id": i} for i in ids[100:]]}),
+    ])
+
+    with patch("couchd.core.clients.http_pool.get_session", MagicMock(return_value=http)):
+        result = await client.get_clips(ids)
+
+    assert http.get.call_count == 2
+    assert len(http.get.call_args_list[0].kwargs["params"]) == 100
+    assert set(result) == set(ids)
+
+
+async def test_concurrent_stream_lookups_share_one_request(client):
+    http = AsyncMock()
+    http.get = MagicMock(return_value=_response(200, {"data": [{"user_login": "alice"}]}))
+
+    with patch("couchd.core.clients.http_pool.get_session", MagicMock(return_value=http)):
+        alice, bob = await asyncio.gather(
+            client.get_stream_status("Alice"),
+            client.get_stream_status("bob"),
+        )
+
+    assert http.get.call_count == 1
+    assert sorted(v for k, v in http.get.call_args.kwargs["params"] if k == "user_login") == ["alice", "bob"]
+    assert alice == {"user_login": "alice"}
+    assert bob is None
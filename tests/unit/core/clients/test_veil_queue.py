@@ -0,0 +1,96 @@
+# tests/unit/core/clients/test_veil_queue.py
+from unittest.mock import AsyncMock, patch
+
+from couchd.core.clients import veil
+from couchd.core.clients.veil import _EventQueue
+
+
+def _fill(queue: _EventQueue, events):
+    # Bypass the background sender; these tests only inspect the buffer.
+    with patch.object(_EventQueue, "_ensure_sender"), patch.object(queue, "_wakeup", create=True):
+        for event_type, payload in events:
+            queue.put(event_type, payload)
+
+
+def test_alerts_drain_before_chat():
+    queue = _EventQueue()
+    _fill(queue, [
+        ("twitch.chat.message", {"n": 1}),
+        ("emotes.update", {}),
+        ("twitch.raid", {"n": 2}),
+    ])
+    assert [t for t, _, _ in queue.take(10)] == ["twitch.raid", "emotes.update", "twitch.chat.message"]
+
+
+def test_speaking_coalesces_per_user():
+    queue = _EventQueue()
+    _fill(queue, [
+        ("discord.voice.speaking", {"user_id": "1", "speaking": True}),
+        ("discord.voice.speaking", {"user_id": "2", "speaking": True}),
+        ("discord.voice.speaking", {"user_id": "1", "speaking": False}),
+    ])
+    batch = queue.take(10)
+    assert [p for _, p, _ in batch] == [
+        {"user_id": "1", "speaking": False},
+        {"user_id": "2", "speaking": True},
+    ]
+    assert queue.stats.coalesced == 1
+
+
+def test_full_lane_drops_oldest():
+    queue = _EventQueue()
+    with patch.dict("couchd.core.constants.VeilConfig.LANE_MAX", {"chat": 2}):
+        _fill(queue, [("twitch.chat.message", {"n": n}) for n in range(3)])
+    assert [p["n"] for _, p, _ in queue.take(10)] == [1, 2]
+    assert queue.stats.dropped == 1
+
+
+async def test_batch_falls_back_to_single_posts_on_404():
+    queue = _EventQueue()
+    post = AsyncMock(side_effect=[404, 204, 204])
+    with patch("couchd.core.clients.veil._post_json", post):
+        await queue._send([("a", {}, None), ("b", {}, None)])
+    assert [c.args[0] for c in post.await_args_list] == ["/events", "/event", "/event"]
+    assert queue.stats.sent == 2
+    assert queue._batch_supported is False
+
+
+async def test_post_event_returns_without_sending(mock_settings):
+    post = AsyncMock(return_value=204)
+    with patch.object(mock_settings, "VEIL_URL", "http://veil.local"), \
+            patch.object(mock_settings, "VEIL_OUTBOX_ENABLED", False), \
+            patch("couchd.core.clients.veil._post_json", post):
+        await veil.post_event("twitch.raid", {"from": "x"})
+        post.assert_not_awaited()
+        await veil.close()
+    post.assert_awaited_once_with("/event", {"type": "twitch.raid", "payload": {"from": "x"}})
+
+
+async def test_acked_alert_is_removed_from_outbox():
+    queue = _EventQueue()
+    ack = AsyncMock()
+    with patch("couchd.core.clients.veil._post_json", AsyncMock(return_value=204)), \
+            patch("couchd.core.clients.veil.veil_outbox.ack", ack):
+        await queue._send([("twitch.raid", {}, "abc"), ("twitch.chat.message", {}, None)])
+    ack.assert_awaited_once_with(["abc"])
+    assert not queue.inflight
+
+
+async def test_failed_alert_stays_in_outbox():
+    queue = _EventQueue()
+    ack = AsyncMock()
+    with patch("couchd.core.clients.veil._post_json", AsyncMock(return_value=503)), \
+            patch("couchd.core.clients.veil.veil_outbox.ack", ack):
+        await queue._send([("twitch.raid", {}, "abc")])
+    ack.assert_not_awaited()
+    assert queue.stats.failed == 1
+
+
+def test_replayed_event_dedupes_by_id():
+    queue = _EventQueue()
+    _fill(queue, [("twitch.raid", {"n": 1})])
+    with patch.object(_EventQueue, "_ensure_sender"), patch.object(queue, "_wakeup", create=True):
+        queue.put("twitch.sub", {}, "abc")
+        queue.put("twitch.sub", {}, "abc")
+    assert queue.contains("abc")
+    assert len(queue.take(10)) == 2
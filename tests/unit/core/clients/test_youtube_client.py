@@ -37,18 +37,14 @@ def _make_aiohttp_mock(status: int, text: str):
     mock_http = AsyncMock()
     mock_http.get = MagicMock(return_value=mock_get_cm)
 
-    mock_session_cm = AsyncMock()
-    mock_session_cm.__aenter__ = AsyncMock(return_value=mock_http)
-    mock_session_cm.__aexit__ = AsyncMock(return_value=False)
-
-    return MagicMock(return_value=mock_session_cm)
+    return MagicMock(return_value=mock_http)
 
 
 async def test_get_latest_video_returns_parsed_dict():
     client = YouTubeRSSClient()
     mock_session = _make_aiohttp_mock(200, _SAMPLE_XML)
 
-    with patch("aiohttp.ClientSession", mock_session):
+    with patch("couchd.core.clients.http_pool.get_session", mock_session):
         result = await client.get_latest_video()
 
     assert result is not None
@@ -62,7 +58,7 @@ async def test_get_latest_video_http_error_returns_none():
     client = YouTubeRSSClient()
     mock_session = _make_aiohttp_mock(404, "")
 
-    with patch("aiohttp.ClientSession", mock_session):
+    with patch("couchd.core.clients.http_pool.get_session", mock_session):
         result = await client.get_latest_video()
 
     assert result is None
@@ -70,7 +66,7 @@ async def test_get_latest_video_http_error_returns_none():
 
 async def test_get_latest_video_network_exception_returns_none():
     client = YouTubeRSSClient()
-    with patch("aiohttp.ClientSession", side_effect=Exception("network error")):
+    with patch("couchd.core.clients.http_pool.get_session", side_effect=Exception("network error")):
         result = await client.get_latest_video()
 
     assert result is None
@@ -80,7 +76,7 @@ async def test_get_latest_video_empty_feed_returns_none():
     client = YouTubeRSSClient()
     mock_session = _make_aiohttp_mock(200, _EMPTY_FEED_XML)
 
-    with patch("aiohttp.ClientSession", mock_session):
+    with patch("couchd.core.clients.http_pool.get_session", mock_session):
         result = await client.get_latest_video()
 
     assert result is None
@@ -0,0 +1,59 @@
+# tests/unit/core/test_chat_archive.py
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from couchd.core.chat_archive import ChatArchive, compact_fragments, ensure_partitions
+from couchd.core.constants import Platform
+
+_UTC = timezone.utc
+
+
+def test_compact_fragments_keeps_only_non_text_offsets():
+    fragments = [
+        {"type": "text", "text": "hi "},
+        {"type": "emote", "text": "Kappa", "id": "25"},
+        {"type": "text", "text": " "},
+        {"type": "mention", "text": "@bob"},
+    ]
+    assert compact_fragments(fragments) == [[3, 5, "e", "25"], [9, 4, "m", "@bob"]]
+
+
+def test_compact_fragments_plain_text_is_none():
+    assert compact_fragments([{"type": "text", "text": "hello"}]) is None
+
+
+async def test_ensure_partitions_rolls_over_year():
+    conn = AsyncMock()
+    await ensure_partitions(conn, datetime(2025, 12, 15, tzinfo=_UTC))
+
+    sql = [c.args[0] for c in conn.execute.await_args_list]
+    assert "chat_messages_2025_12" in sql[0]
+    assert "TO ('2026-01-01T00:00:00+00:00')" in sql[0]
+    assert "chat_messages_2026_01" in sql[1]
+
+
+async def test_write_copies_rows_with_session_per_platform():
+    archive = ChatArchive()
+    conn = MagicMock()
+    conn.is_closed.return_value = False
+    conn.execute = AsyncMock()
+    conn.copy_records_to_table = AsyncMock()
+    twitch_session = MagicMock(id=7)
+
+    async def active(platform):
+        return twitch_session if platform == Platform.TWITCH else None
+
+    sent = datetime(2024, 1, 1, tzinfo=_UTC)
+    archive.record(Platform.TWITCH, "m1", "1", "alice", "hi Kappa", [{"type": "emote", "text": "Kappa", "id": "25"}], sent)
+    archive.record(Platform.YOUTUBE, "m2", "UC1", "bob", "hello", sent_at=sent)
+
+    with patch("couchd.core.chat_archive.get_raw_connection", AsyncMock(return_value=conn)), \
+            patch("couchd.core.chat_archive.get_active_session", side_effect=active) as get_active:
+        await archive.close()
+
+    assert get_active.await_count == 2
+    records = conn.copy_records_to_table.await_args.kwargs["records"]
+    assert records == [
+        (sent, 7, "twitch", "m1", "1", "alice", "hi Kappa", '[[0,5,"e","25"]]'),
+        (sent, None, "youtube", "m2", "UC1", "bob", "hello", None),
+    ]
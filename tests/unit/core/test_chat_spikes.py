@@ -0,0 +1,66 @@
+# tests/unit/core/test_chat_spikes.py
+import pytest
+
+from couchd.core.chat_spikes import SpikeDetector
+from couchd.core.chat_velocity import ChatVelocity
+from couchd.core.constants import Platform, SpikeConfig
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 5000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return _Clock()
+
+
+@pytest.fixture
+def detector(clock):
+    return SpikeDetector(Platform.TWITCH, ChatVelocity(clock=clock), clock=clock)
+
+
+def _run(detector, clock, per_second: int, seconds: int) -> list[tuple]:
+    transitions = []
+    for _ in range(seconds):
+        detector.velocity.record(Platform.TWITCH, per_second)
+        clock.now += 1
+        started, ended = detector.tick()
+        if started or ended:
+            transitions.append(("start", started) if started else ("end", ended))
+    return transitions
+
+
+def test_burst_opens_one_spike_and_closes_after_calm(detector, clock):
+    assert _run(detector, clock, 1, SpikeConfig.WARMUP_SECONDS + 30) == []
+
+    opened = _run(detector, clock, 15, 20)
+    assert [kind for kind, _ in opened] == ["start"]
+
+    # Chat settling back down briefly, then flaring again, is still the same spike.
+    assert _run(detector, clock, 1, 8) == []
+    assert _run(detector, clock, 15, 5) == []
+
+    closed = _run(detector, clock, 1, SpikeConfig.EXIT_HOLD_SECONDS + 15)
+    assert [kind for kind, _ in closed] == ["end"]
+    spike = closed[0][1]
+    assert spike is opened[0][1]
+    assert spike.peak_rate == pytest.approx(15)
+    assert 30 < (spike.ended_at - spike.started_at).total_seconds() < 60
+
+
+def test_no_spike_before_baseline_warms_up(detector, clock):
+    _run(detector, clock, 1, 10)
+    assert _run(detector, clock, 30, 20) == []
+
+
+def test_cooldown_suppresses_back_to_back_spikes(detector, clock):
+    _run(detector, clock, 1, SpikeConfig.WARMUP_SECONDS + 30)
+    _run(detector, clock, 15, 20)
+    _run(detector, clock, 1, SpikeConfig.EXIT_HOLD_SECONDS + 15)
+
+    assert _run(detector, clock, 40, 20) == []
@@ -0,0 +1,59 @@
+# tests/unit/core/test_chat_velocity.py
+import pytest
+
+from couchd.core.chat_velocity import ChatVelocity
+from couchd.core.constants import Platform
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return _Clock()
+
+
+@pytest.fixture
+def velocity(clock):
+    return ChatVelocity(ring_seconds=61, half_life_seconds=10, clock=clock)
+
+
+def _chat(velocity, clock, platform, per_second, seconds):
+    for _ in range(seconds):
+        velocity.record(platform, per_second)
+        clock.now += 1
+
+
+def test_rates_cover_completed_seconds_per_platform(velocity, clock):
+    _chat(velocity, clock, Platform.TWITCH, 3, 20)
+    velocity.record(Platform.YOUTUBE, 40)     # current second, not yet counted
+    clock.now += 1
+
+    assert velocity.rate(10, Platform.TWITCH) == pytest.approx(2.7)   # 9 busy seconds, then a quiet one
+    assert velocity.rate(60, Platform.TWITCH) == pytest.approx(1.0)
+    assert velocity.rate(10) == pytest.approx(6.7)
+
+
+def test_ring_forgets_after_a_lap(velocity, clock):
+    _chat(velocity, clock, Platform.TWITCH, 5, 10)
+    clock.now += 500
+    velocity.record(Platform.TWITCH)
+    clock.now += 1
+
+    assert velocity.rate(60, Platform.TWITCH) == pytest.approx(1 / 60)
+
+
+def test_zscore_flags_a_burst_against_the_baseline(velocity, clock):
+    _chat(velocity, clock, Platform.TWITCH, 2, 60)
+    assert abs(velocity.zscore(Platform.TWITCH)) < 1
+    assert velocity.ewma(Platform.TWITCH) == pytest.approx(2, abs=0.1)
+
+    _chat(velocity, clock, Platform.TWITCH, 20, 10)
+    assert velocity.zscore(Platform.TWITCH) > 10
+    assert velocity.zscore(Platform.YOUTUBE) == 0.0
+
@@ -0,0 +1,67 @@
+# tests/unit/core/test_cooldowns.py
+import pytest
+
+from couchd.core.constants import Cooldown
+from couchd.core.cooldowns import CooldownManager
+
+LC = Cooldown(user_seconds=15, global_seconds=5)
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return _Clock()
+
+
+@pytest.fixture
+def manager(clock):
+    return CooldownManager(max_users_per_command=3, clock=clock)
+
+
+def test_global_then_user_cooldown(manager, clock):
+    assert not manager.check("lc", "alice", LC)
+    manager.record("lc", "alice")
+
+    assert manager.check("lc", "bob", LC)       # global
+    clock.now += 5
+    assert not manager.check("lc", "bob", LC)
+    assert manager.check("lc", "alice", LC)     # still her own cooldown
+    clock.now += 10
+    assert not manager.check("lc", "alice", LC)
+
+
+def test_fresh_clock_does_not_block_first_use():
+    manager = CooldownManager(clock=lambda: 0.0)
+    assert not manager.check("lc", "alice", LC)
+
+
+def test_expired_users_are_swept_on_record(manager, clock):
+    for user in ("a", "b"):
+        manager.check("lc", user, LC)
+        manager.record("lc", user)
+        clock.now += 5
+    assert len(manager) == 2
+
+    clock.now += 9                              # a's 15s are up, b's are not
+    manager.record("lc", "c")
+    assert list(manager._user_last["lc"]) == ["b", "c"]
+
+
+def test_full_command_forgets_least_recent_user(manager, clock):
+    for user in ("a", "b", "c", "d"):
+        manager.check("lc", user, LC)
+        manager.record("lc", user)
+        clock.now += 1
+    clock.now += 4                              # past the global cooldown only
+
+    assert len(manager) == 3
+    assert not manager.check("lc", "a", LC)
+    assert manager.check("lc", "b", LC)
+
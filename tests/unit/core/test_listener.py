@@ -0,0 +1,51 @@
+# tests/unit/core/test_listener.py
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from couchd.core.listener import PgListener, SingleFlight
+
+
+async def test_single_flight_collapses_burst_into_one_rerun():
+    runs = []
+    gate = asyncio.Event()
+
+    async def job():
+        runs.append(len(runs))
+        await gate.wait()
+
+    flight = SingleFlight(job, "test")
+    flight.request("1")
+    await asyncio.sleep(0)  # first run is now in progress
+    for n in range(4):
+        flight.request(str(n))
+    gate.set()
+    await flight.wait()
+
+    assert len(runs) == 2
+
+
+async def test_single_flight_survives_failing_job():
+    job = AsyncMock(side_effect=[RuntimeError("boom"), None])
+    flight = SingleFlight(job, "test")
+
+    flight.request()
+    await flight.wait()
+    flight.request()
+    await flight.wait()
+
+    assert job.await_count == 2
+
+
+async def test_concurrent_start_opens_one_connection():
+    conn = MagicMock()
+    conn.is_closed.return_value = False
+    conn.add_listener = AsyncMock()
+    connect = AsyncMock(return_value=conn)
+    pg = PgListener()
+    pg.subscribe("a", lambda _p: None)
+
+    with patch("couchd.core.listener.get_listener_connection", connect):
+        await asyncio.gather(pg.start(), pg.start())
+    await pg.close()
+
+    assert connect.await_count == 1
@@ -0,0 +1,67 @@
+# tests/unit/core/test_metrics.py
+import json
+from unittest.mock import patch
+
+import pytest
+
+from couchd.core import metrics
+from couchd.core.metrics import Counter, Gauge, Histogram
+
+
+def test_counter_and_gauge_render_with_labels():
+    requests = Counter("test_requests_total", "Requests.", ("upstream",))
+    requests.inc("https://a")
+    requests.inc("https://a", amount=2)
+    depth = Gauge("test_depth", "Depth.", lambda: {("x",): 3, ("y\"z",): 0}, ("lane",))
+
+    assert list(requests.lines()) == ['test_requests_total{upstream="https://a"} 3']
+    assert list(depth.lines()) == ['test_depth{lane="x"} 3', 'test_depth{lane="y\\"z"} 0']
+
+
+def test_histogram_buckets_are_cumulative():
+    hist = Histogram("test_seconds", "Latency.", ("op",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        hist.observe(value, "SELECT")
+
+    assert list(hist.lines()) == [
+        'test_seconds_bucket{op="SELECT",le="0.1"} 2',
+        'test_seconds_bucket{op="SELECT",le="1"} 3',
+        'test_seconds_bucket{op="SELECT",le="+Inf"} 4',
+        'test_seconds_sum{op="SELECT"} 3.65',
+        'test_seconds_count{op="SELECT"} 4',
+    ]
+
+
+def test_failing_gauge_is_skipped_in_render():
+    broken = Gauge("test_broken", "Raises.", lambda: 1 / 0)
+    with patch.object(metrics, "_registry", [broken]):
+        assert metrics.render() == "# HELP test_broken Raises.\n# TYPE test_broken gauge\n"
+
+
+async def test_timed_records_duration_and_errors():
+    @metrics.timed("test.loop")
+    async def ok():
+        return 7
+
+    @metrics.timed("test.failing")
+    async def failing():
+        raise RuntimeError("boom")
+
+    assert await ok() == 7
+    with pytest.raises(RuntimeError):
+        await failing()
+
+    assert metrics.loop_duration.count("test.loop") == 1
+    assert metrics.loop_errors.value("test.loop") == 0
+    assert metrics.loop_errors.value("test.failing") == 1
+    assert ("test.failing",) in metrics._last_runs
+
+
+async def test_healthz_reports_unhealthy_when_loop_lags():
+    with patch.object(metrics, "_last_lag", 0.01):
+        ok = await metrics._healthz(None)
+    with patch.object(metrics, "_last_lag", 5.0):
+        lagging = await metrics._healthz(None)
+
+    assert ok.status == 200 and json.loads(ok.body)["status"] == "ok"
+    assert lagging.status == 503 and json.loads(lagging.body)["loop_lag_seconds"] == 5.0
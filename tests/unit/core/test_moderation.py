@@ -0,0 +1,165 @@
+# tests/unit/core/test_moderation.py
+from couchd.core.constants import FloodConfig, HoldSource
+from couchd.core.moderation import FloodDetector, ModerationEngine, PendingMessage, PendingStore, normalize, simhash
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_normalize_folds_case_confusables_and_leetspeak():
+    assert normalize("FR33 V-Вuсk$​") == "free v-bucks"
+
+
+def test_literal_terms_match_through_obfuscation_and_respect_boundaries():
+    engine = ModerationEngine([r"\bscam\b", "freebies", r"\bhe\b"])
+
+    assert engine.is_flagged("total SC4M right here")
+    assert engine.is_flagged("ѕсаm")
+    assert engine.is_flagged("get FREEBIES now")
+    assert not engine.is_flagged("scampi for dinner")
+    assert not engine.is_flagged("the hero")
+    assert engine.is_flagged("is he here")
+
+
+def test_boundaries_are_read_from_the_raw_text_not_its_leetspeak():
+    engine = ModerationEngine([r"\bspam\b", r"\bscam\b"])
+
+    for text in ("spam!", "buy spam!!", "scam@home", "total scam$", "this is a scam+1", "$scam", "|spam|"):
+        assert engine.is_flagged(text), text
+    assert engine.is_flagged("5C4M")
+    assert not engine.is_flagged("scam5")
+    assert not engine.is_flagged("0spam")
+
+
+def test_overlapping_terms_are_all_found():
+    engine = ModerationEngine(["shers", r"\bhe\b", "hers"])
+
+    assert engine.is_flagged("ushers")
+    assert engine.is_flagged("this is hers")
+
+
+def test_regexes_share_one_alternation_and_keep_their_semantics():
+    engine = ModerationEngine([r"buy\s+followers", r"(?i)discord\.gg/\w+", r"(\w)\1{5,}", "plain"])
+
+    assert engine.is_flagged("BUY   followers cheap")
+    assert engine.is_flagged("join discord.gg/abc")
+    assert engine.is_flagged("aaaaaaa")
+    assert not engine.is_flagged("discord dot gg, buy some")
+    assert not ModerationEngine([]).is_flagged("anything")
+
+
+def test_regexes_with_a_literal_prefix_are_prefiltered_by_the_automaton():
+    engine = ModerationEngine([r"free\s+v-?bucks", r"^gg\.?ez"])
+
+    assert engine.is_flagged("FREE   vbucks here")
+    assert not engine.is_flagged("free stuff, bucks")
+    assert engine.is_flagged("GG.ez")
+    assert not engine.is_flagged("that was gg ez")
+    assert len(engine._anchored) == 1         # "gg" is too short to anchor on; that one stays merged
+    assert engine._regex is not None
+
+
+def test_pending_messages_expire_after_ttl():
+    clock = _Clock()
+    engine = ModerationEngine([], PendingStore(ttl_seconds=60, max_entries=10, clock=clock))
+    engine.add_pending("a", {"text": "x"}, HoldSource.BONELESS_COUCH)
+    clock.now += 30
+    engine.add_pending("b", {"text": "y"}, HoldSource.BONELESS_COUCH)
+
+    assert engine.add_hold_source("a", HoldSource.TWITCH_AUTOMOD).hold_sources == [
+        HoldSource.BONELESS_COUCH, HoldSource.TWITCH_AUTOMOD,
+    ]
+    clock.now += 31
+    assert not engine.has("a")
+    assert engine.pop("b").payload == {"text": "y"}
+    assert engine._pending.stats.expired == 1
+
+
+def test_pending_store_expires_a_shorter_ttl_put_behind_a_longer_one():
+    clock = _Clock()
+    store = PendingStore(ttl_seconds=100, max_entries=10, clock=clock)
+    store.put(PendingMessage(message_id="a", payload={}))
+    store.put(PendingMessage(message_id="b", payload={}), ttl_seconds=5)
+    clock.now += 50
+
+    assert store.get("b") is None
+    assert store.get("a") is not None
+    assert len(store) == 1 and store.stats.expired == 1
+
+
+def test_pending_store_evicts_oldest_past_capacity():
+    store = PendingStore(ttl_seconds=60, max_entries=2, clock=_Clock())
+    engine = ModerationEngine([], store)
+    for message_id in ("a", "b", "c"):
+        engine.add_pending(message_id, {}, HoldSource.BONELESS_COUCH)
+
+    assert not engine.has("a")
+    assert engine.has("b") and engine.has("c")
+    assert store.stats.evicted == 1
+    assert len(store) == 2
+
+
+def test_simhash_keeps_variants_close_and_unrelated_lines_apart():
+    spam = simhash("Best viewers on streamboo dot com")
+
+    assert (spam ^ simhash("B3st viewers on streamboo dot com 4821")).bit_count() <= FloodConfig.MAX_HAMMING
+    assert (spam ^ simhash("can you explain the time complexity again")).bit_count() > FloodConfig.MAX_HAMMING
+    assert simhash("LUL LUL") is None
+
+
+def test_flood_detector_flags_a_chatter_repeating_themselves():
+    flood = FloodDetector(clock=_Clock())
+
+    assert not flood.check("u1", "Best viewers on streamboo dot com")
+    assert not flood.check("u1", "Best viewers on streamboo dot com 2")
+    assert flood.check("u1", "B3st viewers on streamboo dot com 3")
+    assert not flood.check("u2", "completely unrelated question about the problem")
+
+
+def test_flood_detector_flags_a_raid_of_near_duplicates():
+    flood = FloodDetector(clock=_Clock())
+    flagged = [
+        flood.check(f"bot{i}", f"Wanna become famous? Buy followers on example dot com {i}")
+        for i in range(FloodConfig.CHANNEL_REPEATS)
+    ]
+
+    assert flagged == [False] * (FloodConfig.CHANNEL_REPEATS - 1) + [True]
+
+
+def test_flood_window_forgets_old_messages():
+    clock = _Clock()
+    flood = FloodDetector(clock=clock)
+    flood.check("u1", "Best viewers on streamboo dot com")
+    flood.check("u1", "Best viewers on streamboo dot com")
+    clock.now += FloodConfig.WINDOW_SECONDS
+
+    assert not flood.check("u1", "Best viewers on streamboo dot com")
+    assert len(flood) == 1
+    assert list(flood._users) == ["u1"] and all(len(buckets) == 1 for buckets in flood._bands)
+
+
+def test_screen_prefers_patterns_and_exempts_trusted_chatters():
+    engine = ModerationEngine([r"\bscam\b"])
+    engine.flood = FloodDetector(clock=_Clock())
+    text = "Best viewers on streamboo dot com"
+
+    assert engine.screen("u1", "a scam link") == HoldSource.BONELESS_COUCH
+    assert [engine.screen("mod", text, trusted=True) for _ in range(4)] == [None] * 4
+    assert [engine.screen("u1", text) for _ in range(3)] == [None, None, HoldSource.DUPLICATE_FLOOD]
+
+
+def test_flood_window_drops_oldest_past_capacity(monkeypatch):
+    monkeypatch.setattr(FloodConfig, "MAX_ENTRIES", 2)
+    clock = _Clock()
+    flood = FloodDetector(clock=clock)
+    for user_id in ("u1", "u2", "u3"):
+        flood.check(user_id, f"{user_id} has something entirely different to say")
+        clock.now += 1
+
+    assert len(flood) == 2
+    assert sorted(flood._users) == ["u2", "u3"]
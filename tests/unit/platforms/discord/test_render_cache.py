@@ -0,0 +1,95 @@
+# tests/unit/platforms/discord/test_render_cache.py
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import discord
+
+from couchd.core.models import DiscordPost
+from couchd.platforms.discord.components import problems_forum
+from couchd.platforms.discord.components.render_cache import Debouncer, RenderCache, render_hash
+
+
+def test_render_hash_ignores_embed_identity():
+    a = discord.Embed(title="1. Two Sum", url="https://leetcode.com/problems/two-sum/")
+    b = discord.Embed(title="1. Two Sum", url="https://leetcode.com/problems/two-sum/")
+    assert render_hash("name", a) == render_hash("name", b)
+    b.add_field(name="Status", value="Solved")
+    assert render_hash("name", a) != render_hash("name", b)
+
+
+def test_render_cache_is_lru_bounded():
+    cache = RenderCache(max_entries=2)
+    cache.remember("a", "1")
+    cache.remember("b", "2")
+    cache.remember("a", "1")
+    cache.remember("c", "3")
+    assert not cache.changed("a", "1")
+    assert cache.changed("b", "2")
+
+
+async def test_debouncer_runs_latest_job_once():
+    calls = []
+    debouncer = Debouncer(delay=0.01)
+    for n in range(5):
+        debouncer.schedule("thread", AsyncMock(side_effect=lambda n=n: calls.append(n)))
+    await asyncio.sleep(0.05)
+    assert calls == [4]
+    assert debouncer.pending() == 0
+
+
+async def test_debouncer_restarts_delay_on_each_schedule():
+    calls = []
+    debouncer = Debouncer(delay=0.1)
+    debouncer.schedule("thread", AsyncMock(side_effect=lambda: calls.append(1)))
+    await asyncio.sleep(0.06)
+    debouncer.schedule("thread", AsyncMock(side_effect=lambda: calls.append(2)))
+    await asyncio.sleep(0.06)
+    assert calls == []                          # a fixed window would have fired by now
+    await asyncio.sleep(0.1)
+    assert calls == [2]
+
+
+async def test_flush_waits_for_running_job_and_runs_queued_one():
+    calls = []
+    started, release = asyncio.Event(), asyncio.Event()
+
+    async def slow():
+        started.set()
+        await release.wait()
+        calls.append("slow")
+
+    debouncer = Debouncer(delay=0)
+    debouncer.schedule("thread", slow)
+    await started.wait()
+    debouncer.schedule("thread", AsyncMock(side_effect=lambda: calls.append("queued")))
+    debouncer.schedule("other", AsyncMock(side_effect=lambda: calls.append("other")))
+
+    flush = asyncio.create_task(debouncer.flush())
+    await asyncio.sleep(0.01)
+    assert not flush.done()
+    release.set()
+    await flush
+    assert sorted(calls) == ["other", "queued", "slow"]
+    assert calls.index("slow") < calls.index("queued")
+    assert debouncer.pending() == 0
+
+
+async def test_unchanged_thread_is_not_edited():
+    embed = discord.Embed(title="1. Two Sum")
+    thread = MagicMock()
+    thread.edit = AsyncMock()
+    partial = MagicMock(edit=AsyncMock())
+    thread.get_partial_message.return_value = partial
+    forum = MagicMock(available_tags=[])
+    forum.get_thread.return_value = thread
+    post = DiscordPost(kind="lc_thread", ref="two-sum", guild_id=1, channel_id=5, message_id=99, thread_id=99)
+    build = AsyncMock(return_value=("1. Two Sum", embed, [MagicMock(difficulty=None)]))
+
+    with patch.object(problems_forum, "build_problem_embed", build), \
+            patch.object(problems_forum, "render_cache", RenderCache()):
+        await problems_forum.update_problem_thread(forum, "two-sum", post, MagicMock())
+        await problems_forum.update_problem_thread(forum, "two-sum", post, MagicMock())
+
+    thread.edit.assert_awaited_once()
+    partial.edit.assert_awaited_once_with(embed=embed)
+    thread.fetch_message.assert_not_called()
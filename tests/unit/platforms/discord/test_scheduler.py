@@ -0,0 +1,103 @@
+# tests/unit/platforms/discord/test_scheduler.py
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import discord
+import pytest
+
+from couchd.platforms.discord.components.scheduler import DiscordScheduler, Priority
+
+
+def _http_error(status: int) -> discord.HTTPException:
+    return discord.HTTPException(MagicMock(status=status, reason="x"), "error")
+
+
+async def test_higher_priority_runs_first_when_slots_are_scarce():
+    order = []
+    gate = asyncio.Event()
+    scheduler = DiscordScheduler(max_concurrency=1)
+
+    async def blocker():
+        await gate.wait()
+
+    async def record(name):
+        order.append(name)
+
+    scheduler.submit("a", blocker, Priority.IDEAS)
+    done = [
+        scheduler.submit("b", lambda: record("idea"), Priority.IDEAS),
+        scheduler.submit("c", lambda: record("clip"), Priority.CLIPS),
+        scheduler.submit("d", lambda: record("live"), Priority.GO_LIVE),
+    ]
+    gate.set()
+    await asyncio.gather(*done)
+
+    assert order == ["live", "clip", "idea"]
+
+
+async def test_one_route_runs_serially_while_others_proceed():
+    active = {"a": 0}
+    peak = {"a": 0}
+    other_done = asyncio.Event()
+
+    async def on_a():
+        active["a"] += 1
+        peak["a"] = max(peak["a"], active["a"])
+        await asyncio.sleep(0.01)
+        active["a"] -= 1
+
+    async def on_b():
+        other_done.set()
+
+    scheduler = DiscordScheduler(max_concurrency=4)
+    jobs = [scheduler.submit("a", on_a, Priority.FORUM) for _ in range(3)]
+    jobs.append(scheduler.submit("b", on_b, Priority.FORUM))
+    await asyncio.wait_for(other_done.wait(), 0.005)
+    await asyncio.gather(*jobs)
+
+    assert peak["a"] == 1
+
+
+async def test_transient_error_is_retried():
+    calls = []
+
+    async def flaky():
+        calls.append(1)
+        if len(calls) == 1:
+            raise _http_error(503)
+        return "ok"
+
+    scheduler = DiscordScheduler()
+    with patch("couchd.platforms.discord.components.scheduler._retry_delay", return_value=0):
+        assert await scheduler.run("a", flaky, Priority.CLIPS) == "ok"
+
+    assert scheduler.stats.retried == 1
+    assert scheduler.stats.completed == 1
+
+
+async def test_client_error_fails_without_retry():
+    async def forbidden():
+        raise _http_error(403)
+
+    scheduler = DiscordScheduler()
+    with pytest.raises(discord.HTTPException):
+        await scheduler.run("a", forbidden, Priority.CLIPS)
+
+    assert scheduler.stats.retried == 0
+    assert scheduler.stats.failed == 1
+
+
+async def test_same_key_is_queued_once():
+    calls = []
+
+    async def post():
+        calls.append(1)
+
+    scheduler = DiscordScheduler()
+    first = scheduler.submit("a", post, Priority.IDEAS, key=("idea", 1))
+    second = scheduler.submit("a", post, Priority.IDEAS, key=("idea", 1))
+    await first
+
+    assert first is second
+    assert calls == [1]
+    assert scheduler.stats.deduplicated == 1
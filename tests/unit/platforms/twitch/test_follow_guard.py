@@ -0,0 +1,115 @@
+# tests/unit/platforms/twitch/test_follow_guard.py
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from couchd.core.config import settings
+from couchd.core.constants import FollowGuardConfig
+from couchd.platforms.twitch.components.follow_guard import FollowGuard
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return _Clock()
+
+
+@pytest.fixture
+def broadcaster():
+    return MagicMock(ban_user=AsyncMock(), update_chat_settings=AsyncMock())
+
+
+@pytest.fixture
+def guard(clock, broadcaster):
+    bot = MagicMock(create_partialuser=MagicMock(return_value=broadcaster))
+    with patch("couchd.platforms.twitch.components.follow_guard.veil") as veil:
+        veil.post_event = AsyncMock()
+        guard = FollowGuard(bot, clock=clock)
+        guard.veil = veil
+        yield guard
+
+
+async def test_ordinary_follows_are_announced(guard, clock):
+    for i, login in enumerate(["alice", "bob_codes", "carol", "dave"]):
+        assert guard.observe(str(i), login)
+        clock.now += 5
+
+    assert not guard.active
+
+
+async def test_a_bot_wave_trips_defense_and_mutes_the_rest(guard, clock):
+    announced = 0
+    for i in range(1000):                   # 1,000 follows in ten seconds
+        announced += guard.observe(str(i), f"viewer{i:05d}")
+        clock.now += 0.01
+
+    assert guard.active
+    assert announced == FollowGuardConfig.TRIP_SUSPICIOUS - 1
+    assert guard.wave.follows == 1000 - announced
+    assert len(guard._lookups) == 1000
+
+
+async def test_wave_stands_down_with_one_summary(guard, clock):
+    for i in range(FollowGuardConfig.TRIP_SUSPICIOUS + 5):
+        guard.observe(str(i), f"viewer{i:05d}")
+    assert guard.active
+
+    clock.now += FollowGuardConfig.WINDOW_SECONDS + 1
+    guard.tick()
+    assert guard.active                     # calm, but not for long enough yet
+    clock.now += FollowGuardConfig.CALM_SECONDS
+    guard.tick()
+    await asyncio.sleep(0)
+
+    assert not guard.active
+    guard.veil.post_event.assert_awaited_once()
+    topic, summary = guard.veil.post_event.await_args.args
+    assert topic == "twitch.follower.wave"
+    assert summary["follows"] == 6
+    assert guard.observe("x", "erin")
+
+
+async def test_bans_need_a_young_account_and_a_bot_name(guard, broadcaster):
+    for i in range(FollowGuardConfig.TRIP_SUSPICIOUS):
+        guard.observe(str(i), f"viewer{i:05d}")
+    guard.observe("old", "viewer77777")
+    guard.observe("human", "frank")
+    now = datetime.now(timezone.utc)
+    users = [
+        SimpleNamespace(id="3", created_at=now - timedelta(hours=2)),
+        SimpleNamespace(id="old", created_at=now - timedelta(days=900)),
+        SimpleNamespace(id="human", created_at=now - timedelta(hours=1)),
+    ]
+
+    with patch.object(settings, "FOLLOW_DEFENSE_BANS", True):
+        guard.apply_lookup(dict(guard._lookups), users)
+    await asyncio.sleep(0)
+
+    broadcaster.ban_user.assert_awaited_once()
+    assert broadcaster.ban_user.await_args.kwargs["user"] == "3"
+    assert guard.wave.banned == 1
+
+
+async def test_followers_only_is_switched_on_and_back_off(guard, clock, broadcaster):
+    with patch.object(settings, "FOLLOW_DEFENSE_FOLLOWERS_ONLY", True):
+        for i in range(FollowGuardConfig.TRIP_FOLLOWS):
+            guard.observe(str(i), f"name{i}")
+        await asyncio.sleep(0)
+        clock.now += FollowGuardConfig.WINDOW_SECONDS + 1
+        guard.tick()
+        clock.now += FollowGuardConfig.CALM_SECONDS
+        guard.tick()
+        await asyncio.sleep(0)
+
+    modes = [c.kwargs["follower_mode"] for c in broadcaster.update_chat_settings.await_args_list]
+    assert modes == [True, False]